@@ -1,91 +1,68 @@
 # MTR PS-OHLR DUAT - Analysis Module
 """
 Analysis modules for dashboard, lag analysis, S-curve, and performance tracking.
-"""
-
-from .dashboard import (
-    aggregate_records,
-    calculate_summary,
-    get_weekly_trend,
-    get_monthly_trend,
-    get_project_distribution,
-    get_keyword_distribution,
-    get_nth_pivot_by_week,
-    export_dashboard_excel,
-    DashboardAnalyzer
-)
-
-from .lag_analysis import (
-    get_status,
-    load_project_master,
-    calculate_nth_lag_lead,
-    export_lag_report,
-    LagAnalyzer
-)
 
-from .scurve import (
-    calculate_scurve_data,
-    plot_scurve,
-    generate_scurve_excel,
-    SCurveGenerator
-)
-
-from .performance import (
-    calculate_performance_metrics,
-    get_recovery_path,
-    plot_performance_chart,
-    plot_cumulative_progress,
-    PerformanceAnalyzer
-)
+Exports are resolved on first access, so importing one analysis module
+(or starting the sidecar) does not load every other module and its
+plotting / Excel dependencies.
+"""
 
-from .manpower import (
-    get_daily_headcount,
-    get_team_distribution,
-    get_job_type_manpower,
-    get_role_frequency,
-    get_work_access_analysis,
-    get_individual_stats,
-    get_summary_kpis,
-    export_manpower_excel,
-    ManpowerAnalyzer
-)
+import importlib
 
-__all__ = [
+# Public name -> submodule that defines it
+_EXPORTS = {
     # Dashboard
-    'aggregate_records',
-    'calculate_summary',
-    'get_weekly_trend',
-    'get_monthly_trend',
-    'get_project_distribution',
-    'get_keyword_distribution',
-    'get_nth_pivot_by_week',
-    'export_dashboard_excel',
-    'DashboardAnalyzer',
+    'aggregate_records': 'dashboard',
+    'calculate_summary': 'dashboard',
+    'get_weekly_trend': 'dashboard',
+    'get_monthly_trend': 'dashboard',
+    'get_project_distribution': 'dashboard',
+    'get_keyword_distribution': 'dashboard',
+    'calculate_line_distribution': 'dashboard',
+    'get_nth_pivot_by_week': 'dashboard',
+    'export_dashboard_excel': 'dashboard',
+    'DashboardCube': 'dashboard',
+    'DashboardAnalyzer': 'dashboard',
     # Lag Analysis
-    'get_status',
-    'load_project_master',
-    'calculate_nth_lag_lead',
-    'export_lag_report',
-    'LagAnalyzer',
+    'get_status': 'lag_analysis',
+    'load_project_master': 'lag_analysis',
+    'calculate_nth_lag_lead': 'lag_analysis',
+    'export_lag_report': 'lag_analysis',
+    'LagAnalyzer': 'lag_analysis',
     # S-Curve
-    'calculate_scurve_data',
-    'plot_scurve',
-    'generate_scurve_excel',
-    'SCurveGenerator',
+    'calculate_scurve_data': 'scurve',
+    'plot_scurve': 'scurve',
+    'generate_scurve_excel': 'scurve',
+    'SCurveGenerator': 'scurve',
     # Performance
-    'calculate_performance_metrics',
-    'get_recovery_path',
-    'plot_performance_chart',
-    'plot_cumulative_progress',
-    'PerformanceAnalyzer',
+    'calculate_performance_metrics': 'performance',
+    'get_recovery_path': 'performance',
+    'plot_performance_chart': 'performance',
+    'plot_cumulative_progress': 'performance',
+    'PerformanceAnalyzer': 'performance',
     # Manpower
-    'get_daily_headcount',
-    'get_team_distribution',
-    'get_job_type_manpower',
-    'get_role_frequency',
-    'get_work_access_analysis',
-    'get_individual_stats',
-    'get_summary_kpis',
-    'export_manpower_excel',
-    'ManpowerAnalyzer',
-]
+    'get_daily_headcount': 'manpower',
+    'get_team_distribution': 'manpower',
+    'get_job_type_manpower': 'manpower',
+    'get_role_frequency': 'manpower',
+    'get_work_access_analysis': 'manpower',
+    'get_individual_stats': 'manpower',
+    'get_summary_kpis': 'manpower',
+    'export_manpower_excel': 'manpower',
+    'ManpowerAnalyzer': 'manpower',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,21 +3,25 @@
 Dashboard data aggregation and summary calculations.
 """
 
+import numpy as np
 import pandas as pd
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 
+from parsers.record_store import QTY_FIELD, RECORD_FIELDS, RecordStore
+
 logger = logging.getLogger(__name__)
 
 
-def aggregate_records(records: List[Dict[str, Any]]) -> pd.DataFrame:
+def aggregate_records(records: Union[List[Dict[str, Any]], RecordStore]) -> pd.DataFrame:
     """
     Aggregate raw records into a DataFrame with proper formatting.
     
     Args:
-        records: List of record dictionaries from DOCX parsing
+        records: List of record dictionaries from DOCX parsing, or a
+            RecordStore (read column-wise, no per-row dicts)
         
     Returns:
         Cleaned and formatted DataFrame
@@ -25,6 +29,9 @@ def aggregate_records(records: List[Dict[str, Any]]) -> pd.DataFrame:
     if not records:
         return pd.DataFrame()
     
+    if isinstance(records, RecordStore):
+        return _aggregate_store(records)
+    
     df = pd.DataFrame(records)
     
     # Extract day and date components
@@ -43,6 +50,53 @@ def aggregate_records(records: List[Dict[str, Any]]) -> pd.DataFrame:
     return df
 
 
+def _aggregate_store(store: RecordStore) -> pd.DataFrame:
+    """
+    Build the aggregate_records DataFrame from a RecordStore.
+    
+    The string parsing runs once per distinct value (per distinct
+    date/year pair for DateObj) and is expanded to rows by category code,
+    so the result equals aggregate_records(store.to_records()).
+    """
+    def codes(field: str) -> np.ndarray:
+        return np.frombuffer(store.codes(field), dtype=np.intc)
+    
+    def categories(field: str) -> pd.Series:
+        return pd.Series(store.categories(field))
+    
+    def expand(values: pd.Series, idx: np.ndarray) -> pd.Series:
+        return values.take(idx).reset_index(drop=True)
+    
+    data: Dict[str, Any] = {}
+    for field in RECORD_FIELDS:
+        if field == QTY_FIELD:
+            data[field] = np.array(store.qty, dtype=np.float64)
+        else:
+            data[field] = expand(categories(field), codes(field))
+    df = pd.DataFrame(data)
+    
+    full_dates = categories("FullDate")
+    date_cats = full_dates.str.replace(r'^[A-Za-z]{3}\s+', '', regex=True).str.strip()
+    df["Day"] = expand(full_dates.str.extract(r'^([A-Za-z]{3})', expand=False), codes("FullDate"))
+    df["Date"] = expand(date_cats, codes("FullDate"))
+    df["Week"] = expand(categories("Week").astype(str).str.extract(r'(\d+)')[0], codes("Week"))
+    
+    # One to_datetime call per distinct (date, year) pair
+    year_cats = categories("Year")
+    pairs = codes("FullDate").astype(np.int64) * max(len(year_cats), 1) + codes("Year")
+    unique_pairs, inverse = np.unique(pairs, return_inverse=True)
+    pair_dates = pd.to_datetime(
+        expand(date_cats, unique_pairs // max(len(year_cats), 1))
+        + '/' + expand(year_cats, unique_pairs % max(len(year_cats), 1)),
+        format='%d/%m/%Y',
+        errors='coerce'
+    )
+    df["DateObj"] = expand(pair_dates, inverse)
+    df["Month"] = expand(pair_dates.dt.strftime('%Y-%m'), inverse)
+    
+    return df
+
+
 def calculate_summary(df: pd.DataFrame, current_week: int = None, current_month: int = None) -> pd.DataFrame:
     """
     Calculate summary statistics by project.
@@ -274,6 +328,41 @@ def get_keyword_distribution(df: pd.DataFrame, job_keywords: List[str] = None) -
     return {}
 
 
+def calculate_line_distribution(df: pd.DataFrame) -> Tuple[List[str], List[int], List[float]]:
+    """
+    Get NTH and Qty distribution by rail line.
+    
+    Args:
+        df: DataFrame with raw data
+        
+    Returns:
+        Tuple of (line labels sorted by NTH descending, NTH counts, qty sums)
+    """
+    if df is None or df.empty or 'Line' not in df.columns:
+        return [], [], []
+    
+    df_with_line = df[df['Line'] != '']
+    if df_with_line.empty:
+        return [], [], []
+    
+    # NTH by line
+    line_nth = df_with_line.groupby('Line').size()
+    # Qty by line
+    if 'Qty Delivered' in df_with_line.columns:
+        line_qty = df_with_line.groupby('Line')['Qty Delivered'].sum()
+    else:
+        line_qty = pd.Series()
+    
+    # Sort by NTH descending
+    sorted_lines = line_nth.sort_values(ascending=False)
+    
+    return (
+        sorted_lines.index.tolist(),
+        sorted_lines.values.tolist(),
+        [line_qty.get(line, 0) for line in sorted_lines.index],
+    )
+
+
 def get_nth_pivot_by_week(df: pd.DataFrame) -> pd.DataFrame:
     """
     Create NTH pivot table by week and project.
@@ -344,6 +433,205 @@ def export_dashboard_excel(
         return False
 
 
+def _default_job_keywords() -> List[str]:
+    from config import load_app_config
+    return load_app_config().get("keywords", ['CBM', 'CM', 'PA work', 'HLM', 'Provide'])
+
+
+class DashboardCube:
+    """
+    Pre-aggregated NTH count and qty sum for the dashboard charts.
+    
+    Built once per load by grouping the raw rows on (YearWeek, YearMonth,
+    Project, Line).  The week and month keys follow the same rules as
+    get_weekly_trend and get_monthly_trend, and rows with missing keys are
+    kept, so every chart is a small groupby over the cube and returns the
+    same result as the matching function over the raw DataFrame.
+    
+    The Projects/Jobs category is resolved per distinct project at query
+    time, so keyword changes in the app config apply without a rebuild.
+    """
+    
+    KEYS = ["YearWeek", "YearMonth", "Project", "Line"]
+    
+    def __init__(self, df: pd.DataFrame):
+        self.has_project = 'Project' in df.columns
+        self.has_line = 'Line' in df.columns
+        self.has_qty = 'Qty Delivered' in df.columns
+        
+        # Only the columns each key is derived from, so the distinct rows stay few
+        week_columns = ['Year', 'Week'] if {'Year', 'Week'} <= set(df.columns) else ['Date']
+        if 'DateObj' in df.columns and df['DateObj'].notna().any():
+            month_columns = ['DateObj']
+        else:
+            month_columns = ['DateObj', 'Year', 'Week', 'Date']
+        
+        keys = pd.DataFrame({
+            "YearWeek": self._per_distinct(df, week_columns, self._year_week_keys),
+            "YearMonth": self._per_distinct(df, month_columns, self._year_month_keys),
+            "Project": df['Project'] if self.has_project else np.nan,
+            "Line": df['Line'] if self.has_line else np.nan,
+            "Qty": df['Qty Delivered'] if self.has_qty else 0,
+        }, index=df.index)
+        
+        self.frame = keys.groupby(self.KEYS, dropna=False, sort=False).agg(
+            NTH=("Qty", "size"),
+            Qty=("Qty", "sum"),
+        ).reset_index()
+    
+    # -- key columns --------------------------------------------------------
+    
+    @staticmethod
+    def _per_distinct(df: pd.DataFrame, columns: List[str], build) -> pd.Series:
+        """Run *build* on the distinct rows of *columns* and expand the result to every row."""
+        columns = [c for c in columns if c in df.columns]
+        if not columns:
+            return build(df)
+        
+        sub = df[columns]
+        grouped = sub.groupby(columns, dropna=False, sort=False)
+        codes = grouped.ngroup().to_numpy()
+        # head(1) keeps first occurrences in row order, which is ngroup order for sort=False
+        distinct = grouped.head(1).reset_index(drop=True)
+        values = build(distinct).to_numpy()
+        return pd.Series(values[codes], index=df.index, dtype=object)
+    
+    @staticmethod
+    def _year_week_keys(df: pd.DataFrame) -> pd.Series:
+        """Per-row YearWeek as built by get_weekly_trend (NaN where dropped)."""
+        keys = pd.Series(np.nan, index=df.index, dtype=object)
+        try:
+            if 'Year' in df.columns and 'Week' in df.columns:
+                year = pd.to_numeric(df['Year'], errors='coerce')
+                week = pd.to_numeric(df['Week'], errors='coerce')
+                valid = year.notna() & week.notna()
+                keys[valid] = (
+                    year[valid].astype(int).astype(str) + '-W' +
+                    week[valid].astype(int).astype(str).str.zfill(2)
+                )
+            elif 'Date' in df.columns:
+                date_obj = pd.to_datetime(df['Date'], errors='coerce', dayfirst=True)
+                valid = date_obj.notna()
+                iso = date_obj[valid].dt.isocalendar()
+                keys[valid] = (
+                    date_obj[valid].dt.year.astype(str) + '-W' +
+                    iso.week.astype(str).str.zfill(2)
+                )
+        except Exception as e:
+            logger.error(f"Error building weekly keys: {e}")
+            keys[:] = np.nan
+        return keys
+    
+    @staticmethod
+    def _year_month_keys(df: pd.DataFrame) -> pd.Series:
+        """Per-row YearMonth as built by get_monthly_trend (NaN where dropped)."""
+        keys = pd.Series(np.nan, index=df.index, dtype=object)
+        try:
+            if 'DateObj' in df.columns or ('Year' in df.columns and 'Week' in df.columns):
+                if 'DateObj' not in df.columns or df['DateObj'].isna().all():
+                    year = pd.to_numeric(df['Year'], errors='coerce')
+                    week = pd.to_numeric(df['Week'], errors='coerce')
+                    valid = year.notna() & week.notna()
+                    date_obj = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+                    date_obj[valid] = pd.to_datetime(
+                        year[valid].astype(int).astype(str) + '-W' +
+                        week[valid].astype(int).astype(str).str.zfill(2) + '-1',
+                        format='%G-W%V-%u',
+                        errors='coerce'
+                    )
+                else:
+                    date_obj = df['DateObj']
+            elif 'Date' in df.columns:
+                date_obj = pd.to_datetime(df['Date'], errors='coerce', dayfirst=True)
+            else:
+                return keys
+            valid = date_obj.notna()
+            keys[valid] = date_obj[valid].dt.strftime('%Y-%m')
+        except Exception as e:
+            logger.error(f"Error building monthly keys: {e}")
+            keys[:] = np.nan
+        return keys
+    
+    # -- chart slices -------------------------------------------------------
+    
+    def weekly_trend(self, weeks: int = 12, job_keywords: List[str] = None) -> Tuple[List[str], Dict[str, List[int]]]:
+        """Cube equivalent of get_weekly_trend."""
+        if not self.has_project:
+            return [], {}
+        if job_keywords is None:
+            job_keywords = _default_job_keywords()
+        
+        rows = self.frame[self.frame['YearWeek'].notna()]
+        if rows.empty:
+            return [], {}
+        
+        upper_keywords = [kw.upper() for kw in job_keywords]
+        projects = rows['Project'].drop_duplicates()
+        category = {
+            project: 'Jobs' if any(kw in str(project).upper() for kw in upper_keywords) else 'Projects'
+            for project in projects
+        }
+        
+        week_list = sorted(rows['YearWeek'].unique())[-weeks:]
+        counts = rows.assign(Category=rows['Project'].map(category)).groupby(['Category', 'YearWeek'])['NTH'].sum()
+        
+        weekly_data = {}
+        for cat in ['Projects', 'Jobs']:
+            weekly_data[cat] = [counts.get((cat, w), 0) for w in week_list]
+        return week_list, weekly_data
+    
+    def monthly_trend(self, months: int = 6) -> Tuple[List[str], List[int]]:
+        """Cube equivalent of get_monthly_trend."""
+        rows = self.frame[self.frame['YearMonth'].notna()]
+        if rows.empty:
+            return [], []
+        monthly = rows.groupby('YearMonth')['NTH'].sum().sort_index().tail(months)
+        return monthly.index.tolist(), monthly.tolist()
+    
+    def project_distribution(self) -> Dict[str, int]:
+        """Cube equivalent of get_project_distribution."""
+        if not self.has_project:
+            return {}
+        project_nth = self.frame.groupby('Project')['NTH'].sum()
+        project_nth = project_nth.rename(index={'Provide': 'Provide manpower for switching'})
+        return project_nth.to_dict()
+    
+    def keyword_distribution(self, job_keywords: List[str] = None) -> Dict[str, int]:
+        """Cube equivalent of get_keyword_distribution."""
+        if not self.has_project:
+            return {}
+        if job_keywords is None:
+            job_keywords = _default_job_keywords()
+        
+        per_project = self.frame.groupby('Project', dropna=False)['NTH'].sum()
+        names = pd.Series(per_project.index, index=per_project.index).astype(str).str.upper()
+        
+        keyword_totals = {}
+        for kw in job_keywords:
+            mask = names.str.contains(kw.upper(), na=False)
+            total = per_project[mask.to_numpy()].sum()
+            if total > 0:
+                display_name = 'Provide manpower for switching' if kw == 'Provide' else kw
+                keyword_totals[display_name] = total
+        return keyword_totals
+    
+    def line_distribution(self) -> Tuple[List[str], List[int], List[float]]:
+        """Cube equivalent of calculate_line_distribution."""
+        if not self.has_line:
+            return [], [], []
+        rows = self.frame[self.frame['Line'] != '']
+        if rows.empty:
+            return [], [], []
+        by_line = rows.groupby('Line')[['NTH', 'Qty']].sum()
+        sorted_lines = by_line['NTH'].sort_values(ascending=False)
+        qty = by_line['Qty'] if self.has_qty else pd.Series(dtype=float)
+        return (
+            sorted_lines.index.tolist(),
+            sorted_lines.values.tolist(),
+            [qty.get(line, 0) for line in sorted_lines.index],
+        )
+
+
 class DashboardAnalyzer:
     """High-level dashboard data manager."""
     
@@ -352,16 +640,101 @@ class DashboardAnalyzer:
         self.summary = None
         self.last_updated = None
         self.nth_trend = None
+        # source name -> (start, stop) row span in self.df, set by load_from_sources
+        self.source_spans: Dict[str, Tuple[int, int]] = {}
+        # Chart aggregates for self.df, see the cube property
+        self._cube: Optional[DashboardCube] = None
+        self._cube_df: Optional[pd.DataFrame] = None
+        # Bumped on every load, see the data_version property
+        self._data_version = 0
+        self._version_refs: Tuple[Any, Any, Any] = (None, None, None)
     
     def load_from_records(self, records: List[Dict[str, Any]], max_week: int = None):
         """Load dashboard data from parsed records."""
         if not records:
             return False
         
-        self.df = aggregate_records(records)
-        if self.df.empty:
+        df = aggregate_records(records)
+        if df.empty:
+            return False
+        
+        self.df = df
+        self.source_spans = {}
+        self._refresh_derived(max_week)
+        return True
+    
+    def load_from_sources(self, sources: Dict[str, List[Dict[str, Any]]], max_week: int = None) -> bool:
+        """
+        Load dashboard data from records grouped by source file.
+        
+        Rows are laid out in sorted source order, so the result matches
+        ``load_from_records`` on the concatenated records, and the row span
+        of each source is remembered for ``apply_source_delta``.
+        
+        Args:
+            sources: Mapping of source name (report filename) to its records
+            max_week: Current week used for the summary averages
+            
+        Returns:
+            True when any rows were loaded
+        """
+        return self._rebuild({name: aggregate_records(recs) for name, recs in sources.items()}, max_week)
+    
+    def apply_source_delta(
+        self,
+        updated: Dict[str, List[Dict[str, Any]]],
+        removed: List[str] = None,
+        max_week: int = None,
+    ) -> bool:
+        """
+        Replace the rows of changed sources and drop removed ones.
+        
+        Only the records in *updated* are aggregated; rows of untouched
+        sources are reused from the current DataFrame by position.
+        
+        Args:
+            updated: Records of new or modified sources
+            removed: Names of deleted sources
+            max_week: Current week used for the summary averages
+            
+        Returns:
+            True when rows remain after the update
+        """
+        removed_set = set(removed or [])
+        frames: Dict[str, pd.DataFrame] = {}
+        for name, (start, stop) in self.source_spans.items():
+            if name not in removed_set and name not in updated:
+                frames[name] = self.df.iloc[start:stop]
+        for name, recs in updated.items():
+            frames[name] = aggregate_records(recs)
+        return self._rebuild(frames, max_week)
+    
+    def _rebuild(self, frames: Dict[str, pd.DataFrame], max_week: Optional[int]) -> bool:
+        """Concatenate per-source frames in source order and refresh derived tables."""
+        spans: Dict[str, Tuple[int, int]] = {}
+        pieces: List[pd.DataFrame] = []
+        offset = 0
+        for name in sorted(frames):
+            frame = frames[name]
+            spans[name] = (offset, offset + len(frame))
+            offset += len(frame)
+            if not frame.empty:
+                pieces.append(frame)
+        
+        self.source_spans = spans
+        if not pieces:
+            self.df = None
+            self.summary = None
+            self.nth_trend = None
+            self._bump_version()
             return False
         
+        self.df = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0].reset_index(drop=True)
+        self._refresh_derived(max_week)
+        return True
+    
+    def _refresh_derived(self, max_week: Optional[int]) -> None:
+        """Recompute summary and NTH trend from ``self.df``."""
         current_week = max_week or 44
         current_month = datetime.now().month
         
@@ -371,35 +744,92 @@ class DashboardAnalyzer:
         # Create NTH trend
         df_clean = self.df.dropna(subset=["DateObj", "Month", "Week"]).copy()
         self.nth_trend = get_nth_pivot_by_week(df_clean)
-        
-        return True
+        self._build_cube()
+        self._bump_version()
     
     def load_from_excel(self, filepath: Path) -> bool:
         """Load dashboard data from existing Excel file."""
+        from utils.excel_reader import read_excel_sheets
+
         try:
-            # Try to load Raw Data sheet
-            self.df = pd.read_excel(filepath, sheet_name='Raw Data')
+            # Read all sheets with a single open of the workbook
+            sheets = read_excel_sheets(
+                filepath,
+                ['Raw Data', 'Summary by Project', 'NTH Trend by Week'],
+                index_col={'NTH Trend by Week': 0},
+            )
+            if 'Raw Data' not in sheets:
+                raise ValueError("Worksheet 'Raw Data' not found")
+            self.df = sheets['Raw Data']
             
-            # Try to load Summary sheet
-            try:
-                self.summary = pd.read_excel(filepath, sheet_name='Summary by Project')
-            except:
+            # Summary sheet, or recompute it
+            if 'Summary by Project' in sheets:
+                self.summary = sheets['Summary by Project']
+            else:
                 self.summary = calculate_summary(self.df)
             
-            # Try to load NTH Trend sheet
-            try:
-                self.nth_trend = pd.read_excel(filepath, sheet_name='NTH Trend by Week', index_col=0)
-            except:
+            # NTH Trend sheet, or recompute it
+            if 'NTH Trend by Week' in sheets:
+                self.nth_trend = sheets['NTH Trend by Week']
+            else:
                 df_clean = self.df.dropna(subset=["DateObj", "Month", "Week"]).copy() if 'DateObj' in self.df.columns else self.df
                 self.nth_trend = get_nth_pivot_by_week(df_clean)
             
             self.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M")
+            self.source_spans = {}
+            self._build_cube()
+            self._bump_version()
             return True
             
         except Exception as e:
             logger.error(f"Error loading Excel: {e}")
+            # df may already have been replaced
+            self._bump_version()
             return False
     
+    @property
+    def data_version(self) -> int:
+        """
+        Counter identifying the currently loaded data.
+        
+        Bumped by every load, so responses derived from the data can be
+        cached until it changes.  Replacing ``df``, ``summary`` or
+        ``nth_trend`` directly is detected by identity and bumps it too.
+        """
+        refs = (self.df, self.summary, self.nth_trend)
+        if any(a is not b for a, b in zip(refs, self._version_refs)):
+            self._bump_version()
+        return self._data_version
+    
+    def _bump_version(self) -> None:
+        self._data_version += 1
+        self._version_refs = (self.df, self.summary, self.nth_trend)
+    
+    @property
+    def cube(self) -> Optional[DashboardCube]:
+        """
+        Chart aggregates for the current DataFrame.
+        
+        Built when data is loaded; rebuilt here if ``df`` was replaced
+        directly.  None when no data is loaded or the build failed, in
+        which case callers fall back to the DataFrame functions.
+        """
+        if self.df is None:
+            return None
+        if self._cube_df is not self.df:
+            self._build_cube()
+        return self._cube
+    
+    def _build_cube(self) -> None:
+        self._cube_df = self.df
+        self._cube = None
+        if self.df is None or self.df.empty:
+            return
+        try:
+            self._cube = DashboardCube(self.df)
+        except Exception as e:
+            logger.error(f"Error building dashboard cube: {e}")
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get summary statistics."""
         if self.df is None:
@@ -3,14 +3,22 @@
 NTH Lag/Lead analysis for project progress tracking.
 """
 
+import numpy as np
 import pandas as pd
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+from utils.excel_export import apply_column_widths, column_widths
+
 logger = logging.getLogger(__name__)
 
+# calculate_nth_lag_lead engines
+ENGINE_VECTOR = "vector"
+ENGINE_ROWS = "rows"
+ENGINES: Tuple[str, ...] = (ENGINE_VECTOR, ENGINE_ROWS)
+
 
 def get_status(nth_lag_lead: float, t_func=None) -> Tuple[str, str]:
     """
@@ -37,18 +45,14 @@ def get_status(nth_lag_lead: float, t_func=None) -> Tuple[str, str]:
         return t("lag_ahead"), "blue"
 
 
-def load_project_master(filepath: Path) -> Tuple[pd.DataFrame, Dict[str, str], Dict[str, float]]:
+def _map_master_columns(df: pd.DataFrame) -> Dict[str, Any]:
     """
-    Load project master Excel file.
+    Resolve project master columns by header name (case-insensitive).
     
-    Args:
-        filepath: Path to the Excel file
-        
     Returns:
-        Tuple of (project_master_df, project_descriptions, target_qty_map)
+        Mapping of project_no / description / start_date / finish_date /
+        target_qty to the matching column label
     """
-    df = pd.read_excel(filepath)
-    
     # Find required columns (case-insensitive search)
     col_mapping = {}
     for col in df.columns:
@@ -101,79 +105,111 @@ def load_project_master(filepath: Path) -> Tuple[pd.DataFrame, Dict[str, str], D
         else:
             raise ValueError("Could not find 'Project No' column in Excel file")
     
-    # Extract project data
-    projects = []
+    return col_mapping
+    
+
+
+def _parse_master_dates(column: pd.Series) -> pd.Series:
+    """Parse a date column day-first; unparseable cells become NaT."""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    # Each cell is parsed on its own, like pd.to_datetime on a single value
+    return pd.to_datetime(column, dayfirst=True, format='mixed', errors='coerce')
+
+
+def load_project_master(filepath: Path) -> Tuple[pd.DataFrame, Dict[str, str], Dict[str, float]]:
+    """
+    Load project master Excel file.
+    
+    Args:
+        filepath: Path to the Excel file
+        
+    Returns:
+        Tuple of (project_master_df, project_descriptions, target_qty_map)
+    """
+    from utils.excel_reader import read_excel_sheet
+
+    df = read_excel_sheet(filepath)
+    col_mapping = _map_master_columns(df)
+    
+    # Drop rows with a blank or missing Project No
+    project_nos = df[col_mapping['project_no']].astype(str).str.strip()
+    valid = (project_nos.notna() & ~project_nos.isin(['', 'nan'])).to_numpy()
+    if not valid.any():
+        # Empty frame without columns, which LagAnalyzer rejects
+        return pd.DataFrame(), {}, {}
+    
+    rows = df[valid]
+    project_nos = project_nos[valid]
+    project_list = project_nos.tolist()
+    
+    # Descriptions
     project_descriptions = {}
+    titles = [''] * len(project_list)
+    if 'description' in col_mapping:
+        desc = rows[col_mapping['description']].astype(str).str.strip()
+        blank = (desc.isna() | desc.isin(['', 'nan'])).to_numpy()
+        project_descriptions = dict(zip(project_nos[~blank], desc[~blank]))
+        titles = desc.mask(blank, '').tolist()
+    
+    # Target Quantity: non-numeric cells are ignored
     target_qty_map = {}
+    if 'target_qty' in col_mapping:
+        target = rows[col_mapping['target_qty']]
+        if not pd.api.types.is_numeric_dtype(target):
+            target = pd.to_numeric(target.astype(str).str.strip(), errors='coerce')
+        target = target.astype(float)
+        has_target = target.notna().to_numpy()
+        target_qty_map = dict(zip(project_nos[has_target], target[has_target].tolist()))
     
-    for idx, row in df.iterrows():
-        project_no = str(row.get(col_mapping.get('project_no', ''), '')).strip()
-        
-        if not project_no or project_no == 'nan' or project_no == '':
-            continue
-        
-        projects.append(project_no)
-        
-        # Get description
-        if 'description' in col_mapping:
-            desc = str(row.get(col_mapping['description'], '')).strip()
-            if desc and desc != 'nan':
-                project_descriptions[project_no] = desc
-        
-        # Get Target Quantity
-        if 'target_qty' in col_mapping:
-            try:
-                val = row.get(col_mapping['target_qty'])
-                if pd.notna(val) and str(val).strip() != '' and str(val).strip() != 'nan':
-                    target_qty_map[project_no] = float(val)
-            except Exception:
-                pass
-    
-    # Build project_master DataFrame
-    project_master_rows = []
-    for idx, row in df.iterrows():
-        project_no = str(row.get(col_mapping.get('project_no', ''), '')).strip()
-        if not project_no or project_no == 'nan' or project_no == '':
-            continue
-        
-        # Get description
-        desc = ''
-        if 'description' in col_mapping:
-            desc = str(row.get(col_mapping['description'], '')).strip()
-            if desc == 'nan':
-                desc = ''
-        
-        # Get dates
-        start_date = None
-        end_date = None
-        if 'start_date' in col_mapping:
-            try:
-                start_date = pd.to_datetime(row.get(col_mapping['start_date']), dayfirst=True)
-            except:
-                pass
-        if 'finish_date' in col_mapping:
-            try:
-                end_date = pd.to_datetime(row.get(col_mapping['finish_date']), dayfirst=True)
-            except:
-                pass
-        
-        project_master_rows.append({
-            'Project No': project_no,
-            'Title': desc,
-            'Start Date': start_date,
-            'End Date': end_date,
-        })
+    # Dates
+    start_dates = [None] * len(project_list)
+    end_dates = [None] * len(project_list)
+    if 'start_date' in col_mapping:
+        start_dates = _parse_master_dates(rows[col_mapping['start_date']]).tolist()
+    if 'finish_date' in col_mapping:
+        end_dates = _parse_master_dates(rows[col_mapping['finish_date']]).tolist()
     
-    project_master_df = pd.DataFrame(project_master_rows)
+    project_master_df = pd.DataFrame({
+        'Project No': project_list,
+        'Title': titles,
+        'Start Date': start_dates,
+        'End Date': end_dates,
+    })
     
     return project_master_df, project_descriptions, target_qty_map
 
 
+def _project_settings(proj_config: Dict) -> Optional[Tuple[float, float]]:
+    """
+    Read target qty and productivity from a project's config.
+    
+    Returns:
+        Tuple of (target_qty, productivity), or None when the project is
+        skipped or has no valid target qty
+    """
+    if proj_config.get("skip", False):
+        return None
+    
+    target_qty = proj_config.get("target_qty")
+    productivity = proj_config.get("productivity", 3.0)
+    
+    # Skip if no valid target qty
+    if target_qty is None or target_qty == "N/A" or target_qty == "":
+        return None
+    
+    try:
+        return float(target_qty), (float(productivity) if productivity else 3.0)
+    except (ValueError, TypeError):
+        return None
+
+
 def calculate_nth_lag_lead(
     project_master: pd.DataFrame,
     config: Dict[str, Dict],
     actual_qty_map: Dict[str, float],
-    t_func=None
+    t_func=None,
+    engine: str = ENGINE_VECTOR
 ) -> List[Dict[str, Any]]:
     """
     Calculate lag/lead for all projects.
@@ -183,13 +219,30 @@ def calculate_nth_lag_lead(
         config: Configuration dict with target_qty, productivity, skip per project
         actual_qty_map: Map of project -> actual quantity delivered
         t_func: Translation function
+        engine: ENGINE_VECTOR (array operations over the whole master) or
+            ENGINE_ROWS (one project row at a time); both return the same rows
         
     Returns:
         List of result dictionaries
     """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown lag engine: {engine}")
+    
     if project_master is None or project_master.empty:
         return []
     
+    if engine == ENGINE_ROWS:
+        return _lag_lead_rows(project_master, config, actual_qty_map, t_func)
+    return _lag_lead_vectorized(project_master, config, actual_qty_map, t_func)
+
+
+def _lag_lead_rows(
+    project_master: pd.DataFrame,
+    config: Dict[str, Dict],
+    actual_qty_map: Dict[str, float],
+    t_func=None
+) -> List[Dict[str, Any]]:
+    """Row-by-row lag/lead calculation (ENGINE_ROWS)."""
     results = []
     today = datetime.now()
     
@@ -199,31 +252,16 @@ def calculate_nth_lag_lead(
         start_date = row['Start Date']
         end_date = row['End Date']
         
-        # Get config for this project
-        proj_config = config.get(proj_no, {})
-        if proj_config.get("skip", False):
-            continue
-        
-        # Get target qty and productivity
-        target_qty = proj_config.get("target_qty")
-        productivity = proj_config.get("productivity", 3.0)
-        
-        # Skip if no valid target qty
-        if target_qty is None or target_qty == "N/A" or target_qty == "":
-            continue
-        
-        try:
-            target_qty = float(target_qty)
-            productivity = float(productivity) if productivity else 3.0
-        except (ValueError, TypeError):
+        # Get target qty and productivity from the project config
+        settings = _project_settings(config.get(proj_no, {}))
+        if settings is None:
             continue
+        target_qty, productivity = settings
         
         # Calculate project duration
         if pd.notna(start_date) and pd.notna(end_date):
             total_days = (end_date - start_date).days
             elapsed_days = max(0, (today - start_date).days)
-            total_weeks = total_days / 7 if total_days > 0 else 1
-            elapsed_weeks = elapsed_days / 7
             
             # Linear progress percentage (time-based)
             target_progress_pct = min(100, (elapsed_days / total_days) * 100) if total_days > 0 else 0
@@ -262,6 +300,119 @@ def calculate_nth_lag_lead(
     return results
 
 
+def _lag_lead_vectorized(
+    project_master: pd.DataFrame,
+    config: Dict[str, Dict],
+    actual_qty_map: Dict[str, float],
+    t_func=None
+) -> List[Dict[str, Any]]:
+    """
+    Array-based lag/lead calculation (ENGINE_VECTOR).
+    
+    Config is resolved once per distinct project, then durations, targets
+    and lag/lead are computed over whole columns.  Rounding goes through
+    Python's round() so status banding matches _lag_lead_rows exactly.
+    """
+    today = pd.Timestamp(datetime.now())
+    
+    proj_nos = [str(p).strip() for p in project_master['Project No'].tolist()]
+    settings = {p: _project_settings(config.get(p, {})) for p in set(proj_nos)}
+    
+    start_all = pd.to_datetime(project_master['Start Date'])
+    end_all = pd.to_datetime(project_master['End Date'])
+    keep = (
+        np.fromiter((settings[p] is not None for p in proj_nos), dtype=bool, count=len(proj_nos))
+        & start_all.notna().to_numpy()
+        & end_all.notna().to_numpy()
+    )
+    rows = np.flatnonzero(keep)
+    if len(rows) == 0:
+        return []
+    
+    projects = [proj_nos[i] for i in rows]
+    if 'Title' in project_master.columns:
+        titles = project_master['Title'].take(rows).tolist()
+    else:
+        titles = [''] * len(rows)
+    start = start_all.take(rows)
+    end = end_all.take(rows)
+    
+    target_qty = np.array([settings[p][0] for p in projects], dtype=float)
+    productivity = np.array([settings[p][1] for p in projects], dtype=float)
+    actual_raw = [actual_qty_map.get(p, 0) for p in projects]
+    actual_qty = np.array(actual_raw, dtype=float)
+    
+    # Project duration in whole days
+    total_days = (end - start).dt.days.to_numpy()
+    elapsed_days = np.maximum(0, (today - start).dt.days.to_numpy())
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Linear progress percentage (time-based)
+        linear_pct = (elapsed_days / total_days) * 100
+        target_progress_pct = np.where(total_days > 0, np.minimum(100, linear_pct), 0.0)
+        # Target quantity to date (linear assumption)
+        target_qty_to_date = (target_progress_pct / 100) * target_qty
+        actual_progress_pct = np.where(target_qty > 0, actual_qty / target_qty * 100, 0.0)
+        qty_per_nth = (actual_qty - target_qty_to_date) / productivity
+    
+    # Guarded branches yield int 0 (and min() int 100), as in _lag_lead_rows
+    nth_lag_lead = [
+        round(value, 1) if prod > 0 else 0
+        for value, prod in zip(qty_per_nth.tolist(), productivity.tolist())
+    ]
+    target_pct_values = [
+        round(min(100, value), 1) if days > 0 else 0
+        for value, days in zip(linear_pct.tolist(), total_days.tolist())
+    ]
+    actual_pct_values = [
+        round(value, 1) if target > 0 else 0
+        for value, target in zip(actual_progress_pct.tolist(), target_qty.tolist())
+    ]
+    
+    # Same bands as get_status, translated once per band
+    nth = np.array(nth_lag_lead, dtype=float)
+    band = np.select([nth <= -10, nth <= -5, nth < 0, nth < 5], [0, 1, 2, 3], default=4)
+    t = t_func if t_func else lambda x: x
+    band_status = [
+        (t("lag_urgent"), "red"),
+        (t("lag_behind"), "orange"),
+        (t("lag_slight"), "yellow"),
+        (t("lag_on_track"), "green"),
+        (t("lag_ahead"), "blue"),
+    ]
+    
+    columns = zip(
+        projects,
+        titles,
+        start.dt.strftime('%Y-%m-%d').tolist(),
+        end.dt.strftime('%Y-%m-%d').tolist(),
+        target_qty.tolist(),
+        actual_raw,
+        target_pct_values,
+        actual_pct_values,
+        productivity.tolist(),
+        nth_lag_lead,
+        band.tolist(),
+    )
+    return [
+        {
+            "Project": proj_no,
+            "Title": title,
+            "Start Date": start_str,
+            "End Date": end_str,
+            "Target Qty": target,
+            "Actual Qty": actual,
+            "Target % (Linear)": target_pct,
+            "Progress %": actual_pct,
+            "Productivity": prod,
+            "NTH Lag/Lead": lag_lead,
+            "Status": band_status[b][0],
+            "Status Color": band_status[b][1]
+        }
+        for proj_no, title, start_str, end_str, target, actual, target_pct, actual_pct, prod, lag_lead, b in columns
+    ]
+
+
 def export_lag_report(results_df: pd.DataFrame, output_path: Path) -> bool:
     """
     Export lag analysis results to Excel.
@@ -283,14 +434,10 @@ def export_lag_report(results_df: pd.DataFrame, output_path: Path) -> bool:
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             results_export.to_excel(writer, sheet_name='Lag Analysis', index=False)
             
-            # Auto-adjust column widths
-            worksheet = writer.sheets['Lag Analysis']
-            for idx, col in enumerate(results_export.columns):
-                max_length = max(
-                    results_export[col].astype(str).map(len).max(),
-                    len(col)
-                ) + 2
-                worksheet.column_dimensions[chr(65 + idx)].width = min(max_length, 20)
+            # Auto-adjust column widths, capped at 20
+            apply_column_widths(
+                writer.sheets['Lag Analysis'], column_widths(results_export, max_width=20)
+            )
         
         return True
     except Exception as e:
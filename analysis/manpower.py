@@ -5,7 +5,7 @@ Aggregate manpower records and generate analysis outputs.
 
 import logging
 from collections import defaultdict
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterator, Tuple
 from pathlib import Path
 from datetime import datetime
 
@@ -283,88 +283,70 @@ def get_summary_kpis(records: List[Dict[str, Any]]) -> Dict[str, Any]:
 # ── Excel Export ──────────────────────────────────────────────────────────────
 
 
-def export_manpower_excel(records: List[Dict[str, Any]], filepath: Path) -> Path:
-    """
-    Export manpower analysis to a formatted Excel workbook.
-
-    Sheets:
-        1. Raw Data - All shift/job records flattened
-        2. Job Type Summary - Avg workers and role breakdown per job type
-        3. Role Frequency - Person x Role count matrix
-        4. Weekly Team Distribution - S2/S3/S4/S5 per week
-
-    Args:
-        records: List of parsed shift records.
-        filepath: Output Excel file path.
-
-    Returns:
-        Path to the saved file.
-    """
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-
-    workbook = Workbook()
-
-    # Shared styles
-    header_font = Font(name="Arial", size=10, bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    cell_font = Font(name="Arial", size=9)
-    thin_border = Border(
-        left=Side(style="thin", color="CCCCCC"),
-        right=Side(style="thin", color="CCCCCC"),
-        top=Side(style="thin", color="CCCCCC"),
-        bottom=Side(style="thin", color="CCCCCC"),
-    )
-
-    def style_header_row(sheet, num_cols):
-        for col_idx in range(1, num_cols + 1):
-            cell = sheet.cell(row=1, column=col_idx)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = thin_border
-
-    def style_data_cell(cell):
-        cell.font = cell_font
-        cell.border = thin_border
-        cell.alignment = Alignment(vertical="center", wrap_text=True)
-
-    # ── Sheet 1: Raw Data ─────────────────────────────────────────────────
-    ws_raw = workbook.active
-    ws_raw.title = "Raw Data"
-
-    raw_headers = [
-        "Year", "Week", "Date", "Day", "Shift",
-        "Job Type", "Project Code", "Description", "Qty",
-        "Done By", "Total Workers",
-        "S2", "S3", "S4", "S5",
-        "EPIC", "CP(P)", "CP(T)", "AP(E)", "SPC", "HSM",
-        "On Duty Count", "Apprentices", "Term Labour",
+MANPOWER_HEADER_STYLE = "Manpower Header"
+MANPOWER_CELL_STYLE = "Manpower Cell"
+
+RAW_HEADERS = [
+    "Year", "Week", "Date", "Day", "Shift",
+    "Job Type", "Project Code", "Description", "Qty",
+    "Done By", "Total Workers",
+    "S2", "S3", "S4", "S5",
+    "EPIC", "CP(P)", "CP(T)", "AP(E)", "SPC", "HSM",
+    "On Duty Count", "Apprentices", "Term Labour",
+]
+SUMMARY_HEADERS = [
+    "Job Type", "Total Jobs", "Total Workers", "Avg Workers/Job",
+    "Avg S2", "Avg S3", "Avg S4", "Avg S5",
+    "Avg CP(P)", "Avg CP(T)", "Avg AP(E)", "Avg SPC", "Avg HSM",
+]
+ROLE_HEADERS = ["Name", "CP(P)", "CP(T)", "AP(E)", "SPC", "HSM", "NP", "Total"]
+TEAM_HEADERS = ["Week", "S2", "S3", "S4", "S5", "Total"]
+
+
+def _manpower_styles():
+    """Named header / data cell styles, registered once per workbook."""
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, NamedStyle, Side
+
+    thin = Side(style="thin", color="CCCCCC")
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        NamedStyle(
+            name=MANPOWER_HEADER_STYLE,
+            font=Font(name="Arial", size=10, bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=thin_border,
+        ),
+        NamedStyle(
+            name=MANPOWER_CELL_STYLE,
+            font=Font(name="Arial", size=9),
+            alignment=Alignment(vertical="center", wrap_text=True),
+            border=thin_border,
+        ),
     ]
-    for col_idx, header in enumerate(raw_headers, 1):
-        ws_raw.cell(row=1, column=col_idx, value=header)
-    style_header_row(ws_raw, len(raw_headers))
 
-    row_num = 2
-    for record in records:
-        jobs = record.get("jobs", [])
-        if not jobs:
-            # Still write a row for shifts with no jobs
-            jobs = [None]
 
+def _raw_data_rows(records: List[Dict[str, Any]]) -> Iterator[List[Any]]:
+    """One row per job; shifts with no jobs still get a row."""
+    for record in records:
+        jobs = record.get("jobs", []) or [None]
+        shift_values = [
+            record["year"],
+            record["week"],
+            record["date"],
+            record["day_of_week"],
+            record["shift"],
+        ]
+        duty_values = [
+            len(record.get("on_duty_names", [])),
+            ", ".join(record.get("apprentices", [])),
+            record.get("term_labour_count", 0),
+        ]
         for job in jobs:
-            values = [
-                record["year"],
-                record["week"],
-                record["date"],
-                record["day_of_week"],
-                record["shift"],
-            ]
             if job:
                 roles = job.get("roles", {})
                 team_c = job.get("team_counts", {})
-                values.extend([
+                job_values = [
                     job.get("type", ""),
                     job.get("project_code", ""),
                     job.get("description", ""),
@@ -381,44 +363,19 @@ def export_manpower_excel(records: List[Dict[str, Any]], filepath: Path) -> Path
                     ", ".join(roles.get("AP_E", [])),
                     ", ".join(roles.get("SPC", [])),
                     ", ".join(roles.get("HSM", [])),
-                ])
+                ]
             else:
-                values.extend(["", "", "", 0, "", 0, 0, 0, 0, 0, "", "", "", "", "", ""])
-
-            values.extend([
-                len(record.get("on_duty_names", [])),
-                ", ".join(record.get("apprentices", [])),
-                record.get("term_labour_count", 0),
-            ])
-
-            for col_idx, val in enumerate(values, 1):
-                cell = ws_raw.cell(row=row_num, column=col_idx, value=val)
-                style_data_cell(cell)
-            row_num += 1
-
-    # Auto-fit column widths (approximate)
-    for col_idx in range(1, len(raw_headers) + 1):
-        ws_raw.column_dimensions[chr(64 + min(col_idx, 26))].width = 14
-
-    # ── Sheet 2: Job Type Summary ─────────────────────────────────────────
-    ws_summary = workbook.create_sheet("Job Type Summary")
-
-    summary_headers = [
-        "Job Type", "Total Jobs", "Total Workers", "Avg Workers/Job",
-        "Avg S2", "Avg S3", "Avg S4", "Avg S5",
-        "Avg CP(P)", "Avg CP(T)", "Avg AP(E)", "Avg SPC", "Avg HSM",
-    ]
-    for col_idx, header in enumerate(summary_headers, 1):
-        ws_summary.cell(row=1, column=col_idx, value=header)
-    style_header_row(ws_summary, len(summary_headers))
+                job_values = ["", "", "", 0, "", 0, 0, 0, 0, 0, "", "", "", "", "", ""]
+            yield shift_values + job_values + duty_values
+
 
+def _job_type_rows(records: List[Dict[str, Any]]) -> Iterator[List[Any]]:
     job_type_data = get_job_type_manpower(records)
-    row_num = 2
     for jtype in sorted(job_type_data.keys()):
         data = job_type_data[jtype]
         avg_teams = data.get("avg_team_counts", {})
         avg_roles = data.get("avg_roles", {})
-        values = [
+        yield [
             jtype,
             data["total_jobs"],
             data["total_workers"],
@@ -433,26 +390,11 @@ def export_manpower_excel(records: List[Dict[str, Any]], filepath: Path) -> Path
             avg_roles.get("SPC", 0),
             avg_roles.get("HSM", 0),
         ]
-        for col_idx, val in enumerate(values, 1):
-            cell = ws_summary.cell(row=row_num, column=col_idx, value=val)
-            style_data_cell(cell)
-        row_num += 1
-
-    for col_idx in range(1, len(summary_headers) + 1):
-        ws_summary.column_dimensions[chr(64 + min(col_idx, 26))].width = 16
 
-    # ── Sheet 3: Role Frequency Matrix ────────────────────────────────────
-    ws_roles = workbook.create_sheet("Role Frequency")
 
-    role_headers = ["Name", "CP(P)", "CP(T)", "AP(E)", "SPC", "HSM", "NP", "Total"]
-    for col_idx, header in enumerate(role_headers, 1):
-        ws_roles.cell(row=1, column=col_idx, value=header)
-    style_header_row(ws_roles, len(role_headers))
-
-    role_freq = get_role_frequency(records)
-    row_num = 2
-    for entry in role_freq:
-        values = [
+def _role_frequency_rows(records: List[Dict[str, Any]]) -> Iterator[List[Any]]:
+    for entry in get_role_frequency(records):
+        yield [
             entry["name"],
             entry.get("CP_P", 0),
             entry.get("CP_T", 0),
@@ -462,41 +404,61 @@ def export_manpower_excel(records: List[Dict[str, Any]], filepath: Path) -> Path
             entry.get("NP", 0),
             entry["total"],
         ]
-        for col_idx, val in enumerate(values, 1):
-            cell = ws_roles.cell(row=row_num, column=col_idx, value=val)
-            style_data_cell(cell)
-        row_num += 1
-
-    ws_roles.column_dimensions["A"].width = 20
-    for col_idx in range(2, len(role_headers) + 1):
-        ws_roles.column_dimensions[chr(64 + col_idx)].width = 10
-
-    # ── Sheet 4: Weekly Team Distribution ─────────────────────────────────
-    ws_teams = workbook.create_sheet("Weekly Team Distribution")
-
-    team_headers = ["Week", "S2", "S3", "S4", "S5", "Total"]
-    for col_idx, header in enumerate(team_headers, 1):
-        ws_teams.cell(row=1, column=col_idx, value=header)
-    style_header_row(ws_teams, len(team_headers))
-
-    team_dist = get_team_distribution(records)
-    row_num = 2
-    for week, teams in team_dist.items():
+
+
+def _team_distribution_rows(records: List[Dict[str, Any]]) -> Iterator[List[Any]]:
+    for week, teams in get_team_distribution(records).items():
         s2 = teams.get("S2", 0)
         s3 = teams.get("S3", 0)
         s4 = teams.get("S4", 0)
         s5 = teams.get("S5", 0)
-        values = [week, s2, s3, s4, s5, s2 + s3 + s4 + s5]
-        for col_idx, val in enumerate(values, 1):
-            cell = ws_teams.cell(row=row_num, column=col_idx, value=val)
-            style_data_cell(cell)
-        row_num += 1
+        yield [week, s2, s3, s4, s5, s2 + s3 + s4 + s5]
+
+
+def export_manpower_excel(records: List[Dict[str, Any]], filepath: Path) -> Path:
+    """
+    Export manpower analysis to a formatted Excel workbook.
 
-    for col_idx in range(1, len(team_headers) + 1):
-        ws_teams.column_dimensions[chr(64 + col_idx)].width = 12
+    Sheets:
+        1. Raw Data - All shift/job records flattened
+        2. Job Type Summary - Avg workers and role breakdown per job type
+        3. Role Frequency - Person x Role count matrix
+        4. Weekly Team Distribution - S2/S3/S4/S5 per week
+
+    The workbook is write-only: rows are streamed to disk as they are
+    generated and every cell refers to one of two named styles.
+
+    Args:
+        records: List of parsed shift records.
+        filepath: Output Excel file path.
+
+    Returns:
+        Path to the saved file.
+    """
+    from utils.excel_stream import StreamingWorkbook
+
+    styles = {"header_style": MANPOWER_HEADER_STYLE, "cell_style": MANPOWER_CELL_STYLE}
+    with StreamingWorkbook(_manpower_styles()) as book:
+        book.add_sheet(
+            "Raw Data", RAW_HEADERS, _raw_data_rows(records),
+            widths={col_idx: 14 for col_idx in range(1, len(RAW_HEADERS) + 1)}, **styles,
+        )
+        book.add_sheet(
+            "Job Type Summary", SUMMARY_HEADERS, _job_type_rows(records),
+            widths={col_idx: 16 for col_idx in range(1, len(SUMMARY_HEADERS) + 1)}, **styles,
+        )
+        role_widths = {col_idx: 10 for col_idx in range(2, len(ROLE_HEADERS) + 1)}
+        book.add_sheet(
+            "Role Frequency", ROLE_HEADERS, _role_frequency_rows(records),
+            widths={1: 20, **role_widths}, **styles,
+        )
+        book.add_sheet(
+            "Weekly Team Distribution", TEAM_HEADERS, _team_distribution_rows(records),
+            widths={col_idx: 12 for col_idx in range(1, len(TEAM_HEADERS) + 1)}, **styles,
+        )
+
+        book.save(filepath)
 
-    # Save
-    workbook.save(filepath)
     logger.info(f"Manpower Excel exported to {filepath}")
     return filepath
 
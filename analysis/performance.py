@@ -5,9 +5,6 @@ Performance Card analysis for weekly productivity tracking.
 
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
@@ -15,6 +12,8 @@ from pathlib import Path
 import io
 import base64
 
+from utils.plotting import get_pyplot
+
 logger = logging.getLogger(__name__)
 
 
@@ -164,6 +163,7 @@ def plot_performance_chart(
     Returns:
         Base64 encoded image string if no output_path
     """
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=figsize)
     
     # Create x-axis labels
@@ -238,6 +238,7 @@ def plot_cumulative_progress(
     if proj_df.empty:
         return None
     
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=figsize)
     
     # Calculate cumulative actual by year
@@ -5,9 +5,6 @@ S-Curve calculation and plotting for project progress visualization.
 
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
@@ -15,6 +12,8 @@ from pathlib import Path
 import io
 import base64
 
+from utils.plotting import get_pyplot
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,6 +122,7 @@ def plot_scurve(
     Returns:
         Base64 encoded image string if no output_path, else None
     """
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=figsize)
     
     # Plot target line
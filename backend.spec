@@ -54,9 +54,18 @@ hiddenimports = [
     'parsers',
     'parsers.docx_parser',
     'parsers.manpower_parser',
+    'parsers.parse_cache',
+    'parsers.ooxml_stream',
+    'parsers.report_scanner',
+    'parsers.folder_watcher',
+    'parsers.keyword_index',
+    'parsers.record_store',
     'config',
     'utils',
     'utils.excel_export',
+    'utils.excel_reader',
+    'utils.excel_stream',
+    'utils.plotting',
     'routers',
     'routers.config',
     'routers.parse',
@@ -67,8 +76,22 @@ hiddenimports = [
     'routers.export',
     'routers.keyword',
     'routers.manpower',
+    'routers.watch',
     'services',
     'backend.services',
+    'serialization',
+    'backend.serialization',
+    'response_cache',
+    'backend.response_cache',
+    'jobs',
+    'backend.jobs',
+    'executor',
+    'backend.executor',
+    'charts',
+    'backend.charts',
+    'metrics',
+    'backend.metrics',
+    'orjson',
     'backend.routers',
     'backend.routers.config',
     'backend.routers.parse',
@@ -79,6 +102,7 @@ hiddenimports = [
     'backend.routers.export',
     'backend.routers.keyword',
     'backend.routers.manpower',
+    'backend.routers.watch',
 ]
 
 # Modules to exclude (reduce bundle size)
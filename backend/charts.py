@@ -0,0 +1,165 @@
+# MTR DUAT - Chart Rendering
+"""
+Rendered-chart cache and process pool for the matplotlib endpoints.
+
+``plot_scurve``, ``plot_performance_chart`` and ``plot_cumulative_progress``
+draw a 150-dpi PNG with pyplot on every call.  ``ChartRenderer`` keeps the
+base64 PNGs in an LRU cache keyed by a hash of the plotted data and the
+render parameters, so re-opening a chart costs a dictionary lookup.
+
+Misses are rendered in a process pool: pyplot's global figure state stays
+out of the server process, and concurrent renders run side by side instead
+of queueing on one thread.  Identical requests arriving while a render is
+in flight share its result.
+
+The pool size comes from ``DUAT_CHART_WORKERS`` (default 2).  ``0`` renders
+on the single ``CHARTS`` thread of backend/executor.py instead, which is
+also the fallback when the pool cannot start.
+
+Usage::
+
+    key = chart_key("scurve", week_labels, cum_target, request.target_qty)
+    image = await chart_renderer.render(key, plot_scurve, week_labels, ...)
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from backend.executor import CHARTS, get_executor
+
+logger = logging.getLogger(__name__)
+
+CHART_WORKERS_ENV = "DUAT_CHART_WORKERS"
+DEFAULT_CHART_WORKERS = 2
+DEFAULT_MAX_ENTRIES = 64
+
+
+def chart_workers() -> int:
+    """Process pool size from ``DUAT_CHART_WORKERS``; 0 disables the pool."""
+    value = os.environ.get(CHART_WORKERS_ENV)
+    if value is None:
+        return DEFAULT_CHART_WORKERS
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", CHART_WORKERS_ENV, value)
+        return DEFAULT_CHART_WORKERS
+
+
+def chart_key(kind: str, *parts: Any) -> str:
+    """
+    Hash a chart's inputs into a cache key.
+
+    DataFrames and Series are hashed by content (values, index and column
+    names); everything else by ``repr``.
+    """
+    digest = hashlib.blake2b(kind.encode(), digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            if isinstance(part, pd.DataFrame):
+                layout = (list(part.columns), [str(t) for t in part.dtypes])
+            else:
+                layout = (part.name, str(part.dtype))
+            digest.update(repr(layout).encode())
+        else:
+            digest.update(repr(part).encode())
+        # Separator, so ("ab", "c") and ("a", "bc") differ
+        digest.update(b"\x00")
+    return f"{kind}:{digest.hexdigest()}"
+
+
+class ChartRenderer:
+    """LRU cache of rendered charts in front of a render process pool."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, workers: Optional[int] = None) -> None:
+        self.max_entries = max_entries
+        self.workers = chart_workers() if workers is None else max(0, workers)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    async def render(self, key: str, func: Callable[..., Optional[str]], *args: Any) -> Optional[str]:
+        """
+        Return the cached image for *key*, rendering ``func(*args)`` on a miss.
+
+        *func* and *args* must be picklable (module-level plot functions and
+        plain data).  ``None`` results ("no data") are not cached.
+        """
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+            future = self._pending.get(key)
+            submitted = future is None
+            if submitted:
+                future = self._submit(func, args)
+                self._pending[key] = future
+        if submitted:
+            # Outside the lock: the callback runs at once if the render already finished
+            future.add_done_callback(lambda done: self._store(key, done))
+
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            logger.warning("Chart process pool failed; rendering %s in-process", key)
+            with self._lock:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = None
+                self.workers = 0
+            return await self.render(key, func, *args)
+
+    def _submit(self, func: Callable, args: tuple) -> Future:
+        if self.workers > 0:
+            if self._pool is None:
+                # spawn everywhere, as on Windows: no forking of a threaded server
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool.submit(func, *args)
+        return get_executor(CHARTS).submit(func, *args)
+
+    def _store(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if future.cancelled() or future.exception() is not None:
+                return
+            image = future.result()
+            if image is None:
+                return
+            self._entries[key] = image
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def shutdown(self) -> None:
+        """Stop the render processes; the pool is restarted on next use."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
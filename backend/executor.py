@@ -0,0 +1,87 @@
+# MTR DUAT - Blocking Work Executor
+"""
+Run blocking pandas / python-docx / matplotlib work off the event loop.
+
+Route handlers are ``async def``, so anything CPU-bound they run directly
+stalls every other request until it finishes.  ``run_blocking`` hands the
+call to the thread pool of its subsystem and awaits the result; progress
+polling and cheap GETs from the SPA keep flowing while a scan or an
+analysis runs.
+
+Each subsystem has its own pool, which is also its concurrency limit:
+
+* ``ANALYSIS`` (1) -- the analyzer singletons in backend/services.py are
+  loaded and read in place, so their work stays serialised, as it was on
+  the event loop; folder watch deltas are applied here too;
+* ``SCAN`` (2) -- DOCX reading: keyword search, manpower scan, uploads;
+* ``CHARTS`` (1) -- matplotlib's pyplot state is not thread-safe.
+
+Excel exports run on the job pool in backend/jobs.py.  When slow-request
+profiling is on (backend/metrics.py), calls of sampled requests run under
+cProfile.
+
+Usage::
+
+    return await run_blocking(ANALYSIS, build)
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from backend.metrics import profiled
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ANALYSIS = "analysis"
+SCAN = "scan"
+CHARTS = "charts"
+
+# Worker threads per subsystem
+LIMITS: Dict[str, int] = {
+    ANALYSIS: 1,
+    SCAN: 2,
+    CHARTS: 1,
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def get_executor(subsystem: str) -> ThreadPoolExecutor:
+    """Return the pool of *subsystem*, creating it on first use."""
+    if subsystem not in LIMITS:
+        raise ValueError(f"Unknown executor subsystem: {subsystem!r}")
+    with _lock:
+        executor = _executors.get(subsystem)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=LIMITS[subsystem], thread_name_prefix=f"duat-{subsystem}"
+            )
+            _executors[subsystem] = executor
+        return executor
+
+
+async def run_blocking(subsystem: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``func(*args, **kwargs)`` on the pool of *subsystem* and await it.
+
+    Exceptions raised by *func* (including HTTPException) propagate to the
+    caller unchanged.
+    """
+    executor = get_executor(subsystem)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, profiled(functools.partial(func, *args, **kwargs)))
+
+
+def shutdown(wait: bool = True) -> None:
+    """Stop every subsystem pool; they are recreated on next use."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,246 @@
+# MTR DUAT - Export Jobs
+"""
+Background export jobs with downloadable artifacts.
+
+Writing a workbook is CPU-bound openpyxl work; done inside an ``async def``
+handler it blocks the event loop and every other API call stalls until the
+file is saved.  ``ExportJobManager`` runs each export on a small thread pool
+and keeps its state (queued / running / done / failed, progress, error) for
+the status endpoint.
+
+Finished files are written to a managed temp directory and served by job
+ID.  Jobs older than the TTL are forgotten and their files deleted; the
+sweep runs whenever a job is submitted, looked up or listed, and
+``shutdown()`` (called when the sidecar exits) removes the directory.
+
+Usage::
+
+    job = export_jobs.submit("dashboard", "Dashboard.xlsx", build)
+    export_jobs.get(job.job_id).to_dict()     # poll
+    job = await export_jobs.run(...)          # or wait without blocking
+
+*build* is called as ``build(path, progress)`` on a worker thread, where
+``progress(stage, fraction)`` updates the job; returning ``False`` or
+raising marks the job failed.
+"""
+
+import asyncio
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Finished jobs (and their files) are kept this long, in seconds
+DEFAULT_TTL = 3600.0
+DEFAULT_WORKERS = 2
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+ProgressCallback = Callable[[str, float], None]
+ExportBuilder = Callable[[Path, ProgressCallback], Any]
+
+
+class ExportJob:
+    """State of one export; updated by the worker thread, read by the API."""
+
+    def __init__(self, job_id: str, kind: str, filename: str, path: Path, managed: bool = True) -> None:
+        self.job_id = job_id
+        self.kind = kind
+        self.filename = filename
+        self.path = path
+        # Managed files live in the job directory and are deleted with the job
+        self.managed = managed
+        self.status = JOB_QUEUED
+        self.progress = 0.0
+        self.stage = ""
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.future: Optional[Future] = None
+        self._finished_monotonic: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "filename": self.filename,
+            "status": self.status,
+            "progress": self.progress,
+            "stage": self.stage,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+        }
+
+
+class ExportJobManager:
+    """Run exports on a worker pool and keep their files for download."""
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: float = DEFAULT_TTL,
+        max_workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._directory: Optional[Path] = Path(directory) if directory is not None else None
+        self._owns_directory = directory is None
+        self._jobs: Dict[str, ExportJob] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        """Managed directory holding finished files, created on first use."""
+        with self._lock:
+            if self._directory is None:
+                self._directory = Path(tempfile.mkdtemp(prefix="duat_exports_"))
+            self._directory.mkdir(parents=True, exist_ok=True)
+            return self._directory
+
+    def submit(
+        self,
+        kind: str,
+        filename: str,
+        build: ExportBuilder,
+        path: Optional[Path] = None,
+    ) -> ExportJob:
+        """
+        Queue an export.
+
+        Args:
+            kind: Export type, e.g. "dashboard"
+            filename: Download name of the finished file
+            build: ``build(path, progress)`` writing the file to *path*
+            path: Write here instead of the managed directory; such files
+                are left in place when the job expires
+
+        Returns:
+            The queued job
+        """
+        self.cleanup()
+        job_id = uuid.uuid4().hex
+        managed = path is None
+        if managed:
+            path = self.directory / f"{job_id}{Path(filename).suffix or '.xlsx'}"
+        job = ExportJob(job_id, kind, filename, Path(path), managed=managed)
+        with self._lock:
+            self._jobs[job_id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="duat-export")
+            job.future = self._executor.submit(self._run, job, build)
+        return job
+
+    async def run(
+        self,
+        kind: str,
+        filename: str,
+        build: ExportBuilder,
+        path: Optional[Path] = None,
+    ) -> ExportJob:
+        """Submit an export and wait for it without blocking the event loop."""
+        job = self.submit(kind, filename, build, path)
+        return await asyncio.wrap_future(job.future)
+
+    def _run(self, job: ExportJob, build: ExportBuilder) -> ExportJob:
+        job.status = JOB_RUNNING
+
+        def progress(stage: str, fraction: float) -> None:
+            job.stage = stage
+            job.progress = fraction
+
+        try:
+            if build(job.path, progress) is False:
+                raise RuntimeError(f"Failed to export {job.kind}")
+            job.progress = 1.0
+            job.status = JOB_DONE
+        except Exception as exc:
+            logger.error("Export job %s (%s) failed: %s", job.job_id, job.kind, exc)
+            job.error = str(exc)
+            job.status = JOB_FAILED
+            if job.managed:
+                job.path.unlink(missing_ok=True)
+        finally:
+            job.finished_at = datetime.now()
+            job._finished_monotonic = time.monotonic()
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """The job, unless unknown or expired."""
+        self.cleanup()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[ExportJob]:
+        """All known jobs, oldest first."""
+        self.cleanup()
+        with self._lock:
+            return list(self._jobs.values())
+
+    def remove(self, job_id: str) -> bool:
+        """Forget a job and delete its managed file; running jobs are kept."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            if not job.finished and not job.future.cancel():
+                return False
+            del self._jobs[job_id]
+        self._discard(job)
+        return True
+
+    def cleanup(self, now: Optional[float] = None) -> int:
+        """Drop finished jobs older than the TTL; returns how many were dropped."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job._finished_monotonic is not None and now - job._finished_monotonic >= self.ttl
+            ]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            self._discard(job)
+        return len(expired)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool and delete the files of every job."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+            temp_dir = self._directory if self._owns_directory else None
+            if temp_dir is not None:
+                self._directory = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for job in jobs:
+            self._discard(job)
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _discard(job: ExportJob) -> None:
+        if job.managed:
+            try:
+                job.path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.warning("Could not delete export %s: %s", job.path, exc)
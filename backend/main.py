@@ -6,26 +6,51 @@ Provides REST API endpoints for all analysis operations.
 
 import argparse
 import logging
+import multiprocessing
 import os
 import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+# Start of the import phase, for the startup timing logged by start_server()
+_IMPORT_STARTED = time.perf_counter()
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 # Add backend directory to path for routers
 sys.path.insert(0, str(Path(__file__).parent))
 
+from typing import Literal
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import uvicorn
 
-from routers import config, parse, dashboard, lag, performance, scurve, export, keyword, manpower
+from backend import executor
+from backend.metrics import MetricsMiddleware, RequestMetrics, RequestProfiler
+from backend.services import chart_renderer, export_jobs
+
+from routers import config, parse, dashboard, lag, performance, scurve, export, keyword, manpower, watch
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop background work and delete temporary export files on exit."""
+    yield
+    watch.stop_watcher()
+    chart_renderer.shutdown()
+    export_jobs.shutdown()
+    executor.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="MTR PS-OHLR DUAT API",
     description="REST API for MTR Progress Dashboard & NTH Analysis",
-    version="4.0.0"
+    version="4.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend access
@@ -38,6 +63,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route timing for /api/metrics; slow-request profiling via DUAT_PROFILE_SLOW_MS
+request_metrics = RequestMetrics()
+app.add_middleware(
+    MetricsMiddleware,
+    metrics=request_metrics,
+    profiler=RequestProfiler.from_env(),
+    exclude=("/api/metrics",),
+)
+
 # Include routers
 app.include_router(config.router, prefix="/api/config", tags=["Configuration"])
 app.include_router(parse.router, prefix="/api/parse", tags=["Parsing"])
@@ -48,6 +82,13 @@ app.include_router(scurve.router, prefix="/api/scurve", tags=["S-Curve"])
 app.include_router(export.router, prefix="/api/export", tags=["Export"])
 app.include_router(keyword.router, prefix="/api/keyword", tags=["Keyword Search"])
 app.include_router(manpower.router, prefix="/api/manpower", tags=["Manpower Analysis"])
+app.include_router(watch.router, prefix="/api/watch", tags=["Folder Watch"])
+
+# matplotlib, openpyxl and python-docx load on first use, not in here;
+# see scripts/import_report.py
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+logger = logging.getLogger(__name__)
 
 
 @app.get("/")
@@ -62,6 +103,14 @@ async def health_check():
     return {"status": "healthy", "version": "4.0.0"}
 
 
+@app.get("/api/metrics")
+async def get_metrics(format: Literal["prometheus", "json"] = "prometheus"):
+    """Per-route request counts, latency and response sizes since startup."""
+    if format == "json":
+        return request_metrics.to_dict()
+    return PlainTextResponse(request_metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 def start_server(host: str = "127.0.0.1", port: int = 8000):
     """Start the FastAPI server."""
     log_level = os.environ.get("DUAT_LOG_LEVEL", "info").lower()
@@ -70,6 +119,7 @@ def start_server(host: str = "127.0.0.1", port: int = 8000):
         format="[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
+    logger.info("Backend modules imported in %.0f ms", _IMPORT_SECONDS * 1000)
     uvicorn.run(app, host=host, port=port, log_level=log_level)
 
 
@@ -81,5 +131,7 @@ def _parse_args() -> argparse.Namespace:
 
 
 if __name__ == "__main__":
+    # Required for the parser process pool inside the PyInstaller executable
+    multiprocessing.freeze_support()
     args = _parse_args()
     start_server(host=args.host, port=args.port)
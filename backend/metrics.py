@@ -0,0 +1,423 @@
+# MTR DUAT - Request Metrics
+"""
+Per-route request timing, exposed at ``/api/metrics``.
+
+``MetricsMiddleware`` is a plain ASGI middleware (no BaseHTTPMiddleware, so
+streamed file downloads and background tasks are untouched).  For every
+request it records, under the route template (``/api/performance/chart/
+weekly/{project_code}``, not the concrete path; ``unmatched`` for 404s):
+
+* request count by status code
+* latency histogram, until the last body chunk is sent
+* in-flight gauge
+* response size histogram
+
+``RequestMetrics`` renders them in the Prometheus text format or as JSON.
+
+Slow-request profiling is opt-in (environment, read at startup):
+
+* ``DUAT_PROFILE_SLOW_MS`` -- profile requests and keep the profile of any
+  request slower than this; unset disables profiling
+* ``DUAT_PROFILE_SAMPLE`` -- fraction of requests profiled (default 1.0)
+* ``DUAT_PROFILE_DIR`` -- output folder (default ``<cache dir>/profiles``)
+
+Route handlers do their blocking work through ``run_blocking``, so that is
+what gets profiled: each call runs under cProfile in its worker thread and
+the calls of one request are merged into one ``.prof`` file (open with
+snakeviz or ``python -m pstats``) plus a ``.txt`` top-functions summary.
+"""
+
+import bisect
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SLOW_MS_ENV = "DUAT_PROFILE_SLOW_MS"
+PROFILE_SAMPLE_ENV = "DUAT_PROFILE_SAMPLE"
+PROFILE_DIR_ENV = "DUAT_PROFILE_DIR"
+
+# Histogram upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+# Route label of requests no route matched; keeps label values bounded
+UNMATCHED = "unmatched"
+
+_PROFILE_TOP = 40
+
+
+class Histogram:
+    """Fixed-bucket histogram, Prometheus style (``value <= le``)."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # Last slot counts values above every bound (+Inf)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(le, count)`` pairs, ending with ``+Inf``."""
+        pairs, running = [], 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            pairs.append(("+Inf" if bound == float("inf") else _number(bound), running))
+        return pairs
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the *q* quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        running, lower = 0, 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and running + count >= rank:
+                return min(lower + (bound - lower) * (rank - running) / count, self.max)
+            running += count
+            lower = bound
+        # Above the last bound: the largest value seen is the best estimate
+        return self.max
+
+
+class RouteStats:
+    __slots__ = ("statuses", "latency", "size", "in_flight")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        # Filled in per snapshot from the active requests
+        self.in_flight = 0
+
+
+class RequestMetrics:
+    """Request counters, histograms and gauges keyed by (method, route)."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+        # Scopes of requests being handled; routing fills in their route
+        self._active: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, scope: Dict[str, Any]) -> None:
+        with self._lock:
+            self._active[id(scope)] = scope
+
+    def finish(self, scope: Dict[str, Any], status: int, seconds: float, size: int) -> None:
+        key = (scope["method"], route_template(scope))
+        with self._lock:
+            self._active.pop(id(scope), None)
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = RouteStats()
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.latency.observe(seconds)
+            stats.size.observe(size)
+
+    def _snapshot(self) -> List[Tuple[Tuple[str, str], RouteStats]]:
+        with self._lock:
+            routes = dict(self._routes)
+            active = list(self._active.values())
+        for stats in routes.values():
+            stats.in_flight = 0
+        for scope in active:
+            key = (scope["method"], route_template(scope))
+            if key not in routes:
+                routes[key] = RouteStats()
+            routes[key].in_flight += 1
+        return sorted(routes.items(), key=lambda item: (item[0][1], item[0][0]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON view: per route counts, latency quantiles (ms) and sizes."""
+        routes = []
+        for (method, route), stats in self._snapshot():
+            latency, size = stats.latency, stats.size
+            routes.append({
+                "method": method,
+                "route": route,
+                "requests": latency.count,
+                "in_flight": stats.in_flight,
+                "status": {str(code): count for code, count in sorted(stats.statuses.items())},
+                "latency_ms": {
+                    "mean": _ms(latency.sum / latency.count) if latency.count else None,
+                    "p50": _ms(latency.quantile(0.5)),
+                    "p95": _ms(latency.quantile(0.95)),
+                    "p99": _ms(latency.quantile(0.99)),
+                    "max": _ms(latency.max) if latency.count else None,
+                },
+                "response_bytes": {
+                    "total": int(size.sum),
+                    "mean": round(size.sum / size.count) if size.count else None,
+                    "max": int(size.max),
+                },
+            })
+        return {
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "routes": routes,
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        snapshot = self._snapshot()
+        lines = [
+            "# HELP duat_http_requests_total Requests handled, by route and status code.",
+            "# TYPE duat_http_requests_total counter",
+        ]
+        for (method, route), stats in snapshot:
+            for code, count in sorted(stats.statuses.items()):
+                lines.append(f"duat_http_requests_total{_labels(method, route, status=str(code))} {count}")
+
+        lines += [
+            "# HELP duat_http_requests_in_flight Requests being handled.",
+            "# TYPE duat_http_requests_in_flight gauge",
+        ]
+        for (method, route), stats in snapshot:
+            lines.append(f"duat_http_requests_in_flight{_labels(method, route)} {stats.in_flight}")
+
+        for name, help_text, attr in (
+            ("duat_http_request_duration_seconds", "Time until the last response byte was sent.", "latency"),
+            ("duat_http_response_size_bytes", "Response body size.", "size"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (method, route), stats in snapshot:
+                histogram = getattr(stats, attr)
+                for le, count in histogram.cumulative():
+                    lines.append(f"{name}_bucket{_labels(method, route, le=le)} {count}")
+                lines.append(f"{name}_sum{_labels(method, route)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(method, route)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(method: str, route: str, **extra: str) -> str:
+    labels = {"method": method, "route": route, **extra}
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+# ---------------------------------------------------------------------------
+# Slow-request profiler
+# ---------------------------------------------------------------------------
+
+# Profiles of the current request's run_blocking calls, when it is sampled
+_request_profiles: contextvars.ContextVar[Optional[List[cProfile.Profile]]] = contextvars.ContextVar(
+    "duat_request_profiles", default=None
+)
+
+# Only one cProfile profiler can be active per process on Python 3.12+
+# (it is built on sys.monitoring), so profile one worker call at a time.
+_profiler_lock = threading.Lock()
+
+
+def profiled(func: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Wrap *func* to run under cProfile when the current request is sampled.
+
+    Called on the event loop by ``run_blocking``; the returned callable
+    runs in the worker thread.  Returns *func* itself otherwise.  While
+    another call is being profiled, *func* runs unprofiled.
+    """
+    profiles = _request_profiles.get()
+    if profiles is None:
+        return func
+
+    def run():
+        if not _profiler_lock.acquire(blocking=False):
+            return func()
+        try:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiling tool (e.g. a debugger) is active
+                return func()
+            try:
+                return func()
+            finally:
+                profile.disable()
+                profiles.append(profile)
+        finally:
+            _profiler_lock.release()
+
+    return run
+
+
+class RequestProfiler:
+    """Keeps cProfile output of sampled requests slower than a threshold."""
+
+    def __init__(self, slow_ms: float, output_dir: Path, sample: float = 1.0):
+        self.slow_seconds = slow_ms / 1000
+        self.output_dir = Path(output_dir)
+        self.sample = sample
+        self.written = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["RequestProfiler"]:
+        """Profiler configured by ``DUAT_PROFILE_*``, or None when not enabled."""
+        slow_ms = os.environ.get(PROFILE_SLOW_MS_ENV)
+        if not slow_ms:
+            return None
+        try:
+            threshold = float(slow_ms)
+            sample = float(os.environ.get(PROFILE_SAMPLE_ENV, "1"))
+        except ValueError:
+            logger.warning("Ignoring invalid %s / %s", PROFILE_SLOW_MS_ENV, PROFILE_SAMPLE_ENV)
+            return None
+
+        output_dir = os.environ.get(PROFILE_DIR_ENV)
+        if output_dir is None:
+            from config import get_cache_dir
+            output_dir = get_cache_dir() / "profiles"
+
+        logger.info(
+            "Profiling %.0f%% of requests; keeping those slower than %.0f ms in %s",
+            sample * 100, threshold, output_dir,
+        )
+        return cls(threshold, Path(output_dir), sample)
+
+    def sample_request(self) -> Optional[List[cProfile.Profile]]:
+        """Profile list to collect this request into, or None if it is not sampled."""
+        if self.sample < 1 and random.random() >= self.sample:
+            return None
+        return []
+
+    def finish(self, profiles: List[cProfile.Profile], method: str, route: str, seconds: float) -> Optional[Path]:
+        """Write the collected *profiles* when the request was slow."""
+        if seconds < self.slow_seconds or not profiles:
+            return None
+        try:
+            return self._write(profiles, method, route, seconds)
+        except OSError as e:
+            logger.warning("Failed to write request profile: %s", e)
+            return None
+
+    def _write(self, profiles: List[cProfile.Profile], method: str, route: str, seconds: float) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        stem = f"{datetime.now():%Y%m%d_%H%M%S}_{method}_{slug}_{seconds * 1000:.0f}ms"
+        path = self.output_dir / f"{stem}.prof"
+
+        text = io.StringIO()
+        stats = pstats.Stats(profiles[0], stream=text)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(str(path))
+        text.write(f"{method} {route} took {seconds * 1000:.0f} ms\n")
+        stats.sort_stats("cumulative").print_stats(_PROFILE_TOP)
+        path.with_suffix(".txt").write_text(text.getvalue(), encoding="utf-8")
+
+        self.written += 1
+        logger.warning("Slow request %s %s took %.0f ms; profile written to %s", method, route, seconds * 1000, path)
+        return path
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route *scope* was dispatched to, e.g.
+    ``/api/lag/config/{project_no}``.
+
+    Built from the concrete path and its path parameters, as the ``route``
+    routing leaves in the scope may not carry the router prefix.
+    """
+    if scope.get("route") is None:
+        return UNMATCHED
+    segments = scope["path"].split("/")
+    # Parameters are single path segments; replace from the end
+    for name, value in (scope.get("path_params") or {}).items():
+        value = str(value)
+        for index in range(len(segments) - 1, -1, -1):
+            if segments[index] == value:
+                segments[index] = "{" + name + "}"
+                break
+    return "/".join(segments)
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding ``RequestMetrics`` and the optional profiler."""
+
+    def __init__(
+        self,
+        app,
+        metrics: RequestMetrics,
+        profiler: Optional[RequestProfiler] = None,
+        exclude: Sequence[str] = (),
+    ):
+        self.app = app
+        self.metrics = metrics
+        self.profiler = profiler
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        state = {"status": 500, "size": 0, "done": False}
+        profiles = self.profiler.sample_request() if self.profiler else None
+        token = _request_profiles.set(profiles) if profiles is not None else None
+        self.metrics.start(scope)
+
+        def finish():
+            if state["done"]:
+                return
+            state["done"] = True
+            seconds = time.perf_counter() - started
+            self.metrics.finish(scope, state["status"], seconds, state["size"])
+            if profiles is not None:
+                self.profiler.finish(profiles, scope["method"], route_template(scope), seconds)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["size"] += len(message.get("body", b""))
+            await send(message)
+            # Background tasks run after the last chunk; they are not request latency
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
+            if token is not None:
+                _request_profiles.reset(token)
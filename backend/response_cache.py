@@ -0,0 +1,124 @@
+# MTR DUAT - Response Cache
+"""
+Version-keyed response cache with ETag revalidation.
+
+Dashboard GET endpoints are pure functions of the loaded data, which only
+changes when ``DashboardAnalyzer.data_version`` changes.  ``cached_json``
+keeps the rendered body of each endpoint (per path, query string and any
+extra *vary* key) together with the version it was built for, and serves it
+again until the version moves on.
+
+Every cached response carries an ``ETag`` and ``Cache-Control: no-cache``,
+so the SPA's browser cache revalidates with ``If-None-Match`` and gets a
+body-less 304 while the data is unchanged.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on cached body bytes; /raw-data pages can be large
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class CacheEntry(NamedTuple):
+    version: Hashable
+    etag: str
+    body: bytes
+    media_type: Optional[str]
+
+
+class ResponseCache:
+    """LRU cache of rendered response bodies, bounded by total size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, version: Hashable) -> Optional[CacheEntry]:
+        """Return the entry for *key* if it was built for *version*."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, entry: CacheEntry) -> None:
+        """Store *entry*, evicting least recently used entries over the size limit."""
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.body)
+            self._entries[key] = entry
+            self._size += len(entry.body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _etag(version: Hashable, body: bytes) -> str:
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return f'"v{version}-{digest}"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes added by proxies
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def cached_json(
+    cache: ResponseCache,
+    request: Request,
+    version: Hashable,
+    build: Callable[[], Response],
+    vary: Any = None,
+) -> Response:
+    """Serve *build*'s response from *cache* while *version* is unchanged.
+
+    *build* is only called on a miss; exceptions such as HTTPException
+    propagate and are not cached.  *vary* is added to the cache key for
+    endpoints that also depend on something other than the data (e.g.
+    the configured job keywords).
+    """
+    key = (request.url.path, request.url.query, vary)
+    entry = cache.get(key, version)
+    if entry is None:
+        response = build()
+        if response.status_code != 200:
+            return response
+        entry = CacheEntry(version, _etag(version, response.body), response.body, response.media_type)
+        cache.put(key, entry)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
@@ -1,7 +1,7 @@
 # MTR DUAT - Dashboard Router
 """Dashboard analysis API endpoints."""
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import logging
@@ -9,8 +9,6 @@ import tempfile
 import shutil
 from pathlib import Path
 import sys
-import numpy as np
-import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -22,33 +20,19 @@ from analysis.dashboard import (
     get_weekly_trend,
     get_monthly_trend,
     get_project_distribution,
-    get_keyword_distribution
+    get_keyword_distribution,
+    calculate_line_distribution
 )
-
-
-def convert_to_native(obj):
-    """Convert numpy/pandas types to native Python types for JSON serialization."""
-    if isinstance(obj, dict):
-        return {k: convert_to_native(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_native(item) for item in obj]
-    elif isinstance(obj, (np.integer, np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64, np.float32)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, pd.Timestamp):
-        return obj.isoformat()
-    elif pd.isna(obj):
-        return None
-    else:
-        return obj
+from backend.executor import ANALYSIS, run_blocking
+from backend.response_cache import cached_json
+from config import load_app_config
+from backend.serialization import native_response
 
 router = APIRouter()
 
 # Import shared analyzer from services
-from backend.services import dashboard_analyzer as analyzer
+from backend.services import dashboard_analyzer as analyzer, parsing_state
+from backend.services import dashboard_response_cache as response_cache
 
 
 class RecordsInput(BaseModel):
@@ -56,219 +40,312 @@ class RecordsInput(BaseModel):
     max_week: Optional[int] = None
 
 
+class ParsedInput(BaseModel):
+    # Parse job to load; None uses whatever the last parse produced
+    job_id: Optional[str] = None
+    # Defaults to the max week of the parse
+    max_week: Optional[int] = None
+
+
 @router.post("/analyze")
 async def analyze_records(input_data: RecordsInput):
     """Analyze records and generate dashboard data."""
     if not input_data.records:
         raise HTTPException(status_code=400, detail="No records provided")
     
-    success = analyzer.load_from_records(input_data.records, input_data.max_week)
-    
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to analyze records")
+    def analyze():
+        success = analyzer.load_from_records(input_data.records, input_data.max_week)
+        
+        if not success:
+            raise HTTPException(status_code=500, detail="Failed to analyze records")
+        
+        return native_response({
+            "success": True,
+            "stats": analyzer.get_stats(),
+            "last_updated": analyzer.last_updated
+        })
     
-    return convert_to_native({
-        "success": True,
-        "stats": analyzer.get_stats(),
-        "last_updated": analyzer.last_updated
-    })
+    return await run_blocking(ANALYSIS, analyze)
 
 
-@router.post("/load-excel")
-async def load_from_excel(file: UploadFile = File(...)):
-    """Load dashboard data from an existing Excel file."""
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="File must be an Excel file")
+@router.post("/analyze-parsed")
+async def analyze_parsed_records(input_data: Optional[ParsedInput] = None):
+    """
+    Analyze the records of the last folder parse or scan in-process.
+    Same result as posting /api/parse/results to /analyze, without sending
+    the records over HTTP.
+    """
+    input_data = input_data or ParsedInput()
+    
+    if parsing_state["in_progress"]:
+        raise HTTPException(status_code=409, detail="Parsing still in progress")
+    
+    if input_data.job_id is not None and input_data.job_id != parsing_state.get("job_id"):
+        raise HTTPException(status_code=404, detail="Parse job not found")
+    
+    records = parsing_state["records"]
+    if not records:
+        raise HTTPException(status_code=400, detail="No parsed records")
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = Path(tmp.name)
+    max_week = input_data.max_week or parsing_state["max_week"] or None
+    job_id = parsing_state.get("job_id")
     
-    try:
-        success = analyzer.load_from_excel(tmp_path)
+    def analyze():
+        success = analyzer.load_from_records(records, max_week)
+        
         if not success:
-            raise HTTPException(status_code=500, detail="Failed to load Excel file")
+            raise HTTPException(status_code=500, detail="Failed to analyze records")
         
-        return convert_to_native({
+        return native_response({
             "success": True,
-            "filename": file.filename,
+            "job_id": job_id,
             "stats": analyzer.get_stats(),
             "last_updated": analyzer.last_updated
         })
-    finally:
-        tmp_path.unlink(missing_ok=True)
+    
+    return await run_blocking(ANALYSIS, analyze)
+
+
+@router.post("/load-excel")
+async def load_from_excel(file: UploadFile = File(...)):
+    """Load dashboard data from an existing Excel file."""
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="File must be an Excel file")
+    
+    def load():
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
+            shutil.copyfileobj(file.file, tmp)
+            tmp_path = Path(tmp.name)
+        
+        try:
+            success = analyzer.load_from_excel(tmp_path)
+            if not success:
+                raise HTTPException(status_code=500, detail="Failed to load Excel file")
+            
+            return native_response({
+                "success": True,
+                "filename": file.filename,
+                "stats": analyzer.get_stats(),
+                "last_updated": analyzer.last_updated
+            })
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    return await run_blocking(ANALYSIS, load)
+
+
+async def _cached(request: Request, build, vary=None):
+    """
+    Serve a GET response from the shared cache until the dashboard data changes.
+    
+    Runs on the analysis pool, after any queued load; *vary* may be a
+    callable evaluated there as well.
+    """
+    def serve():
+        return cached_json(
+            response_cache, request, analyzer.data_version, build, vary() if callable(vary) else vary
+        )
+    
+    return await run_blocking(ANALYSIS, serve)
+
+
+def _job_keywords():
+    # Weekly trend and keyword distribution also depend on configured keywords
+    return tuple(load_app_config().get("keywords") or ())
 
 
 @router.get("/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Get summary statistics."""
-    stats = analyzer.get_stats()
-    if not stats:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    return convert_to_native(stats)
+    def build():
+        stats = analyzer.get_stats()
+        if not stats:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        return native_response(stats)
+    
+    return await _cached(request, build)
 
 
 @router.get("/summary")
-async def get_summary():
+async def get_summary(request: Request):
     """Get project summary table."""
-    if analyzer.summary is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
+    def build():
+        if analyzer.summary is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        
+        return native_response({
+            "columns": analyzer.summary.columns.tolist(),
+            "data": analyzer.summary
+        })
     
-    return convert_to_native({
-        "columns": analyzer.summary.columns.tolist(),
-        "data": analyzer.summary.to_dict(orient="records")
-    })
+    return await _cached(request, build)
 
 
 @router.get("/trends/weekly")
-async def get_weekly_trends(weeks: int = 12):
+async def get_weekly_trends(request: Request, weeks: int = 12):
     """Get weekly trend data for charts."""
-    if analyzer.df is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    
-    week_labels, category_data = get_weekly_trend(analyzer.df, weeks)
+    def build():
+        if analyzer.df is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        
+        cube = analyzer.cube
+        if cube is not None:
+            week_labels, category_data = cube.weekly_trend(weeks)
+        else:
+            week_labels, category_data = get_weekly_trend(analyzer.df, weeks)
+        
+        return native_response({
+            "labels": week_labels,
+            "datasets": category_data
+        })
     
-    return convert_to_native({
-        "labels": week_labels,
-        "datasets": category_data
-    })
+    return await _cached(request, build, vary=_job_keywords)
 
 
 @router.get("/trends/monthly")
-async def get_monthly_trends(months: int = 6):
+async def get_monthly_trends(request: Request, months: int = 6):
     """Get monthly trend data."""
-    if analyzer.df is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    
-    month_labels, nth_counts = get_monthly_trend(analyzer.df, months)
+    def build():
+        if analyzer.df is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        
+        cube = analyzer.cube
+        if cube is not None:
+            month_labels, nth_counts = cube.monthly_trend(months)
+        else:
+            month_labels, nth_counts = get_monthly_trend(analyzer.df, months)
+        
+        return native_response({
+            "labels": month_labels,
+            "data": nth_counts
+        })
     
-    return convert_to_native({
-        "labels": month_labels,
-        "data": nth_counts
-    })
+    return await _cached(request, build)
 
 
 @router.get("/distribution/projects")
-async def get_projects_distribution():
+async def get_projects_distribution(request: Request):
     """Get NTH distribution by project."""
-    if analyzer.df is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    
-    distribution = get_project_distribution(analyzer.df)
+    def build():
+        if analyzer.df is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        
+        cube = analyzer.cube
+        distribution = cube.project_distribution() if cube is not None else get_project_distribution(analyzer.df)
+        
+        return native_response({
+            "labels": list(distribution.keys()),
+            "data": list(distribution.values())
+        })
     
-    return convert_to_native({
-        "labels": list(distribution.keys()),
-        "data": list(distribution.values())
-    })
+    return await _cached(request, build)
 
 
 @router.get("/distribution/keywords")
-async def get_keywords_distribution():
+async def get_keywords_distribution(request: Request):
     """Get NTH distribution by keyword jobs."""
-    if analyzer.df is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    
-    distribution = get_keyword_distribution(analyzer.df)
+    def build():
+        if analyzer.df is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        
+        cube = analyzer.cube
+        distribution = cube.keyword_distribution() if cube is not None else get_keyword_distribution(analyzer.df)
+        
+        return native_response({
+            "labels": list(distribution.keys()),
+            "data": list(distribution.values())
+        })
     
-    return convert_to_native({
-        "labels": list(distribution.keys()),
-        "data": list(distribution.values())
-    })
+    return await _cached(request, build, vary=_job_keywords)
 
 
 @router.get("/raw-data")
-async def get_raw_data(limit: int = 100, offset: int = 0):
+async def get_raw_data(request: Request, limit: int = 100, offset: int = 0):
     """Get raw data with pagination."""
-    if analyzer.df is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    
-    total = len(analyzer.df)
-    data = analyzer.df.iloc[offset:offset + limit]
+    def build():
+        if analyzer.df is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        
+        total = len(analyzer.df)
+        data = analyzer.df.iloc[offset:offset + limit]
+        
+        return native_response({
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "data": data
+        })
     
-    return convert_to_native({
-        "total": total,
-        "limit": limit,
-        "offset": offset,
-        "data": data.to_dict(orient="records")
-    })
+    return await _cached(request, build)
 
 
 @router.get("/pivot")
-async def get_nth_pivot():
+async def get_nth_pivot(request: Request):
     """Get NTH pivot table by week and project."""
-    if analyzer.nth_trend is None or analyzer.nth_trend.empty:
-        raise HTTPException(status_code=404, detail="No trend data available")
-    
-    pivot = analyzer.nth_trend.reset_index()
+    def build():
+        if analyzer.nth_trend is None or analyzer.nth_trend.empty:
+            raise HTTPException(status_code=404, detail="No trend data available")
+        
+        pivot = analyzer.nth_trend.reset_index()
+        
+        return native_response({
+            "columns": pivot.columns.tolist(),
+            "data": pivot
+        })
     
-    return convert_to_native({
-        "columns": pivot.columns.tolist(),
-        "data": pivot.to_dict(orient="records")
-    })
+    return await _cached(request, build)
 
 
 @router.get("/distribution/lines")
-async def get_line_distribution():
+async def get_line_distribution(request: Request):
     """Get NTH and Qty distribution by rail line."""
-    if analyzer.df is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    
-    df = analyzer.df
-    if 'Line' not in df.columns:
-        return convert_to_native({
-            "labels": [],
-            "nth_data": [],
-            "qty_data": []
-        })
-    
-    df_with_line = df[df['Line'] != ''].copy()
-    if df_with_line.empty:
-        return convert_to_native({
-            "labels": [],
-            "nth_data": [],
-            "qty_data": []
+    def build():
+        if analyzer.df is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+        
+        cube = analyzer.cube
+        if cube is not None:
+            labels, nth_data, qty_data = cube.line_distribution()
+        else:
+            labels, nth_data, qty_data = calculate_line_distribution(analyzer.df)
+        
+        return native_response({
+            "labels": labels,
+            "nth_data": nth_data,
+            "qty_data": qty_data
         })
     
-    # NTH by line
-    line_nth = df_with_line.groupby('Line').size()
-    # Qty by line
-    line_qty = df_with_line.groupby('Line')['Qty Delivered'].sum() if 'Qty Delivered' in df_with_line.columns else pd.Series()
-    
-    # Sort by NTH descending
-    sorted_lines = line_nth.sort_values(ascending=False)
-    
-    return convert_to_native({
-        "labels": sorted_lines.index.tolist(),
-        "nth_data": sorted_lines.values.tolist(),
-        "qty_data": [line_qty.get(line, 0) for line in sorted_lines.index]
-    })
+    return await _cached(request, build)
 
 
 @router.get("/trends/nth-by-project")
-async def get_nth_trend_by_project(weeks: int = 52):
+async def get_nth_trend_by_project(request: Request, weeks: int = 52):
     """Get NTH trend by week for all projects."""
-    if analyzer.nth_trend is None or analyzer.nth_trend.empty:
-        raise HTTPException(status_code=404, detail="No trend data available")
-    
-    # Get last N weeks
-    trend_data = analyzer.nth_trend.tail(weeks)
-    
-    # Get week labels (index)
-    week_labels = trend_data.index.tolist()
-    
-    # Get project columns sorted by total NTH
-    project_totals = trend_data.sum().sort_values(ascending=False)
-    projects = project_totals.index.tolist()
-    
-    # Build datasets for each project
-    datasets = {}
-    for proj in projects:
-        if proj in trend_data.columns:
-            datasets[proj] = trend_data[proj].fillna(0).tolist()
+    def build():
+        if analyzer.nth_trend is None or analyzer.nth_trend.empty:
+            raise HTTPException(status_code=404, detail="No trend data available")
+        
+        # Get last N weeks
+        trend_data = analyzer.nth_trend.tail(weeks)
+        
+        # Get week labels (index)
+        week_labels = trend_data.index.tolist()
+        
+        # Get project columns sorted by total NTH
+        project_totals = trend_data.sum().sort_values(ascending=False)
+        projects = project_totals.index.tolist()
+        
+        # Build datasets for each project
+        datasets = {}
+        for proj in projects:
+            if proj in trend_data.columns:
+                datasets[proj] = trend_data[proj].fillna(0).tolist()
+        
+        return native_response({
+            "labels": week_labels,
+            "projects": projects,
+            "datasets": datasets,
+            "totals": project_totals.to_dict()
+        })
     
-    return convert_to_native({
-        "labels": week_labels,
-        "projects": projects,
-        "datasets": datasets,
-        "totals": project_totals.to_dict()
-    })
+    return await _cached(request, build)
@@ -6,7 +6,6 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional
 import logging
-import tempfile
 from pathlib import Path
 import sys
 
@@ -18,6 +17,9 @@ from utils.excel_export import (
     create_dashboard_excel,
     export_lag_analysis_report
 )
+from backend.executor import ANALYSIS, run_blocking
+from backend.jobs import JOB_DONE, JOB_FAILED, XLSX_MEDIA_TYPE
+from backend.services import export_jobs
 
 router = APIRouter()
 
@@ -26,61 +28,73 @@ class ExportRequest(BaseModel):
     filename: Optional[str] = None
 
 
-@router.post("/dashboard")
-async def export_dashboard(request: ExportRequest):
-    """Export dashboard data to Excel file."""
+def _dashboard_export():
+    """Snapshot the dashboard data and return a job builder for it.
+
+    Runs on the ANALYSIS pool, which owns the analyzer singletons.
+    """
     from backend.services import dashboard_analyzer
     
     if dashboard_analyzer.df is None or dashboard_analyzer.summary is None:
         raise HTTPException(status_code=400, detail="No dashboard data to export")
     
-    # Create temp file
-    filename = request.filename or "MTR_DUAT_Dashboard.xlsx"
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-        output_path = Path(tmp.name)
-    
     # Get raw data columns
     raw_df = dashboard_analyzer.df[["Year", "Day", "Date", "Week", "Project", "Qty Delivered"]].copy()
+    summary = dashboard_analyzer.summary
+    nth_trend = dashboard_analyzer.nth_trend
     
-    success = create_dashboard_excel(
-        raw_df,
-        dashboard_analyzer.summary,
-        output_path,
-        dashboard_analyzer.nth_trend
-    )
+    def build(output_path: Path, progress) -> bool:
+        return create_dashboard_excel(raw_df, summary, output_path, nth_trend, progress_callback=progress)
     
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to export dashboard")
-    
-    return FileResponse(
-        path=output_path,
-        filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    return build
 
 
-@router.post("/lag-analysis")
-async def export_lag_analysis(request: ExportRequest):
-    """Export lag analysis results to Excel file."""
+def _lag_analysis_export():
+    """Snapshot the lag analysis results and return a job builder for them.
+
+    Runs on the ANALYSIS pool, which owns the analyzer singletons.
+    """
     from backend.services import lag_analyzer
     
     if lag_analyzer.results is None:
         raise HTTPException(status_code=400, detail="No lag analysis results to export")
     
-    filename = request.filename or "MTR_DUAT_Lag_Analysis.xlsx"
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-        output_path = Path(tmp.name)
+    results = lag_analyzer.results
+    
+    def build(output_path: Path, progress) -> bool:
+        return export_lag_analysis_report(results, output_path)
+    
+    return build
+
+
+def _file_response(job) -> FileResponse:
+    return FileResponse(path=job.path, filename=job.filename, media_type=XLSX_MEDIA_TYPE)
+
+
+@router.post("/dashboard")
+async def export_dashboard(request: ExportRequest):
+    """Export dashboard data to Excel file."""
+    build = await run_blocking(ANALYSIS, _dashboard_export)
+    filename = request.filename or "MTR_DUAT_Dashboard.xlsx"
+    job = await export_jobs.run("dashboard", filename, build)
     
-    success = export_lag_analysis_report(lag_analyzer.results, output_path)
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=500, detail="Failed to export dashboard")
     
-    if not success:
+    return _file_response(job)
+
+
+@router.post("/lag-analysis")
+async def export_lag_analysis(request: ExportRequest):
+    """Export lag analysis results to Excel file."""
+    build = await run_blocking(ANALYSIS, _lag_analysis_export)
+    filename = request.filename or "MTR_DUAT_Lag_Analysis.xlsx"
+    job = await export_jobs.run("lag-analysis", filename, build)
+    
+    if job.status != JOB_DONE:
         raise HTTPException(status_code=500, detail="Failed to export lag analysis")
     
-    return FileResponse(
-        path=output_path,
-        filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    return _file_response(job)
 
 
 @router.get("/download/{file_type}")
@@ -100,10 +114,7 @@ async def download_file(file_type: str):
 @router.post("/save-dashboard")
 async def save_dashboard_to_folder(folder_path: str = ""):
     """Save dashboard Excel to the source folder (like the Flet app does)."""
-    from backend.services import dashboard_analyzer
-    
-    if dashboard_analyzer.df is None or dashboard_analyzer.summary is None:
-        raise HTTPException(status_code=400, detail="No dashboard data to export")
+    build = await run_blocking(ANALYSIS, _dashboard_export)
     
     if not folder_path:
         raise HTTPException(status_code=400, detail="No folder path provided")
@@ -113,17 +124,70 @@ async def save_dashboard_to_folder(folder_path: str = ""):
         raise HTTPException(status_code=400, detail="Folder does not exist")
     
     output_file = folder / "Progress Dashboard + NTH.xlsx"
+    job = await export_jobs.run("dashboard", output_file.name, build, path=output_file)
     
-    raw_df = dashboard_analyzer.df[["Year", "Day", "Date", "Week", "Project", "Qty Delivered"]].copy()
-    
-    success = create_dashboard_excel(
-        raw_df,
-        dashboard_analyzer.summary,
-        output_file,
-        dashboard_analyzer.nth_trend
-    )
-    
-    if not success:
+    if job.status != JOB_DONE:
         raise HTTPException(status_code=500, detail="Failed to save dashboard Excel")
     
     return {"success": True, "filename": output_file.name, "path": str(output_file)}
+
+
+# ---------------------------------------------------------------------------
+# Background export jobs
+# ---------------------------------------------------------------------------
+
+@router.post("/jobs/dashboard")
+async def start_dashboard_export(request: ExportRequest):
+    """Start a dashboard export in the background; poll /jobs/{job_id}."""
+    build = await run_blocking(ANALYSIS, _dashboard_export)
+    job = export_jobs.submit("dashboard", request.filename or "MTR_DUAT_Dashboard.xlsx", build)
+    return job.to_dict()
+
+
+@router.post("/jobs/lag-analysis")
+async def start_lag_analysis_export(request: ExportRequest):
+    """Start a lag analysis export in the background; poll /jobs/{job_id}."""
+    build = await run_blocking(ANALYSIS, _lag_analysis_export)
+    job = export_jobs.submit("lag-analysis", request.filename or "MTR_DUAT_Lag_Analysis.xlsx", build)
+    return job.to_dict()
+
+
+@router.get("/jobs")
+async def list_export_jobs():
+    """List export jobs that have not expired yet."""
+    return {"jobs": [job.to_dict() for job in export_jobs.jobs()]}
+
+
+def _get_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export job: {job_id}")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_export_job(job_id: str):
+    """Status and progress of an export job."""
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    """Download the file of a finished export job."""
+    job = _get_job(job_id)
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=500, detail=job.error or "Export failed")
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=409, detail="Export still in progress")
+    if not job.path.exists():
+        raise HTTPException(status_code=410, detail="Export file no longer available")
+    return _file_response(job)
+
+
+@router.delete("/jobs/{job_id}")
+async def delete_export_job(job_id: str):
+    """Forget an export job and delete its file."""
+    _get_job(job_id)
+    if not export_jobs.remove(job_id):
+        raise HTTPException(status_code=409, detail="Export still in progress")
+    return {"success": True}
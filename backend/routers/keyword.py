@@ -3,23 +3,29 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Literal
 from pathlib import Path
-import re
-from docx import Document
+import sys
 import logging
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from parsers.keyword_index import MODE_SUBSTRING
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Import shared state from services
-from backend.services import search_state
+from backend.executor import SCAN, run_blocking
+from backend.services import search_state, get_keyword_index
 
 
 class KeywordSearchRequest(BaseModel):
     folder_path: str
     keyword: str
+    # substring: legacy case-insensitive substring match
+    # all / any: whole-word terms, "term*" for prefix matches
+    mode: Literal["substring", "all", "any"] = MODE_SUBSTRING
 
 
 @router.post("/search")
@@ -33,49 +39,27 @@ async def search_keyword(request: KeywordSearchRequest):
     if not keyword:
         raise HTTPException(status_code=400, detail="Keyword cannot be empty")
 
-    docx_files = sorted([
-        f for f in folder.glob("PS-OHLR_DUAT_Daily Report_*.docx")
-        if not f.name.startswith("~$")
-    ])
+    def search():
+        docx_files = sorted([
+            f for f in folder.glob("PS-OHLR_DUAT_Daily Report_*.docx")
+            if not f.name.startswith("~$")
+        ])
 
-    total_files = len(docx_files)
-    all_matches = []
-    matched_file_count = 0
+        # Only new or modified reports are reopened; the rest comes from the index
+        index = get_keyword_index()
+        reindexed = index.refresh(folder, docx_files)
+        index.save()
 
-    for filepath in docx_files:
         try:
-            doc = Document(str(filepath))
-            file_matches = []
-
-            for para in doc.paragraphs:
-                text = para.text.strip()
-                if text and keyword.lower() in text.lower():
-                    file_matches.append({"location": "Paragraph", "text": text[:500]})
-
-            for t_idx, table in enumerate(doc.tables):
-                for r_idx, row in enumerate(table.rows):
-                    for c_idx, cell in enumerate(row.cells):
-                        cell_text = cell.text.strip()
-                        if cell_text and keyword.lower() in cell_text.lower():
-                            file_matches.append({
-                                "location": f"Table {t_idx+1}, Row {r_idx+1}, Col {c_idx+1}",
-                                "text": cell_text[:500]
-                            })
-
-            # Deduplicate
-            seen = set()
-            unique = []
-            for m in file_matches:
-                if m["text"] not in seen:
-                    seen.add(m["text"])
-                    unique.append(m)
-
-            if unique:
-                matched_file_count += 1
-                all_matches.append({"filename": filepath.name, "matches": unique})
-        except Exception as e:
-            logger.warning("Failed to process %s: %s", filepath.name, e)
-            continue
+            found = index.search(keyword, docx_files, request.mode)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return len(docx_files), reindexed, found
+
+    total_files, reindexed, found = await run_blocking(SCAN, search)
+
+    all_matches = [{"filename": name, "matches": matches} for name, matches in found.items()]
+    matched_file_count = len(all_matches)
 
     search_state.update({
         "results": all_matches, "keyword": keyword,
@@ -86,5 +70,6 @@ async def search_keyword(request: KeywordSearchRequest):
         "keyword": keyword,
         "total_files": total_files,
         "matched_files": matched_file_count,
-        "results": all_matches
+        "results": all_matches,
+        "reindexed_files": reindexed
     }
@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from analysis.lag_analysis import LagAnalyzer, get_status
+from backend.executor import ANALYSIS, run_blocking
+from backend.serialization import native_response
 
 router = APIRouter()
 
@@ -37,31 +39,34 @@ async def load_project_master(file: UploadFile = File(...)):
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be an Excel file")
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = Path(tmp.name)
-    
-    try:
-        # Try to get summary from dashboard if available
-        from backend.services import dashboard_analyzer
-        summary_df = dashboard_analyzer.summary
-        
-        success = lag_analyzer.load_project_master(tmp_path, summary_df)
+    def load():
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
+            shutil.copyfileobj(file.file, tmp)
+            tmp_path = Path(tmp.name)
         
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to load project master")
-        
-        return {
-            "success": True,
-            "filename": file.filename,
-            "projects": lag_analyzer.projects,
-            "project_count": len(lag_analyzer.projects),
-            "descriptions": lag_analyzer.project_descriptions,
-            "target_qty_map": lag_analyzer.target_qty_map,
-            "productivity_map": lag_analyzer.productivity_map
-        }
-    finally:
-        tmp_path.unlink(missing_ok=True)
+        try:
+            # Try to get summary from dashboard if available
+            from backend.services import dashboard_analyzer
+            summary_df = dashboard_analyzer.summary
+            
+            success = lag_analyzer.load_project_master(tmp_path, summary_df)
+            
+            if not success:
+                raise HTTPException(status_code=500, detail="Failed to load project master")
+            
+            return native_response({
+                "success": True,
+                "filename": file.filename,
+                "projects": lag_analyzer.projects,
+                "project_count": len(lag_analyzer.projects),
+                "descriptions": lag_analyzer.project_descriptions,
+                "target_qty_map": lag_analyzer.target_qty_map,
+                "productivity_map": lag_analyzer.productivity_map
+            })
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    return await run_blocking(ANALYSIS, load)
 
 
 @router.get("/projects")
@@ -70,11 +75,11 @@ async def get_projects():
     if not lag_analyzer.projects:
         raise HTTPException(status_code=404, detail="No projects loaded")
     
-    return {
+    return native_response({
         "projects": lag_analyzer.projects,
         "descriptions": lag_analyzer.project_descriptions,
         "config": lag_analyzer.config
-    }
+    })
 
 
 @router.put("/config/{project_no}")
@@ -100,18 +105,21 @@ async def calculate_lag_lead(request: CalculateRequest):
     if lag_analyzer.project_master is None:
         raise HTTPException(status_code=400, detail="No project master loaded")
     
-    success = lag_analyzer.calculate(request.actual_qty_map)
-    
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to calculate lag/lead")
-    
-    results = lag_analyzer.results.to_dict(orient="records") if lag_analyzer.results is not None else []
+    def calculate():
+        success = lag_analyzer.calculate(request.actual_qty_map)
+        
+        if not success:
+            raise HTTPException(status_code=500, detail="Failed to calculate lag/lead")
+        
+        results = lag_analyzer.results if lag_analyzer.results is not None else []
+        
+        return native_response({
+            "success": True,
+            "last_calculated": lag_analyzer.last_calculated,
+            "results": results
+        })
     
-    return {
-        "success": True,
-        "last_calculated": lag_analyzer.last_calculated,
-        "results": results
-    }
+    return await run_blocking(ANALYSIS, calculate)
 
 
 @router.get("/results")
@@ -120,10 +128,10 @@ async def get_results():
     if lag_analyzer.results is None:
         raise HTTPException(status_code=404, detail="No results available")
     
-    return {
+    return native_response({
         "last_calculated": lag_analyzer.last_calculated,
-        "results": lag_analyzer.results.to_dict(orient="records")
-    }
+        "results": lag_analyzer.results
+    })
 
 
 @router.get("/status-legend")
@@ -4,12 +4,14 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any
+from datetime import datetime
 from pathlib import Path
 import sys
 import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from parsers.manpower_parser import ManpowerParser
+from parsers.parse_stats import ParseStats, stats_enabled
 from analysis.manpower import ManpowerAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -17,11 +19,15 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Import shared state from services
-from backend.services import manpower_state
+from backend.executor import ANALYSIS, SCAN, run_blocking
+from backend.jobs import JOB_DONE
+from backend.services import export_jobs, manpower_state
 
 
 class ManpowerScanRequest(BaseModel):
     folder_path: str
+    # Per-stage parse timings in the response (also on with DUAT_PARSE_STATS=1)
+    stats: bool = False
 
 
 class ManpowerExportRequest(BaseModel):
@@ -35,10 +41,14 @@ async def scan_manpower(request: ManpowerScanRequest):
     if not folder.exists():
         raise HTTPException(status_code=404, detail="Folder path does not exist")
 
+    stats = ParseStats() if request.stats or stats_enabled() else None
+
+    def scan():
+        parser = ManpowerParser(folder, stats=stats)
+        return parser.get_report_files(), parser.process_all()
+
     try:
-        parser = ManpowerParser(folder)
-        files = parser.get_report_files()
-        records = parser.process_all()
+        files, records = await run_blocking(SCAN, scan)
         manpower_state["records"] = records
         manpower_state["total_files"] = len(files)
 
@@ -46,7 +56,8 @@ async def scan_manpower(request: ManpowerScanRequest):
         return {
             "total_files": len(files),
             "total_records": len(records),
-            "total_jobs": total_jobs
+            "total_jobs": total_jobs,
+            "stats": stats.to_dict() if stats is not None else None,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -58,39 +69,63 @@ async def get_analysis():
     if not manpower_state["records"]:
         raise HTTPException(status_code=404, detail="No manpower data. Run scan first.")
 
+    def analyze():
+        analyzer = ManpowerAnalyzer(manpower_state["records"])
+        kpis = analyzer.summary_kpis()
+        job_type_mp = analyzer.job_type_manpower()
+        role_freq = analyzer.role_frequency()
+        team_dist = analyzer.team_distribution()
+        access = analyzer.work_access_analysis()
+
+        return {
+            "kpis": kpis,
+            "job_type_manpower": {k: _serialize(v) for k, v in job_type_mp.items()},
+            "role_frequency": role_freq[:20],
+            "team_distribution": team_dist,
+            "work_access": {k: _serialize(v) for k, v in access.items()},
+        }
+
+    return await run_blocking(ANALYSIS, analyze)
+
+
+def _manpower_export():
+    """Snapshot the scanned shifts and return a job builder for the workbook."""
+    if not manpower_state["records"]:
+        raise HTTPException(status_code=404, detail="No manpower data. Run scan first.")
+
     analyzer = ManpowerAnalyzer(manpower_state["records"])
-    kpis = analyzer.summary_kpis()
-    job_type_mp = analyzer.job_type_manpower()
-    role_freq = analyzer.role_frequency()
-    team_dist = analyzer.team_distribution()
-    access = analyzer.work_access_analysis()
 
-    return {
-        "kpis": kpis,
-        "job_type_manpower": {k: _serialize(v) for k, v in job_type_mp.items()},
-        "role_frequency": role_freq[:20],
-        "team_distribution": team_dist,
-        "work_access": {k: _serialize(v) for k, v in access.items()},
-    }
+    def build(output_path: Path, progress) -> None:
+        analyzer.export_excel(output_path)
+
+    return build
+
+
+def _export_filename() -> str:
+    return f"Manpower_Analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
 
 @router.post("/export")
 async def export_manpower(request: ManpowerExportRequest):
     """Export manpower analysis to Excel."""
-    if not manpower_state["records"]:
-        raise HTTPException(status_code=404, detail="No manpower data. Run scan first.")
+    build = _manpower_export()
 
     folder = Path(request.folder_path)
-    from datetime import datetime
-    filename = f"Manpower_Analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    filename = _export_filename()
     export_path = folder / filename
 
-    try:
-        analyzer = ManpowerAnalyzer(manpower_state["records"])
-        analyzer.export_excel(export_path)
-        return {"filename": filename, "path": str(export_path)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    job = await export_jobs.run("manpower", filename, build, path=export_path)
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=500, detail=job.error)
+    return {"filename": filename, "path": str(export_path)}
+
+
+@router.post("/export/job")
+async def start_manpower_export_job():
+    """Start a manpower export in the background; poll /api/export/jobs/{job_id}."""
+    build = _manpower_export()
+    job = export_jobs.submit("manpower", _export_filename(), build)
+    return job.to_dict()
 
 
 def _serialize(obj):
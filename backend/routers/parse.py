@@ -3,26 +3,47 @@
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 import tempfile
 import shutil
+import uuid
 from pathlib import Path
 import sys
 import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from parsers.docx_parser import DailyReportParser, process_docx
+from config import get_cache_dir
+from parsers.docx_parser import PARSER_VERSION, DailyReportParser, process_docx
+from parsers.parse_cache import DEFAULT_CACHE_FILENAME, ParseCache
+from parsers.parse_stats import ParseStats, stats_enabled
+from parsers.record_store import RecordStore
+from parsers.report_scanner import ReportScanner
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Import shared state from services
-from backend.services import parsing_state
+from backend.executor import SCAN, run_blocking
+from backend.services import parsing_state, manpower_state, get_keyword_index
 
 
 class FolderParseRequest(BaseModel):
     folder_path: str
+    # Process-pool size; 1 = sequential (default), None picks a size from the CPU count
+    workers: Optional[int] = 1
+    # Reuse records of unchanged files from the on-disk parse cache
+    use_cache: bool = True
+    # Extraction engine: python-docx object model or streaming XML reader
+    engine: Literal["docx", "stream"] = "docx"
+    # Per-stage parser timings in /progress; DUAT_PARSE_STATS=1 turns them on for every parse
+    stats: bool = False
+
+
+class FolderScanRequest(BaseModel):
+    folder_path: str
+    workers: Optional[int] = 1
+    engine: Literal["docx", "stream"] = "docx"
 
 
 class ParseResult(BaseModel):
@@ -38,13 +59,18 @@ async def parse_single_docx(file: UploadFile = File(...)):
     if not file.filename.endswith('.docx'):
         raise HTTPException(status_code=400, detail="File must be a .docx file")
     
-    # Save uploaded file to temp location
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = Path(tmp.name)
+    def parse():
+        # Save uploaded file to temp location
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
+            shutil.copyfileobj(file.file, tmp)
+            tmp_path = Path(tmp.name)
+        try:
+            return process_docx(tmp_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
     
     try:
-        records = process_docx(tmp_path)
+        records = await run_blocking(SCAN, parse)
         return {
             "success": True,
             "filename": file.filename,
@@ -54,8 +80,6 @@ async def parse_single_docx(file: UploadFile = File(...)):
     except Exception as e:
         logger.error("Failed to parse DOCX: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        tmp_path.unlink(missing_ok=True)
 
 
 @router.post("/folder")
@@ -78,20 +102,39 @@ async def parse_folder(request: FolderParseRequest, background_tasks: Background
         raise HTTPException(status_code=409, detail="Parsing already in progress")
     
     # Start background parsing
-    background_tasks.add_task(process_folder_background, folder_path)
+    job_id = uuid.uuid4().hex
+    parsing_state["job_id"] = job_id
+    background_tasks.add_task(
+        process_folder_background,
+        folder_path,
+        request.workers,
+        request.use_cache,
+        request.engine,
+        request.stats or stats_enabled(),
+    )
     
-    return {"status": "started", "message": "Parsing started in background"}
+    return {"status": "started", "message": "Parsing started in background", "job_id": job_id}
 
 
-def process_folder_background(folder_path: Path):
+def process_folder_background(
+    folder_path: Path,
+    workers: Optional[int] = 1,
+    use_cache: bool = True,
+    engine: str = "docx",
+    collect_stats: bool = False,
+):
     """Background task to process folder."""
     global parsing_state
     
     parsing_state["in_progress"] = True
     parsing_state["progress"] = 0
-    parsing_state["records"] = []
+    parsing_state["records"] = RecordStore()
+    parsing_state["cached_files"] = 0
+    parsing_state["stats"] = None
     
-    parser = DailyReportParser(folder_path)
+    cache = ParseCache(get_cache_dir() / DEFAULT_CACHE_FILENAME, PARSER_VERSION) if use_cache else None
+    stats = ParseStats() if collect_stats else None
+    parser = DailyReportParser(folder_path, workers=workers, cache=cache, engine=engine, stats=stats)
     files = parser.get_report_files()
     
     parsing_state["total_files"] = len(files)
@@ -99,12 +142,16 @@ def process_folder_background(folder_path: Path):
     def progress_callback(filename: str, progress: float):
         parsing_state["current_file"] = filename
         parsing_state["progress"] = progress
+        if stats is not None:
+            parsing_state["stats"] = stats.to_dict()
     
     try:
-        records = parser.process_all(progress_callback)
+        records = parser.process_into(RecordStore(), progress_callback)
         parsing_state["records"] = records
         parsing_state["max_week"] = parser.get_max_week()
         parsing_state["progress"] = 1.0
+        if cache is not None:
+            parsing_state["cached_files"] = cache.hits
     except Exception as e:
         logger.error("Background folder parsing failed: %s", e)
         parsing_state["error"] = str(e)
@@ -112,16 +159,84 @@ def process_folder_background(folder_path: Path):
         parsing_state["in_progress"] = False
 
 
+@router.post("/scan")
+async def scan_folder(request: FolderScanRequest, background_tasks: BackgroundTasks):
+    """
+    Scan all daily reports once for delivery records, manpower shifts
+    and the keyword search text index.
+    Runs in background like /folder; poll /progress for status.
+    """
+    folder_path = Path(request.folder_path)
+
+    if not folder_path.exists():
+        raise HTTPException(status_code=400, detail="Folder does not exist")
+
+    if not folder_path.is_dir():
+        raise HTTPException(status_code=400, detail="Path is not a directory")
+
+    if parsing_state["in_progress"]:
+        raise HTTPException(status_code=409, detail="Parsing already in progress")
+
+    job_id = uuid.uuid4().hex
+    parsing_state["job_id"] = job_id
+    background_tasks.add_task(scan_folder_background, folder_path, request.workers, request.engine)
+
+    return {"status": "started", "message": "Scan started in background", "job_id": job_id}
+
+
+def scan_folder_background(
+    folder_path: Path,
+    workers: Optional[int] = 1,
+    engine: str = "docx",
+):
+    """Background task for the combined single-pass scan."""
+    parsing_state["in_progress"] = True
+    parsing_state["progress"] = 0
+    parsing_state["records"] = RecordStore()
+    parsing_state["cached_files"] = 0
+    parsing_state["stats"] = None
+    parsing_state["error"] = None
+
+    scanner = ReportScanner(folder_path, workers=workers, engine=engine)
+    files = scanner.get_report_files()
+
+    parsing_state["total_files"] = len(files)
+
+    def progress_callback(filename: str, progress: float):
+        parsing_state["current_file"] = filename
+        parsing_state["progress"] = progress
+
+    try:
+        result = scanner.scan_all(progress_callback)
+        parsing_state["records"] = RecordStore.from_records(result["records"])
+        parsing_state["max_week"] = result["max_week"]
+        manpower_state["records"] = result["shifts"]
+        manpower_state["total_files"] = len(files)
+        index = get_keyword_index()
+        for name, entries in result["texts"].items():
+            index.put(folder_path / name, entries, result["signatures"].get(name))
+        index.save()
+        parsing_state["progress"] = 1.0
+    except Exception as e:
+        logger.error("Background folder scan failed: %s", e)
+        parsing_state["error"] = str(e)
+    finally:
+        parsing_state["in_progress"] = False
+
+
 @router.get("/progress")
 async def get_parse_progress():
     """Get current parsing progress."""
     return {
         "in_progress": parsing_state["in_progress"],
+        "job_id": parsing_state.get("job_id"),
         "progress": parsing_state["progress"],
         "current_file": parsing_state["current_file"],
         "total_files": parsing_state["total_files"],
         "records_count": len(parsing_state["records"]),
         "max_week": parsing_state["max_week"],
+        "cached_files": parsing_state.get("cached_files", 0),
+        "stats": parsing_state.get("stats"),
         "error": parsing_state.get("error")
     }
 
@@ -134,9 +249,10 @@ async def get_parse_results():
     
     return {
         "success": True,
+        "job_id": parsing_state.get("job_id"),
         "total_records": len(parsing_state["records"]),
         "max_week": parsing_state["max_week"],
-        "records": parsing_state["records"]
+        "records": parsing_state["records"].to_records()
     }
 
 
@@ -149,7 +265,7 @@ async def list_report_files(folder_path: str):
         raise HTTPException(status_code=400, detail="Invalid folder path")
     
     parser = DailyReportParser(path)
-    files = parser.get_report_files()
+    files = await run_blocking(SCAN, parser.get_report_files)
     
     return {
         "folder": str(path),
@@ -23,7 +23,10 @@ from analysis.performance import (
 router = APIRouter()
 
 # Import shared analyzer from services
-from backend.services import perf_analyzer
+from backend.charts import chart_key
+from backend.executor import ANALYSIS, run_blocking
+from backend.services import chart_renderer, perf_analyzer
+from backend.serialization import native_response
 
 
 class AnalyzeRequest(BaseModel):
@@ -49,7 +52,7 @@ async def set_data_from_dashboard():
     if dashboard_analyzer.df is None:
         raise HTTPException(status_code=404, detail="No dashboard data available")
     
-    perf_analyzer.set_data(dashboard_analyzer.df)
+    await run_blocking(ANALYSIS, perf_analyzer.set_data, dashboard_analyzer.df)
     
     return {"success": True, "message": "Data loaded from dashboard"}
 
@@ -57,7 +60,7 @@ async def set_data_from_dashboard():
 @router.get("/projects")
 async def get_available_projects():
     """Get list of projects with data."""
-    projects = perf_analyzer.get_available_projects()
+    projects = await run_blocking(ANALYSIS, perf_analyzer.get_available_projects)
     
     if not projects:
         raise HTTPException(status_code=404, detail="No projects available")
@@ -71,33 +74,36 @@ async def analyze_project(request: AnalyzeRequest):
     if perf_analyzer.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
     
-    result = perf_analyzer.analyze(
-        request.project_code,
-        request.target_productivity,
-        request.target_qty,
-        request.start_year,
-        request.end_year
-    )
-    
-    if not result:
-        raise HTTPException(status_code=404, detail=f"No data found for project {request.project_code}")
-    
-    # Convert weekly_data DataFrame to list
-    if 'weekly_data' in result:
-        result['weekly_data'] = result['weekly_data'].to_dict(orient='records')
+    def analyze():
+        result = perf_analyzer.analyze(
+            request.project_code,
+            request.target_productivity,
+            request.target_qty,
+            request.start_year,
+            request.end_year
+        )
+        
+        if not result:
+            raise HTTPException(status_code=404, detail=f"No data found for project {request.project_code}")
+        
+        # weekly_data DataFrame is converted column-wise by native_response
+        return native_response({"success": True, "metrics": result})
     
-    return {"success": True, "metrics": result}
+    return await run_blocking(ANALYSIS, analyze)
 
 
 @router.get("/breakdown")
 async def get_weekly_breakdown():
     """Get weekly breakdown for current project."""
-    breakdown = perf_analyzer.get_weekly_breakdown()
-    
-    if not breakdown:
-        raise HTTPException(status_code=404, detail="No breakdown available")
+    def build():
+        breakdown = perf_analyzer.get_weekly_breakdown()
+        
+        if not breakdown:
+            raise HTTPException(status_code=404, detail="No breakdown available")
+        
+        return native_response({"breakdown": breakdown})
     
-    return {"breakdown": breakdown}
+    return await run_blocking(ANALYSIS, build)
 
 
 @router.post("/recovery")
@@ -119,13 +125,20 @@ async def get_weekly_chart(project_code: str, target_productivity: float = 3.0):
     if perf_analyzer.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
     
-    metrics = calculate_performance_metrics(perf_analyzer.df, project_code, target_productivity)
-    
-    if not metrics or 'weekly_data' not in metrics:
-        raise HTTPException(status_code=404, detail="No data for project")
-    
-    img_base64 = plot_performance_chart(
-        metrics['weekly_data'],
+    def prepare():
+        metrics = calculate_performance_metrics(perf_analyzer.df, project_code, target_productivity)
+        
+        if not metrics or 'weekly_data' not in metrics:
+            raise HTTPException(status_code=404, detail="No data for project")
+        
+        weekly_data = metrics['weekly_data']
+        return weekly_data, chart_key("performance-weekly", weekly_data, target_productivity, project_code)
+    
+    weekly_data, key = await run_blocking(ANALYSIS, prepare)
+    img_base64 = await chart_renderer.render(
+        key,
+        plot_performance_chart,
+        weekly_data,
         target_productivity,
         project_code
     )
@@ -144,8 +157,21 @@ async def get_cumulative_chart(
     if perf_analyzer.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
     
-    img_base64 = plot_cumulative_progress(
-        perf_analyzer.df,
+    def prepare():
+        # Only this project's rows are sent to the render process
+        df = perf_analyzer.df
+        proj_df = df.loc[
+            df['Project'].str.upper() == project_code.upper(),
+            ['Project', 'Year', 'Qty Delivered']
+        ]
+        key = chart_key("performance-cumulative", proj_df, project_code, target_qty, start_year, end_year)
+        return proj_df, key
+    
+    proj_df, key = await run_blocking(ANALYSIS, prepare)
+    img_base64 = await chart_renderer.render(
+        key,
+        plot_cumulative_progress,
+        proj_df,
         project_code,
         target_qty,
         start_year,
@@ -166,12 +192,23 @@ async def get_cumulative_data(
     end_year: int = None
 ):
     """Get cumulative progress data for charting."""
-    import numpy as np
-    from datetime import datetime
-    
     if perf_analyzer.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
     
+    return await run_blocking(
+        ANALYSIS, _cumulative_data, project_code, target_qty, start_year, end_year
+    )
+
+
+def _cumulative_data(
+    project_code: str,
+    target_qty: Optional[float],
+    start_year: Optional[int],
+    end_year: Optional[int]
+):
+    """Cumulative actual / plan / recovery / projected series of one project."""
+    from datetime import datetime
+    
     # Filter for this project
     proj_df = perf_analyzer.df[perf_analyzer.df['Project'].str.upper() == project_code.upper()].copy()
     
@@ -267,7 +304,7 @@ async def get_cumulative_data(
         
         chart_data.append(point)
     
-    return {
+    return native_response({
         "chart_data": chart_data,
         "metrics": {
             "current_pace": round(current_pace, 1),
@@ -283,4 +320,4 @@ async def get_cumulative_data(
             "current": current_year,
             "last_actual": last_actual_year
         }
-    }
+    })
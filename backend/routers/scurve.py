@@ -6,7 +6,6 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional
 import logging
-import tempfile
 from pathlib import Path
 import sys
 
@@ -23,7 +22,10 @@ from analysis.scurve import (
 router = APIRouter()
 
 # Import shared generator from services
-from backend.services import scurve_gen
+from backend.charts import chart_key
+from backend.executor import ANALYSIS, run_blocking
+from backend.jobs import JOB_DONE, XLSX_MEDIA_TYPE
+from backend.services import chart_renderer, export_jobs, scurve_gen
 
 
 class SCurveRequest(BaseModel):
@@ -43,7 +45,7 @@ async def set_data_from_dashboard():
     if dashboard_analyzer.df is None:
         raise HTTPException(status_code=404, detail="No dashboard data available")
     
-    scurve_gen.set_data(dashboard_analyzer.df)
+    await run_blocking(ANALYSIS, scurve_gen.set_data, dashboard_analyzer.df)
     
     return {"success": True, "message": "Data loaded from dashboard"}
 
@@ -54,7 +56,9 @@ async def calculate_scurve(request: SCurveRequest):
     if scurve_gen.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
     
-    week_labels, cum_target, cum_actual, progress = calculate_scurve_data(
+    week_labels, cum_target, cum_actual, progress = await run_blocking(
+        ANALYSIS,
+        calculate_scurve_data,
         scurve_gen.df,
         request.project_code,
         request.target_qty,
@@ -89,7 +93,9 @@ async def get_scurve_chart(request: SCurveRequest):
     if scurve_gen.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
     
-    week_labels, cum_target, cum_actual, progress = calculate_scurve_data(
+    week_labels, cum_target, cum_actual, progress = await run_blocking(
+        ANALYSIS,
+        calculate_scurve_data,
         scurve_gen.df,
         request.project_code,
         request.target_qty,
@@ -105,7 +111,10 @@ async def get_scurve_chart(request: SCurveRequest):
             detail=f"No data found for project {request.project_code}"
         )
     
-    img_base64 = plot_scurve(
+    key = chart_key("scurve", week_labels, cum_target, cum_actual, request.project_code, request.target_qty)
+    img_base64 = await chart_renderer.render(
+        key,
+        plot_scurve,
         week_labels,
         cum_target,
         cum_actual,
@@ -120,32 +129,44 @@ async def get_scurve_chart(request: SCurveRequest):
     }
 
 
-@router.post("/excel")
-async def generate_scurve_excel_file(request: SCurveRequest):
-    """Generate S-Curve Excel report and return download URL."""
+def _scurve_export(request: SCurveRequest):
+    """Snapshot the S-Curve data and return a job builder for the report."""
     if scurve_gen.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
     
-    # Create temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-        output_path = Path(tmp.name)
+    df = scurve_gen.df
     
-    success, progress = generate_scurve_excel(
-        scurve_gen.df,
-        request.project_code,
-        request.target_qty,
-        request.start_year,
-        request.start_week,
-        request.end_year,
-        request.end_week,
-        output_path
-    )
+    def build(output_path: Path, progress) -> bool:
+        success, _ = generate_scurve_excel(
+            df,
+            request.project_code,
+            request.target_qty,
+            request.start_year,
+            request.start_week,
+            request.end_year,
+            request.end_week,
+            output_path
+        )
+        return success
     
-    if not success:
+    return build
+
+
+@router.post("/excel")
+async def generate_scurve_excel_file(request: SCurveRequest):
+    """Generate S-Curve Excel report and return it as a download."""
+    build = _scurve_export(request)
+    job = await export_jobs.run("scurve", f"SCurve_{request.project_code}.xlsx", build)
+    
+    if job.status != JOB_DONE:
         raise HTTPException(status_code=500, detail="Failed to generate Excel file")
     
-    return FileResponse(
-        path=output_path,
-        filename=f"SCurve_{request.project_code}.xlsx",
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    return FileResponse(path=job.path, filename=job.filename, media_type=XLSX_MEDIA_TYPE)
+
+
+@router.post("/excel/job")
+async def start_scurve_excel_job(request: SCurveRequest):
+    """Start an S-Curve Excel export in the background; poll /api/export/jobs/{job_id}."""
+    build = _scurve_export(request)
+    job = export_jobs.submit("scurve", f"SCurve_{request.project_code}.xlsx", build)
+    return job.to_dict()
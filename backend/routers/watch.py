@@ -0,0 +1,167 @@
+# MTR DUAT - Folder Watch Router
+"""Folder watch mode: keep parsed records in sync with the report folder."""
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from datetime import datetime
+import functools
+from pathlib import Path
+import sys
+import logging
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from backend.executor import ANALYSIS, SCAN, get_executor, run_blocking
+from config import get_cache_dir
+from parsers.docx_parser import PARSER_VERSION, extract_week_year_from_filename
+from parsers.folder_watcher import DEFAULT_POLL_INTERVAL, FolderWatcher, WatchDelta
+from parsers.parse_cache import DEFAULT_CACHE_FILENAME, ParseCache
+from parsers.record_store import RecordStore
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Import shared state from services
+from backend.services import dashboard_analyzer, parsing_state, watch_state
+
+
+class WatchStartRequest(BaseModel):
+    folder_path: str
+    interval: float = Field(DEFAULT_POLL_INTERVAL, ge=0.5, le=3600)
+    engine: Literal["docx", "stream"] = "docx"
+    use_cache: bool = True
+
+
+def apply_watch_delta(delta: WatchDelta, watcher: Optional[FolderWatcher] = None) -> bool:
+    """
+    Merge a watcher delta into parsing_state and the dashboard analyzer.
+
+    A delta from *watcher* is dropped (returns False) once that watcher is
+    no longer the active one, e.g. after a restart on another folder.
+    """
+    if watcher is not None and watch_state.get("watcher") is not watcher:
+        logger.info("Dropping folder watch changes from a stopped watcher")
+        return False
+
+    file_records = dict(parsing_state.get("file_records") or {})
+    for name in delta.removed:
+        file_records.pop(name, None)
+    file_records.update(delta.updated)
+
+    ordered = sorted(file_records)
+    max_week = max((extract_week_year_from_filename(name)[0] for name in ordered), default=0)
+
+    parsing_state["file_records"] = {name: file_records[name] for name in ordered}
+    parsing_state["records"] = RecordStore.from_records(r for name in ordered for r in file_records[name])
+    parsing_state["total_files"] = len(ordered)
+    parsing_state["max_week"] = max_week
+
+    # Reuse untouched rows when the analyzer already tracks sources
+    if dashboard_analyzer.source_spans and dashboard_analyzer.df is not None:
+        dashboard_analyzer.apply_source_delta(delta.updated, delta.removed, max_week or None)
+    else:
+        dashboard_analyzer.load_from_sources(parsing_state["file_records"], max_week or None)
+
+    watch_state["last_change"] = datetime.now().isoformat(timespec="seconds")
+    watch_state["files_updated"] += len(delta.updated)
+    watch_state["files_removed"] += len(delta.removed)
+    logger.info(
+        "Folder watch applied %d updated and %d removed file(s)",
+        len(delta.updated), len(delta.removed),
+    )
+    return True
+
+
+def _on_delta(watcher: FolderWatcher, delta: WatchDelta) -> None:
+    # Runs on the watcher thread; the analyzer is only touched on ANALYSIS
+    if watch_state.get("watcher") is not watcher:
+        return
+    try:
+        get_executor(ANALYSIS).submit(apply_watch_delta, delta, watcher).result()
+        watch_state["error"] = None
+    except Exception as e:
+        logger.error("Failed to apply folder watch changes: %s", e)
+        watch_state["error"] = str(e)
+
+
+def stop_watcher() -> bool:
+    """
+    Stop the active watcher, if any.  Returns True if one was running.
+
+    Blocks until the poll thread exits (up to 5 s); routes run it off the
+    event loop.  The watcher is detached first, so a poll still finishing
+    has its delta dropped.
+    """
+    watcher = watch_state.get("watcher")
+    if watcher is None:
+        return False
+    watch_state["watcher"] = None
+    watcher.stop(timeout=5)
+    return True
+
+
+@router.post("/start")
+async def start_watch(request: WatchStartRequest):
+    """
+    Start watching a folder.
+    The first poll parses every report (served from the parse cache where
+    possible); later polls only parse new or modified files.
+    """
+    folder_path = Path(request.folder_path)
+
+    if not folder_path.exists():
+        raise HTTPException(status_code=400, detail="Folder does not exist")
+
+    if not folder_path.is_dir():
+        raise HTTPException(status_code=400, detail="Path is not a directory")
+
+    await run_blocking(SCAN, stop_watcher)
+
+    cache = ParseCache(get_cache_dir() / DEFAULT_CACHE_FILENAME, PARSER_VERSION) if request.use_cache else None
+    watcher = FolderWatcher(folder_path, engine=request.engine, cache=cache)
+
+    parsing_state["file_records"] = {}
+    # Records now follow the folder, not a parse job
+    parsing_state["job_id"] = None
+    watch_state.update({
+        "watcher": watcher,
+        "folder": str(folder_path),
+        "interval": request.interval,
+        "last_change": None,
+        "files_updated": 0,
+        "files_removed": 0,
+        "error": None,
+    })
+    watcher.start(
+        request.interval,
+        functools.partial(_on_delta, watcher),
+        should_skip=lambda: parsing_state["in_progress"],
+    )
+
+    return {"status": "watching", "folder": str(folder_path), "interval": request.interval}
+
+
+@router.post("/stop")
+async def stop_watch():
+    """Stop watching the folder."""
+    was_running = await run_blocking(SCAN, stop_watcher)
+    return {"status": "stopped", "was_running": was_running}
+
+
+@router.get("/status")
+async def get_watch_status():
+    """Get folder watch status."""
+    watcher = watch_state.get("watcher")
+    return {
+        "active": watcher is not None and watcher.running,
+        "folder": watch_state["folder"],
+        "interval": watch_state["interval"],
+        "polls": watcher.polls if watcher is not None else 0,
+        "tracked_files": len(parsing_state.get("file_records") or {}),
+        "last_poll": watcher.last_poll.isoformat(timespec="seconds") if watcher and watcher.last_poll else None,
+        "last_change": watch_state["last_change"],
+        "files_updated": watch_state["files_updated"],
+        "files_removed": watch_state["files_removed"],
+        "error": watch_state["error"],
+    }
@@ -0,0 +1,134 @@
+# MTR DUAT - Response Serialization
+"""
+Fast JSON responses for DataFrame-heavy endpoints.
+
+``to_native`` converts numpy/pandas values to plain Python like the old
+per-value ``convert_to_native`` walk, but DataFrames and Series are
+converted one column at a time: numeric columns go through
+``ndarray.tolist()`` and only missing values are patched to ``None``.
+
+``native_response`` wraps the converted payload in :class:`FastJSONResponse`.
+Returning a Response instance also skips FastAPI's own recursive
+``jsonable_encoder`` pass.  The response is rendered with orjson when it is
+installed, otherwise with the standard library like Starlette's
+JSONResponse.
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def column_values(series: pd.Series) -> List[Any]:
+    """Convert a Series to a list of JSON-native values (NaN/NaT -> None)."""
+    mask = series.isna().to_numpy()
+    dtype = series.dtype
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        values = _datetime_strings(series, mask)
+        if values is None:
+            return [None if missing else ts.isoformat() for ts, missing in zip(series.array, mask)]
+    elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+        if isinstance(dtype, np.dtype):
+            values = series.to_numpy().tolist()
+        else:
+            # Nullable extension dtypes: fill before converting
+            values = series.to_numpy(dtype=object, na_value=None).tolist()
+            return [to_native(v) for v in values]
+    elif pd.api.types.is_string_dtype(dtype) and not pd.api.types.is_object_dtype(dtype):
+        values = series.to_numpy(dtype=object).tolist()
+    else:
+        # Mixed object columns can hold numpy scalars, timestamps, ...
+        return [None if missing else to_native(v) for v, missing in zip(series.tolist(), mask)]
+
+    if mask.any():
+        for idx in np.flatnonzero(mask):
+            values[idx] = None
+    return values
+
+
+def _datetime_strings(series: pd.Series, mask: np.ndarray):
+    """ISO strings for a tz-naive datetime column of whole seconds, else None.
+
+    Matches ``Timestamp.isoformat()``, which omits the fraction when it is
+    zero; columns with sub-second or tz-aware values take the slow path.
+    """
+    if not isinstance(series.dtype, np.dtype):
+        return None
+    values = series.to_numpy()
+    seconds = values.astype("datetime64[s]")
+    if not (seconds.astype(values.dtype) == values)[~mask].all():
+        return None
+    return np.datetime_as_string(seconds, unit="s").tolist()
+
+
+def frame_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Column-wise equivalent of ``to_native(df.to_dict(orient="records"))``."""
+    columns = [to_native(c) for c in df.columns]
+    data = [column_values(df.iloc[:, i]) for i in range(df.shape[1])]
+    return [dict(zip(columns, row)) for row in zip(*data)]
+
+
+def to_native(obj: Any) -> Any:
+    """Convert numpy/pandas types to native Python types for JSON serialization."""
+    if isinstance(obj, dict):
+        return {to_native(k): to_native(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_native(item) for item in obj]
+    if isinstance(obj, pd.DataFrame):
+        return frame_records(obj)
+    if isinstance(obj, pd.Series):
+        return column_values(obj)
+    if isinstance(obj, np.ndarray):
+        return column_values(pd.Series(obj.ravel())) if obj.ndim == 1 else to_native(obj.tolist())
+    if isinstance(obj, np.generic):
+        # Before the builtin checks: np.float64 subclasses float
+        if isinstance(obj, np.bool_):
+            return bool(obj)
+        if isinstance(obj, np.integer):
+            return int(obj)
+        if isinstance(obj, np.floating):
+            return None if np.isnan(obj) else float(obj)
+    if isinstance(obj, (str, bool, int)) or obj is None:
+        return obj
+    if isinstance(obj, float):
+        return None if obj != obj else obj
+    if isinstance(obj, (pd.Timestamp, datetime, date)):
+        return None if pd.isna(obj) else obj.isoformat()
+    if pd.api.types.is_scalar(obj) and pd.isna(obj):
+        return None
+    return obj
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson when available."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def native_response(payload: Any, status_code: int = 200) -> FastJSONResponse:
+    """Convert *payload* with ``to_native`` and wrap it in a FastJSONResponse."""
+    return FastJSONResponse(to_native(payload), status_code=status_code)
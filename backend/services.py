@@ -8,12 +8,19 @@ TD-1 / TD-8: Replaces per-router global singletons with a single registry.
 """
 
 import logging
+import threading
 from typing import Any, Dict, List
 
 from analysis.dashboard import DashboardAnalyzer
 from analysis.lag_analysis import LagAnalyzer
 from analysis.performance import PerformanceAnalyzer
 from analysis.scurve import SCurveGenerator
+from config import get_cache_dir
+from parsers.keyword_index import DEFAULT_INDEX_FILENAME, KeywordIndex
+from parsers.record_store import RecordStore
+from backend.charts import ChartRenderer
+from backend.jobs import ExportJobManager
+from backend.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +32,15 @@ lag_analyzer = LagAnalyzer()
 perf_analyzer = PerformanceAnalyzer()
 scurve_gen = SCurveGenerator()
 
+# Rendered dashboard GET responses, keyed by dashboard_analyzer.data_version
+dashboard_response_cache = ResponseCache()
+
+# Background Excel exports and their downloadable files
+export_jobs = ExportJobManager()
+
+# Rendered matplotlib charts (base64 PNG), keyed by a hash of their inputs
+chart_renderer = ChartRenderer()
+
 # ---------------------------------------------------------------------------
 # Shared mutable state for stateless routers
 # Shapes match what each router actually reads/writes.
@@ -35,8 +51,16 @@ parsing_state: Dict[str, Any] = {
     "progress": 0,
     "current_file": "",
     "total_files": 0,
-    "records": [],
+    # Columnar RecordStore of delivery records from the last parse
+    "records": RecordStore(),
     "max_week": 0,
+    "cached_files": 0,
+    # ParseStats.to_dict() of the last /folder parse run with stage timings
+    "stats": None,
+    # ID of the last /folder or /scan run, for /api/dashboard/analyze-parsed
+    "job_id": None,
+    # filename -> records, maintained by folder watch mode
+    "file_records": {},
 }
 
 manpower_state: Dict[str, Any] = {
@@ -49,4 +73,29 @@ search_state: Dict[str, Any] = {
     "keyword": "",
     "total_files": 0,
     "matched_files": 0,
+    # Persistent KeywordIndex, created on first use by get_keyword_index()
+    "index": None,
 }
+
+watch_state: Dict[str, Any] = {
+    "watcher": None,
+    "folder": "",
+    "interval": 0.0,
+    "last_change": None,
+    "files_updated": 0,
+    "files_removed": 0,
+    "error": None,
+}
+
+_keyword_index_lock = threading.Lock()
+
+
+def get_keyword_index() -> KeywordIndex:
+    """Return the shared keyword index, loading it from the cache dir on first use."""
+    index_file = get_cache_dir() / DEFAULT_INDEX_FILENAME
+    with _keyword_index_lock:
+        index = search_state.get("index")
+        if index is None or index.index_file != index_file:
+            index = KeywordIndex(index_file)
+            search_state["index"] = index
+        return index
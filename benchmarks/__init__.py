@@ -0,0 +1,7 @@
+# MTR DUAT - Benchmarks Package
+"""
+Performance benchmarks for the parser hot paths.
+
+Not part of the shipped backend; run from the repository root, e.g.
+``python -m benchmarks.bench_parsers --files 500``.
+"""
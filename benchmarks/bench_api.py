@@ -0,0 +1,380 @@
+# MTR DUAT - API Latency Benchmark
+"""
+Replay the SPA's request mix against the sidecar and time every call.
+
+``backend.main:app`` is booted in-process and called through an ASGI
+transport (no socket, no uvicorn), so the numbers are the app's own
+latency including the executor queues.  Each round:
+
+1. ``parse``        -- ``POST /api/parse/scan`` on generated daily reports
+2. ``analyze``      -- ``POST /api/dashboard/analyze`` with ``--records``
+                       synthetic delivery records (100k by default)
+3. ``dashboard``    -- the ten GETs DashboardPage fires with Promise.all
+4. ``performance``  -- set-data, then analyze + breakdown + cumulative-data
+5. ``scurve``       -- set-data, then calculate
+6. ``lag``          -- load-master, then calculate
+7. ``manpower``     -- analysis of the scanned shifts
+
+Every burst is sent by ``--clients`` clients at once (several windows, a
+double-clicked refresh); the loading steps that replace shared state run
+once.  Per endpoint the p50 / p95 / p99 latency and the throughput while
+its bursts ran are written as JSON; with ``--baseline`` the exit code is 1
+when any endpoint's p95 got slower than the tolerance allows.
+
+Usage:
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --records 250000 --clients 4 --rounds 10
+    python -m benchmarks.bench_api --baseline bench_api.json --tolerance 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.report_generator import JOB_TYPES, LINES, generate_reports
+
+logger = logging.getLogger("bench_api")
+
+DEFAULT_RECORDS = 100_000
+DEFAULT_REPORTS = 20
+DEFAULT_PROJECTS = 40
+DEFAULT_TOLERANCE = 0.2
+FIRST_DAY = date(2023, 1, 2)
+DAYS = 2 * 364
+
+# One planned request: (name, method, path, request kwargs)
+Call = Tuple[str, str, str, Dict[str, Any]]
+
+# The GETs DashboardPage.fetchAll sends together
+DASHBOARD_BURST: List[Call] = [
+    (path.split("?")[0][len("/api/"):], "GET", path, {})
+    for path in (
+        "/api/dashboard/stats",
+        "/api/dashboard/trends/weekly",
+        "/api/dashboard/trends/monthly",
+        "/api/dashboard/distribution/projects",
+        "/api/dashboard/distribution/keywords",
+        "/api/dashboard/distribution/lines",
+        "/api/dashboard/trends/nth-by-project",
+        "/api/dashboard/summary",
+        "/api/dashboard/raw-data?limit=50&offset=0",
+        "/api/dashboard/pivot",
+    )
+]
+
+
+def project_codes(count: int = DEFAULT_PROJECTS) -> List[str]:
+    return [f"C{2200 + i}" for i in range(count)]
+
+
+def synthetic_records(count: int, projects: int = DEFAULT_PROJECTS, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    *count* delivery records shaped like the parser's output, spread over
+    two years of days, project codes, keyword jobs and rail lines.
+    """
+    rng = random.Random(seed)
+    codes = project_codes(projects)
+    names = codes + list(JOB_TYPES)
+    records = []
+    for _ in range(count):
+        day = FIRST_DAY + timedelta(days=rng.randrange(DAYS))
+        year, week, _ = day.isocalendar()
+        records.append({
+            "FullDate": f"{day.strftime('%a')} {day.day:02d}/{day.month:02d}",
+            "Project": rng.choice(names),
+            "Qty Delivered": float(rng.randint(0, 12)),
+            "Week": f"WK{week:02d}",
+            "Year": str(year),
+            "Line": rng.choice(LINES),
+        })
+    return records
+
+
+def write_project_master(path: Path, codes: Sequence[str]) -> Path:
+    """Project master workbook for the lag analysis, one row per code."""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["ID", "Category", "Project No", "One Line Title", "Start Date", "Finish Date", "Target Qty"])
+    for i, code in enumerate(codes, 1):
+        ws.append([i, "OHL", code, f"Benchmark project {code}", "02/01/2023", "29/12/2025", 2000 + 50 * i])
+    wb.save(path)
+    return path
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+class Recorder:
+    """Collects request latencies and the wall time of the bursts they ran in."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.busy: Dict[str, float] = defaultdict(float)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.enabled = True
+
+    async def call(self, client, name: str, method: str, path: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, path, **kwargs)
+        elapsed = time.perf_counter() - started
+        if self.enabled:
+            self.latencies[name].append(elapsed)
+            if response.status_code >= 400:
+                self.errors[name] += 1
+        if response.status_code >= 400:
+            logger.warning("%s %s -> %d %s", method, path, response.status_code, response.text[:200])
+        return response
+
+    async def burst(self, client, calls: Sequence[Call], clients: int = 1) -> list:
+        """Send *calls* together from *clients* clients; return the first client's responses."""
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            self.call(client, name, method, path, **kwargs)
+            for _ in range(clients)
+            for name, method, path, kwargs in calls
+        ))
+        if self.enabled:
+            elapsed = time.perf_counter() - started
+            for name in {name for name, *_ in calls}:
+                self.busy[name] += elapsed
+        return responses[:len(calls)]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        results = []
+        for name, values in self.latencies.items():
+            ms = [v * 1000 for v in values]
+            busy = self.busy[name]
+            results.append({
+                "name": name,
+                "requests": len(values),
+                "errors": self.errors[name],
+                "p50_ms": round(percentile(ms, 50), 1),
+                "p95_ms": round(percentile(ms, 95), 1),
+                "p99_ms": round(percentile(ms, 99), 1),
+                "max_ms": round(max(ms), 1),
+                "requests_per_sec": round(len(values) / busy, 1) if busy else None,
+            })
+        return results
+
+
+def _dataset_calls(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Request bodies derived from the synthetic dataset."""
+    codes = set(project_codes())
+    totals: Dict[str, float] = defaultdict(float)
+    for record in records:
+        if record["Project"] in codes:
+            totals[record["Project"]] += record["Qty Delivered"]
+    project = max(totals, key=totals.get)
+    return {
+        "project": project,
+        "actual_qty_map": dict(totals),
+        "scurve": {
+            "project_code": project,
+            "target_qty": totals[project] * 1.2,
+            "start_year": FIRST_DAY.year,
+            "start_week": 1,
+            "end_year": FIRST_DAY.year + 1,
+            "end_week": 52,
+        },
+    }
+
+
+async def _parse(recorder: Recorder, client, folder: Path) -> None:
+    # The scan runs as a background task; the ASGI call returns once it is done
+    await recorder.burst(client, [
+        ("parse/scan", "POST", "/api/parse/scan", {"json": {"folder_path": str(folder), "engine": "stream"}}),
+    ])
+    progress = (await client.get("/api/parse/progress")).json()
+    if progress["in_progress"] or progress["error"]:
+        raise RuntimeError(f"Report scan did not finish cleanly: {progress}")
+
+
+async def run_round(
+    recorder: Recorder,
+    client,
+    records: List[Dict[str, Any]],
+    dataset: Dict[str, Any],
+    reports: Optional[Path],
+    master: Path,
+    clients: int,
+) -> None:
+    """One pass through the SPA's pages, in the order a user visits them."""
+    if reports is not None:
+        await _parse(recorder, client, reports)
+    await recorder.burst(client, [
+        ("dashboard/analyze", "POST", "/api/dashboard/analyze", {"json": {"records": records}}),
+    ])
+
+    await recorder.burst(client, DASHBOARD_BURST, clients)
+
+    project = dataset["project"]
+    await recorder.burst(client, [("performance/set-data", "POST", "/api/performance/set-data", {})])
+    await recorder.burst(client, [
+        ("performance/analyze", "POST", "/api/performance/analyze", {"json": {"project_code": project}}),
+        ("performance/breakdown", "GET", "/api/performance/breakdown", {}),
+        ("performance/cumulative-data", "GET", f"/api/performance/cumulative-data/{project}", {}),
+    ], clients)
+
+    await recorder.burst(client, [("scurve/set-data", "POST", "/api/scurve/set-data", {})])
+    await recorder.burst(client, [
+        ("scurve/calculate", "POST", "/api/scurve/calculate", {"json": dataset["scurve"]}),
+    ], clients)
+
+    files = {"file": (master.name, master.read_bytes(), "application/octet-stream")}
+    await recorder.burst(client, [("lag/load-master", "POST", "/api/lag/load-master", {"files": files})])
+    await recorder.burst(client, [
+        ("lag/calculate", "POST", "/api/lag/calculate", {"json": {"actual_qty_map": dataset["actual_qty_map"]}}),
+    ], clients)
+
+    if reports is not None:
+        await recorder.burst(client, [("manpower/analysis", "GET", "/api/manpower/analysis", {})], clients)
+
+
+async def run_benchmark(
+    records: int = DEFAULT_RECORDS,
+    reports: int = DEFAULT_REPORTS,
+    rounds: int = 5,
+    warmup: int = 1,
+    clients: int = 1,
+    workdir: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Boot the app in-process and replay *rounds* rounds of the request mix.
+
+    The first *warmup* rounds are not recorded (first-use imports, pool
+    start-up).  Config and caches go to *workdir*, never the user's.
+    """
+    import httpx
+
+    with tempfile.TemporaryDirectory(prefix="duat_bench_api_") as tmp:
+        workdir = Path(workdir or tmp)
+        os.environ["DUAT_CONFIG_PATH"] = str(workdir / "config.json")
+        os.environ["DUAT_CACHE_DIR"] = str(workdir / "cache")
+
+        from backend import executor
+        from backend.main import app
+
+        report_folder = None
+        if reports:
+            report_folder = workdir / "reports"
+            logger.info("Generating %d reports in %s", reports, report_folder)
+            generate_reports(report_folder, reports)
+
+        logger.info("Generating %d delivery records", records)
+        data = synthetic_records(records)
+        dataset = _dataset_calls(data)
+        master = write_project_master(workdir / "project_master.xlsx", project_codes())
+
+        recorder = Recorder()
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://duat", timeout=None) as client:
+                for index in range(warmup + rounds):
+                    recorder.enabled = index >= warmup
+                    started = time.perf_counter()
+                    await run_round(recorder, client, data, dataset, report_folder, master, clients)
+                    logger.info("Round %d/%d%s took %.2f s", index + 1, warmup + rounds,
+                                " (warm-up)" if index < warmup else "", time.perf_counter() - started)
+        finally:
+            executor.shutdown(wait=True)
+
+    results = sorted(recorder.summary(), key=lambda r: r["name"])
+    for r in results:
+        logger.info(
+            "%-36s %5d req %8.1f p50 %8.1f p95 %8.1f p99 ms %8.1f req/s%s",
+            r["name"], r["requests"], r["p50_ms"], r["p95_ms"], r["p99_ms"], r["requests_per_sec"] or 0,
+            f"  ({r['errors']} errors)" if r["errors"] else "",
+        )
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Names of endpoints whose p95 rose more than *tolerance* above *baseline*."""
+    previous = {r["name"]: r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if not before or not before.get("p95_ms") or not result.get("p95_ms"):
+            continue
+        change = result["p95_ms"] / before["p95_ms"] - 1
+        logger.info("%-36s %+6.1f%% p95 vs baseline", result["name"], change * 100)
+        if change > tolerance:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the sidecar API with the SPA's request mix")
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORDS,
+                        help="Synthetic delivery records posted to /analyze (default: 100000)")
+    parser.add_argument("--reports", type=int, default=DEFAULT_REPORTS,
+                        help="Daily reports to scan each round; 0 skips parse and manpower (default: 20)")
+    parser.add_argument("--rounds", type=int, default=5, help="Recorded rounds (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="Unrecorded rounds first (default: 1)")
+    parser.add_argument("--clients", type=int, default=1, help="Clients sending each burst at once (default: 1)")
+    parser.add_argument("--output", type=Path, default=Path("bench_api.json"), help="Results JSON file")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed p95 rise vs baseline (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    started = time.perf_counter()
+    results = asyncio.run(run_benchmark(args.records, args.reports, args.rounds, args.warmup, args.clients))
+    total = sum(r["requests"] for r in results)
+    logger.info("%d requests in %.1f s", total, time.perf_counter() - started)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "records": args.records,
+        "reports": args.reports,
+        "rounds": args.rounds,
+        "clients": args.clients,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info("Results written to %s", args.output)
+
+    failed = [r["name"] for r in results if r["errors"]]
+    if failed:
+        logger.error("Requests failed: %s", ", ".join(failed))
+        return 1
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            logger.error("Slower than baseline: %s", ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+# MTR DUAT - Parser Benchmarks
+"""
+Time the DOCX parsers on synthetic daily reports.
+
+Cases:
+
+* ``process_docx[<engine>]``             -- one call per file
+* ``DailyReportParser[<engine>,w=<n>]``  -- ``process_all()`` over the folder
+* ``ManpowerParser``                     -- ``process_all()`` over the folder
+
+Each case runs in a fresh interpreter so its peak RSS is its own.  Results
+(files/sec, records/sec, peak RSS) are written as JSON; with ``--baseline``
+the run is compared against an earlier results file and the exit code is 1
+when any case got slower than the tolerance allows.
+
+Usage:
+    python -m benchmarks.bench_parsers --files 50
+    python -m benchmarks.bench_parsers --files 5000 --workers 1 4 --output results.json
+    python -m benchmarks.bench_parsers --files 500 --baseline results.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.report_generator import generate_reports
+from parsers.docx_parser import ENGINES, DailyReportParser, process_docx
+from parsers.manpower_parser import ManpowerParser
+
+logger = logging.getLogger("bench_parsers")
+
+CASE_PROCESS_DOCX = "process_docx"
+CASE_DAILY_REPORT = "DailyReportParser"
+CASE_MANPOWER = "ManpowerParser"
+
+DEFAULT_FILES = 50
+DEFAULT_TOLERANCE = 0.2
+
+# Written next to generated reports; only folders holding it are regenerated
+GENERATED_MARKER = ".duat_bench_reports"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size in MiB, where the OS reports it.
+
+    On POSIX this is the larger of this process and its largest finished
+    child (the DailyReportParser pool workers).
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize / (1024 * 1024)
+    return None
+
+
+def _count_records(case: str, records: List[Dict]) -> int:
+    if case == CASE_MANPOWER:
+        # Shift records hold the jobs; count jobs like delivery rows
+        return sum(len(r.get("jobs", [])) for r in records)
+    return len(records)
+
+
+def run_case(case: str, folder: Path, engine: str = "docx", workers: int = 1) -> Dict[str, Any]:
+    """Run one benchmark case in this process and return its measurements."""
+    files = DailyReportParser(folder).get_report_files()
+    started = time.perf_counter()
+    if case == CASE_PROCESS_DOCX:
+        records = []
+        for path in files:
+            records.extend(process_docx(path, engine))
+    elif case == CASE_DAILY_REPORT:
+        records = DailyReportParser(folder, workers=workers, engine=engine).process_all()
+    elif case == CASE_MANPOWER:
+        records = ManpowerParser(folder).process_all()
+    else:
+        raise ValueError(f"Unknown benchmark case: {case}")
+    seconds = time.perf_counter() - started
+
+    count = _count_records(case, records)
+    return {
+        "files": len(files),
+        "records": count,
+        "seconds": round(seconds, 4),
+        "files_per_sec": round(len(files) / seconds, 2) if seconds else None,
+        "records_per_sec": round(count / seconds, 1) if seconds else None,
+        "peak_rss_mb": _round(peak_rss_mb()),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def _isolated_case(conn, case: str, folder: Path, engine: str, workers: int) -> None:
+    try:
+        conn.send(("ok", run_case(case, folder, engine, workers)))
+    except Exception as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def _run_isolated(case: str, folder: Path, engine: str, workers: int) -> Dict[str, Any]:
+    # A plain (non-daemon) process, so DailyReportParser can start its own pool
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_isolated_case, args=(sender, case, folder, engine, workers))
+    process.start()
+    sender.close()
+    try:
+        status, payload = receiver.recv()
+    except EOFError:
+        status, payload = "error", f"worker exited with code {process.exitcode}"
+    process.join()
+    if status != "ok":
+        raise RuntimeError(f"{case_name(case, engine, workers)} failed: {payload}")
+    return payload
+
+
+def prepare_reports(folder: Path, count: int) -> None:
+    """
+    Make sure *folder* holds *count* synthetic reports.
+
+    Reports are only deleted and regenerated in folders this tool wrote
+    (marked with ``GENERATED_MARKER``); a folder of real reports with a
+    different count raises ValueError instead.
+    """
+    folder = Path(folder)
+    existing = DailyReportParser(folder).get_report_files()
+    if len(existing) == count:
+        return
+    marker = folder / GENERATED_MARKER
+    if existing and not marker.exists():
+        raise ValueError(
+            f"{folder} holds {len(existing)} reports not generated by this tool; "
+            f"use an empty folder or --files {len(existing)}"
+        )
+    logger.info("Generating %d reports in %s", count, folder)
+    for path in existing:
+        path.unlink()
+    generate_reports(folder, count)
+    marker.write_text("Synthetic reports written by benchmarks.bench_parsers\n", encoding="utf-8")
+
+
+def case_name(case: str, engine: str, workers: int) -> str:
+    if case == CASE_PROCESS_DOCX:
+        return f"{case}[{engine}]"
+    if case == CASE_DAILY_REPORT:
+        return f"{case}[{engine},w={workers}]"
+    return case
+
+
+def run_benchmarks(
+    folder: Path,
+    engines: Sequence[str] = ENGINES,
+    workers: Sequence[int] = (1,),
+    repeat: int = 1,
+    isolate: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Time every case on the reports in *folder*.
+
+    With *repeat* > 1 the fastest run is kept.  *isolate* runs each case in
+    a fresh process so peak RSS is not inherited from earlier cases.
+    """
+    plan = [(CASE_PROCESS_DOCX, engine, 1) for engine in engines]
+    plan += [(CASE_DAILY_REPORT, engine, count) for engine in engines for count in workers]
+    plan.append((CASE_MANPOWER, "docx", 1))
+
+    results = []
+    for case, engine, count in plan:
+        name = case_name(case, engine, count)
+        runs = [
+            _run_isolated(case, folder, engine, count) if isolate else run_case(case, folder, engine, count)
+            for _ in range(repeat)
+        ]
+        best = min(runs, key=lambda r: r["seconds"])
+        best["peak_rss_mb"] = max((r["peak_rss_mb"] for r in runs if r["peak_rss_mb"] is not None), default=None)
+        results.append({"name": name, **best})
+        logger.info(
+            "%-36s %6d files %8d records %8.2f s %8.1f files/s %10.1f records/s",
+            name, best["files"], best["records"], best["seconds"],
+            best["files_per_sec"] or 0, best["records_per_sec"] or 0,
+        )
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Names of cases whose files/sec fell more than *tolerance* below *baseline*."""
+    previous = {r["name"]: r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if not before or not before.get("files_per_sec") or not result.get("files_per_sec"):
+            continue
+        change = result["files_per_sec"] / before["files_per_sec"] - 1
+        logger.info("%-36s %+6.1f%% files/s vs baseline", result["name"], change * 100)
+        if change < -tolerance:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the DOCX parsers on synthetic reports")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="Number of reports (default: 50)")
+    parser.add_argument("--folder", type=Path, help="Reuse / write reports here instead of a temp folder")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=ENGINES)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1], help="DailyReportParser worker counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is kept (default: 3)")
+    parser.add_argument("--output", type=Path, default=Path("bench_parsers.json"), help="Results JSON file")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed files/sec drop vs baseline (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    with tempfile.TemporaryDirectory(prefix="duat_bench_") as tmp:
+        folder = args.folder or Path(tmp)
+        try:
+            prepare_reports(folder, args.files)
+        except ValueError as e:
+            parser.error(str(e))
+        results = run_benchmarks(folder, args.engines, args.workers, args.repeat)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "files": args.files,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info("Results written to %s", args.output)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            logger.error("Slower than baseline: %s", ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
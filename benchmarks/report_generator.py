@@ -0,0 +1,165 @@
+# MTR DUAT - Synthetic Daily Report Generator
+"""
+Write realistic ``PS-OHLR_DUAT_Daily Report_WK##_YYYY.docx`` files for
+benchmarks.
+
+Each report has the two tables the parsers read:
+
+1. Delivery table (Date | Description | Qty | Line), one block of day and
+   night-shift rows per day.  Night-shift keyword rows are partly written
+   as blue runs, which the delivery parser zeroes.
+2. Manpower table (Date | Shift | Description | Done by | Qty | Roles),
+   with job rows, team counts, EPIC roles, attendance, apprentices, term
+   labour and leave rows.
+
+Building documents with python-docx is slow, so only *variants* distinct
+reports are built; the rest are byte copies under their own week / year
+file names (the parsers take week and year from the file name).
+
+Usage::
+
+    from benchmarks.report_generator import generate_reports
+    files = generate_reports(Path("/tmp/reports"), count=500)
+"""
+
+import random
+import shutil
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from docx import Document
+from docx.shared import RGBColor
+
+REPORT_NAME = "PS-OHLR_DUAT_Daily Report_WK{week:02d}_{year}.docx"
+FIRST_YEAR = 2020
+WEEKS_PER_YEAR = 52
+DEFAULT_VARIANTS = 12
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+LINES = ("KTL", "TCL", "AEL", "TWL", "ISL", "TKL", "EAL", "SIL", "TML", "DRL")
+JOB_TYPES = ("CBM", "CM", "PA work", "SPA work", "HLM", "C&R")
+TASKS = ("dropper replacement", "contact wire renewal", "registration arm check", "cantilever adjustment")
+NAMES = (
+    "Chan Tai Man", "Wong Siu Ming", "Lee Ka Fai", "Cheung Wai Kit", "Lam Chi Keung",
+    "Ho Man Wai", "Ng Kwok Wing", "Tang Yiu Fai", "Yip Chun Hei", "Leung Hoi Yan",
+)
+BLUE = RGBColor(0x00, 0x00, 0xFF)
+
+
+def report_filename(index: int) -> str:
+    """File name of the *index*-th report: consecutive weeks from WK01 2020."""
+    return REPORT_NAME.format(week=index % WEEKS_PER_YEAR + 1, year=FIRST_YEAR + index // WEEKS_PER_YEAR)
+
+
+def _names(rng: random.Random, count: int) -> str:
+    return ", ".join(rng.sample(NAMES, count))
+
+
+def _set_row(table, values: Sequence[str], blue_column: int = -1) -> None:
+    cells = table.add_row().cells
+    for col, value in enumerate(values):
+        if col == blue_column:
+            run = cells[col].paragraphs[0].add_run(value)
+            run.font.color.rgb = BLUE
+        else:
+            cells[col].text = value
+
+
+def _delivery_table(doc, rng: random.Random, day_dates: List[Tuple[str, str]], rows_per_shift: int) -> None:
+    table = doc.add_table(rows=1, cols=4)
+    for col, header in enumerate(("Date", "Description", "Qty", "Line")):
+        table.rows[0].cells[col].text = header
+
+    for day, date in day_dates:
+        for night in (False, True):
+            if night:
+                _set_row(table, (f"{day} {date}", "Night Shift", "", ""))
+            for _ in range(rows_per_shift):
+                line = rng.choice(LINES)
+                project = f"C{rng.randint(1000, 9999)}"
+                job = rng.choice(JOB_TYPES)
+                description = f"{project} {job} {rng.choice(TASKS)} {line}"
+                if night:
+                    description = f"Night {description}"
+                # Some night-shift keyword rows are marked blue (planned, not delivered)
+                blue = 1 if night and rng.random() < 0.3 else -1
+                _set_row(table, (f"{day} {date}", description, str(rng.randint(1, 12)), line), blue_column=blue)
+
+
+def _manpower_table(doc, rng: random.Random, day_dates: List[Tuple[str, str]], rows_per_shift: int) -> None:
+    headers = ("Date", "Shift", "Description", "Done by", "Qty", "Roles")
+    table = doc.add_table(rows=1, cols=len(headers))
+    for col, header in enumerate(headers):
+        table.rows[0].cells[col].text = header
+
+    for day, date in day_dates:
+        for shift in ("Day Shift", "Night Shift"):
+            for _ in range(rows_per_shift):
+                project = f"C{rng.randint(1000, 9999)}"
+                teams = ", ".join(f"S{team}x{rng.randint(1, 4)}" for team in rng.sample(range(2, 6), 2))
+                roles = (
+                    f"CP(P): {rng.choice(NAMES)} CP(T): {rng.choice(NAMES)} "
+                    f"AP(E): {_names(rng, 2)} SPC: {rng.choice(NAMES)}"
+                )
+                _set_row(table, (
+                    f"{day} {date}", shift,
+                    f"{project} {rng.choice(JOB_TYPES)} {rng.choice(TASKS)} {rng.choice(LINES)}",
+                    teams, str(rng.randint(1, 12)), roles,
+                ))
+            _set_row(table, (f"{day} {date}", shift, f"On duty: {_names(rng, 4)}", "S2x2, S3x1", "", ""))
+            _set_row(table, (f"{day} {date}", shift, f"Apprentice: {_names(rng, 1)}", "", "", ""))
+            _set_row(table, (f"{day} {date}", shift, f"Term labour: {rng.randint(0, 6)}", "", "", ""))
+        leave = f"AL: {_names(rng, 2)}\nSL: {rng.choice(NAMES)}\nTraining: {rng.choice(NAMES)}"
+        _set_row(table, (f"{day} {date}", "", leave, "", "", ""))
+
+
+def build_report(path: Path, seed: int = 0, rows_per_shift: int = 4) -> Path:
+    """Write one synthetic report with both tables to *path*."""
+    rng = random.Random(seed)
+    first_day = rng.randint(1, 21)
+    month = rng.randint(1, 12)
+    day_dates = [(day, f"{first_day + offset}/{month}") for offset, day in enumerate(DAYS)]
+
+    doc = Document()
+    doc.add_paragraph("PS-OHLR Daily Update")
+    _delivery_table(doc, rng, day_dates, rows_per_shift)
+    doc.add_paragraph("Manpower")
+    _manpower_table(doc, rng, day_dates, rows_per_shift)
+    doc.save(str(path))
+    return path
+
+
+def generate_reports(
+    folder: Path,
+    count: int,
+    variants: int = DEFAULT_VARIANTS,
+    rows_per_shift: int = 4,
+    seed: int = 0,
+) -> List[Path]:
+    """
+    Write *count* reports to *folder*.
+
+    Args:
+        folder: Output folder, created if missing
+        count: Number of report files (e.g. 50 to 5000)
+        variants: Distinct documents built; the others are copies
+        rows_per_shift: Job rows per shift in each table
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        Paths of the written reports, in week order
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    for index in range(count):
+        path = folder / report_filename(index)
+        if index < variants:
+            build_report(path, seed=seed + index, rows_per_shift=rows_per_shift)
+        else:
+            shutil.copyfile(files[index % variants], path)
+        files.append(path)
+    return files
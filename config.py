@@ -7,6 +7,9 @@ Config file location strategy (portable):
 - DUAT_CONFIG_PATH env var overrides all
 - Production: same directory as the executable
 - Development: current working directory
+
+Persistent caches (parsed records, search index) live in a ``.duat_cache``
+folder next to the config file unless DUAT_CACHE_DIR is set.
 """
 
 import json
@@ -19,6 +22,7 @@ from typing import Dict
 logger = logging.getLogger(__name__)
 
 CONFIG_FILENAME = "mtr_duat_config.json"
+CACHE_DIRNAME = ".duat_cache"
 
 DEFAULT_CONFIG: Dict = {
     "last_folder": "",
@@ -43,6 +47,14 @@ def _get_config_path() -> Path:
     return Path.cwd() / CONFIG_FILENAME
 
 
+def get_cache_dir() -> Path:
+    """Return the directory used for persistent caches (not created here)."""
+    env_dir = os.environ.get("DUAT_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    return _get_config_path().parent / CACHE_DIRNAME
+
+
 def load_app_config() -> Dict:
     """Load configuration from JSON file, merging with defaults."""
     config = {**DEFAULT_CONFIG, "keywords": list(DEFAULT_CONFIG["keywords"])}
@@ -44,6 +44,7 @@ export const api = {
     request<T>(endpoint, { method: 'POST', body: body ? JSON.stringify(body) : undefined }),
   put: <T>(endpoint: string, body?: unknown) =>
     request<T>(endpoint, { method: 'PUT', body: body ? JSON.stringify(body) : undefined }),
+  delete: <T>(endpoint: string) => request<T>(endpoint, { method: 'DELETE' }),
 }
 
 // --- API Groups ---
@@ -63,10 +64,13 @@ export const parseApi = {
   progress: () => api.get('/api/parse/progress'),
   results: () => api.get('/api/parse/results'),
   files: (path: string) => api.post('/api/parse/files', { path }),
+  scan: (folderPath: string) => api.post('/api/parse/scan', { folder_path: folderPath }),
 }
 
 export const dashboardApi = {
   analyze: (records: unknown) => api.post('/api/dashboard/analyze', records),
+  analyzeParsed: (jobId?: string) =>
+    api.post('/api/dashboard/analyze-parsed', jobId ? { job_id: jobId } : {}),
   loadExcel: (formData: FormData) => requestFormData('/api/dashboard/load-excel', formData),
   stats: () => api.get('/api/dashboard/stats'),
   summary: () => api.get('/api/dashboard/summary'),
@@ -109,6 +113,7 @@ export const scurveApi = {
   calculate: (params: unknown) => api.post('/api/scurve/calculate', params),
   chart: (params: unknown) => api.post('/api/scurve/chart', params),
   excel: (params: unknown) => api.post('/api/scurve/excel', params),
+  excelJob: (params: unknown) => api.post<ExportJob>('/api/scurve/excel/job', params),
 }
 
 export const exportApi = {
@@ -118,6 +123,28 @@ export const exportApi = {
   saveDashboard: () => api.post('/api/export/save-dashboard'),
 }
 
+export interface ExportJob {
+  job_id: string
+  kind: string
+  filename: string
+  status: 'queued' | 'running' | 'done' | 'failed'
+  progress: number
+  stage: string
+  error: string | null
+  created_at: string
+  finished_at: string | null
+}
+
+// Background exports: start a job, poll its status, then download by job ID
+export const exportJobsApi = {
+  dashboard: (filename?: string) => api.post<ExportJob>('/api/export/jobs/dashboard', { filename }),
+  lagAnalysis: (filename?: string) => api.post<ExportJob>('/api/export/jobs/lag-analysis', { filename }),
+  list: () => api.get<{ jobs: ExportJob[] }>('/api/export/jobs'),
+  status: (jobId: string) => api.get<ExportJob>(`/api/export/jobs/${jobId}`),
+  downloadUrl: (jobId: string) => `${getBaseUrl()}/api/export/jobs/${jobId}/download`,
+  remove: (jobId: string) => api.delete(`/api/export/jobs/${jobId}`),
+}
+
 export const keywordApi = {
   search: (folderPath: string, keyword: string) =>
     api.post('/api/keyword/search', { folderPath, keyword }),
@@ -127,4 +154,5 @@ export const manpowerApi = {
   scan: (folderPath: string) => api.post('/api/manpower/scan', { folderPath }),
   analysis: () => api.get('/api/manpower/analysis'),
   exportExcel: (path: string) => api.post('/api/manpower/export-excel', { path }),
+  exportJob: () => api.post<ExportJob>('/api/manpower/export/job'),
 }
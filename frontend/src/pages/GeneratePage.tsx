@@ -1,7 +1,7 @@
 import { useState, useRef } from 'react'
 import { useAppStore } from '@/lib/store'
 import { t } from '@/lib/i18n'
-import { dashboardApi, parseApi } from '@/lib/api'
+import { dashboardApi } from '@/lib/api'
 import type { DashboardStats } from '@/lib/types'
 
 export default function GeneratePage() {
@@ -20,8 +20,7 @@ export default function GeneratePage() {
     setAnalyzing(true)
     setLoading(true)
     try {
-      const records = await parseApi.results()
-      const result = (await dashboardApi.analyze(records)) as { stats: DashboardStats }
+      const result = (await dashboardApi.analyzeParsed()) as { stats: DashboardStats }
       setDashboardStats(result.stats)
       setDashboardLoaded(true)
       addNotification('success', t('generate.complete'))
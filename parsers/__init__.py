@@ -1,18 +1,36 @@
 # MTR DUAT - Parsers Package
 """
 DOCX parsing modules for daily reports and manpower data extraction.
+
+The parser classes are resolved on first access; python-docx itself is only
+imported by the code paths that open a document with it.
 """
 
-__all__ = []
+import importlib
+
+from .parse_cache import ParseCache
+from .record_store import RecordStore
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "DailyReportParser": "docx_parser",
+    "process_docx": "docx_parser",
+    "ManpowerParser": "manpower_parser",
+    "ReportScanner": "report_scanner",
+    "scan_report": "report_scanner",
+}
+
+__all__ = ["ParseCache", "RecordStore", *_EXPORTS]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
 
-try:
-    from .docx_parser import DailyReportParser, process_docx
-    __all__.extend(["DailyReportParser", "process_docx"])
-except ImportError:
-    pass
 
-try:
-    from .manpower_parser import ManpowerParser
-    __all__.append("ManpowerParser")
-except ImportError:
-    pass
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,12 +6,20 @@ Each record contains: FullDate, Project, Qty Delivered, Week, Year, Line.
 """
 
 import logging
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
 
-from docx import Document
-from docx.shared import RGBColor
+from .ooxml_stream import StreamCell, iter_body_tables
+from .parse_cache import ParseCache
+from .parse_stats import ParseStats, stage_timer
+from .record_store import RecordStore
+
+if TYPE_CHECKING:
+    from docx.shared import RGBColor
 
 logger = logging.getLogger("duat.parser")
 
@@ -19,6 +27,9 @@ logger = logging.getLogger("duat.parser")
 # Constants
 # ---------------------------------------------------------------------------
 
+# Bump whenever record extraction changes so cached records are re-parsed.
+PARSER_VERSION = "1"
+
 LINE_CODE_PATTERN = r"\b(KTL|TCL|AEL|TWL|ISL|TKL|EAL|SIL|TML|DRL)\b"
 
 JOB_KEYWORDS: List[str] = ["CBM", "CM", "PA work", "HLM", "Provide"]
@@ -33,16 +44,26 @@ _PROJECT_CODE_PATTERN = re.compile(r"\bC(\d{4})\b")
 _BLUE_THRESHOLD_BLUE = 0x80
 _BLUE_THRESHOLD_OTHER = 0x80
 
+# Extraction engines accepted by process_docx / DailyReportParser
+ENGINE_DOCX = "docx"
+ENGINE_STREAM = "stream"
+ENGINES: Tuple[str, ...] = (ENGINE_DOCX, ENGINE_STREAM)
+
+# Upper bound for the automatic worker count; python-docx parsing is CPU
+# bound but each worker holds a full document model in memory.
+_MAX_AUTO_WORKERS = 8
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
 
 
-def is_blue_color(rgb: Optional[RGBColor]) -> bool:
+def is_blue_color(rgb: Optional["RGBColor"]) -> bool:
     """Return True when *rgb* represents a blue shade.
 
     Blue is defined as: blue channel >= 0x80 **and** both red and green
     channels are below 0x80.  ``None`` is treated as "no colour" (not blue).
+    Any ``(r, g, b)`` sequence is accepted, not just ``RGBColor``.
     """
     if rgb is None:
         return False
@@ -81,20 +102,45 @@ def extract_week_year_from_filename(filename: str) -> Tuple[int, int]:
     return 0, 0
 
 
+def resolve_worker_count(workers: Optional[int]) -> int:
+    """Normalise a requested worker count.
+
+    ``None`` selects an automatic value (one less than the CPU count, capped
+    at ``_MAX_AUTO_WORKERS``).  Values below 1 fall back to sequential mode.
+    """
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        return max(1, min(cpus - 1, _MAX_AUTO_WORKERS))
+    return max(1, int(workers))
+
+
 # ---------------------------------------------------------------------------
 # Cell / run helpers
 # ---------------------------------------------------------------------------
 
 
-def _cell_has_blue_text(cell) -> bool:
+def _cell_has_blue_text(cell, stats: Optional[ParseStats] = None) -> bool:
     """Return True if any run inside *cell* has blue font colour."""
     for paragraph in cell.paragraphs:
         for run in paragraph.runs:
+            if stats is not None:
+                stats.counts["runs"] += 1
             if run.font.color and is_blue_color(run.font.color.rgb):
                 return True
     return False
 
 
+def _stream_cells_have_blue(cells: List[StreamCell], stats: Optional[ParseStats] = None) -> bool:
+    """Return True if any run colour of the streamed *cells* is blue."""
+    for cell in cells:
+        for rgb in cell.run_colors:
+            if stats is not None:
+                stats.counts["runs"] += 1
+            if is_blue_color(rgb):
+                return True
+    return False
+
+
 def _cell_text(cell) -> str:
     """Return the full plain-text content of a table cell."""
     return "\n".join(p.text for p in cell.paragraphs).strip()
@@ -150,86 +196,201 @@ def _identify_project(text: str) -> str:
 # ---------------------------------------------------------------------------
 
 
+def _row_record(
+    cell_texts: List[str],
+    row_has_blue: Callable[[], bool],
+    week: str,
+    year: str,
+    is_night: bool = False,
+) -> Optional[Dict]:
+    """Build a delivery record from one table row, or ``None`` to skip it.
+
+    *cell_texts* holds the stripped text of every grid cell in the row.
+    *row_has_blue* is only called when the blue-text rule can apply, so
+    engines can defer the run colour scan.
+    """
+    if len(cell_texts) < 2:
+        return None
+
+    # Gather full row text for context
+    row_text = " ".join(cell_texts)
+    if not row_text.strip():
+        return None
+
+    # Detect night shift from row context
+    night = is_night or _is_night_shift_row(row_text)
+
+    # Try to extract a date from the first cell
+    full_date = cell_texts[0]
+
+    # Description cell (second cell typically)
+    desc_text = cell_texts[1]
+
+    # Qty cell (third cell if available)
+    qty_text = cell_texts[2] if len(cell_texts) > 2 else ""
+    qty = _extract_qty(qty_text)
+
+    # Determine project
+    combined_text = f"{desc_text} {row_text}"
+    project = _identify_project(combined_text)
+
+    if not project and not full_date:
+        return None
+
+    # Night shift + blue keyword -> qty = 0
+    if night and _has_job_keyword(combined_text) and row_has_blue():
+        qty = 0.0
+
+    # Extract line code from all available text
+    line = extract_line_code(combined_text)
+
+    return {
+        "FullDate": full_date,
+        "Project": project,
+        "Qty Delivered": qty,
+        "Week": week,
+        "Year": year,
+        "Line": line,
+    }
+
+
+def _timed_row_record(
+    cell_texts: List[str],
+    row_has_blue: Callable[[], bool],
+    week: str,
+    year: str,
+    is_night: bool,
+    stats: ParseStats,
+) -> Optional[Dict]:
+    """:func:`_row_record` with its time split into ``match`` and ``blue``."""
+    stats.counts["rows"] += 1
+    stats.counts["cells"] += len(cell_texts)
+    blue_seconds = 0.0
+
+    def timed_blue() -> bool:
+        nonlocal blue_seconds
+        started = time.perf_counter()
+        try:
+            return row_has_blue()
+        finally:
+            blue_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    record = _row_record(cell_texts, timed_blue, week, year, is_night)
+    stats.add("match", time.perf_counter() - started - blue_seconds)
+    stats.add("blue", blue_seconds)
+    return record
+
+
 def _parse_table_records(
     table,
     week: str,
     year: str,
     is_night: bool = False,
+    stats: Optional[ParseStats] = None,
 ) -> List[Dict]:
     """Extract delivery records from a single DOCX table.
 
     Skips the header row (index 0).  For each subsequent row, attempts to
-    build a record from the cell contents.
+    build a record from the cell contents.  With *stats*, the extract /
+    blue / match stages and the table, row, cell and run counts are
+    accumulated there.
     """
     records: List[Dict] = []
-    rows = table.rows
+    with stage_timer(stats, "extract"):
+        rows = table.rows
+    if stats is not None:
+        stats.counts["tables"] += 1
 
     if len(rows) < 2:
         return records
 
     for row in rows[1:]:
-        cells = row.cells
-        if len(cells) < 2:
-            continue
-
-        # Gather full row text for context
-        row_text = " ".join(_cell_text(c) for c in cells)
-        if not row_text.strip():
-            continue
-
-        # Detect night shift from row context
-        night = is_night or _is_night_shift_row(row_text)
-
-        # Check for blue text in any cell of this row
-        has_blue = any(_cell_has_blue_text(c) for c in cells)
-
-        # Try to extract a date from the first cell
-        full_date = _cell_text(cells[0])
-
-        # Description cell (second cell typically)
-        desc_text = _cell_text(cells[1]) if len(cells) > 1 else ""
-
-        # Qty cell (third cell if available)
-        qty_text = _cell_text(cells[2]) if len(cells) > 2 else ""
-        qty = _extract_qty(qty_text)
-
-        # Determine project
-        combined_text = f"{desc_text} {row_text}"
-        project = _identify_project(combined_text)
-
-        if not project and not full_date:
-            continue
+        if stats is None:
+            cells = row.cells
+            record = _row_record(
+                [_cell_text(c) for c in cells],
+                lambda: any(_cell_has_blue_text(c) for c in cells),
+                week,
+                year,
+                is_night,
+            )
+        else:
+            with stats.stage("extract"):
+                cells = row.cells
+                cell_texts = [_cell_text(c) for c in cells]
+            record = _timed_row_record(
+                cell_texts,
+                lambda: any(_cell_has_blue_text(c, stats) for c in cells),
+                week,
+                year,
+                is_night,
+                stats,
+            )
+        if record is not None:
+            records.append(record)
 
-        # Night shift + blue keyword -> qty = 0
-        if night and has_blue and _has_job_keyword(combined_text):
-            qty = 0.0
+    return records
 
-        # Extract line code from all available text
-        line = extract_line_code(combined_text)
 
-        if project or full_date:
-            record: Dict = {
-                "FullDate": full_date,
-                "Project": project,
-                "Qty Delivered": qty,
-                "Week": week,
-                "Year": year,
-                "Line": line,
-            }
+def _parse_stream_table_records(
+    rows: List[List[StreamCell]],
+    week: str,
+    year: str,
+    is_night: bool = False,
+    stats: Optional[ParseStats] = None,
+) -> List[Dict]:
+    """Streaming-engine counterpart of :func:`_parse_table_records`."""
+    records: List[Dict] = []
+    if stats is not None:
+        stats.counts["tables"] += 1
+    for cells in rows[1:]:
+        if stats is None:
+            record = _row_record(
+                [c.text for c in cells],
+                lambda: _stream_cells_have_blue(cells),
+                week,
+                year,
+                is_night,
+            )
+        else:
+            record = _timed_row_record(
+                [c.text for c in cells],
+                lambda: _stream_cells_have_blue(cells, stats),
+                week,
+                year,
+                is_night,
+                stats,
+            )
+        if record is not None:
             records.append(record)
 
     return records
 
 
-def process_docx(filepath: Path) -> List[Dict]:
+def process_docx(
+    filepath: Path,
+    engine: str = ENGINE_DOCX,
+    stats: Optional[ParseStats] = None,
+) -> List[Dict]:
     """Parse a single DOCX file and return a list of delivery records.
 
     Each record is a dict with keys:
     ``FullDate``, ``Project``, ``Qty Delivered``, ``Week``, ``Year``, ``Line``.
 
+    *engine* selects the extraction backend: ``"docx"`` walks the
+    python-docx object model, ``"stream"`` reads the document XML directly
+    (see :mod:`parsers.ooxml_stream`).  Both return identical records.
+
+    When *stats* is given, per-stage times and item counts are added to it
+    (see :mod:`parsers.parse_stats`).
+
     Returns an empty list when the file does not exist, is not a ``.docx``,
     or cannot be opened.
     """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown parser engine: {engine!r}")
+
     filepath = Path(filepath)
 
     if not filepath.exists():
@@ -245,20 +406,55 @@ def process_docx(filepath: Path) -> List[Dict]:
     week = str(week_num) if week_num else ""
     year = str(year_num) if year_num else ""
 
+    if stats is not None:
+        stats.counts["files"] += 1
+
+    if engine == ENGINE_STREAM:
+        return _process_docx_stream(filepath, week, year, stats)
+
+    # python-docx is only needed by this engine; loaded on first use
+    from docx import Document
+
     try:
-        doc = Document(str(filepath))
+        with stage_timer(stats, "load"):
+            doc = Document(str(filepath))
     except Exception as exc:
         logger.error("Failed to open DOCX %s: %s", filepath, exc)
         return []
 
     records: List[Dict] = []
     for table in doc.tables:
-        table_records = _parse_table_records(table, week, year)
+        table_records = _parse_table_records(table, week, year, stats=stats)
         records.extend(table_records)
 
     return records
 
 
+def _process_docx_with_stats(filepath: Path, engine: str) -> Tuple[List[Dict], ParseStats]:
+    """Pool worker entry: records of one file plus its own stage timings."""
+    stats = ParseStats()
+    return process_docx(filepath, engine, stats), stats
+
+
+def _process_docx_stream(
+    filepath: Path,
+    week: str,
+    year: str,
+    stats: Optional[ParseStats] = None,
+) -> List[Dict]:
+    """Extract records with the streaming OOXML reader."""
+    records: List[Dict] = []
+    try:
+        for rows in iter_body_tables(filepath, stats):
+            records.extend(_parse_stream_table_records(rows, week, year, stats=stats))
+    except Exception as exc:
+        # Same contract as the python-docx engine: unreadable file -> no records
+        logger.error("Failed to open DOCX %s: %s", filepath, exc)
+        return []
+
+    return records
+
+
 # ---------------------------------------------------------------------------
 # DailyReportParser class
 # ---------------------------------------------------------------------------
@@ -269,14 +465,35 @@ class DailyReportParser:
 
     Usage::
 
-        parser = DailyReportParser(Path("C:/Reports"))
+        parser = DailyReportParser(Path("C:/Reports"), workers=4, engine="stream")
         files = parser.get_report_files()
         records = parser.process_all(progress_callback=my_cb)
         max_week = parser.get_max_week()
+
+    With ``workers > 1`` files are parsed in a process pool.  Records are
+    still merged in sorted file order, so the result is identical to a
+    sequential run.  When a :class:`ParseCache` is supplied, unchanged files
+    are served from the cache and only new or modified files are opened.
+    *engine* is passed through to :func:`process_docx`.  A :class:`ParseStats`
+    *stats* collects the stage timings of every opened file, including
+    those parsed in pool workers, and is logged when the run finishes.
     """
 
-    def __init__(self, folder_path) -> None:
+    def __init__(
+        self,
+        folder_path,
+        workers: int = 1,
+        cache: Optional[ParseCache] = None,
+        engine: str = ENGINE_DOCX,
+        stats: Optional[ParseStats] = None,
+    ) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown parser engine: {engine!r}")
         self.folder_path: Path = Path(folder_path)
+        self.workers: int = resolve_worker_count(workers)
+        self.cache: Optional[ParseCache] = cache
+        self.engine: str = engine
+        self.stats: Optional[ParseStats] = stats
         self._records: List[Dict] = []
         self._max_week: int = 0
 
@@ -307,34 +524,127 @@ class DailyReportParser:
 
         *progress_callback*, when provided, is called with
         ``(filename, progress_float)`` after each file is processed.
-        ``progress_float`` ranges from 0.0 to 1.0.
+        ``progress_float`` ranges from 0.0 to 1.0.  In process-pool mode the
+        callback fires in completion order, but the returned records always
+        follow the sorted file order.
+        """
+        all_records: List[Dict] = []
+        self._process(all_records.extend, progress_callback)
+        self._records = all_records
+        return all_records
+
+    def process_into(
+        self,
+        store: RecordStore,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+    ) -> RecordStore:
+        """Parse every matching file and append the records to *store*.
+
+        Same order and progress reporting as :meth:`process_all`, but each
+        file's records are appended to the columnar store as soon as every
+        earlier file is done, so the full list of record dicts is never
+        held in memory.  Returns *store*.
+        """
+        self._process(store.extend, progress_callback)
+        return store
+
+    def get_max_week(self) -> int:
+        """Return the highest week number seen across processed files.
+
+        Returns ``0`` if no files have been processed yet.
         """
+        return self._max_week
+
+    # -- internals ----------------------------------------------------------
+
+    def _process(
+        self,
+        sink: Callable[[List[Dict]], None],
+        progress_callback: Optional[Callable[[str, float], None]],
+    ) -> None:
+        """Parse the report files and pass each file's records to *sink* in file order."""
         files = self.get_report_files()
         if not files:
-            return []
+            return
 
-        all_records: List[Dict] = []
         total = len(files)
-
+        per_file: List[Optional[List[Dict]]] = [None] * total
+        next_idx = 0
+        done = 0
+
+        def flush() -> None:
+            # Hand over the completed prefix of files, then drop their records
+            nonlocal next_idx
+            while next_idx < total and per_file[next_idx] is not None:
+                sink(per_file[next_idx])
+                per_file[next_idx] = None
+                next_idx += 1
+
+        pending: List[int] = []
+        signatures: Dict[int, Optional[Tuple[int, int]]] = {}
         for idx, fpath in enumerate(files):
-            file_records = process_docx(fpath)
-            all_records.extend(file_records)
+            cached = self.cache.get(fpath) if self.cache is not None else None
+            if cached is None:
+                pending.append(idx)
+                continue
 
-            # Track max week
-            wk, _ = extract_week_year_from_filename(fpath.name)
-            if wk > self._max_week:
-                self._max_week = wk
+            per_file[idx] = cached
+            done += 1
+            if progress_callback is not None:
+                progress_callback(fpath.name, done / total)
+
+        if self.cache is not None:
+            # Capture signatures before parsing so a file saved mid-scan is re-read next time
+            signatures = {idx: self.cache.signature(files[idx]) for idx in pending}
 
+        flush()
+        pending_files = [files[idx] for idx in pending]
+        for pos, file_records in self._iter_parsed(pending_files):
+            idx = pending[pos]
+            per_file[idx] = file_records
+            if self.cache is not None:
+                self.cache.put(files[idx], file_records, signatures.get(idx))
+
+            done += 1
             if progress_callback is not None:
-                progress = (idx + 1) / total
-                progress_callback(fpath.name, progress)
+                progress_callback(files[idx].name, done / total)
+            flush()
 
-        self._records = all_records
-        return all_records
+        if self.cache is not None:
+            self.cache.save()
 
-    def get_max_week(self) -> int:
-        """Return the highest week number seen across processed files.
+        if self.stats is not None:
+            logger.info("Parse stages for %d opened files: %s", len(pending), self.stats.summary())
 
-        Returns ``0`` if no files have been processed yet.
-        """
-        return self._max_week
+        # Track max week
+        for fpath in files:
+            wk, _ = extract_week_year_from_filename(fpath.name)
+            if wk > self._max_week:
+                self._max_week = wk
+
+    def _iter_parsed(self, files: List[Path]) -> Iterator[Tuple[int, List[Dict]]]:
+        """Yield ``(file_index, records)`` as each file finishes parsing."""
+        if not files:
+            return
+
+        workers = min(self.workers, len(files))
+        if workers <= 1:
+            for idx, fpath in enumerate(files):
+                yield idx, process_docx(fpath, self.engine, self.stats)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if self.stats is None:
+                futures = {pool.submit(process_docx, fpath, self.engine): idx for idx, fpath in enumerate(files)}
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+                return
+
+            # Each worker times its own file; the totals are merged here
+            futures = {
+                pool.submit(_process_docx_with_stats, fpath, self.engine): idx for idx, fpath in enumerate(files)
+            }
+            for future in as_completed(futures):
+                records, file_stats = future.result()
+                self.stats.merge(file_stats)
+                yield futures[future], records
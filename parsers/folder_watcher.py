@@ -0,0 +1,173 @@
+# MTR DUAT - Folder Watcher
+"""
+Polling watcher for the daily-report folder.
+
+Each poll takes a ``(size, mtime_ns)`` snapshot of the matching report files
+and diffs it against the previous one.  Only new or modified files are
+parsed; deleted files are reported so their records can be dropped.  Polling
+is used instead of OS notifications because reports usually live on a
+network share, where change events are unreliable.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .docx_parser import ENGINE_DOCX, ENGINES, process_docx
+from .manpower_parser import REPORT_GLOB
+from .parse_cache import ParseCache, _file_signature
+
+logger = logging.getLogger("duat.parser")
+
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+class WatchDelta(NamedTuple):
+    """Changes found by one poll: new/modified files with their records, and deleted files."""
+
+    updated: Dict[str, List[Dict]]
+    removed: List[str]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.updated or self.removed)
+
+
+class FolderWatcher:
+    """Detect and parse new, changed or deleted report files.
+
+    Usage::
+
+        watcher = FolderWatcher(Path("C:/Reports"), engine="stream")
+        delta = watcher.poll()          # first poll reports every file
+        watcher.start(5.0, on_delta)    # keep polling in a daemon thread
+        watcher.stop()
+
+    The first poll has no previous snapshot, so every file is reported as
+    new.  Pass a :class:`ParseCache` to make that baseline cheap.
+    """
+
+    def __init__(
+        self,
+        folder_path,
+        engine: str = ENGINE_DOCX,
+        cache: Optional[ParseCache] = None,
+    ) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown parser engine: {engine!r}")
+        self.folder_path: Path = Path(folder_path)
+        self.engine: str = engine
+        self.cache: Optional[ParseCache] = cache
+        self.polls: int = 0
+        self.last_poll: Optional[datetime] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- polling ------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Return ``{filename: (size, mtime_ns)}`` for the current report files."""
+        if not self.folder_path.is_dir():
+            return {}
+
+        current: Dict[str, Tuple[int, int]] = {}
+        for f in self.folder_path.glob(REPORT_GLOB):
+            if f.name.startswith("~$"):
+                continue
+            signature = _file_signature(f)
+            if signature is not None:
+                current[f.name] = signature
+        return current
+
+    def poll(self) -> WatchDelta:
+        """Diff the folder against the previous snapshot and parse what changed."""
+        current = self.snapshot()
+        previous = self._snapshot
+
+        changed = sorted(
+            name for name, signature in current.items()
+            if previous.get(name) != signature
+        )
+        removed = sorted(name for name in previous if name not in current)
+
+        updated: Dict[str, List[Dict]] = {}
+        for name in changed:
+            updated[name] = self._parse(self.folder_path / name, current[name])
+
+        if self.cache is not None and (updated or removed):
+            self.cache.save()
+
+        self._snapshot = current
+        self.polls += 1
+        self.last_poll = datetime.now()
+        return WatchDelta(updated, removed)
+
+    # -- background thread --------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(
+        self,
+        interval: float,
+        on_delta: Callable[[WatchDelta], None],
+        should_skip: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Poll every *interval* seconds in a daemon thread.
+
+        *on_delta* receives each delta that has changes.  While
+        *should_skip* returns True the poll is postponed, e.g. during a full
+        folder parse.
+        """
+        if self.running:
+            raise RuntimeError("Folder watcher is already running")
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval, on_delta, should_skip),
+            name="duat-folder-watch",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal the polling thread to exit and wait for it."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # -- internals ----------------------------------------------------------
+
+    def _parse(self, filepath: Path, signature: Tuple[int, int]) -> List[Dict]:
+        if self.cache is not None:
+            cached = self.cache.get(filepath)
+            if cached is not None:
+                return cached
+
+        records = process_docx(filepath, self.engine)
+        if self.cache is not None:
+            self.cache.put(filepath, records, signature)
+        return records
+
+    def _run(
+        self,
+        interval: float,
+        on_delta: Callable[[WatchDelta], None],
+        should_skip: Optional[Callable[[], bool]],
+    ) -> None:
+        # Poll immediately so the baseline is loaded without waiting
+        while not self._stop_event.is_set():
+            if should_skip is None or not should_skip():
+                try:
+                    delta = self.poll()
+                    if delta.has_changes:
+                        on_delta(delta)
+                except Exception as exc:
+                    logger.error("Folder watch poll failed for %s: %s", self.folder_path, exc)
+            self._stop_event.wait(interval)
@@ -0,0 +1,319 @@
+# MTR DUAT - Keyword Index
+"""
+Persistent inverted index over report paragraph and table-cell text.
+
+Each indexed file keeps its text entries (``{"location", "text"}`` in
+document order) together with the ``(size, mtime_ns)`` signature they were
+read at, so a refresh only reopens new or modified reports.  The entries are
+stored as JSON in the cache directory; the token postings are rebuilt in
+memory when the index is loaded.
+
+Query modes:
+
+* ``substring`` -- the legacy behaviour: case-insensitive substring match.
+  Candidate entries come from tokens in the vocabulary that contain each
+  query token and are then verified with a substring check, so results are
+  identical to a linear scan.
+* ``all`` / ``any`` -- whitespace-separated terms matched as whole words;
+  a trailing ``*`` makes a term a prefix query (``insp*``).
+"""
+
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .docx_parser import ENGINE_DOCX, ENGINES
+from .parse_cache import _file_signature, write_json_atomic
+from .report_scanner import MATCH_TEXT_LIMIT, read_text_entries
+
+logger = logging.getLogger("duat.parser")
+
+DEFAULT_INDEX_FILENAME = "keyword_index.json"
+
+MODE_SUBSTRING = "substring"
+MODE_ALL = "all"
+MODE_ANY = "any"
+SEARCH_MODES: Tuple[str, ...] = (MODE_SUBSTRING, MODE_ALL, MODE_ANY)
+
+_INDEX_FORMAT = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# token -> {file key -> entry indexes}
+Postings = Dict[str, Dict[str, Set[int]]]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split *text* into lower-case word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KeywordIndex:
+    """Inverted index of report text, persisted between sessions.
+
+    Usage::
+
+        index = KeywordIndex(cache_dir / DEFAULT_INDEX_FILENAME)
+        index.refresh(folder, report_files)
+        results = index.search("cbm", report_files)
+        index.save()
+    """
+
+    def __init__(self, index_file, engine: str = ENGINE_DOCX) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown parser engine: {engine!r}")
+        self.index_file: Path = Path(index_file)
+        self.engine: str = engine
+        self._files: Dict[str, Dict] = {}
+        self._postings: Postings = {}
+        self._lock = threading.RLock()
+        self._dirty: bool = False
+        self._load()
+
+    # -- maintenance --------------------------------------------------------
+
+    def refresh(self, folder, files: Iterable[Path]) -> int:
+        """Bring the index up to date for the report *files* of *folder*.
+
+        New or modified files are re-read; indexed files of *folder* that are
+        no longer in *files* are dropped.  Files that cannot be read are
+        logged and left out, so they are retried next time.  Returns the
+        number of files re-read.
+        """
+        folder_key = self._key(Path(folder))
+        keys = {self._key(Path(f)): Path(f) for f in files}
+        reread = 0
+
+        with self._lock:
+            for key in [k for k in self._files if str(Path(k).parent) == folder_key and k not in keys]:
+                self._remove(key)
+
+            for key, filepath in keys.items():
+                signature = _file_signature(filepath)
+                entry = self._files.get(key)
+                if entry is not None and signature is not None and tuple(entry["signature"]) == signature:
+                    continue
+
+                try:
+                    entries = read_text_entries(filepath, self.engine)
+                except Exception as exc:
+                    logger.warning("Failed to index %s: %s", filepath.name, exc)
+                    self._remove(key)
+                    continue
+
+                self.put(filepath, entries, signature)
+                reread += 1
+
+        return reread
+
+    def put(self, filepath, entries: List[Dict], signature: Optional[Tuple[int, int]] = None) -> None:
+        """Index *entries* for *filepath*, replacing any previous version."""
+        filepath = Path(filepath)
+        if signature is None:
+            signature = _file_signature(filepath)
+        if signature is None:
+            return
+
+        key = self._key(filepath)
+        with self._lock:
+            self._remove(key)
+            self._files[key] = {"signature": list(signature), "entries": entries}
+            self._add_postings(key, entries)
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Write the index to disk if it changed.  Returns True on success."""
+        with self._lock:
+            if not self._dirty:
+                return True
+            payload = {"format": _INDEX_FORMAT, "files": self._files}
+            try:
+                write_json_atomic(self.index_file, payload)
+            except OSError as exc:
+                logger.warning("Failed to write keyword index %s: %s", self.index_file, exc)
+                return False
+            self._dirty = False
+            return True
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    # -- queries ------------------------------------------------------------
+
+    def search(self, query: str, files: Iterable[Path], mode: str = MODE_SUBSTRING) -> Dict[str, List[Dict]]:
+        """Return ``{filename: matches}`` for the indexed *files* that match.
+
+        Matches keep document order, are de-duplicated by text and truncated
+        to ``MATCH_TEXT_LIMIT`` characters, like the legacy linear search.
+        Raises ``ValueError`` for an unknown mode or a query without any
+        searchable terms in ``all`` / ``any`` mode.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode!r}")
+
+        keys = [self._key(Path(f)) for f in files]
+        with self._lock:
+            if mode == MODE_SUBSTRING:
+                hits = self._substring_hits(query, keys)
+            else:
+                hits = self._term_hits(query, keys, require_all=(mode == MODE_ALL))
+
+            results: Dict[str, List[Dict]] = {}
+            for key in keys:
+                idxs = hits.get(key)
+                if not idxs:
+                    continue
+                matches = self._collect(self._files[key]["entries"], sorted(idxs))
+                if matches:
+                    results[Path(key).name] = matches
+        return results
+
+    # -- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _key(filepath: Path) -> str:
+        return str(filepath.resolve())
+
+    @staticmethod
+    def _collect(entries: List[Dict], idxs: List[int]) -> List[Dict]:
+        seen = set()
+        matches: List[Dict] = []
+        for idx in idxs:
+            text = entries[idx]["text"][:MATCH_TEXT_LIMIT]
+            if text in seen:
+                continue
+            seen.add(text)
+            matches.append({"location": entries[idx]["location"], "text": text})
+        return matches
+
+    def _substring_hits(self, query: str, keys: List[str]) -> Dict[str, Set[int]]:
+        needle = query.lower()
+        tokens = tokenize(needle)
+
+        if tokens:
+            # Every query token sits inside some text token of a matching entry
+            candidates: Optional[Dict[str, Set[int]]] = None
+            for token in set(tokens):
+                found = self._postings_matching(lambda vocab: token in vocab)
+                candidates = found if candidates is None else _intersect(candidates, found)
+        else:
+            # No word characters to look up (e.g. "&"): check every entry
+            candidates = {
+                key: set(range(len(self._files[key]["entries"])))
+                for key in keys if key in self._files
+            }
+
+        hits: Dict[str, Set[int]] = {}
+        for key in keys:
+            idxs = candidates.get(key) if candidates else None
+            if not idxs:
+                continue
+            entries = self._files[key]["entries"]
+            verified = {i for i in idxs if needle in entries[i]["text"].lower()}
+            if verified:
+                hits[key] = verified
+        return hits
+
+    def _term_hits(self, query: str, keys: List[str], require_all: bool) -> Dict[str, Set[int]]:
+        term_hits: List[Dict[str, Set[int]]] = []
+        for term in query.split():
+            prefix = term.endswith("*")
+            tokens = tokenize(term.rstrip("*"))
+            if not tokens:
+                continue
+
+            hits: Optional[Dict[str, Set[int]]] = None
+            for pos, token in enumerate(tokens):
+                if prefix and pos == len(tokens) - 1:
+                    found = self._postings_matching(lambda vocab: vocab.startswith(token))
+                else:
+                    found = _copy(self._postings.get(token, {}))
+                hits = found if hits is None else _intersect(hits, found)
+            term_hits.append(hits or {})
+
+        if not term_hits:
+            raise ValueError("Query has no searchable terms")
+
+        combined = term_hits[0]
+        for hits in term_hits[1:]:
+            combined = _intersect(combined, hits) if require_all else _union(combined, hits)
+
+        wanted = set(keys)
+        return {key: idxs for key, idxs in combined.items() if key in wanted}
+
+    def _postings_matching(self, predicate) -> Dict[str, Set[int]]:
+        found: Dict[str, Set[int]] = {}
+        for vocab, by_file in self._postings.items():
+            if predicate(vocab):
+                for key, idxs in by_file.items():
+                    found.setdefault(key, set()).update(idxs)
+        return found
+
+    def _add_postings(self, key: str, entries: List[Dict]) -> None:
+        for idx, entry in enumerate(entries):
+            for token in set(tokenize(entry["text"])):
+                self._postings.setdefault(token, {}).setdefault(key, set()).add(idx)
+
+    def _remove(self, key: str) -> None:
+        entry = self._files.pop(key, None)
+        if entry is None:
+            return
+        for text_entry in entry["entries"]:
+            for token in set(tokenize(text_entry["text"])):
+                by_file = self._postings.get(token)
+                if by_file is not None:
+                    by_file.pop(key, None)
+                    if not by_file:
+                        del self._postings[token]
+        self._dirty = True
+
+    def _load(self) -> None:
+        if not self.index_file.exists():
+            return
+        try:
+            payload = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, ValueError) as exc:
+            logger.warning("Ignoring unreadable keyword index %s: %s", self.index_file, exc)
+            return
+
+        if not isinstance(payload, dict) or payload.get("format") != _INDEX_FORMAT:
+            logger.info("Keyword index format changed, starting fresh")
+            return
+
+        files = payload.get("files")
+        if not isinstance(files, dict):
+            return
+        try:
+            for key, entry in files.items():
+                if len(entry["signature"]) != 2:
+                    raise ValueError(f"bad signature for {key}")
+                self._add_postings(key, entry["entries"])
+        except (KeyError, TypeError, ValueError) as exc:
+            logger.warning("Ignoring malformed keyword index %s: %s", self.index_file, exc)
+            self._files = {}
+            self._postings = {}
+            return
+        self._files = files
+
+
+def _copy(hits: Dict[str, Set[int]]) -> Dict[str, Set[int]]:
+    return {key: set(idxs) for key, idxs in hits.items()}
+
+
+def _intersect(a: Dict[str, Set[int]], b: Dict[str, Set[int]]) -> Dict[str, Set[int]]:
+    result: Dict[str, Set[int]] = {}
+    for key, idxs in a.items():
+        common = idxs & b.get(key, set())
+        if common:
+            result[key] = common
+    return result
+
+
+def _union(a: Dict[str, Set[int]], b: Dict[str, Set[int]]) -> Dict[str, Set[int]]:
+    result = _copy(a)
+    for key, idxs in b.items():
+        result.setdefault(key, set()).update(idxs)
+    return result
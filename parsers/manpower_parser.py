@@ -9,7 +9,9 @@ attendance, and leave information.
 import logging
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from .parse_stats import ParseStats, stage_timer
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,11 @@ JOB_TYPE_KEYWORDS: List[Tuple[str, str]] = [
 ]
 
 LEAVE_CATEGORIES = ("AL", "SH", "SL", "RD", "Training")
+LEAVE_MARKERS = tuple(f"{category}:" for category in LEAVE_CATEGORIES)
+
+DATE_RE = re.compile(r"(\d{1,2}/\d{1,2}(?:/\d{2,4})?)")
+DAY_RE = re.compile(r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\w*", re.IGNORECASE)
+NUMBER_RE = re.compile(r"(\d+)")
 
 ROLE_PATTERNS: List[Tuple[str, str]] = [
     (r"CP\s*\(\s*P\s*\)", "CP_P"),
@@ -40,6 +47,19 @@ ROLE_PATTERNS: List[Tuple[str, str]] = [
     (r"NP", "NP"),
 ]
 
+# One pattern per role: names after 'ROLE:' up to the next 'ROLE:' or the end
+_ROLE_LABELS = "|".join(pattern for pattern, _ in ROLE_PATTERNS)
+ROLE_RES: List[Tuple[Pattern, str]] = [
+    (
+        re.compile(
+            pattern + r"\s*:\s*([^\n]+?)(?=\s*(?:" + _ROLE_LABELS + r")\s*:|$)",
+            re.IGNORECASE,
+        ),
+        role_key,
+    )
+    for pattern, role_key in ROLE_PATTERNS
+]
+
 EMPTY_LEAVE: Dict[str, List[str]] = {
     "AL": [], "SH": [], "SL": [], "RD": [], "Training": [],
 }
@@ -144,13 +164,11 @@ def _parse_epic_roles(text: str) -> Dict:
 
     roles["EPIC"] = text.strip()
 
-    for pattern, role_key in ROLE_PATTERNS:
-        role_re = re.compile(
-            pattern + r"\s*:\s*([^\n]+?)(?=\s*(?:"
-            + "|".join(p for p, _ in ROLE_PATTERNS)
-            + r")\s*:|$)",
-            re.IGNORECASE,
-        )
+    # Every role needs a 'ROLE:' label
+    if ":" not in text:
+        return roles
+
+    for role_re, role_key in ROLE_RES:
         for match in role_re.finditer(text):
             names_str = match.group(1).strip().rstrip(",")
             names = [n.strip() for n in names_str.split(",") if n.strip()]
@@ -187,6 +205,41 @@ def _parse_shift_from_filename(filename: str) -> Tuple[str, str]:
     return week, year
 
 
+class RowFeatures(NamedTuple):
+    """Everything the shift row rules read from the joined row text."""
+
+    text: str
+    job_type: str
+    project_code: Optional[str]
+    team_counts: Dict[str, int]
+    on_duty: bool
+    apprentice: bool
+    term_labour: bool
+    leave: bool
+
+
+def _classify_row(cell_texts: List[str]) -> RowFeatures:
+    """
+    Tag one second-table row with all of its features.
+
+    The row text is joined and lowered once and every pattern is run once;
+    the keyword and marker tests stay plain substring checks, which beat a
+    combined regex scan in CPython.
+    """
+    text = " ".join(cell_texts)
+    lower_text = text.lower()
+    return RowFeatures(
+        text=text,
+        job_type=_classify_job_type(text),
+        project_code=_extract_project_code(text),
+        team_counts=_parse_team_counts(text),
+        on_duty="on duty" in lower_text or "attendance" in lower_text,
+        apprentice="apprentice" in lower_text,
+        term_labour="term labour" in lower_text or "term labor" in lower_text,
+        leave=any(marker in text for marker in LEAVE_MARKERS),
+    )
+
+
 # ── Table Parsing ─────────────────────────────────────────────────────────────
 
 
@@ -195,15 +248,34 @@ def _get_cell_text(cell) -> str:
     return "\n".join(p.text for p in cell.paragraphs).strip()
 
 
-def _parse_second_table(table, week: str, year: str) -> List[Dict]:
+def _parse_second_table(table, week: str, year: str, stats: Optional[ParseStats] = None) -> List[Dict]:
     """
     Parse the second table of a daily report DOCX for shift records.
 
     The table contains shift information split into sections:
     HLM, C&R Works and Projects, Attendance, Other Notable Items.
+    With *stats*, cell text extraction and row matching are timed there.
+    """
+    with stage_timer(stats, "extract"):
+        rows = [[_get_cell_text(c) for c in row.cells] for row in table.rows]
+    if stats is None:
+        return _parse_shift_rows(rows, week, year)
+
+    stats.counts["tables"] += 1
+    stats.counts["rows"] += max(len(rows) - 1, 0)
+    stats.counts["cells"] += sum(len(cells) for cells in rows[1:])
+    with stats.stage("match"):
+        return _parse_shift_rows(rows, week, year)
+
+
+def _parse_shift_rows(rows: List[List[str]], week: str, year: str) -> List[Dict]:
+    """
+    Build shift records from the cell texts of the second table.
+
+    *rows* holds one list of stripped cell texts per table row, header
+    included, so any table reader can feed it.
     """
     records: List[Dict] = []
-    rows = table.rows
 
     if len(rows) < 2:
         return records
@@ -212,23 +284,17 @@ def _parse_second_table(table, week: str, year: str) -> List[Dict]:
     current_day = ""
     current_shift = ""
 
-    for row in rows[1:]:
-        cells = row.cells
-        if len(cells) < 2:
+    for cell_texts in rows[1:]:
+        if len(cell_texts) < 2:
             continue
 
-        cell_texts = [_get_cell_text(c) for c in cells]
         first_cell = cell_texts[0] if cell_texts else ""
 
         # Detect date pattern
-        date_match = re.search(r"(\d{1,2}/\d{1,2}(?:/\d{2,4})?)", first_cell)
+        date_match = DATE_RE.search(first_cell)
         if date_match:
             current_date = date_match.group(1)
-            day_match = re.search(
-                r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\w*",
-                first_cell,
-                re.IGNORECASE,
-            )
+            day_match = DAY_RE.search(first_cell)
             if day_match:
                 current_day = day_match.group(0)
 
@@ -244,16 +310,13 @@ def _parse_second_table(table, week: str, year: str) -> List[Dict]:
             elif cell_text.strip() == "Night":
                 current_shift = "Night"
 
-        full_row_text = " ".join(cell_texts)
-        lower_text = full_row_text.lower()
+        row = _classify_row(cell_texts)
+        full_row_text = row.text
 
         # Parse job entries
-        job_type = _classify_job_type(full_row_text)
-        has_project = _extract_project_code(full_row_text) is not None
-
-        if job_type != "Other" or has_project:
-            project_code = _extract_project_code(full_row_text)
-            team_counts = _parse_team_counts(full_row_text)
+        if row.job_type != "Other" or row.project_code is not None:
+            project_code = row.project_code
+            team_counts = row.team_counts
 
             qty = 0.0
             for ct in cell_texts:
@@ -266,15 +329,17 @@ def _parse_second_table(table, week: str, year: str) -> List[Dict]:
 
             roles = _parse_epic_roles(full_row_text)
             done_by_raw = ""
-            for ct in cell_texts:
-                if TEAM_COUNT_RE.search(ct):
-                    done_by_raw = ct.strip()
-                    break
+            # A cell can only hold a team count if the row text does
+            if team_counts:
+                for ct in cell_texts:
+                    if TEAM_COUNT_RE.search(ct):
+                        done_by_raw = ct.strip()
+                        break
 
             worker_names = _extract_names_from_text(done_by_raw)
             total_workers = sum(team_counts.values()) + len(worker_names)
 
-            resolved_type = job_type if job_type != "Other" else (
+            resolved_type = row.job_type if row.job_type != "Other" else (
                 "C&R" if project_code else "Other"
             )
 
@@ -314,18 +379,17 @@ def _parse_second_table(table, week: str, year: str) -> List[Dict]:
                 records[-1]["jobs"].append(job)
 
         # Parse attendance
-        if "on duty" in lower_text or "attendance" in lower_text:
+        if row.on_duty:
             after_colon = (
                 full_row_text.split(":", 1)[-1] if ":" in full_row_text else ""
             )
             names = _extract_names_from_text(after_colon)
-            team_counts = _parse_team_counts(full_row_text)
             if records:
                 records[-1]["on_duty_names"] = names
-                records[-1]["on_duty_team_counts"] = team_counts
+                records[-1]["on_duty_team_counts"] = dict(row.team_counts)
 
         # Parse apprentices
-        if "apprentice" in lower_text:
+        if row.apprentice:
             after_colon = (
                 full_row_text.split(":", 1)[-1] if ":" in full_row_text else ""
             )
@@ -334,24 +398,22 @@ def _parse_second_table(table, week: str, year: str) -> List[Dict]:
                 records[-1]["apprentices"] = names
 
         # Parse term labour
-        if "term labour" in lower_text or "term labor" in lower_text:
+        if row.term_labour:
             count_src = (
                 full_row_text.split(":")[-1] if ":" in full_row_text
                 else full_row_text
             )
-            count_match = re.search(r"(\d+)", count_src)
+            count_match = NUMBER_RE.search(count_src)
             if count_match and records:
                 records[-1]["term_labour_count"] = int(count_match.group(1))
 
         # Parse leave
-        for category in LEAVE_CATEGORIES:
-            if f"{category}:" in full_row_text:
-                leave_data = _categorize_leave(full_row_text)
-                if records:
-                    for cat_key, cat_names in leave_data.items():
-                        if cat_names:
-                            records[-1]["leave"][cat_key].extend(cat_names)
-                break
+        if row.leave:
+            leave_data = _categorize_leave(full_row_text)
+            if records:
+                for cat_key, cat_names in leave_data.items():
+                    if cat_names:
+                        records[-1]["leave"][cat_key].extend(cat_names)
 
     return records
 
@@ -365,10 +427,12 @@ class ManpowerParser:
 
     Reads the SECOND table of each DOCX file matching the report pattern,
     extracting shift records with jobs, attendance, and leave data.
+    A :class:`ParseStats` *stats* collects per-stage timings.
     """
 
-    def __init__(self, folder_path: Path) -> None:
+    def __init__(self, folder_path: Path, stats: Optional[ParseStats] = None) -> None:
         self.folder_path = Path(folder_path)
+        self.stats = stats
 
     def get_report_files(self) -> List[Path]:
         """
@@ -402,7 +466,10 @@ class ManpowerParser:
 
         for filepath in files:
             try:
-                doc = Document(str(filepath))
+                with stage_timer(self.stats, "load"):
+                    doc = Document(str(filepath))
+                if self.stats is not None:
+                    self.stats.counts["files"] += 1
                 tables = doc.tables
 
                 if len(tables) < 2:
@@ -413,7 +480,7 @@ class ManpowerParser:
                     continue
 
                 week, year = _parse_shift_from_filename(filepath.name)
-                records = _parse_second_table(tables[1], week, year)
+                records = _parse_second_table(tables[1], week, year, self.stats)
                 all_records.extend(records)
 
                 logger.info(
@@ -430,4 +497,7 @@ class ManpowerParser:
                 )
                 continue
 
+        if self.stats is not None:
+            logger.info("Manpower parse stages: %s", self.stats.summary())
+
         return all_records
@@ -0,0 +1,274 @@
+# MTR DUAT - Streaming OOXML Reader
+"""
+Stream body paragraphs and tables straight out of a DOCX package.
+
+The python-docx object model builds proxy objects for every row, cell,
+paragraph and run access, and revisits merged cells once per grid column.
+This reader instead feeds ``word/document.xml`` from the zip through an
+incremental XML parser.  Each body-level block is handed out as soon as its
+closing tag is seen and then released, so peak memory stays at roughly one
+table.
+
+Cell semantics deliberately mirror python-docx ``_Row.cells``:
+
+* a cell spanning N grid columns (``w:gridSpan``) appears N times;
+* a ``w:vMerge`` continuation cell resolves to the cell above it;
+* cell text joins the cell's own paragraphs with newlines (nested tables
+  are ignored) and is stripped;
+* only ``w:r`` / ``w:hyperlink`` children contribute paragraph text, and
+  only direct ``w:r`` children contribute run colours.
+"""
+
+import io
+import posixpath
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_DOCUMENT_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+
+_DEFAULT_MAIN_PART = "word/document.xml"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+_BODY = _w("body")
+_P = _w("p")
+_R = _w("r")
+_T = _w("t")
+_TBL = _w("tbl")
+_TR = _w("tr")
+_TC = _w("tc")
+_TRPR = _w("trPr")
+_TCPR = _w("tcPr")
+_RPR = _w("rPr")
+_COLOR = _w("color")
+_GRID_BEFORE = _w("gridBefore")
+_GRID_SPAN = _w("gridSpan")
+_V_MERGE = _w("vMerge")
+_HYPERLINK = _w("hyperlink")
+_VAL = _w("val")
+_TYPE = _w("type")
+
+# Run inner-content elements and their plain-text equivalents (w:t and w:br
+# are handled separately because their text depends on the element).
+_RUN_TEXT_CHARS: Dict[str, str] = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+_BR = _w("br")
+
+RGB = Tuple[int, int, int]
+
+BLOCK_PARAGRAPH = "paragraph"
+BLOCK_TABLE = "table"
+
+
+class StreamCell(NamedTuple):
+    """Text and run colours of one table cell."""
+
+    text: str
+    run_colors: Tuple[Optional[RGB], ...]
+
+
+# ---------------------------------------------------------------------------
+# Element helpers
+# ---------------------------------------------------------------------------
+
+
+def _run_text(r) -> str:
+    parts: List[str] = []
+    for child in r:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or "")
+        elif tag == _BR:
+            # Page and column breaks have no text equivalent
+            if child.get(_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            char = _RUN_TEXT_CHARS.get(tag)
+            if char is not None:
+                parts.append(char)
+    return "".join(parts)
+
+
+def paragraph_text(p) -> str:
+    """Return the text of a ``w:p`` element the way python-docx does."""
+    parts: List[str] = []
+    for child in p:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterfind(_R))
+    return "".join(parts)
+
+
+def _run_color(r) -> Optional[RGB]:
+    rpr = r.find(_RPR)
+    if rpr is None:
+        return None
+    color = rpr.find(_COLOR)
+    if color is None:
+        return None
+    val = color.get(_VAL)
+    if not val or val == "auto" or len(val) != 6:
+        return None
+    try:
+        return int(val[0:2], 16), int(val[2:4], 16), int(val[4:6], 16)
+    except ValueError:
+        return None
+
+
+def _int_val(parent, tag: str, default: int) -> int:
+    if parent is None:
+        return default
+    el = parent.find(tag)
+    if el is None:
+        return default
+    try:
+        return int(el.get(_VAL, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _stream_cell(tc) -> StreamCell:
+    paragraphs = tc.findall(_P)
+    text = "\n".join(paragraph_text(p) for p in paragraphs).strip()
+    colors = tuple(_run_color(r) for p in paragraphs for r in p.iterfind(_R))
+    return StreamCell(text, colors)
+
+
+def table_rows(tbl) -> List[List[StreamCell]]:
+    """Expand a ``w:tbl`` element into rows of :class:`StreamCell`."""
+    rows: List[List[StreamCell]] = []
+    # grid offset -> (root cell, root span) of the previous row, for vMerge
+    above: Dict[int, Tuple[StreamCell, int]] = {}
+
+    for tr in tbl.iterfind(_TR):
+        offset = _int_val(tr.find(_TRPR), _GRID_BEFORE, 0)
+        cells: List[StreamCell] = []
+        current: Dict[int, Tuple[StreamCell, int]] = {}
+
+        for tc in tr.iterfind(_TC):
+            tcpr = tc.find(_TCPR)
+            span = _int_val(tcpr, _GRID_SPAN, 1)
+            v_merge = None
+            if tcpr is not None:
+                v_merge_el = tcpr.find(_V_MERGE)
+                if v_merge_el is not None:
+                    v_merge = v_merge_el.get(_VAL, "continue")
+
+            if v_merge == "continue" and offset in above:
+                root = above[offset]
+            else:
+                root = (_stream_cell(tc), span)
+
+            cells.extend([root[0]] * root[1])
+            current[offset] = root
+            offset += span
+
+        above = current
+        rows.append(cells)
+
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Package access
+# ---------------------------------------------------------------------------
+
+
+def _main_part_name(package: zipfile.ZipFile) -> str:
+    """Resolve the main document part from the package relationships."""
+    try:
+        rels = ElementTree.fromstring(package.read("_rels/.rels"))
+    except (KeyError, ElementTree.ParseError):
+        return _DEFAULT_MAIN_PART
+
+    for rel in rels.iterfind(f"{{{_REL_NS}}}Relationship"):
+        if rel.get("Type") == _OFFICE_DOCUMENT_REL:
+            target = rel.get("Target", "").lstrip("/")
+            return posixpath.normpath(target) if target else _DEFAULT_MAIN_PART
+    return _DEFAULT_MAIN_PART
+
+
+def iter_body_blocks(filepath, stats=None) -> Iterator[Tuple[str, Any]]:
+    """Yield the body-level blocks of a DOCX file in document order.
+
+    Yields ``("paragraph", text)`` for each body paragraph and
+    ``("table", rows)`` for each body table, where *rows* is a list of rows
+    of :class:`StreamCell`.  Raises ``zipfile.BadZipFile``, ``KeyError`` or
+    ``ElementTree.ParseError`` for files that are not valid DOCX packages.
+
+    With a :class:`~parsers.parse_stats.ParseStats` *stats*, the document
+    part is decompressed up front so ``unzip``, ``xml`` and ``extract``
+    (building the blocks) are timed separately.
+    """
+    with zipfile.ZipFile(Path(filepath)) as package:
+        part_name = _main_part_name(package)
+        if stats is None:
+            with package.open(part_name) as stream:
+                yield from _iter_blocks(stream)
+            return
+
+        with stats.stage("unzip"):
+            data = package.read(part_name)
+        yield from _iter_blocks(io.BytesIO(data), stats)
+
+
+def _iter_blocks(stream, stats=None) -> Iterator[Tuple[str, Any]]:
+    depth = 0
+    body = None
+    # Time spent in here since the consumer last resumed us
+    resumed = time.perf_counter() if stats is not None else 0.0
+    for event, elem in ElementTree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 2 and elem.tag == _BODY:
+                body = elem
+            continue
+
+        depth -= 1
+        # Body children sit at depth 3: w:document > w:body > block
+        if depth != 2 or body is None:
+            continue
+
+        if elem.tag == _TBL:
+            kind, build = BLOCK_TABLE, table_rows
+        elif elem.tag == _P:
+            kind, build = BLOCK_PARAGRAPH, paragraph_text
+        else:
+            body.remove(elem)
+            continue
+
+        if stats is None:
+            yield kind, build(elem)
+        else:
+            parsed = time.perf_counter()
+            block = build(elem)
+            stats.add("xml", parsed - resumed)
+            stats.add("extract", time.perf_counter() - parsed)
+            yield kind, block
+            resumed = time.perf_counter()
+        body.remove(elem)
+
+    if stats is not None:
+        stats.add("xml", time.perf_counter() - resumed)
+
+
+def iter_body_tables(filepath, stats=None) -> Iterator[List[List[StreamCell]]]:
+    """Yield the rows of every body-level table in a DOCX file."""
+    for kind, block in iter_body_blocks(filepath, stats):
+        if kind == BLOCK_TABLE:
+            yield block
@@ -0,0 +1,163 @@
+# MTR DUAT - Parse Cache
+"""
+Persistent per-file record cache for daily-report parsing.
+
+Old weekly reports never change, so a folder rescan only needs to open files
+that are new or modified.  Each cache entry is keyed by the resolved file path
+and stores the file size, modification time and the parser version stamp that
+produced the records.  Any mismatch is treated as a miss.
+
+The cache is a single JSON file so it survives sidecar restarts.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("duat.parser")
+
+DEFAULT_CACHE_FILENAME = "parse_cache.json"
+
+_CACHE_FORMAT = 1
+
+
+def write_json_atomic(path: Path, payload) -> None:
+    """Write *payload* as JSON via a temp file so readers never see a partial file."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _file_signature(filepath: Path) -> Optional[Tuple[int, int]]:
+    """Return ``(size, mtime_ns)`` for *filepath*, or ``None`` if it cannot be read."""
+    try:
+        stat = filepath.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class ParseCache:
+    """On-disk cache of delivery records produced by ``process_docx``.
+
+    Usage::
+
+        cache = ParseCache(cache_dir / DEFAULT_CACHE_FILENAME, PARSER_VERSION)
+        records = cache.get(path)
+        if records is None:
+            records = process_docx(path)
+            cache.put(path, records)
+        cache.save()
+    """
+
+    def __init__(self, cache_file, version: str) -> None:
+        self.cache_file: Path = Path(cache_file)
+        self.version: str = str(version)
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: Dict[str, Dict] = {}
+        self._dirty: bool = False
+        self._load()
+
+    # -- public API ---------------------------------------------------------
+
+    def get(self, filepath) -> Optional[List[Dict]]:
+        """Return cached records for *filepath*, or ``None`` on a miss."""
+        filepath = Path(filepath)
+        entry = self._entries.get(self._key(filepath))
+        signature = _file_signature(filepath)
+
+        if (
+            entry is None
+            or signature is None
+            or entry.get("version") != self.version
+            or (entry.get("size"), entry.get("mtime_ns")) != signature
+        ):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["records"]
+
+    def put(self, filepath, records: List[Dict], signature: Optional[Tuple[int, int]] = None) -> None:
+        """Store *records* for *filepath*.
+
+        Pass the *signature* captured before parsing when available, so a
+        file modified mid-parse is re-read on the next scan.
+        """
+        filepath = Path(filepath)
+        if signature is None:
+            signature = _file_signature(filepath)
+        if signature is None:
+            return
+
+        self._entries[self._key(filepath)] = {
+            "size": signature[0],
+            "mtime_ns": signature[1],
+            "version": self.version,
+            "records": records,
+        }
+        self._dirty = True
+
+    def signature(self, filepath) -> Optional[Tuple[int, int]]:
+        """Return the ``(size, mtime_ns)`` pair used to validate entries."""
+        return _file_signature(Path(filepath))
+
+    def discard_missing(self) -> int:
+        """Drop entries whose files no longer exist.  Returns the count removed."""
+        stale = [key for key in self._entries if not Path(key).exists()]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove every entry (the file is rewritten on the next ``save``)."""
+        if self._entries:
+            self._entries = {}
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Write the cache to disk if it changed.  Returns True on success."""
+        if not self._dirty:
+            return True
+
+        payload = {"format": _CACHE_FORMAT, "entries": self._entries}
+        try:
+            write_json_atomic(self.cache_file, payload)
+        except OSError as exc:
+            logger.warning("Failed to write parse cache %s: %s", self.cache_file, exc)
+            return False
+
+        self._dirty = False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _key(filepath: Path) -> str:
+        return str(filepath.resolve())
+
+    def _load(self) -> None:
+        if not self.cache_file.exists():
+            return
+        try:
+            payload = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, ValueError) as exc:
+            logger.warning("Ignoring unreadable parse cache %s: %s", self.cache_file, exc)
+            return
+
+        if not isinstance(payload, dict) or payload.get("format") != _CACHE_FORMAT:
+            logger.info("Parse cache format changed, starting fresh")
+            return
+
+        entries = payload.get("entries")
+        if isinstance(entries, dict):
+            self._entries = entries
@@ -0,0 +1,97 @@
+# MTR DUAT - Parse Stage Timings
+"""
+Per-stage wall time and item counts for the DOCX parsers.
+
+Instrumentation is off unless a :class:`ParseStats` is passed to
+``process_docx`` / ``DailyReportParser`` / ``ManpowerParser`` (the folder
+parse endpoint does so when asked, or when ``DUAT_PARSE_STATS=1``).
+Without one the hot paths only pay a ``None`` check per row.
+
+Stages:
+
+* ``load``    -- python-docx ``Document()``: zip decompression, XML parse
+  and object model build in one call
+* ``unzip``   -- stream engine: reading the document part out of the zip
+* ``xml``     -- stream engine: incremental XML parsing
+* ``extract`` -- cell text extraction (``row.cells`` and paragraph text, or
+  building the stream engine's cells)
+* ``blue``    -- run colour walk of the night-shift blue-text rule
+* ``match``   -- row classification: date, project, keyword and line
+  regexes and the rest of the record rules
+
+Counts: ``files``, ``tables``, ``rows``, ``cells`` and ``runs`` (runs whose
+colour was checked).
+"""
+
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Optional
+
+STATS_ENV = "DUAT_PARSE_STATS"
+
+STAGES = ("load", "unzip", "xml", "extract", "blue", "match")
+COUNTS = ("files", "tables", "rows", "cells", "runs")
+
+
+def stats_enabled() -> bool:
+    """Whether ``DUAT_PARSE_STATS`` turns stage timing on for every parse."""
+    return os.environ.get(STATS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ParseStats:
+    """Accumulated stage seconds and item counts; picklable for pool workers."""
+
+    __slots__ = ("seconds", "counts")
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTS, 0)
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - started
+
+    def add(self, name: str, seconds: float) -> None:
+        self.seconds[name] += seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] += n
+
+    def merge(self, other: "ParseStats") -> None:
+        """Add the totals of *other* (e.g. from a pool worker) to these."""
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+        for name, n in other.counts.items():
+            self.counts[name] += n
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            "seconds": {name: round(seconds, 4) for name, seconds in self.seconds.items()},
+            "counts": dict(self.counts),
+            "total_seconds": round(self.total_seconds, 4),
+        }
+
+    def summary(self) -> str:
+        """One log line: stages by time with their share, then the counts."""
+        total = self.total_seconds or 1.0
+        stages = ", ".join(
+            f"{name} {seconds:.2f}s ({seconds / total:.0%})"
+            for name, seconds in sorted(self.seconds.items(), key=lambda item: -item[1])
+            if seconds
+        )
+        counts = ", ".join(f"{name} {n}" for name, n in self.counts.items())
+        return f"{stages or 'no stages timed'} | {counts}"
+
+
+def stage_timer(stats: Optional[ParseStats], name: str) -> ContextManager:
+    """``stats.stage(name)``, or a no-op when *stats* is None."""
+    return stats.stage(name) if stats is not None else nullcontext()
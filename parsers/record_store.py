@@ -0,0 +1,111 @@
+# MTR DUAT - Record Store
+"""
+Columnar storage for parsed delivery records.
+
+A folder parse used to keep every delivery row as its own ``dict``.  The
+store keeps one typed ``array`` per field instead: ``Qty Delivered`` as
+doubles and the string fields (FullDate, Project, Week, Year, Line) as
+``int32`` codes into a per-field category list.  The strings repeat heavily
+across an archive (a few dozen projects and line codes, one FullDate per
+day), so each record costs a few dozen bytes instead of a dict with six
+boxed values.
+
+Records can still be read back as dicts with ``to_records()`` or by
+iterating the store.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Field order matches the dicts built by docx_parser._row_record
+QTY_FIELD = "Qty Delivered"
+RECORD_FIELDS: Tuple[str, ...] = ("FullDate", "Project", QTY_FIELD, "Week", "Year", "Line")
+CATEGORICAL_FIELDS: Tuple[str, ...] = tuple(f for f in RECORD_FIELDS if f != QTY_FIELD)
+
+
+class RecordStore:
+    """Append-only columnar store of delivery records.
+
+    Usage::
+
+        store = RecordStore()
+        parser.process_into(store)
+        len(store)
+        store.codes("Project"), store.categories("Project")
+        store.to_records()          # list of dicts, as process_all returns
+    """
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, array] = {f: array("i") for f in CATEGORICAL_FIELDS}
+        self._categories: Dict[str, List[Any]] = {f: [] for f in CATEGORICAL_FIELDS}
+        self._lookup: Dict[str, Dict[Any, int]] = {f: {} for f in CATEGORICAL_FIELDS}
+        self._qty = array("d")
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "RecordStore":
+        """Build a store from record dicts."""
+        store = cls()
+        store.extend(records)
+        return store
+
+    # -- writing ------------------------------------------------------------
+
+    def append(self, record: Dict) -> None:
+        """Append one record dict."""
+        for field in CATEGORICAL_FIELDS:
+            value = record.get(field, "")
+            lookup = self._lookup[field]
+            code = lookup.get(value)
+            if code is None:
+                code = len(self._categories[field])
+                self._categories[field].append(value)
+                lookup[value] = code
+            self._codes[field].append(code)
+        self._qty.append(float(record.get(QTY_FIELD, 0.0)))
+
+    def extend(self, records: Iterable[Dict]) -> None:
+        """Append every record dict in *records*."""
+        for record in records:
+            self.append(record)
+
+    def clear(self) -> None:
+        """Drop all records and categories."""
+        self.__init__()
+
+    # -- reading ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._qty)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_records())
+
+    def codes(self, field: str) -> array:
+        """Return the ``int32`` category codes of a string field."""
+        return self._codes[field]
+
+    def categories(self, field: str) -> List[Any]:
+        """Return the distinct values of a string field, indexed by code."""
+        return self._categories[field]
+
+    @property
+    def qty(self) -> array:
+        """Return the ``Qty Delivered`` column as an array of doubles."""
+        return self._qty
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers in bytes (categories excluded)."""
+        total = self._qty.itemsize * len(self._qty)
+        for codes in self._codes.values():
+            total += codes.itemsize * len(codes)
+        return total
+
+    def to_records(self) -> List[Dict]:
+        """Decode the store back into record dicts in insertion order."""
+        columns = [
+            self._qty if field == QTY_FIELD
+            else [self._categories[field][c] for c in self._codes[field]]
+            for field in RECORD_FIELDS
+        ]
+        return [dict(zip(RECORD_FIELDS, values)) for values in zip(*columns)]
@@ -0,0 +1,308 @@
+# MTR DUAT - Report Scanner
+"""
+Single-pass scan of daily report DOCX files.
+
+The delivery parser reads every table, the manpower parser reads the second
+table and keyword search reads all paragraphs and cells.  Run separately they
+open each report three times.  :func:`scan_report` loads a file once and
+feeds all three extractors from that load.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .docx_parser import (
+    ENGINE_DOCX,
+    ENGINE_STREAM,
+    ENGINES,
+    _cell_has_blue_text,
+    _cell_text,
+    _parse_stream_table_records,
+    _row_record,
+    extract_week_year_from_filename,
+    resolve_worker_count,
+)
+from .manpower_parser import (
+    REPORT_GLOB,
+    _get_cell_text,
+    _parse_shift_from_filename,
+    _parse_shift_rows,
+)
+from .ooxml_stream import BLOCK_PARAGRAPH, BLOCK_TABLE, iter_body_blocks
+from .parse_cache import _file_signature
+
+logger = logging.getLogger("duat.parser")
+
+# Matched text is truncated to this many characters in search results
+MATCH_TEXT_LIMIT = 500
+
+
+# ---------------------------------------------------------------------------
+# Text entries / keyword matching
+# ---------------------------------------------------------------------------
+
+
+def _text_entries(paragraphs: List[str], tables: List[List[List[str]]]) -> List[Dict]:
+    """Build ``{"location", "text"}`` entries for non-empty paragraphs and cells."""
+    entries: List[Dict] = []
+    for text in paragraphs:
+        text = text.strip()
+        if text:
+            entries.append({"location": "Paragraph", "text": text})
+
+    for t_idx, rows in enumerate(tables):
+        for r_idx, row in enumerate(rows):
+            for c_idx, text in enumerate(row):
+                if text:
+                    entries.append({
+                        "location": f"Table {t_idx+1}, Row {r_idx+1}, Col {c_idx+1}",
+                        "text": text,
+                    })
+    return entries
+
+
+def extract_text_entries(doc) -> List[Dict]:
+    """Return the searchable text entries of a python-docx ``Document``."""
+    tables = [
+        [[_get_cell_text(c) for c in row.cells] for row in table.rows]
+        for table in doc.tables
+    ]
+    return _text_entries([p.text for p in doc.paragraphs], tables)
+
+
+def read_text_entries(filepath: Path, engine: str = ENGINE_DOCX) -> List[Dict]:
+    """Open *filepath* and return its text entries.  Raises if it cannot be read."""
+    if engine == ENGINE_STREAM:
+        paragraphs: List[str] = []
+        tables: List[List[List[str]]] = []
+        for kind, block in iter_body_blocks(filepath):
+            if kind == BLOCK_PARAGRAPH:
+                paragraphs.append(block)
+            elif kind == BLOCK_TABLE:
+                tables.append([[c.text for c in row] for row in block])
+        return _text_entries(paragraphs, tables)
+
+    from docx import Document
+
+    return extract_text_entries(Document(str(filepath)))
+
+
+def search_text_entries(entries: List[Dict], keyword: str) -> List[Dict]:
+    """Return case-insensitive matches of *keyword*, de-duplicated by text."""
+    needle = keyword.lower()
+    seen = set()
+    matches: List[Dict] = []
+    for entry in entries:
+        if needle not in entry["text"].lower():
+            continue
+        text = entry["text"][:MATCH_TEXT_LIMIT]
+        if text in seen:
+            continue
+        seen.add(text)
+        matches.append({"location": entry["location"], "text": text})
+    return matches
+
+
+# ---------------------------------------------------------------------------
+# Single-file scan
+# ---------------------------------------------------------------------------
+
+
+def _empty_scan() -> Dict:
+    return {"records": [], "shifts": [], "texts": [], "has_manpower_table": False}
+
+
+def _shift_records(filepath: Path, table_texts: List[List[List[str]]], week: str, year: str) -> List[Dict]:
+    """Run the manpower extractor on the second table, as ``ManpowerParser`` does."""
+    if len(table_texts) < 2:
+        logger.warning("File %s has fewer than 2 tables, skipping", filepath.name)
+        return []
+    try:
+        return _parse_shift_rows(table_texts[1], week, year)
+    except Exception as exc:
+        logger.error("Failed to parse %s: %s", filepath.name, exc)
+        return []
+
+
+def _scan_docx(filepath: Path, week: str, year: str, shift_week: str, shift_year: str) -> Dict:
+    from docx import Document
+
+    doc = Document(str(filepath))
+
+    records: List[Dict] = []
+    table_texts: List[List[List[str]]] = []
+    for table in doc.tables:
+        rows_texts: List[List[str]] = []
+        for r_idx, row in enumerate(table.rows):
+            cells = row.cells
+            texts = [_cell_text(c) for c in cells]
+            rows_texts.append(texts)
+            if r_idx == 0:
+                continue
+            # Same row rules as _parse_table_records, reusing the cell texts
+            record = _row_record(
+                texts,
+                lambda: any(_cell_has_blue_text(c) for c in cells),
+                week,
+                year,
+            )
+            if record is not None:
+                records.append(record)
+        table_texts.append(rows_texts)
+
+    shifts = _shift_records(filepath, table_texts, shift_week, shift_year)
+
+    return {
+        "records": records,
+        "shifts": shifts,
+        "texts": _text_entries([p.text for p in doc.paragraphs], table_texts),
+        "has_manpower_table": len(table_texts) >= 2,
+    }
+
+
+def _scan_stream(filepath: Path, week: str, year: str, shift_week: str, shift_year: str) -> Dict:
+    paragraphs: List[str] = []
+    table_texts: List[List[List[str]]] = []
+    records: List[Dict] = []
+
+    for kind, block in iter_body_blocks(filepath):
+        if kind == BLOCK_PARAGRAPH:
+            paragraphs.append(block)
+        elif kind == BLOCK_TABLE:
+            records.extend(_parse_stream_table_records(block, week, year))
+            table_texts.append([[c.text for c in row] for row in block])
+
+    shifts = _shift_records(filepath, table_texts, shift_week, shift_year)
+
+    return {
+        "records": records,
+        "shifts": shifts,
+        "texts": _text_entries(paragraphs, table_texts),
+        "has_manpower_table": len(table_texts) >= 2,
+    }
+
+
+def scan_report(filepath: Path, engine: str = ENGINE_DOCX) -> Dict:
+    """Load one report and run every extractor on it.
+
+    Returns a dict with:
+
+    * ``records`` -- delivery records, as from ``process_docx``
+    * ``shifts`` -- manpower shift records from the second table
+    * ``texts`` -- ``{"location", "text"}`` entries for keyword search
+    * ``has_manpower_table`` -- whether a second table was present
+
+    Files that do not exist or cannot be opened yield empty results.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown parser engine: {engine!r}")
+
+    filepath = Path(filepath)
+    if not filepath.exists() or filepath.suffix.lower() != ".docx":
+        logger.warning("Not a readable .docx file: %s", filepath)
+        return _empty_scan()
+
+    week_num, year_num = extract_week_year_from_filename(filepath.name)
+    week = str(week_num) if week_num else ""
+    year = str(year_num) if year_num else ""
+    shift_week, shift_year = _parse_shift_from_filename(filepath.name)
+
+    scan = _scan_stream if engine == ENGINE_STREAM else _scan_docx
+    try:
+        return scan(filepath, week, year, shift_week, shift_year)
+    except Exception as exc:
+        logger.error("Failed to scan DOCX %s: %s", filepath, exc)
+        return _empty_scan()
+
+
+# ---------------------------------------------------------------------------
+# ReportScanner class
+# ---------------------------------------------------------------------------
+
+
+class ReportScanner:
+    """Scan a folder of daily reports once for all three pipelines.
+
+    Usage::
+
+        scanner = ReportScanner(Path("C:/Reports"), workers=4)
+        result = scanner.scan_all(progress_callback=my_cb)
+        result["records"], result["shifts"], result["texts"]
+
+    ``texts`` maps each filename to its text entries.  Results are merged in
+    sorted file order regardless of ``workers``.
+    """
+
+    def __init__(self, folder_path, workers: int = 1, engine: str = ENGINE_DOCX) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown parser engine: {engine!r}")
+        self.folder_path: Path = Path(folder_path)
+        self.workers: int = resolve_worker_count(workers)
+        self.engine: str = engine
+
+    def get_report_files(self) -> List[Path]:
+        """Return sorted report files, excluding ``~$`` temp files."""
+        if not self.folder_path.is_dir():
+            return []
+        return sorted(
+            f for f in self.folder_path.glob(REPORT_GLOB)
+            if not f.name.startswith("~$")
+        )
+
+    def scan_all(
+        self,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+    ) -> Dict:
+        """Scan every report and return the merged results.
+
+        The result dict holds ``records``, ``max_week``, ``shifts``,
+        ``manpower_files`` (reports with a second table), ``texts`` and the
+        ``signatures`` each file had when the scan started.
+        """
+        files = self.get_report_files()
+        signatures = {f.name: _file_signature(f) for f in files}
+        per_file: List[Optional[Dict]] = [None] * len(files)
+
+        for done, (idx, scan) in enumerate(self._iter_scanned(files), start=1):
+            per_file[idx] = scan
+            if progress_callback is not None:
+                progress_callback(files[idx].name, done / len(files))
+
+        records: List[Dict] = []
+        shifts: List[Dict] = []
+        texts: Dict[str, List[Dict]] = {}
+        manpower_files = 0
+        for fpath, scan in zip(files, per_file):
+            records.extend(scan["records"])
+            shifts.extend(scan["shifts"])
+            texts[fpath.name] = scan["texts"]
+            manpower_files += scan["has_manpower_table"]
+
+        max_week = max((extract_week_year_from_filename(f.name)[0] for f in files), default=0)
+
+        return {
+            "records": records,
+            "max_week": max_week,
+            "shifts": shifts,
+            "manpower_files": manpower_files,
+            "texts": texts,
+            "signatures": signatures,
+        }
+
+    def _iter_scanned(self, files: List[Path]) -> Iterator[Tuple[int, Dict]]:
+        """Yield ``(file_index, scan)`` as each file finishes."""
+        if not files:
+            return
+
+        workers = min(self.workers, len(files))
+        if workers <= 1:
+            for idx, fpath in enumerate(files):
+                yield idx, scan_report(fpath, self.engine)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(scan_report, fpath, self.engine): idx for idx, fpath in enumerate(files)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
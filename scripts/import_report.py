@@ -0,0 +1,93 @@
+"""
+MTR DUAT - Import-Time Report
+
+Measures what the sidecar imports before uvicorn can bind its port, using
+``python -X importtime``, and lists the slowest modules.  Also checks that
+the heavy libraries which are meant to load on first use (matplotlib,
+openpyxl, python-docx) stay out of the startup path.
+
+Usage:
+    python scripts/import_report.py             # Top 25 modules
+    python scripts/import_report.py --top 50
+    python scripts/import_report.py --check     # Exit 1 if a deferred library is imported
+"""
+
+import argparse
+import logging
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, NamedTuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="[%(asctime)s] [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger("import_report")
+
+ROOT = Path(__file__).parent.parent
+
+# Loaded on first use, never during sidecar startup
+DEFERRED_PACKAGES = ("matplotlib", "openpyxl", "docx", "lxml")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(text: str) -> List[ImportEntry]:
+    """Parse the ``-X importtime`` lines of *text* (stderr of the child)."""
+    entries = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure(target: str = "backend.main") -> List[ImportEntry]:
+    """Import *target* in a fresh interpreter and return its import timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report sidecar import time")
+    parser.add_argument("--target", default="backend.main", help="Module to import (default: backend.main)")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list (default: 25)")
+    parser.add_argument("--check", action="store_true", help="Fail if a deferred library is imported")
+    args = parser.parse_args()
+
+    entries = measure(args.target)
+    total_us = sum(e.cumulative_us for e in entries if e.depth == 0)
+    logger.info("Importing %s took %.0f ms (%d modules)", args.target, total_us / 1000, len(entries))
+
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in sorted(entries, key=lambda e: e.cumulative_us, reverse=True)[:args.top]:
+        print(f"{entry.cumulative_us / 1000:>14.1f} {entry.self_us / 1000:>9.1f}  {'  ' * entry.depth}{entry.module}")
+
+    loaded = sorted({e.module.split(".")[0] for e in entries} & set(DEFERRED_PACKAGES))
+    if loaded:
+        logger.warning("Deferred libraries imported at startup: %s", ", ".join(loaded))
+        return 1 if args.check else 0
+    logger.info("Deferred libraries not imported: %s", ", ".join(DEFERRED_PACKAGES))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
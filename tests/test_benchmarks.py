@@ -0,0 +1,144 @@
+# MTR DUAT - Benchmark Harness Tests
+"""Smoke tests for the synthetic report generator and the benchmarks."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from analysis.dashboard import aggregate_records
+from benchmarks import bench_api
+from benchmarks.bench_parsers import (
+    CASE_DAILY_REPORT,
+    CASE_MANPOWER,
+    CASE_PROCESS_DOCX,
+    GENERATED_MARKER,
+    compare,
+    prepare_reports,
+    run_case,
+)
+from benchmarks.report_generator import generate_reports, report_filename
+from parsers.docx_parser import DailyReportParser, process_docx
+from parsers.manpower_parser import ManpowerParser
+
+
+@pytest.fixture(scope="module")
+def reports(tmp_path_factory) -> Path:
+    folder = tmp_path_factory.mktemp("reports")
+    generate_reports(folder, count=3, variants=2, rows_per_shift=2)
+    return folder
+
+
+# ===========================================================================
+# 1. Report generator
+# ===========================================================================
+
+
+class TestReportGenerator:
+    @pytest.mark.unit
+    def test_file_names_follow_report_pattern(self, reports: Path):
+        files = DailyReportParser(reports).get_report_files()
+        assert [f.name for f in files] == [report_filename(i) for i in range(3)]
+        assert report_filename(52) == "PS-OHLR_DUAT_Daily Report_WK01_2021.docx"
+
+    @pytest.mark.unit
+    def test_delivery_table_has_zeroed_blue_night_rows(self, reports: Path):
+        records = process_docx(reports / report_filename(0))
+        night = [r for r in records if r["Project"].startswith("C") and r["Qty Delivered"] == 0.0]
+        assert records and night
+        assert records == process_docx(reports / report_filename(0), "stream")
+
+    @pytest.mark.unit
+    def test_manpower_table_has_day_and_night_shifts(self, reports: Path):
+        records = ManpowerParser(reports).process_all()
+        assert {r["shift"] for r in records} == {"Day", "Night"}
+        assert all(r["jobs"] for r in records)
+        assert any(r["term_labour_count"] for r in records)
+        assert any(r["leave"]["AL"] for r in records)
+
+
+# ===========================================================================
+# 2. Benchmark cases
+# ===========================================================================
+
+
+class TestBenchmarkCases:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("case", [CASE_PROCESS_DOCX, CASE_DAILY_REPORT, CASE_MANPOWER])
+    def test_run_case_reports_throughput(self, reports: Path, case: str):
+        result = run_case(case, reports, engine="stream")
+        assert result["files"] == 3 and result["records"] > 0
+        assert result["files_per_sec"] > 0 and result["records_per_sec"] > 0
+        assert result["peak_rss_mb"] is None or result["peak_rss_mb"] > 0
+
+    @pytest.mark.unit
+    def test_compare_flags_slowdowns_beyond_tolerance(self):
+        baseline = [{"name": "a", "files_per_sec": 100.0}, {"name": "b", "files_per_sec": 100.0}]
+        results = [{"name": "a", "files_per_sec": 85.0}, {"name": "b", "files_per_sec": 70.0}]
+        assert compare(results, baseline, tolerance=0.2) == ["b"]
+
+    @pytest.mark.unit
+    def test_prepare_reports_regenerates_only_its_own_folders(self, tmp_path: Path):
+        prepare_reports(tmp_path, 2)
+        assert (tmp_path / GENERATED_MARKER).exists()
+        prepare_reports(tmp_path, 3)
+        assert len(DailyReportParser(tmp_path).get_report_files()) == 3
+
+    @pytest.mark.unit
+    def test_prepare_reports_refuses_foreign_reports(self, tmp_path: Path):
+        generate_reports(tmp_path, count=2, variants=1, rows_per_shift=1)
+        with pytest.raises(ValueError, match="not generated by this tool"):
+            prepare_reports(tmp_path, 3)
+        assert len(DailyReportParser(tmp_path).get_report_files()) == 2
+        # The matching count is reused as is
+        prepare_reports(tmp_path, 2)
+        assert not (tmp_path / GENERATED_MARKER).exists()
+
+
+# ===========================================================================
+# 3. API latency benchmark
+# ===========================================================================
+
+
+class TestApiBenchmark:
+    @pytest.mark.unit
+    def test_synthetic_records_aggregate_cleanly(self):
+        records = bench_api.synthetic_records(500)
+        df = aggregate_records(records)
+        assert len(df) == 500
+        assert df["DateObj"].notna().all()
+        assert set(df["Project"]) & set(bench_api.project_codes())
+
+    @pytest.mark.unit
+    def test_summary_reports_percentiles_and_throughput(self):
+        recorder = bench_api.Recorder()
+        recorder.latencies["a"] = [i / 1000 for i in range(1, 101)]
+        recorder.busy["a"] = 2.0
+        (result,) = recorder.summary()
+        assert result["requests"] == 100 and result["errors"] == 0
+        assert result["p50_ms"] == pytest.approx(50.5)
+        assert result["p99_ms"] == pytest.approx(99.0, abs=0.1)
+        assert result["requests_per_sec"] == 50.0
+
+    @pytest.mark.unit
+    def test_compare_flags_latency_rises_beyond_tolerance(self):
+        baseline = [{"name": "a", "p95_ms": 100.0}, {"name": "b", "p95_ms": 100.0}]
+        results = [{"name": "a", "p95_ms": 115.0}, {"name": "b", "p95_ms": 130.0}]
+        assert bench_api.compare(results, baseline, tolerance=0.2) == ["b"]
+
+    @pytest.mark.integration
+    def test_replays_request_mix_against_app(self, tmp_path: Path):
+        output = tmp_path / "bench_api.json"
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_api", "--records", "2000", "--reports", "2",
+             "--rounds", "1", "--warmup", "0", "--clients", "2", "--output", str(output)],
+            cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True,
+        )
+        results = {r["name"]: r for r in json.loads(output.read_text())["results"]}
+        for name in ("parse/scan", "dashboard/analyze", "dashboard/pivot", "lag/calculate",
+                     "scurve/calculate", "manpower/analysis"):
+            assert results[name]["errors"] == 0
+        assert results["dashboard/stats"]["requests"] == 2
+        assert all(r["p99_ms"] >= r["p50_ms"] > 0 for r in results.values())
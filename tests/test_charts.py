@@ -0,0 +1,143 @@
+# MTR DUAT - Chart Renderer Tests
+"""Tests for backend/charts.py."""
+
+import asyncio
+import base64
+import threading
+
+import pandas as pd
+import pytest
+
+from analysis.scurve import plot_scurve
+from backend.charts import CHART_WORKERS_ENV, DEFAULT_CHART_WORKERS, ChartRenderer, chart_key, chart_workers
+
+
+class CountingRender:
+    """Stand-in plot function for in-thread renders (workers=0)."""
+
+    def __init__(self, result="image", gate=None):
+        self.calls = 0
+        self.result = result
+        self.gate = gate
+        self._lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self._lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(10)
+        return None if self.result is None else f"{self.result}:{args}"
+
+
+@pytest.fixture
+def renderer():
+    renderer = ChartRenderer(max_entries=2, workers=0)
+    yield renderer
+    renderer.shutdown()
+
+
+# ===========================================================================
+# 1. chart_key
+# ===========================================================================
+
+
+class TestChartKey:
+    @pytest.mark.unit
+    def test_same_inputs_same_key(self):
+        df = pd.DataFrame({"Year": [2024, 2025], "Qty": [1.0, 2.0]})
+        assert chart_key("weekly", df, 3.0, "C2264") == chart_key("weekly", df.copy(), 3.0, "C2264")
+
+    @pytest.mark.unit
+    def test_data_and_parameters_change_key(self):
+        df = pd.DataFrame({"Year": [2024, 2025], "Qty": [1.0, 2.0]})
+        base = chart_key("weekly", df, 3.0, "C2264")
+
+        changed = df.copy()
+        changed.loc[1, "Qty"] = 2.5
+        assert chart_key("weekly", changed, 3.0, "C2264") != base
+        assert chart_key("weekly", df.rename(columns={"Qty": "Q"}), 3.0, "C2264") != base
+        assert chart_key("weekly", df, 3.5, "C2264") != base
+        assert chart_key("cumulative", df, 3.0, "C2264") != base
+        assert chart_key("scurve", ["ab"], "c") != chart_key("scurve", ["a"], "bc")
+
+
+# ===========================================================================
+# 2. ChartRenderer
+# ===========================================================================
+
+
+class TestChartRenderer:
+    @pytest.mark.unit
+    def test_repeat_render_served_from_cache(self, renderer):
+        render = CountingRender()
+
+        first = asyncio.run(renderer.render("k1", render, 1))
+        second = asyncio.run(renderer.render("k1", render, 1))
+
+        assert first == second == "image:(1,)"
+        assert render.calls == 1
+        assert (renderer.hits, renderer.misses) == (1, 1)
+
+    @pytest.mark.unit
+    def test_least_recently_used_evicted(self, renderer):
+        render = CountingRender()
+        for key in ("a", "b", "a", "c"):
+            asyncio.run(renderer.render(key, render))
+
+        assert len(renderer) == 2
+        asyncio.run(renderer.render("a", render))
+        assert render.calls == 3
+        asyncio.run(renderer.render("b", render))
+        assert render.calls == 4
+
+    @pytest.mark.unit
+    def test_no_data_result_not_cached(self, renderer):
+        render = CountingRender(result=None)
+        assert asyncio.run(renderer.render("empty", render)) is None
+        assert asyncio.run(renderer.render("empty", render)) is None
+        assert render.calls == 2 and len(renderer) == 0
+
+    @pytest.mark.unit
+    def test_errors_propagate_and_are_not_cached(self, renderer):
+        def fail():
+            raise ValueError("bad data")
+
+        with pytest.raises(ValueError, match="bad data"):
+            asyncio.run(renderer.render("bad", fail))
+        assert len(renderer) == 0
+
+    @pytest.mark.unit
+    def test_concurrent_identical_renders_share_one_call(self, renderer):
+        gate = threading.Event()
+        render = CountingRender(gate=gate)
+
+        async def main():
+            tasks = [asyncio.ensure_future(renderer.render("same", render)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            gate.set()
+            return await asyncio.gather(*tasks)
+
+        assert asyncio.run(main()) == ["image:()"] * 3
+        assert render.calls == 1
+
+    @pytest.mark.unit
+    def test_worker_count_from_environment(self, monkeypatch):
+        monkeypatch.delenv(CHART_WORKERS_ENV, raising=False)
+        assert chart_workers() == DEFAULT_CHART_WORKERS
+        monkeypatch.setenv(CHART_WORKERS_ENV, "0")
+        assert chart_workers() == 0
+        assert ChartRenderer().workers == 0
+        monkeypatch.setenv(CHART_WORKERS_ENV, "many")
+        assert chart_workers() == DEFAULT_CHART_WORKERS
+
+    @pytest.mark.integration
+    def test_renders_png_in_process_pool(self):
+        renderer = ChartRenderer(workers=1)
+        try:
+            args = (["2024-W01", "2024-W02"], [10.0, 20.0], [8.0, 21.0], "C2264", 20.0)
+            image = asyncio.run(renderer.render(chart_key("scurve", *args), plot_scurve, *args))
+        finally:
+            renderer.shutdown()
+
+        assert base64.b64decode(image).startswith(b"\x89PNG")
+        assert len(renderer) == 1
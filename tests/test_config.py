@@ -6,7 +6,7 @@ import os
 import pytest
 from pathlib import Path
 
-from config import DEFAULT_CONFIG, load_app_config, save_app_config, _get_config_path
+from config import DEFAULT_CONFIG, load_app_config, save_app_config, _get_config_path, get_cache_dir
 
 
 class TestDefaultConfig:
@@ -64,6 +64,21 @@ class TestGetConfigPath:
         assert result == Path(custom_path)
 
 
+class TestGetCacheDir:
+    """Tests for get_cache_dir."""
+
+    @pytest.mark.unit
+    def test_defaults_next_to_config(self, tmp_config_file: Path, monkeypatch):
+        monkeypatch.delenv("DUAT_CACHE_DIR", raising=False)
+        monkeypatch.setattr("config._get_config_path", lambda: tmp_config_file)
+        assert get_cache_dir() == tmp_config_file.parent / ".duat_cache"
+
+    @pytest.mark.unit
+    def test_env_override(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("DUAT_CACHE_DIR", str(tmp_path / "cache"))
+        assert get_cache_dir() == tmp_path / "cache"
+
+
 class TestLoadAppConfig:
     """Tests for load_app_config."""
 
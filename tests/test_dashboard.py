@@ -13,7 +13,9 @@ from analysis.dashboard import (
     get_project_distribution,
     get_keyword_distribution,
     get_nth_pivot_by_week,
+    calculate_line_distribution,
     export_dashboard_excel,
+    DashboardCube,
     DashboardAnalyzer,
 )
 
@@ -247,6 +249,137 @@ class TestDashboardAnalyzer:
         assert analyzer.get_stats() == {}
 
 
+# ── DashboardAnalyzer source deltas ─────────────────────────────────────────
+
+
+def _assert_same_tables(a: DashboardAnalyzer, b: DashboardAnalyzer):
+    pd.testing.assert_frame_equal(a.df, b.df)
+    pd.testing.assert_frame_equal(a.summary, b.summary)
+    pd.testing.assert_frame_equal(a.nth_trend, b.nth_trend)
+
+
+@pytest.mark.unit
+class TestDashboardAnalyzerSources:
+
+    def _sources(self):
+        records = _make_records()
+        return {"wk02.docx": records[3:], "wk01.docx": records[:3], "empty.docx": []}
+
+    def test_load_from_sources_matches_load_from_records(self):
+        sources = self._sources()
+        by_source = DashboardAnalyzer()
+        assert by_source.load_from_sources(sources, max_week=2) is True
+
+        flat = DashboardAnalyzer()
+        flat.load_from_records([r for name in sorted(sources) for r in sources[name]], max_week=2)
+
+        _assert_same_tables(by_source, flat)
+        assert by_source.source_spans == {"empty.docx": (0, 0), "wk01.docx": (0, 3), "wk02.docx": (3, 6)}
+
+    def test_apply_source_delta_matches_full_reload(self):
+        sources = self._sources()
+        analyzer = DashboardAnalyzer()
+        analyzer.load_from_sources(sources, max_week=2)
+
+        changed = [dict(r, **{"Qty Delivered": 10}) for r in sources["wk02.docx"][:1]]
+        added = [
+            {
+                "FullDate": "Mon 15/01", "Project": "HLM", "Qty Delivered": 2,
+                "Week": "WK03", "Year": "2024", "Line": "KTL",
+            },
+        ]
+        analyzer.apply_source_delta({"wk02.docx": changed, "wk03.docx": added}, removed=["wk01.docx"], max_week=3)
+
+        expected = DashboardAnalyzer()
+        expected.load_from_records(changed + added, max_week=3)
+
+        _assert_same_tables(analyzer, expected)
+        assert set(analyzer.source_spans) == {"empty.docx", "wk02.docx", "wk03.docx"}
+
+    def test_removing_all_sources_clears_data(self):
+        analyzer = DashboardAnalyzer()
+        analyzer.load_from_sources(self._sources(), max_week=2)
+        assert analyzer.apply_source_delta({}, removed=["wk01.docx", "wk02.docx"]) is False
+        assert analyzer.df is None
+        assert analyzer.get_stats() == {}
+
+    def test_load_from_records_resets_sources(self):
+        analyzer = DashboardAnalyzer()
+        analyzer.load_from_sources(self._sources(), max_week=2)
+        analyzer.load_from_records(_make_records(), max_week=2)
+        assert analyzer.source_spans == {}
+
+
+# ── DashboardCube ───────────────────────────────────────────────────────────
+
+
+JOB_KEYWORDS = ['CBM', 'CM', 'PA work', 'HLM', 'Provide']
+
+
+def _cube_frames():
+    """Raw frames covering the key fallbacks of the trend functions."""
+    records = _make_records() + [
+        {"FullDate": "Mon 15/01", "Project": "HLM", "Qty Delivered": 2, "Week": "WK03", "Year": "2024", "Line": "KTL"},
+        {"FullDate": "Tue 16/01", "Project": "C2264", "Qty Delivered": 1.5, "Week": "", "Year": "2024", "Line": ""},
+        {"FullDate": "", "Project": "CM x", "Qty Delivered": 4, "Week": "WK52", "Year": "2023", "Line": "TWL"},
+        {"FullDate": "Wed 31/02", "Project": "C3001", "Qty Delivered": 0, "Week": "WK09", "Year": "2025",
+         "Line": "KTL"},
+    ]
+    df = aggregate_records(records)
+    no_dates = df.copy()
+    no_dates["DateObj"] = pd.NaT
+    date_only = pd.DataFrame([
+        {"Project": "C2264", "Date": "01/01/2024", "Qty Delivered": 5, "Line": "EAL"},
+        {"Project": "CBM", "Date": "15/02/2024", "Qty Delivered": 3, "Line": ""},
+        {"Project": None, "Date": "bad", "Qty Delivered": 2, "Line": "KTL"},
+    ])
+    return {
+        "records": df,
+        "no_dateobj_column": df.drop(columns=["DateObj"]),
+        "empty_dateobj": no_dates,
+        "date_only": date_only,
+        "no_line_or_qty": df.drop(columns=["Line", "Qty Delivered"]),
+    }
+
+
+@pytest.mark.unit
+class TestDashboardCube:
+
+    @pytest.mark.parametrize("name", sorted(_cube_frames()))
+    def test_slices_match_dataframe_functions(self, name):
+        df = _cube_frames()[name]
+        cube = DashboardCube(df)
+        for weeks in (2, 52):
+            assert cube.weekly_trend(weeks, JOB_KEYWORDS) == get_weekly_trend(df, weeks, JOB_KEYWORDS)
+        for months in (1, 12):
+            assert cube.monthly_trend(months) == get_monthly_trend(df, months)
+        assert cube.project_distribution() == get_project_distribution(df)
+        assert cube.keyword_distribution(JOB_KEYWORDS) == get_keyword_distribution(df, JOB_KEYWORDS)
+        assert cube.line_distribution() == calculate_line_distribution(df)
+
+    def test_cube_is_smaller_than_raw_rows(self):
+        df = aggregate_records(_make_records() * 50)
+        cube = DashboardCube(df)
+        assert len(cube.frame) == 5
+        assert cube.frame["NTH"].sum() == len(df)
+
+    def test_analyzer_builds_cube_on_load(self):
+        analyzer = DashboardAnalyzer()
+        assert analyzer.cube is None
+        analyzer.load_from_records(_make_records(), max_week=2)
+        cube = analyzer.cube
+        assert cube is not None
+        assert analyzer.cube is cube
+
+    def test_analyzer_rebuilds_cube_when_df_replaced(self):
+        analyzer = DashboardAnalyzer()
+        analyzer.load_from_records(_make_records(), max_week=2)
+        analyzer.df = aggregate_records(_make_records(3))
+        assert analyzer.cube.project_distribution() == {"C2264": 2, "CBM": 1}
+        analyzer.df = None
+        assert analyzer.cube is None
+
+
 # ── export_dashboard_excel ──────────────────────────────────────────────────
 
 
@@ -312,6 +445,27 @@ class TestDashboardAnalyzerLoadFromExcel:
         assert analyzer.summary is not None
         assert analyzer.last_updated is not None
 
+    def test_load_from_excel_matches_read_excel_sheets(self, tmp_path):
+        df = aggregate_records(_make_records())
+        summary = calculate_summary(df, current_week=2, current_month=1)
+        nth_pivot = get_nth_pivot_by_week(df)
+        filepath = tmp_path / "dashboard_load.xlsx"
+        export_dashboard_excel(df, summary, nth_pivot, filepath)
+
+        analyzer = DashboardAnalyzer()
+        assert analyzer.load_from_excel(filepath) is True
+        pd.testing.assert_frame_equal(analyzer.df, pd.read_excel(filepath, sheet_name="Raw Data"))
+        pd.testing.assert_frame_equal(analyzer.summary, pd.read_excel(filepath, sheet_name="Summary by Project"))
+        pd.testing.assert_frame_equal(
+            analyzer.nth_trend, pd.read_excel(filepath, sheet_name="NTH Trend by Week", index_col=0)
+        )
+
+    def test_load_from_excel_without_raw_data_sheet(self, tmp_path):
+        filepath = tmp_path / "other.xlsx"
+        pd.DataFrame({"A": [1]}).to_excel(filepath, sheet_name="Other", index=False)
+        analyzer = DashboardAnalyzer()
+        assert analyzer.load_from_excel(filepath) is False
+
     def test_load_from_excel_invalid_file(self, tmp_path):
         filepath = tmp_path / "nonexistent.xlsx"
         analyzer = DashboardAnalyzer()
@@ -92,6 +92,62 @@ class TestDashboardAnalyze:
         assert res.status_code == 400
 
 
+# ---------------------------------------------------------------------------
+# POST /api/dashboard/analyze-parsed
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def parsed_state():
+    """Put MOCK_RECORDS into parsing_state as if a parse job had finished."""
+    from backend.services import parsing_state
+    from parsers.record_store import RecordStore
+
+    saved = dict(parsing_state)
+    parsing_state.update({
+        "in_progress": False,
+        "records": RecordStore.from_records(MOCK_RECORDS),
+        "max_week": 4,
+        "job_id": "job-1",
+    })
+    yield parsing_state
+    parsing_state.clear()
+    parsing_state.update(saved)
+
+
+@pytest.mark.integration
+class TestDashboardAnalyzeParsed:
+
+    def test_matches_analyze_round_trip(self, client, parsed_state):
+        res = client.post("/api/dashboard/analyze-parsed", json={"job_id": "job-1"})
+        assert res.status_code == 200
+        assert res.json()["job_id"] == "job-1"
+        parsed_stats = res.json()["stats"]
+        parsed_summary = client.get("/api/dashboard/summary").json()
+
+        client.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS, "max_week": 4})
+        assert parsed_stats == client.get("/api/dashboard/stats").json()
+        assert parsed_summary == client.get("/api/dashboard/summary").json()
+
+    def test_without_body_uses_last_parse(self, client, parsed_state):
+        res = client.post("/api/dashboard/analyze-parsed")
+        assert res.status_code == 200
+        assert res.json()["stats"]["total_records"] == len(MOCK_RECORDS)
+
+    def test_stale_job_id_returns_404(self, client, parsed_state):
+        res = client.post("/api/dashboard/analyze-parsed", json={"job_id": "job-0"})
+        assert res.status_code == 404
+
+    def test_in_progress_returns_409(self, client, parsed_state):
+        parsed_state["in_progress"] = True
+        assert client.post("/api/dashboard/analyze-parsed").status_code == 409
+
+    def test_no_records_returns_400(self, client, parsed_state):
+        from parsers.record_store import RecordStore
+
+        parsed_state["records"] = RecordStore()
+        assert client.post("/api/dashboard/analyze-parsed").status_code == 400
+
+
 # ---------------------------------------------------------------------------
 # GET /api/dashboard/stats
 # ---------------------------------------------------------------------------
@@ -326,3 +382,54 @@ class TestDashboardNthByProject:
     def test_nth_by_project_404_when_no_data(self, client):
         res = client.get("/api/dashboard/trends/nth-by-project")
         assert res.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Response cache: ETag / If-None-Match
+# ---------------------------------------------------------------------------
+
+@pytest.mark.integration
+class TestDashboardResponseCache:
+
+    def test_responses_carry_etag(self, loaded_client):
+        res = loaded_client.get("/api/dashboard/stats")
+        assert res.headers["etag"].startswith('"v')
+        assert res.headers["cache-control"] == "no-cache"
+
+    def test_matching_etag_returns_304(self, loaded_client):
+        etag = loaded_client.get("/api/dashboard/trends/weekly").headers["etag"]
+        res = loaded_client.get("/api/dashboard/trends/weekly", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.content == b""
+        assert res.headers["etag"] == etag
+
+    def test_query_string_is_part_of_key(self, loaded_client):
+        etag = loaded_client.get("/api/dashboard/raw-data?limit=2").headers["etag"]
+        res = loaded_client.get("/api/dashboard/raw-data?limit=3", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert len(res.json()["data"]) == 3
+
+    def test_reload_invalidates(self, loaded_client):
+        first = loaded_client.get("/api/dashboard/stats")
+        loaded_client.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS[:3], "max_week": 1})
+        res = loaded_client.get("/api/dashboard/stats", headers={"If-None-Match": first.headers["etag"]})
+        assert res.status_code == 200
+        assert res.headers["etag"] != first.headers["etag"]
+        assert res.json()["total_nth"] != first.json()["total_nth"]
+
+    def test_cleared_data_returns_404(self, loaded_client):
+        assert loaded_client.get("/api/dashboard/summary").status_code == 200
+        dashboard_analyzer.df = None
+        dashboard_analyzer.summary = None
+        dashboard_analyzer.nth_trend = None
+        assert loaded_client.get("/api/dashboard/summary").status_code == 404
+
+    def test_keyword_config_change_rebuilds(self, loaded_client, tmp_path, monkeypatch):
+        import json
+        config_path = tmp_path / "config.json"
+        monkeypatch.setenv("DUAT_CONFIG_PATH", str(config_path))
+        config_path.write_text(json.dumps({"keywords": ["CBM"]}), encoding="utf-8")
+        assert loaded_client.get("/api/dashboard/distribution/keywords").json()["labels"] == ["CBM"]
+
+        config_path.write_text(json.dumps({"keywords": ["CBM", "HLM"]}), encoding="utf-8")
+        assert loaded_client.get("/api/dashboard/distribution/keywords").json()["labels"] == ["CBM", "HLM"]
@@ -20,9 +20,11 @@ from parsers.docx_parser import (
     is_blue_color,
     extract_week_year_from_filename,
     extract_project_code,
+    resolve_worker_count,
     JOB_KEYWORDS,
     LINE_CODE_PATTERN,
 )
+from parsers.record_store import RecordStore
 
 
 # ===========================================================================
@@ -221,6 +223,65 @@ class TestProcessAll:
         assert calls[-1][1] == pytest.approx(1.0, abs=0.01)
 
 
+@pytest.fixture
+def folder_with_table_reports(tmp_path: Path) -> Path:
+    """Create several report files whose tables yield distinct records."""
+    for week, project in ((3, "C1001"), (12, "C1002"), (7, "C1003"), (9, "CBM")):
+        doc = Document()
+        table = doc.add_table(rows=3, cols=3)
+        table.rows[0].cells[0].text = "Date"
+        table.rows[0].cells[1].text = "Description"
+        table.rows[0].cells[2].text = "Qty"
+        for offset, row in enumerate(table.rows[1:], start=1):
+            row.cells[0].text = f"Mon {offset}/3"
+            row.cells[1].text = f"{project} KTL"
+            row.cells[2].text = str(week + offset)
+        doc.save(str(tmp_path / f"PS-OHLR_DUAT_Daily Report_WK{week:02d}_2025.docx"))
+    return tmp_path
+
+
+class TestProcessAllParallel:
+    @pytest.mark.unit
+    def test_pool_matches_sequential_order(self, folder_with_table_reports: Path):
+        sequential = DailyReportParser(folder_with_table_reports).process_all()
+        parallel = DailyReportParser(folder_with_table_reports, workers=2).process_all()
+        assert len(sequential) == 8
+        assert parallel == sequential
+
+    @pytest.mark.unit
+    def test_pool_reports_progress_per_file(self, folder_with_table_reports: Path):
+        parser = DailyReportParser(folder_with_table_reports, workers=2)
+        calls = []
+        parser.process_all(progress_callback=lambda name, p: calls.append((name, p)))
+        assert len(calls) == 4
+        assert [p for _, p in calls] == pytest.approx([0.25, 0.5, 0.75, 1.0])
+        assert {name for name, _ in calls} == {f.name for f in parser.get_report_files()}
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_process_into_matches_process_all(self, folder_with_table_reports: Path, workers: int):
+        expected = DailyReportParser(folder_with_table_reports).process_all()
+        parser = DailyReportParser(folder_with_table_reports, workers=workers)
+        store = RecordStore()
+        assert parser.process_into(store) is store
+        assert store.to_records() == expected
+        assert parser.get_max_week() == 12
+
+    @pytest.mark.unit
+    def test_pool_tracks_max_week(self, folder_with_table_reports: Path):
+        parser = DailyReportParser(folder_with_table_reports, workers=3)
+        parser.process_all()
+        assert parser.get_max_week() == 12
+
+    @pytest.mark.unit
+    def test_resolve_worker_count(self):
+        assert resolve_worker_count(1) == 1
+        assert resolve_worker_count(0) == 1
+        assert resolve_worker_count(-2) == 1
+        assert resolve_worker_count(4) == 4
+        assert resolve_worker_count(None) >= 1
+
+
 # ===========================================================================
 # 7-8. process_docx
 # ===========================================================================
@@ -2,11 +2,16 @@
 """TDD tests for utils/excel_export.py - written BEFORE implementation."""
 
 import pytest
+import numpy as np
 import pandas as pd
 import openpyxl
+from datetime import datetime
 from pathlib import Path
 
 from utils.excel_export import (
+    ENGINE_PANDAS,
+    ENGINE_STREAM,
+    column_widths,
     export_dataframe_to_excel,
     create_dashboard_excel,
     export_lag_analysis_report,
@@ -204,6 +209,58 @@ class TestCreateDashboardExcel:
         result = create_dashboard_excel(raw_df, summary_df, bad_path)
         assert result is False
 
+    @pytest.mark.unit
+    def test_engines_write_same_cells_and_widths(
+        self,
+        tmp_path: Path,
+        raw_df: pd.DataFrame,
+        summary_df: pd.DataFrame,
+        nth_trend_df: pd.DataFrame,
+    ):
+        """The streaming engine must match the pandas engine cell for cell."""
+        raw_df = raw_df.assign(
+            DateObj=pd.to_datetime(["2025-01-01", None]),
+            Note=["a much longer note", None],
+        )
+        paths = {}
+        for engine in (ENGINE_PANDAS, ENGINE_STREAM):
+            paths[engine] = tmp_path / f"{engine}.xlsx"
+            assert create_dashboard_excel(raw_df, summary_df, paths[engine], nth_trend_df, engine=engine)
+
+        expected = openpyxl.load_workbook(paths[ENGINE_PANDAS])
+        actual = openpyxl.load_workbook(paths[ENGINE_STREAM])
+        assert actual.sheetnames == expected.sheetnames
+        for name in expected.sheetnames:
+            exp_ws, act_ws = expected[name], actual[name]
+            assert [[c.value for c in row] for row in act_ws.iter_rows()] == [
+                [c.value for c in row] for row in exp_ws.iter_rows()
+            ]
+            assert [[c.number_format for c in row] for row in act_ws.iter_rows()] == [
+                [c.number_format for c in row] for row in exp_ws.iter_rows()
+            ]
+            assert {k: d.width for k, d in act_ws.column_dimensions.items()} == {
+                k: d.width for k, d in exp_ws.column_dimensions.items()
+            }
+
+    @pytest.mark.unit
+    def test_stream_engine_header_is_bold(
+        self, tmp_path: Path, raw_df: pd.DataFrame, summary_df: pd.DataFrame
+    ):
+        path = tmp_path / "dashboard.xlsx"
+        create_dashboard_excel(raw_df, summary_df, path, engine=ENGINE_STREAM)
+
+        wb = openpyxl.load_workbook(path)
+        assert all(cell.font.b for cell in wb["Raw Data"][1])
+        assert wb["Raw Data"].column_dimensions["E"].width == len("Project") + 2
+        wb.close()
+
+    @pytest.mark.unit
+    def test_unknown_engine_rejected(
+        self, tmp_path: Path, raw_df: pd.DataFrame, summary_df: pd.DataFrame
+    ):
+        with pytest.raises(ValueError):
+            create_dashboard_excel(raw_df, summary_df, tmp_path / "x.xlsx", engine="xlsxwriter")
+
 
 # ===========================================================================
 # Tests: export_lag_analysis_report
@@ -268,3 +325,50 @@ class TestExportLagAnalysisReport:
         bad_path = Path("Z:/nonexistent/dir/lag.xlsx")
         result = export_lag_analysis_report(lag_results_df, bad_path)
         assert result is False
+
+
+# ===========================================================================
+# Tests: column_widths
+# ===========================================================================
+
+def _walked_widths(ws) -> dict:
+    """Widths from a walk over every written cell (longest str value + 2)."""
+    return {
+        col_idx: max((len(str(c.value)) if c.value is not None else 0) for c in col) + 2
+        for col_idx, col in enumerate(ws.iter_cols(min_row=1), start=1)
+    }
+
+
+class TestColumnWidths:
+    """Widths computed from the DataFrame instead of the written cells."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("index", [False, True])
+    def test_matches_walk_over_written_cells(self, tmp_path: Path, index: bool):
+        df = pd.DataFrame(
+            {
+                "Project": ["Alpha", None, "A much longer project name"],
+                "Qty": [1.25, np.nan, 100.0],
+                "Week": [1, 22, 3],
+                "When": [datetime(2025, 1, 1), pd.NaT, datetime(2025, 1, 2, 3, 4, 5, 600)],
+                "Done": [True, False, True],
+                "Mixed": [3, "text", datetime(2025, 1, 1).date()],
+            },
+            index=pd.Index(["2025-W01", "2025-W02", "2025-W10"], name="YearWeek"),
+        )
+        path = tmp_path / "widths.xlsx"
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            df.to_excel(writer, sheet_name="Sheet1", index=index)
+            assert column_widths(df, index=index) == _walked_widths(writer.sheets["Sheet1"])
+
+    @pytest.mark.unit
+    def test_max_width_and_padding(self):
+        df = pd.DataFrame({"Name": ["x" * 40], "N": [1]})
+        assert column_widths(df, max_width=20) == {1: 20, 2: 3}
+        assert column_widths(df, padding=0) == {1: 40, 2: 1}
+
+    @pytest.mark.unit
+    def test_sampled_rows_keep_header_width(self):
+        df = pd.DataFrame({"A long header": range(10_000)})
+        assert column_widths(df, sample_rows=50) == {1: len("A long header") + 2}
+        assert column_widths(df.head(0)) == {1: len("A long header") + 2}
@@ -0,0 +1,226 @@
+# MTR DUAT - Excel Reader Tests
+"""Unit tests for utils/excel_reader.py."""
+
+import zipfile
+import pytest
+import pandas as pd
+import openpyxl
+from datetime import datetime
+from pathlib import Path
+
+from utils import excel_reader
+from utils.excel_reader import (
+    ENGINE_STREAM,
+    ENGINES,
+    STREAM_OPENPYXL_SERIES,
+    read_excel_sheet,
+    read_excel_sheets,
+)
+
+
+# ===========================================================================
+# Fixtures
+# ===========================================================================
+
+
+@pytest.fixture
+def dashboard_workbook(tmp_path: Path) -> Path:
+    """Workbook laid out like a dashboard export, written by pandas."""
+    filepath = tmp_path / "Progress Dashboard + NTH.xlsx"
+    raw = pd.DataFrame({
+        "FullDate": ["Mon 03/03", "Tue 04/03", None, "Thu 06/03"],
+        "Project": ["C2264", "CBM", "C2264", "PA work"],
+        "Qty Delivered": [5.0, 2.5, 3.0, 4.0],
+        "Week": ["10", "10", "10", "10"],
+        "DateObj": pd.to_datetime(["2025-03-03", "2025-03-04", None, "2025-03-06"]),
+        "Done": [True, False, True, False],
+    })
+    summary = pd.DataFrame({"Project": ["C2264", "CBM"], "NTH": [2, 1], "Qty per NTH": [4.0, 2.5]})
+    pivot = pd.DataFrame(
+        {"C2264": [2.0, None], "CBM": [1.0, 3.0]},
+        index=pd.Index(["2025-W10", "2025-W11"], name="YearWeek"),
+    )
+    with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
+        raw.to_excel(writer, sheet_name="Raw Data", index=False)
+        summary.to_excel(writer, sheet_name="Summary by Project", index=False)
+        pivot.to_excel(writer, sheet_name="NTH Trend by Week", index=True)
+    return filepath
+
+
+_SHEET_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>\n'
+    '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+    '<c r="C1" t="inlineStr"><is><t>Flag</t></is></c><c r="D1" t="inlineStr"><is><t>Note</t></is></c>'
+    '<c r="E1" t="s"><v>2</v></c></row>\n'
+    '<row r="2"><c r="A2" t="s"><v>3</v></c><c r="B2" s="1"><v>45717</v></c><c r="C2" t="b"><v>1</v></c>'
+    '<c r="D2" t="inlineStr"><is><r><t>rich </t></r><r><t>text</t></r></is></c><c r="E2"><v>12.0</v></c></row>\n'
+    '<row r="4"><c r="A4" t="str"><f>A2</f><v>C2265</v></c><c r="C4" t="b"><v>0</v></c>'
+    '<c r="D4" t="e"><v>#DIV/0!</v></c><c r="E4"><v>2.5E1</v></c></row>\n'
+    '<row><c t="s"><v>3</v></c><c s="1"><v>45718.5</v></c><c/><c t="e"><v>#N/A</v></c><c><v>7</v></c></row>\n'
+    '<row r="6"/>\n'
+    '</sheetData></worksheet>'
+)
+
+_SHARED_STRINGS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="4" uniqueCount="4">
+<si><t>Project No</t></si><si><t>Start Date</t></si><si><t>Target Qty</t></si><si><t>C2264</t></si></sst>"""
+
+_STYLES_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="1"><font/></fonts><fills count="1"><fill><patternFill patternType="none"/></fill></fills>
+<borders count="1"><border/></borders>
+<cellStyleXfs count="1"><xf numFmtId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" xfId="0"/><xf numFmtId="14" xfId="0" applyNumberFormat="1"/></cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+
+@pytest.fixture
+def hand_written_workbook(tmp_path: Path) -> Path:
+    """Minimal package with shared/inline/rich strings, sparse rows, errors and dates."""
+    filepath = tmp_path / "master.xlsx"
+    ns = "http://schemas.openxmlformats.org/package/2006/relationships"
+    rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    sml = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{sml}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/worksheets/sheet1.xml" ContentType="{sml}.worksheet+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{sml}.styles+xml"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" ContentType="{sml}.sharedStrings+xml"/>'
+            '</Types>'
+        ),
+        "_rels/.rels": (
+            f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{ns}">'
+            f'<Relationship Id="rId1" Type="{rel}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="{rel}">'
+            '<sheets><sheet name="Projects" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{ns}">'
+            f'<Relationship Id="rId1" Type="{rel}/worksheet" Target="worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId2" Type="{rel}/styles" Target="styles.xml"/>'
+            f'<Relationship Id="rId3" Type="{rel}/sharedStrings" Target="sharedStrings.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/styles.xml": _STYLES_XML,
+        "xl/sharedStrings.xml": _SHARED_STRINGS_XML,
+        "xl/worksheets/sheet1.xml": _SHEET_XML,
+    }
+    with zipfile.ZipFile(filepath, "w") as package:
+        for name, content in parts.items():
+            package.writestr(name, content)
+    return filepath
+
+
+# ===========================================================================
+# 1. Parity with pd.read_excel
+# ===========================================================================
+
+
+class TestReadExcelParity:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_dashboard_sheets_match_read_excel(self, dashboard_workbook: Path, engine: str):
+        frames = read_excel_sheets(
+            dashboard_workbook,
+            ["Raw Data", "Summary by Project", "NTH Trend by Week"],
+            index_col={"NTH Trend by Week": 0},
+            engine=engine,
+        )
+        for name in ("Raw Data", "Summary by Project"):
+            pd.testing.assert_frame_equal(frames[name], pd.read_excel(dashboard_workbook, sheet_name=name))
+        pd.testing.assert_frame_equal(
+            frames["NTH Trend by Week"],
+            pd.read_excel(dashboard_workbook, sheet_name="NTH Trend by Week", index_col=0),
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_cell_types_match_read_excel(self, hand_written_workbook: Path, engine: str):
+        df = read_excel_sheet(hand_written_workbook, engine=engine)
+        pd.testing.assert_frame_equal(df, pd.read_excel(hand_written_workbook))
+
+    @pytest.mark.unit
+    def test_stream_values(self, hand_written_workbook: Path):
+        df = read_excel_sheet(hand_written_workbook, engine=ENGINE_STREAM)
+        assert df.columns.tolist() == ["Project No", "Start Date", "Flag", "Note", "Target Qty"]
+        # Row 3 is missing from the XML and comes back blank
+        assert len(df) == 4
+        assert df["Project No"].isna().tolist() == [False, True, False, False]
+        assert df["Project No"][2] == "C2265"
+        assert df["Start Date"][0] == datetime(2025, 3, 1)
+        assert df["Start Date"][3] == datetime(2025, 3, 2, 12)
+        assert df["Flag"][0] == 1.0 and df["Flag"][2] == 0.0
+        assert df["Note"][0] == "rich text"
+        # Error cells read as missing
+        assert df["Note"][2:].isna().all()
+        assert df["Target Qty"][[0, 2, 3]].tolist() == [12.0, 25.0, 7.0]
+
+    @pytest.mark.unit
+    def test_stream_falls_back_without_private_openpyxl_attributes(self, hand_written_workbook: Path, monkeypatch):
+        # As if an openpyxl upgrade renamed what the stream reader uses
+        monkeypatch.setattr(excel_reader, "_STREAM_WORKBOOK_ATTRS", ("_date_formats_renamed",))
+        monkeypatch.setattr(excel_reader, "_iter_stream_values", None)
+        df = read_excel_sheet(hand_written_workbook, engine=ENGINE_STREAM)
+        pd.testing.assert_frame_equal(df, pd.read_excel(hand_written_workbook))
+
+    @pytest.mark.unit
+    def test_stream_falls_back_on_unsupported_openpyxl_version(self, hand_written_workbook: Path, monkeypatch):
+        monkeypatch.setattr(openpyxl, "__version__", "4.0.0")
+        monkeypatch.setattr(excel_reader, "_iter_stream_values", None)
+        df = read_excel_sheet(hand_written_workbook, engine=ENGINE_STREAM)
+        pd.testing.assert_frame_equal(df, pd.read_excel(hand_written_workbook))
+
+    @pytest.mark.unit
+    def test_installed_openpyxl_is_a_supported_stream_version(self):
+        # Fails on an openpyxl upgrade: re-check _iter_stream_values against
+        # the new release before adding it to STREAM_OPENPYXL_SERIES
+        assert openpyxl.__version__.startswith(STREAM_OPENPYXL_SERIES)
+
+    @pytest.mark.unit
+    def test_default_engine_does_not_parse_xml(self, dashboard_workbook: Path, monkeypatch):
+        monkeypatch.setattr(excel_reader, "_iter_stream_values", None)
+        frames = read_excel_sheets(dashboard_workbook, ["Raw Data"])
+        pd.testing.assert_frame_equal(frames["Raw Data"], pd.read_excel(dashboard_workbook, sheet_name="Raw Data"))
+
+
+# ===========================================================================
+# 2. Sheet selection
+# ===========================================================================
+
+
+class TestSheetSelection:
+    @pytest.mark.unit
+    def test_missing_sheets_left_out(self, dashboard_workbook: Path):
+        frames = read_excel_sheets(dashboard_workbook, ["Raw Data", "Nope", 7])
+        assert list(frames) == ["Raw Data"]
+
+    @pytest.mark.unit
+    def test_sheet_by_position(self, dashboard_workbook: Path):
+        df = read_excel_sheet(dashboard_workbook, 1)
+        assert df["Project"].tolist() == ["C2264", "CBM"]
+
+    @pytest.mark.unit
+    def test_missing_sheet_raises(self, dashboard_workbook: Path):
+        with pytest.raises(ValueError):
+            read_excel_sheet(dashboard_workbook, "Nope")
+
+    @pytest.mark.unit
+    def test_empty_sheet(self, tmp_path: Path):
+        filepath = tmp_path / "empty.xlsx"
+        openpyxl.Workbook().save(filepath)
+        assert read_excel_sheet(filepath).empty
+
+    @pytest.mark.unit
+    def test_unknown_engine_rejected(self, dashboard_workbook: Path):
+        with pytest.raises(ValueError):
+            read_excel_sheets(dashboard_workbook, ["Raw Data"], engine="xlrd")
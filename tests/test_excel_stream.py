@@ -0,0 +1,125 @@
+# MTR DUAT - Streaming Excel Writer Tests
+"""Unit tests for utils/excel_stream.py."""
+
+import pytest
+import numpy as np
+import pandas as pd
+import openpyxl
+from datetime import date, datetime
+from pathlib import Path
+
+from utils import excel_stream
+from utils.excel_stream import (
+    DATE_STYLE,
+    DATETIME_STYLE,
+    HEADER_STYLE,
+    StreamingWorkbook,
+    date_style,
+    datetime_style,
+    frame_rows,
+    header_style,
+)
+
+
+@pytest.fixture
+def book() -> StreamingWorkbook:
+    return StreamingWorkbook([header_style(), datetime_style(), date_style()])
+
+
+# ===========================================================================
+# 1. add_sheet
+# ===========================================================================
+
+
+class TestAddSheet:
+    @pytest.mark.unit
+    def test_rows_streamed_from_generator(self, book: StreamingWorkbook, tmp_path: Path):
+        rows = ([i, f"row {i}"] for i in range(3))
+        count = book.add_sheet("Data", ["No", "Name"], rows, widths={1: 8, 2: 20}, header_style=HEADER_STYLE)
+        book.save(tmp_path / "out.xlsx")
+
+        assert count == 3
+        ws = openpyxl.load_workbook(tmp_path / "out.xlsx")["Data"]
+        assert [[c.value for c in row] for row in ws.iter_rows()] == [
+            ["No", "Name"], [0, "row 0"], [1, "row 1"], [2, "row 2"],
+        ]
+        assert ws["A1"].style == HEADER_STYLE and ws["A1"].font.b
+        assert ws["A2"].style == "Normal"
+        assert ws.column_dimensions["A"].width == 8
+        assert ws.column_dimensions["B"].width == 20
+
+    @pytest.mark.unit
+    def test_cell_style_applied_to_every_data_cell(self, book: StreamingWorkbook, tmp_path: Path):
+        book.add_sheet("Data", ["A", "B"], [[1, None], [2, "x"]], cell_style=DATE_STYLE)
+        book.save(tmp_path / "out.xlsx")
+
+        ws = openpyxl.load_workbook(tmp_path / "out.xlsx")["Data"]
+        assert ws["A1"].style == "Normal"
+        assert {c.style for row in ws.iter_rows(min_row=2) for c in row} == {DATE_STYLE}
+
+
+# ===========================================================================
+# 2. add_frame
+# ===========================================================================
+
+
+class TestAddFrame:
+    @pytest.mark.unit
+    def test_rows_are_converted_in_chunks(self, book: StreamingWorkbook, monkeypatch):
+        df = pd.DataFrame(
+            {
+                "Qty": [1.5, np.nan, 3.0, 4.0, 5.0],
+                "DateObj": pd.to_datetime(["2025-03-03", None, "2025-03-05", "2025-03-06", "2025-03-07"]),
+                "Note": ["a", None, "c", "d", "e"],
+            },
+            index=pd.Index(list("vwxyz"), name="Key"),
+        )
+        ws = book.book.create_sheet("Chunks")
+
+        def plain(rows):
+            return [[getattr(v, "value", v) for v in row] for row in rows]
+
+        expected = plain(frame_rows(ws, df, index=True, chunk_rows=len(df)))
+        assert plain(frame_rows(ws, df, index=True, chunk_rows=2)) == expected
+        assert expected[1] == ["w", None, None, None]
+
+        # Taking the first row converts only the first chunk of each column
+        converted = []
+        column_cells = excel_stream._column_cells
+        monkeypatch.setattr(
+            excel_stream, "_column_cells",
+            lambda ws, series, style=None: converted.append(len(series)) or column_cells(ws, series, style),
+        )
+        next(frame_rows(ws, df, chunk_rows=2))
+        assert converted == [2, 2, 2]
+
+    @pytest.mark.unit
+    def test_round_trips_through_read_excel(self, book: StreamingWorkbook, tmp_path: Path):
+        df = pd.DataFrame({
+            "Project": ["C2264", None, "CBM"],
+            "Qty": [1.5, np.nan, 3.0],
+            "Week": [1, 2, 3],
+            "DateObj": [datetime(2025, 3, 3), pd.NaT, datetime(2025, 3, 5, 12, 30)],
+            "Done": [True, False, True],
+        })
+        book.add_frame("Raw Data", df)
+        book.save(tmp_path / "out.xlsx")
+
+        df["DateObj"] = df["DateObj"].astype("datetime64[us]")
+        pd.testing.assert_frame_equal(pd.read_excel(tmp_path / "out.xlsx"), df)
+
+    @pytest.mark.unit
+    def test_index_and_date_formats(self, book: StreamingWorkbook, tmp_path: Path):
+        df = pd.DataFrame(
+            {"When": pd.to_datetime(["2025-03-03 08:00"]), "Mixed": [date(2025, 3, 4)]},
+            index=pd.Index(["2025-W10"], name="YearWeek"),
+        )
+        book.add_frame("Trend", df, index=True)
+        book.save(tmp_path / "out.xlsx")
+
+        ws = openpyxl.load_workbook(tmp_path / "out.xlsx")["Trend"]
+        assert [c.value for c in ws[1]] == ["YearWeek", "When", "Mixed"]
+        assert ws["A2"].value == "2025-W10" and ws["A2"].style == HEADER_STYLE
+        assert ws["B2"].value == datetime(2025, 3, 3, 8) and ws["B2"].style == DATETIME_STYLE
+        assert ws["B2"].number_format == "YYYY-MM-DD HH:MM:SS"
+        assert ws["C2"].style == DATE_STYLE and ws["C2"].number_format == "YYYY-MM-DD"
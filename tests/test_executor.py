@@ -0,0 +1,137 @@
+# MTR DUAT - Executor Tests
+"""Tests for backend/executor.py and the offloaded router work."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import executor
+from backend.executor import ANALYSIS, CHARTS, LIMITS, SCAN, get_executor, run_blocking
+from backend.main import app
+from backend.services import dashboard_analyzer, perf_analyzer
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    executor.shutdown()
+    yield
+    executor.shutdown()
+
+
+# ===========================================================================
+# 1. run_blocking
+# ===========================================================================
+
+
+class TestRunBlocking:
+    @pytest.mark.unit
+    def test_returns_result_from_worker_thread(self):
+        def work(a, b=0):
+            return a + b, threading.current_thread().name
+
+        total, thread_name = asyncio.run(run_blocking(ANALYSIS, work, 2, b=3))
+
+        assert total == 5
+        assert thread_name.startswith("duat-analysis")
+
+    @pytest.mark.unit
+    def test_exceptions_propagate(self):
+        def fail():
+            raise KeyError("missing")
+
+        with pytest.raises(KeyError, match="missing"):
+            asyncio.run(run_blocking(SCAN, fail))
+
+    @pytest.mark.unit
+    def test_unknown_subsystem(self):
+        with pytest.raises(ValueError, match="Unknown executor subsystem"):
+            get_executor("gpu")
+
+    @pytest.mark.unit
+    def test_pools_are_reused_and_sized_per_subsystem(self):
+        assert get_executor(SCAN) is get_executor(SCAN)
+        assert get_executor(CHARTS) is not get_executor(ANALYSIS)
+        assert get_executor(SCAN)._max_workers == LIMITS[SCAN]
+
+
+# ===========================================================================
+# 2. Concurrency
+# ===========================================================================
+
+
+def _track(active, peak, lock, delay=0.05):
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(delay)
+        with lock:
+            active[0] -= 1
+    return work
+
+
+class TestConcurrency:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("subsystem", [ANALYSIS, SCAN, CHARTS])
+    def test_concurrency_capped_per_subsystem(self, subsystem):
+        active, peak, lock = [0], [0], threading.Lock()
+        work = _track(active, peak, lock)
+
+        async def main():
+            await asyncio.gather(*(run_blocking(subsystem, work) for _ in range(5)))
+
+        asyncio.run(main())
+        assert peak[0] == LIMITS[subsystem]
+
+    @pytest.mark.unit
+    def test_slow_scan_does_not_block_analysis_or_loop(self):
+        release = threading.Event()
+
+        async def main():
+            scan = asyncio.ensure_future(run_blocking(SCAN, release.wait, 10))
+            # The event loop keeps ticking and the analysis pool is free
+            await asyncio.sleep(0.01)
+            result = await asyncio.wait_for(run_blocking(ANALYSIS, lambda: "done"), timeout=5)
+            assert not scan.done()
+            release.set()
+            return result, await scan
+
+        assert asyncio.run(main()) == ("done", True)
+
+
+# ===========================================================================
+# 3. API
+# ===========================================================================
+
+
+MOCK_RECORDS = [
+    {"FullDate": "Mon 01/01", "Project": "C2264", "Qty Delivered": 5, "Week": "WK01", "Year": "2024", "Line": "EAL"},
+]
+
+
+@pytest.fixture
+def client():
+    yield TestClient(app)
+    dashboard_analyzer.df = None
+    dashboard_analyzer.summary = None
+    dashboard_analyzer.nth_trend = None
+    perf_analyzer.df = None
+
+
+@pytest.mark.integration
+class TestOffloadedEndpoints:
+    def test_analysis_runs_on_analysis_pool(self, client):
+        res = client.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS, "max_week": 1})
+        assert res.status_code == 200
+        assert ANALYSIS in executor._executors
+
+    def test_http_exception_from_worker_keeps_status(self, client):
+        client.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS, "max_week": 1})
+        assert client.post("/api/performance/set-data").status_code == 200
+
+        res = client.post("/api/performance/analyze", json={"project_code": "NOPE"})
+        assert res.status_code == 404
+        assert "NOPE" in res.json()["detail"]
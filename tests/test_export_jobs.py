@@ -0,0 +1,215 @@
+# MTR DUAT - Export Job Tests
+"""Tests for backend/jobs.py and the background export endpoints."""
+
+import threading
+import time
+
+import openpyxl
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.jobs import JOB_DONE, JOB_FAILED, JOB_RUNNING, ExportJobManager
+from backend.main import app
+from backend.services import dashboard_analyzer, export_jobs
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ExportJobManager(directory=tmp_path / "exports", ttl=60)
+    yield manager
+    manager.shutdown()
+
+
+def _write(text: str = "data"):
+    def build(path, progress):
+        progress("writing", 0.5)
+        path.write_text(text)
+    return build
+
+
+# ===========================================================================
+# 1. ExportJobManager
+# ===========================================================================
+
+
+class TestExportJobManager:
+    @pytest.mark.unit
+    def test_job_runs_to_done(self, manager):
+        job = manager.submit("dashboard", "Dashboard.xlsx", _write())
+        job.future.result(timeout=10)
+
+        assert job.status == JOB_DONE
+        assert job.progress == 1.0 and job.stage == "writing"
+        assert job.path.parent == manager.directory
+        assert job.path.read_text() == "data"
+        assert manager.get(job.job_id) is job
+        assert job.to_dict()["finished_at"] is not None
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("build", [
+        lambda path, progress: False,
+        lambda path, progress: 1 / 0,
+    ])
+    def test_failed_job_keeps_error_and_no_file(self, manager, build):
+        job = manager.submit("dashboard", "Dashboard.xlsx", build)
+        job.future.result(timeout=10)
+
+        assert job.status == JOB_FAILED
+        assert job.error
+        assert not job.path.exists()
+
+    @pytest.mark.unit
+    def test_status_visible_while_running(self, manager):
+        release = threading.Event()
+
+        def build(path, progress):
+            progress("Raw Data", 0.25)
+            release.wait(10)
+            path.write_text("x")
+
+        job = manager.submit("dashboard", "Dashboard.xlsx", build)
+        deadline = time.monotonic() + 10
+        while job.progress != 0.25 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert job.status == JOB_RUNNING
+        assert not manager.remove(job.job_id)
+
+        release.set()
+        job.future.result(timeout=10)
+        assert manager.remove(job.job_id)
+        assert manager.get(job.job_id) is None
+        assert not job.path.exists()
+
+    @pytest.mark.unit
+    def test_cleanup_drops_expired_jobs_and_files(self, manager):
+        job = manager.submit("dashboard", "Dashboard.xlsx", _write())
+        job.future.result(timeout=10)
+
+        assert manager.cleanup(now=time.monotonic() + 30) == 0
+        assert manager.cleanup(now=time.monotonic() + 61) == 1
+        assert manager.get(job.job_id) is None
+        assert not job.path.exists()
+
+    @pytest.mark.unit
+    def test_lookup_sweeps_expired_jobs(self, tmp_path):
+        manager = ExportJobManager(directory=tmp_path / "exports", ttl=0)
+        try:
+            job = manager.submit("dashboard", "Dashboard.xlsx", _write())
+            job.future.result(timeout=10)
+            assert manager.get(job.job_id) is None
+            assert not job.path.exists()
+        finally:
+            manager.shutdown()
+
+    @pytest.mark.unit
+    def test_shutdown_removes_owned_directory(self):
+        manager = ExportJobManager()
+        job = manager.submit("dashboard", "Dashboard.xlsx", _write())
+        job.future.result(timeout=10)
+        directory = manager.directory
+        manager.shutdown()
+        assert not directory.exists()
+
+    @pytest.mark.unit
+    def test_external_path_left_in_place(self, manager, tmp_path):
+        target = tmp_path / "Progress Dashboard + NTH.xlsx"
+        job = manager.submit("dashboard", target.name, _write(), path=target)
+        job.future.result(timeout=10)
+
+        assert manager.cleanup(now=time.monotonic() + 61) == 1
+        assert target.read_text() == "data"
+
+
+# ===========================================================================
+# 2. API
+# ===========================================================================
+
+MOCK_RECORDS = [
+    {"FullDate": "Mon 01/01", "Project": "C2264", "Qty Delivered": 5, "Week": "WK01", "Year": "2024", "Line": "EAL"},
+    {"FullDate": "Thu 08/01", "Project": "CBM", "Qty Delivered": 4, "Week": "WK02", "Year": "2024", "Line": "EAL"},
+]
+
+
+@pytest.fixture
+def client():
+    dashboard_analyzer.df = None
+    dashboard_analyzer.summary = None
+    dashboard_analyzer.nth_trend = None
+    yield TestClient(app)
+    dashboard_analyzer.df = None
+    dashboard_analyzer.summary = None
+    dashboard_analyzer.nth_trend = None
+
+
+def _wait_for(client, job_id):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        status = client.get(f"/api/export/jobs/{job_id}").json()
+        if status["status"] in (JOB_DONE, JOB_FAILED):
+            return status
+        time.sleep(0.02)
+    raise AssertionError("export job did not finish")
+
+
+@pytest.mark.integration
+class TestExportJobApi:
+    def test_dashboard_job_download(self, client, tmp_path):
+        client.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS, "max_week": 2})
+
+        res = client.post("/api/export/jobs/dashboard", json={"filename": "dash.xlsx"})
+        assert res.status_code == 200
+        job_id = res.json()["job_id"]
+
+        status = _wait_for(client, job_id)
+        assert status["status"] == JOB_DONE and status["progress"] == 1.0
+        assert job_id in [job["job_id"] for job in client.get("/api/export/jobs").json()["jobs"]]
+
+        res = client.get(f"/api/export/jobs/{job_id}/download")
+        assert res.status_code == 200
+        assert "dash.xlsx" in res.headers["content-disposition"]
+        path = tmp_path / "dash.xlsx"
+        path.write_bytes(res.content)
+        assert openpyxl.load_workbook(path).sheetnames[:2] == ["Raw Data", "Summary by Project"]
+
+        assert client.delete(f"/api/export/jobs/{job_id}").status_code == 200
+        assert client.get(f"/api/export/jobs/{job_id}").status_code == 404
+
+    def test_synchronous_export_still_returns_file(self, client):
+        client.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS, "max_week": 2})
+        res = client.post("/api/export/dashboard", json={})
+        assert res.status_code == 200
+        assert res.content[:2] == b"PK"
+
+    def test_snapshot_taken_on_analysis_pool(self, client, monkeypatch):
+        from routers import export
+
+        threads = []
+        dashboard_export = export._dashboard_export
+
+        def snapshot():
+            threads.append(threading.current_thread().name)
+            return dashboard_export()
+
+        monkeypatch.setattr(export, "_dashboard_export", snapshot)
+        client.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS, "max_week": 2})
+        _wait_for(client, client.post("/api/export/jobs/dashboard", json={}).json()["job_id"])
+        assert len(threads) == 1 and threads[0].startswith("duat-analysis")
+
+    def test_no_data_rejected_before_queueing(self, client):
+        before = len(export_jobs.jobs())
+        assert client.post("/api/export/jobs/dashboard", json={}).status_code == 400
+        assert len(export_jobs.jobs()) == before
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/export/jobs/nope").status_code == 404
+        assert client.get("/api/export/jobs/nope/download").status_code == 404
+
+    def test_app_shutdown_deletes_export_directory(self, client):
+        with TestClient(app) as running:
+            running.post("/api/dashboard/analyze", json={"records": MOCK_RECORDS, "max_week": 2})
+            job_id = running.post("/api/export/jobs/dashboard", json={}).json()["job_id"]
+            _wait_for(running, job_id)
+            directory = export_jobs.directory
+        # The lifespan shut the job manager down with the app
+        assert not directory.exists()
+        assert export_jobs.get(job_id) is None
@@ -0,0 +1,221 @@
+# MTR DUAT - Folder Watcher Tests
+"""Unit and API tests for parsers/folder_watcher.py and the watch router."""
+
+import os
+import time
+import pytest
+from pathlib import Path
+from docx import Document
+from fastapi.testclient import TestClient
+
+from parsers.docx_parser import process_docx
+from parsers.folder_watcher import FolderWatcher, WatchDelta
+
+
+# ===========================================================================
+# Fixtures
+# ===========================================================================
+
+
+def _write_report(folder: Path, week: int, project: str, qty: int = 3) -> Path:
+    path = folder / f"PS-OHLR_DUAT_Daily Report_WK{week:02d}_2025.docx"
+    doc = Document()
+    table = doc.add_table(rows=2, cols=3)
+    table.cell(0, 0).text = "Date"
+    table.cell(1, 0).text = f"Mon {week}/3"
+    table.cell(1, 1).text = f"{project} KTL"
+    table.cell(1, 2).text = str(qty)
+    doc.save(str(path))
+    return path
+
+
+def _touch_later(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+@pytest.fixture
+def watched_folder(tmp_path: Path) -> Path:
+    _write_report(tmp_path, 1, "C1001")
+    _write_report(tmp_path, 2, "C1002")
+    return tmp_path
+
+
+# ===========================================================================
+# 1. Polling
+# ===========================================================================
+
+
+class TestFolderWatcherPoll:
+    @pytest.mark.unit
+    def test_first_poll_reports_every_file(self, watched_folder: Path):
+        delta = FolderWatcher(watched_folder).poll()
+        assert sorted(delta.updated) == [
+            "PS-OHLR_DUAT_Daily Report_WK01_2025.docx",
+            "PS-OHLR_DUAT_Daily Report_WK02_2025.docx",
+        ]
+        assert delta.removed == []
+        path = watched_folder / "PS-OHLR_DUAT_Daily Report_WK01_2025.docx"
+        assert delta.updated[path.name] == process_docx(path)
+
+    @pytest.mark.unit
+    def test_unchanged_folder_has_no_changes(self, watched_folder: Path):
+        watcher = FolderWatcher(watched_folder)
+        watcher.poll()
+        delta = watcher.poll()
+        assert not delta.has_changes
+        assert watcher.polls == 2
+
+    @pytest.mark.unit
+    def test_detects_new_changed_and_removed(self, watched_folder: Path):
+        watcher = FolderWatcher(watched_folder)
+        watcher.poll()
+
+        new_path = _write_report(watched_folder, 3, "C1003")
+        changed = _write_report(watched_folder, 2, "C2002", qty=9)
+        _touch_later(changed)
+        (watched_folder / "PS-OHLR_DUAT_Daily Report_WK01_2025.docx").unlink()
+        (watched_folder / "~$PS-OHLR_DUAT_Daily Report_WK04_2025.docx").write_bytes(b"lock")
+
+        delta = watcher.poll()
+        assert sorted(delta.updated) == [changed.name, new_path.name]
+        assert delta.updated[changed.name][0]["Project"] == "C2002"
+        assert delta.removed == ["PS-OHLR_DUAT_Daily Report_WK01_2025.docx"]
+
+    @pytest.mark.unit
+    def test_unknown_engine_rejected(self, watched_folder: Path):
+        with pytest.raises(ValueError):
+            FolderWatcher(watched_folder, engine="sax")
+
+
+# ===========================================================================
+# 2. Background thread
+# ===========================================================================
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestFolderWatcherThread:
+    @pytest.mark.unit
+    def test_start_delivers_baseline_and_stops(self, watched_folder: Path):
+        deltas = []
+        watcher = FolderWatcher(watched_folder)
+        watcher.start(0.05, deltas.append)
+        try:
+            assert _wait_for(lambda: len(deltas) == 1)
+            assert isinstance(deltas[0], WatchDelta)
+            with pytest.raises(RuntimeError):
+                watcher.start(0.05, deltas.append)
+        finally:
+            watcher.stop(timeout=5)
+        assert not watcher.running
+
+    @pytest.mark.unit
+    def test_should_skip_postpones_polling(self, watched_folder: Path):
+        watcher = FolderWatcher(watched_folder)
+        watcher.start(0.02, lambda delta: None, should_skip=lambda: True)
+        try:
+            time.sleep(0.15)
+            assert watcher.polls == 0
+        finally:
+            watcher.stop(timeout=5)
+
+
+# ===========================================================================
+# 3. Watch endpoints
+# ===========================================================================
+
+
+@pytest.fixture
+def _restore_state():
+    from backend.services import dashboard_analyzer, parsing_state, watch_state
+
+    saved = [(state, dict(state)) for state in (parsing_state, watch_state)]
+    yield
+    from backend.routers.watch import stop_watcher
+
+    stop_watcher()
+    for state, snapshot in saved:
+        state.clear()
+        state.update(snapshot)
+    dashboard_analyzer.df = None
+    dashboard_analyzer.summary = None
+    dashboard_analyzer.nth_trend = None
+    dashboard_analyzer.last_updated = None
+    dashboard_analyzer.source_spans = {}
+
+
+class TestWatchEndpoints:
+    @pytest.mark.integration
+    def test_watch_applies_deltas(self, watched_folder: Path, tmp_path_factory, monkeypatch, _restore_state):
+        from backend.main import app
+        from backend.services import dashboard_analyzer, parsing_state, watch_state
+
+        monkeypatch.setenv("DUAT_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        client = TestClient(app)
+
+        resp = client.post("/api/watch/start", json={"folder_path": str(watched_folder), "interval": 0.5})
+        assert resp.status_code == 200
+        # files_updated is bumped after records and analyzer are refreshed
+        assert _wait_for(lambda: watch_state["files_updated"] == 2)
+        assert len(parsing_state["file_records"]) == 2
+        assert dashboard_analyzer.get_stats()["total_records"] == 2
+        assert parsing_state["max_week"] == 2
+
+        _write_report(watched_folder, 5, "C1005")
+        assert _wait_for(lambda: watch_state["files_updated"] == 3)
+        assert len(parsing_state["records"]) == 3
+        assert dashboard_analyzer.get_stats()["total_records"] == 3
+        assert parsing_state["max_week"] == 5
+
+        status = client.get("/api/watch/status").json()
+        assert status["active"] is True
+        assert status["tracked_files"] == 3
+        assert status["polls"] >= 2
+
+        stopped = client.post("/api/watch/stop").json()
+        assert stopped["was_running"] is True
+        assert client.get("/api/watch/status").json()["active"] is False
+
+    @pytest.mark.unit
+    def test_deltas_are_applied_on_analysis_pool(self, watched_folder: Path, monkeypatch, _restore_state):
+        import threading
+
+        from backend.routers import watch
+
+        threads = []
+        monkeypatch.setattr(
+            watch, "apply_watch_delta", lambda delta, watcher: threads.append(threading.current_thread().name)
+        )
+        watcher = FolderWatcher(watched_folder)
+        monkeypatch.setitem(watch.watch_state, "watcher", watcher)
+        watch._on_delta(watcher, WatchDelta(updated={}, removed=[]))
+        assert len(threads) == 1 and threads[0].startswith("duat-analysis")
+
+    @pytest.mark.unit
+    def test_deltas_of_a_replaced_watcher_are_dropped(self, watched_folder: Path, monkeypatch, _restore_state):
+        from backend.routers import watch
+        from backend.services import parsing_state
+
+        stale, active = FolderWatcher(watched_folder), FolderWatcher(watched_folder)
+        monkeypatch.setitem(watch.watch_state, "watcher", active)
+        parsing_state["file_records"] = {}
+        delta = WatchDelta(updated={"old.docx": [{"Project": "C1001"}]}, removed=[])
+
+        watch._on_delta(stale, delta)
+        assert watch.apply_watch_delta(delta, stale) is False
+        assert parsing_state["file_records"] == {}
+
+    @pytest.mark.integration
+    def test_watch_rejects_missing_folder(self, tmp_path: Path):
+        from backend.main import app
+
+        resp = TestClient(app).post("/api/watch/start", json={"folder_path": str(tmp_path / "missing")})
+        assert resp.status_code == 400
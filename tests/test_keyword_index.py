@@ -0,0 +1,259 @@
+# MTR DUAT - Keyword Index Tests
+"""Unit and API tests for parsers/keyword_index.py."""
+
+import json
+import os
+import pytest
+from pathlib import Path
+from docx import Document
+from fastapi.testclient import TestClient
+
+from parsers.keyword_index import KeywordIndex, tokenize
+from parsers.report_scanner import read_text_entries, search_text_entries
+
+
+# ===========================================================================
+# Fixtures
+# ===========================================================================
+
+
+def _write_report(folder: Path, week: int, lines) -> Path:
+    path = folder / f"PS-OHLR_DUAT_Daily Report_WK{week:02d}_2025.docx"
+    doc = Document()
+    doc.add_paragraph(f"Week {week} summary")
+    table = doc.add_table(rows=len(lines), cols=2)
+    for row, (a, b) in zip(table.rows, lines):
+        row.cells[0].text = a
+        row.cells[1].text = b
+    doc.save(str(path))
+    return path
+
+
+def _report_files(folder: Path):
+    return sorted(folder.glob("PS-OHLR_DUAT_Daily Report_*.docx"))
+
+
+@pytest.fixture
+def report_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "reports"
+    folder.mkdir()
+    _write_report(folder, 1, [("Mon 3/3", "CBM work KTL"), ("Tue 4/3", "C&R C1001 inspection")])
+    _write_report(folder, 2, [("Wed 5/3", "Inspected cable TWL"), ("Thu 6/3", "PA work, CBM")])
+    _write_report(folder, 3, [("Fri 7/3", "HLM " + "x" * 600), ("Sat 8/3", "CBM work KTL")])
+    return folder
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> KeywordIndex:
+    return KeywordIndex(tmp_path / "cache" / "keyword_index.json")
+
+
+def _linear_search(files, keyword):
+    """Reference implementation: the original per-entry substring scan."""
+    results = {}
+    for path in files:
+        matches = search_text_entries(read_text_entries(path), keyword)
+        if matches:
+            results[path.name] = matches
+    return results
+
+
+# ===========================================================================
+# 1. Substring mode matches the linear scan
+# ===========================================================================
+
+
+class TestSubstringSearch:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("keyword", [
+        "cbm", "CBM WORK", "bm wo", "c&r", "&", "ktl", "inspect", "5/3", "x" * 10, "nothing", "week 2",
+    ])
+    def test_matches_linear_scan(self, report_folder: Path, index: KeywordIndex, keyword: str):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        assert index.search(keyword, files) == _linear_search(files, keyword)
+
+    @pytest.mark.unit
+    def test_restricted_to_requested_files(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        assert list(index.search("cbm", files[:1])) == [files[0].name]
+
+    @pytest.mark.unit
+    def test_unknown_mode_rejected(self, report_folder: Path, index: KeywordIndex):
+        with pytest.raises(ValueError):
+            index.search("cbm", _report_files(report_folder), mode="regex")
+
+
+# ===========================================================================
+# 2. Term and prefix modes
+# ===========================================================================
+
+
+class TestTermSearch:
+    @pytest.mark.unit
+    def test_all_requires_every_term(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        results = index.search("cbm ktl", files, mode="all")
+        assert sorted(results) == [files[0].name, files[2].name]
+        assert all("KTL" in m["text"] for matches in results.values() for m in matches)
+
+    @pytest.mark.unit
+    def test_whole_words_only(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        assert index.search("inspect", files, mode="all") == {}
+
+    @pytest.mark.unit
+    def test_prefix_term(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        results = index.search("inspect*", files, mode="all")
+        assert sorted(results) == [files[0].name, files[1].name]
+
+    @pytest.mark.unit
+    def test_any_matches_either_term(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        results = index.search("hlm twl", files, mode="any")
+        assert sorted(results) == [files[1].name, files[2].name]
+
+    @pytest.mark.unit
+    def test_query_without_terms_rejected(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        with pytest.raises(ValueError):
+            index.search("& *", files, mode="all")
+
+    @pytest.mark.unit
+    def test_tokenize(self):
+        assert tokenize("C&R C1001, PA-work") == ["c", "r", "c1001", "pa", "work"]
+
+
+# ===========================================================================
+# 3. Incremental refresh and persistence
+# ===========================================================================
+
+
+class TestIndexMaintenance:
+    @pytest.mark.unit
+    def test_refresh_only_rereads_changed_files(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        assert index.refresh(report_folder, files) == 3
+        assert index.refresh(report_folder, files) == 0
+
+        changed = _write_report(report_folder, 2, [("Wed 5/3", "Provide lighting")])
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+        assert index.refresh(report_folder, files) == 1
+        assert list(index.search("lighting", files)) == [changed.name]
+        assert changed.name not in index.search("inspected", files)
+
+    @pytest.mark.unit
+    def test_deleted_files_are_dropped(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        files[0].unlink()
+
+        remaining = _report_files(report_folder)
+        index.refresh(report_folder, remaining)
+        assert len(index) == 2
+        assert index.search("c&r", remaining) == {}
+
+    @pytest.mark.unit
+    def test_persists_between_instances(self, report_folder: Path, index: KeywordIndex):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        assert index.save() is True
+
+        reloaded = KeywordIndex(index.index_file)
+        assert len(reloaded) == 3
+        assert reloaded.refresh(report_folder, files) == 0
+        assert reloaded.search("cbm", files) == index.search("cbm", files)
+
+    @pytest.mark.unit
+    def test_unreadable_file_is_retried(self, report_folder: Path, index: KeywordIndex):
+        bad = report_folder / "PS-OHLR_DUAT_Daily Report_WK09_2025.docx"
+        bad.write_bytes(b"not a docx")
+        files = _report_files(report_folder)
+
+        assert index.refresh(report_folder, files) == 3
+        assert len(index) == 3
+        assert index.refresh(report_folder, files) == 0
+
+    @pytest.mark.unit
+    def test_corrupt_index_file_ignored(self, tmp_path: Path):
+        index_file = tmp_path / "keyword_index.json"
+        index_file.write_text("{not json", encoding="utf-8")
+        assert len(KeywordIndex(index_file)) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("bad_entry", [
+        {"signature": [1, 2]},
+        {"entries": []},
+        {"signature": [1, 2], "entries": [{"line": 1}]},
+        {"signature": None, "entries": []},
+        "not an entry",
+    ])
+    def test_malformed_index_entry_starts_fresh(self, report_folder: Path, index: KeywordIndex, bad_entry):
+        files = _report_files(report_folder)
+        index.refresh(report_folder, files)
+        index.save()
+        payload = json.loads(index.index_file.read_text(encoding="utf-8"))
+        payload["files"]["broken.docx"] = bad_entry
+        index.index_file.write_text(json.dumps(payload), encoding="utf-8")
+
+        reloaded = KeywordIndex(index.index_file)
+        assert len(reloaded) == 0
+        assert reloaded.search("cbm", files) == {}
+        assert reloaded.refresh(report_folder, files) == 3
+        assert reloaded.search("cbm", files) == index.search("cbm", files)
+
+
+# ===========================================================================
+# 4. Search endpoint
+# ===========================================================================
+
+
+@pytest.fixture
+def client(tmp_path_factory, monkeypatch):
+    from backend.main import app
+    from backend.services import search_state
+
+    monkeypatch.setenv("DUAT_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    saved = dict(search_state)
+    yield TestClient(app)
+    search_state.clear()
+    search_state.update(saved)
+
+
+class TestSearchEndpoint:
+    @pytest.mark.integration
+    def test_substring_search_and_reindex_counts(self, report_folder: Path, client):
+        payload = {"folder_path": str(report_folder), "keyword": "cbm"}
+        first = client.post("/api/keyword/search", json=payload).json()
+        assert first["matched_files"] == 3
+        assert first["total_files"] == 3
+        assert first["reindexed_files"] == 3
+
+        second = client.post("/api/keyword/search", json=payload).json()
+        assert second["reindexed_files"] == 0
+        assert second["results"] == first["results"]
+
+    @pytest.mark.integration
+    def test_prefix_mode(self, report_folder: Path, client):
+        resp = client.post(
+            "/api/keyword/search",
+            json={"folder_path": str(report_folder), "keyword": "insp*", "mode": "all"},
+        )
+        assert resp.json()["matched_files"] == 2
+
+    @pytest.mark.integration
+    def test_query_without_terms_returns_400(self, report_folder: Path, client):
+        resp = client.post(
+            "/api/keyword/search",
+            json={"folder_path": str(report_folder), "keyword": "&", "mode": "any"},
+        )
+        assert resp.status_code == 400
@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 from analysis.lag_analysis import (
+    ENGINE_ROWS,
+    ENGINE_VECTOR,
     get_status,
     load_project_master,
     calculate_nth_lag_lead,
@@ -149,6 +151,84 @@ class TestCalculateNthLagLead:
         assert len(results) == 0
 
 
+def _make_mixed_master():
+    """Helper: project master and config covering every skip/guard branch."""
+    today = datetime.now()
+    rows, config, actual_qty = [], {}, {}
+    for i in range(60):
+        proj_no = f"C{3000 + i % 50}"
+        start = today - timedelta(days=(i * 37) % 700 - 60)
+        rows.append({
+            "Project No": f" {proj_no} ",
+            "Title": f"Project {i}" if i % 7 else None,
+            "Start Date": None if i == 5 else start,
+            "End Date": None if i == 9 else start + timedelta(days=(i * 53) % 800 - 20),
+        })
+        config[proj_no] = {
+            "target_qty": ["N/A", "", None, "bad"][i % 4] if i % 11 == 0 else (i * 97) % 1500,
+            "productivity": [3.0, 2.5, 0, None, 1.7][i % 5],
+            "skip": i % 13 == 0,
+        }
+        if i % 3:
+            actual_qty[proj_no] = (i * 61) % 1200
+    # Zero target quantity, zero-day duration and a finished schedule
+    for proj_no, start, days, target in (
+        ("C4000", today - timedelta(days=30), 90, 0),
+        ("C4001", today - timedelta(days=30), 0, 200),
+        ("C4002", today - timedelta(days=300), 100, 200),
+    ):
+        rows.append({
+            "Project No": proj_no,
+            "Title": proj_no,
+            "Start Date": start,
+            "End Date": start + timedelta(days=days),
+        })
+        config[proj_no] = {"target_qty": target, "productivity": 2.0, "skip": False}
+        actual_qty[proj_no] = 40
+    return pd.DataFrame(rows), config, actual_qty
+
+
+@pytest.mark.unit
+class TestLagLeadEngines:
+
+    def test_vector_matches_rows(self):
+        pm, config, actual_qty = _make_mixed_master()
+        expected = calculate_nth_lag_lead(pm, config, actual_qty, engine=ENGINE_ROWS)
+        results = calculate_nth_lag_lead(pm, config, actual_qty, engine=ENGINE_VECTOR)
+        assert len(expected) > 20
+        assert results == expected
+        # Same Python types per field, so the frames get the same dtypes
+        assert [{k: type(v) for k, v in row.items()} for row in results] == [
+            {k: type(v) for k, v in row.items()} for row in expected
+        ]
+        pd.testing.assert_frame_equal(pd.DataFrame(results), pd.DataFrame(expected))
+
+    def test_guarded_percentages_are_int_zero(self):
+        pm, config, actual_qty = _make_mixed_master()
+        for engine in (ENGINE_ROWS, ENGINE_VECTOR):
+            by_project = {r["Project"]: r for r in calculate_nth_lag_lead(pm, config, actual_qty, engine=engine)}
+            assert type(by_project["C4000"]["Progress %"]) is int
+            assert type(by_project["C4001"]["Target % (Linear)"]) is int
+            assert by_project["C4002"]["Target % (Linear)"] == 100
+
+    def test_status_bands_match_get_status(self):
+        pm, config, actual_qty = _make_mixed_master()
+        t_func = lambda key: key.upper()
+        for row in calculate_nth_lag_lead(pm, config, actual_qty, t_func=t_func):
+            assert (row["Status"], row["Status Color"]) == get_status(row["NTH Lag/Lead"], t_func)
+
+    def test_without_title_column(self):
+        pm = _make_project_master().drop(columns=["Title"])
+        config = {"C2264": {"target_qty": 1000}, "C2265": {"target_qty": 500, "productivity": 2.5}}
+        results = calculate_nth_lag_lead(pm, config, {"C2264": 400})
+        assert results == calculate_nth_lag_lead(pm, config, {"C2264": 400}, engine=ENGINE_ROWS)
+        assert [r["Title"] for r in results] == ["", ""]
+
+    def test_unknown_engine_rejected(self):
+        with pytest.raises(ValueError):
+            calculate_nth_lag_lead(_make_project_master(), {}, {}, engine="sql")
+
+
 # ── export_lag_report ────────────────────────────────────────────────────────
 
 
@@ -185,6 +265,17 @@ class TestExportLagReport:
         exported = pd.read_excel(output, sheet_name="Lag Analysis")
         assert "Status Color" not in exported.columns
 
+    def test_column_widths_capped_at_20(self, tmp_path):
+        results_df = pd.DataFrame([
+            {"Project": "C2264", "Title": "A very long project title indeed", "Status": "lag_urgent"},
+        ])
+        output = tmp_path / "lag_report.xlsx"
+        export_lag_report(results_df, output)
+
+        from openpyxl import load_workbook
+        ws = load_workbook(output)["Lag Analysis"]
+        assert [ws.column_dimensions[c].width for c in "ABC"] == [9, 20, 12]
+
 
 # ── LagAnalyzer ──────────────────────────────────────────────────────────────
 
@@ -308,6 +399,36 @@ class TestLoadProjectMaster:
         assert "C2264" in df["Project No"].values
         assert "C2265" in df["Project No"].values
 
+    def test_mixed_cells_are_coerced_per_column(self, tmp_path):
+        filepath = tmp_path / "master.xlsx"
+        rows = [
+            [1, "OHL", " C5000 ", "nan", "13/01/2024", datetime(2025, 2, 1), " 12 "],
+            [2, "OHL", "nan", "Skipped", "01/01/2024", "31/12/2025", 100],
+            [3, "OHL", "C5001", "Valid", "not a date", "", "N/A"],
+            [4, "OHL", "C5002", None, "2024-03-05", "05/06/2025 10:30", 7.5],
+        ]
+        _create_project_master_excel(filepath, rows=rows)
+
+        df, descriptions, target_map = load_project_master(filepath)
+
+        assert df["Project No"].tolist() == ["C5000", "C5001", "C5002"]
+        assert df["Title"].tolist() == ["", "Valid", ""]
+        assert descriptions == {"C5001": "Valid"}
+        assert target_map == {"C5000": 12.0, "C5002": 7.5}
+        assert df["Start Date"].tolist()[0] == pd.Timestamp(2024, 1, 13)
+        assert pd.isna(df["Start Date"].tolist()[1])
+        assert df["End Date"].tolist()[2] == pd.Timestamp(2025, 6, 5, 10, 30)
+
+    def test_no_project_rows_returns_empty_frame(self, tmp_path):
+        filepath = tmp_path / "master.xlsx"
+        _create_project_master_excel(filepath, rows=[[1, "OHL", None, "Nothing", None, None, None]])
+
+        df, descriptions, target_map = load_project_master(filepath)
+
+        assert df.empty
+        assert descriptions == {}
+        assert target_map == {}
+
 
 # ── LagAnalyzer.load_project_master ─────────────────────────────────────────
 
@@ -480,6 +480,25 @@ class TestExportManpowerExcel:
         assert result == output
         assert output.exists()
 
+    def test_cells_use_named_styles(self, tmp_path):
+        records = _make_records() + [{**_make_records()[1], "jobs": []}]
+        output = tmp_path / "manpower.xlsx"
+        export_manpower_excel(records, output)
+
+        from openpyxl import load_workbook
+        wb = load_workbook(output)
+        ws = wb["Raw Data"]
+        assert {cell.style for cell in ws[1]} == {"Manpower Header"}
+        assert ws["A1"].font.b and ws["A1"].fill.fgColor.rgb == "001F4E79"
+        data_styles = {cell.style for row in ws.iter_rows(min_row=2) for cell in row}
+        assert data_styles == {"Manpower Cell"}
+        # The shift without jobs still gets a row, with blank job columns
+        assert ws.max_row == 6
+        assert [ws.cell(row=6, column=c).value for c in (6, 9, 11)] == [None, 0, 0]
+        assert ws.column_dimensions["X"].width == 14
+        assert wb["Role Frequency"].column_dimensions["A"].width == 20
+        wb.close()
+
 
 # ── ManpowerAnalyzer.export_excel ───────────────────────────────────────────
 
@@ -248,6 +248,46 @@ class TestParseEpicRoles:
         result = _parse_epic_roles(text)
         assert result["EPIC"] != ""
 
+    @pytest.mark.unit
+    def test_text_without_labels_has_no_roles(self):
+        from parsers.manpower_parser import _parse_epic_roles
+        result = _parse_epic_roles("CP John SPC Mary")
+        assert result["EPIC"] == "CP John SPC Mary"
+        assert not any(result[key] for key in ("CP_P", "CP_T", "AP_E", "SPC", "HSM", "NP"))
+
+
+class TestClassifyRow:
+    """Tests for _classify_row row features."""
+
+    @pytest.mark.unit
+    def test_job_row_features(self):
+        from parsers.manpower_parser import _classify_row
+        row = _classify_row(["Mon 19/5", "C1234 SPA work", "S2x2, S3x1", "3"])
+        assert row.text == "Mon 19/5 C1234 SPA work S2x2, S3x1 3"
+        assert row.job_type == "SPA work"
+        assert row.project_code == "C1234"
+        assert row.team_counts == {"S2": 2, "S3": 1}
+        assert not (row.on_duty or row.apprentice or row.term_labour or row.leave)
+
+    @pytest.mark.unit
+    def test_section_markers(self):
+        from parsers.manpower_parser import _classify_row
+        assert _classify_row(["", "ON DUTY: Alan"]).on_duty
+        assert _classify_row(["Attendance", "Alan"]).on_duty
+        assert _classify_row(["Apprentice: Ben"]).apprentice
+        assert _classify_row(["Term Labor", "2"]).term_labour
+        assert _classify_row(["", "Training: Carl"]).leave
+        # Leave markers are case sensitive and need the colon
+        assert not _classify_row(["al: Carl", "AL Dan"]).leave
+
+    @pytest.mark.unit
+    def test_other_row(self):
+        from parsers.manpower_parser import _classify_row
+        row = _classify_row(["Remarks", "nothing to report"])
+        assert row.job_type == "Other"
+        assert row.project_code is None
+        assert row.team_counts == {}
+
 
 # ── ManpowerParser class tests ───────────────────────────────────────────────
 
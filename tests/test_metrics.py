@@ -0,0 +1,242 @@
+# MTR DUAT - Request Metrics Tests
+"""Tests for backend/metrics.py and the /api/metrics endpoint."""
+
+import pstats
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend.executor import ANALYSIS, run_blocking
+from backend.main import app
+from backend.metrics import (
+    PROFILE_DIR_ENV,
+    PROFILE_SAMPLE_ENV,
+    PROFILE_SLOW_MS_ENV,
+    UNMATCHED,
+    Histogram,
+    MetricsMiddleware,
+    RequestMetrics,
+    RequestProfiler,
+    _request_profiles,
+    profiled,
+)
+
+
+def _slow_work(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+def _make_app(metrics: RequestMetrics, profiler: RequestProfiler = None) -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"item": item_id}
+
+    @router.get("/slow")
+    async def slow(seconds: float = 0.05):
+        return {"result": await run_blocking(ANALYSIS, _slow_work, seconds)}
+
+    @router.get("/inspect")
+    async def inspect():
+        return metrics.to_dict()
+
+    test_app = FastAPI()
+    test_app.include_router(router, prefix="/api/test")
+    test_app.add_middleware(MetricsMiddleware, metrics=metrics, profiler=profiler, exclude=("/api/test/items/hidden",))
+    return test_app
+
+
+def _route(metrics: RequestMetrics, route: str) -> dict:
+    return next(r for r in metrics.to_dict()["routes"] if r["route"] == route)
+
+
+# ===========================================================================
+# 1. Histogram
+# ===========================================================================
+
+
+class TestHistogram:
+    @pytest.mark.unit
+    def test_buckets_are_cumulative_and_inclusive(self):
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 9):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("1", 2), ("5", 3), ("+Inf", 4)]
+        assert histogram.count == 4 and histogram.sum == 13.5 and histogram.max == 9
+
+    @pytest.mark.unit
+    def test_quantile_interpolates_within_bucket_and_caps_at_max(self):
+        histogram = Histogram((0.1, 1.0))
+        for _ in range(10):
+            histogram.observe(0.5)
+
+        assert 0.1 < histogram.quantile(0.5) <= 0.5
+        assert histogram.quantile(0.99) == 0.5
+        assert Histogram((1,)).quantile(0.5) is None
+
+
+# ===========================================================================
+# 2. Middleware
+# ===========================================================================
+
+
+class TestMetricsMiddleware:
+    @pytest.mark.unit
+    def test_records_route_templates_statuses_and_sizes(self):
+        metrics = RequestMetrics()
+        client = TestClient(_make_app(metrics))
+
+        client.get("/api/test/items/a")
+        client.get("/api/test/items/b")
+        client.get("/api/test/items/missing")
+        client.get("/not/a/route")
+
+        item = _route(metrics, "/api/test/items/{item_id}")
+        assert item["requests"] == 3
+        assert item["status"] == {"200": 2, "404": 1}
+        assert item["response_bytes"]["total"] == len(b'{"item":"a"}') * 2 + len(b'{"detail":"Not found"}')
+        assert _route(metrics, UNMATCHED)["status"] == {"404": 1}
+
+    @pytest.mark.unit
+    def test_latency_covers_blocking_work(self):
+        metrics = RequestMetrics()
+        TestClient(_make_app(metrics)).get("/api/test/slow", params={"seconds": 0.05})
+
+        latency = _route(metrics, "/api/test/slow")["latency_ms"]
+        assert latency["max"] >= 50
+        assert latency["p50"] <= latency["max"]
+
+    @pytest.mark.unit
+    def test_in_flight_counts_requests_being_handled(self):
+        metrics = RequestMetrics()
+        client = TestClient(_make_app(metrics))
+
+        # The handler sees its own request in flight
+        during = client.get("/api/test/inspect").json()["routes"]
+        assert next(r for r in during if r["route"] == "/api/test/inspect")["in_flight"] == 1
+        assert _route(metrics, "/api/test/inspect")["in_flight"] == 0
+
+    @pytest.mark.unit
+    def test_excluded_paths_are_not_recorded(self):
+        metrics = RequestMetrics()
+        TestClient(_make_app(metrics)).get("/api/test/items/hidden")
+        assert metrics.to_dict()["routes"] == []
+
+    @pytest.mark.unit
+    def test_prometheus_text_format(self):
+        metrics = RequestMetrics()
+        TestClient(_make_app(metrics)).get("/api/test/items/a")
+        text = metrics.to_prometheus()
+
+        labels = 'method="GET",route="/api/test/items/{item_id}"'
+        assert "# TYPE duat_http_requests_total counter" in text
+        assert f'duat_http_requests_total{{{labels},status="200"}} 1' in text
+        assert f"duat_http_requests_in_flight{{{labels}}} 0" in text
+        assert f'duat_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"duat_http_response_size_bytes_count{{{labels}}} 1" in text
+        assert text.endswith("\n")
+
+
+# ===========================================================================
+# 3. Slow-request profiler
+# ===========================================================================
+
+
+class TestRequestProfiler:
+    @pytest.mark.unit
+    def test_slow_request_profile_is_written(self, tmp_path):
+        profiler = RequestProfiler(slow_ms=20, output_dir=tmp_path)
+        client = TestClient(_make_app(RequestMetrics(), profiler))
+
+        client.get("/api/test/slow", params={"seconds": 0.05})
+        client.get("/api/test/items/a")
+
+        (prof,) = tmp_path.glob("*.prof")
+        assert "GET_api_test_slow" in prof.name
+        stats = pstats.Stats(str(prof))
+        assert any(func[2] == "_slow_work" for func in stats.stats)
+        assert "_slow_work" in prof.with_suffix(".txt").read_text(encoding="utf-8")
+        assert profiler.written == 1
+
+    @pytest.mark.unit
+    def test_fast_and_unsampled_requests_are_not_written(self, tmp_path):
+        fast = RequestProfiler(slow_ms=10_000, output_dir=tmp_path / "fast")
+        unsampled = RequestProfiler(slow_ms=0, output_dir=tmp_path / "unsampled", sample=0)
+
+        for profiler in (fast, unsampled):
+            TestClient(_make_app(RequestMetrics(), profiler)).get("/api/test/slow", params={"seconds": 0.01})
+
+        assert fast.written == unsampled.written == 0
+        assert not (tmp_path / "unsampled").exists()
+
+    @pytest.mark.unit
+    def test_overlapping_profiled_calls_both_succeed(self):
+        # Python 3.12+ allows one active cProfile per process; the second
+        # overlapping call must run unprofiled instead of failing
+        barrier = threading.Barrier(2, timeout=5)
+
+        def work(value):
+            barrier.wait()
+            return value
+
+        profiles = []
+        token = _request_profiles.set(profiles)
+        try:
+            calls = [profiled(lambda v=v: work(v)) for v in (1, 2)]
+        finally:
+            _request_profiles.reset(token)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = [f.result() for f in [pool.submit(call) for call in calls]]
+
+        assert results == [1, 2]
+        assert len(profiles) == 1
+
+    @pytest.mark.unit
+    def test_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv(PROFILE_SLOW_MS_ENV, raising=False)
+        assert RequestProfiler.from_env() is None
+
+        monkeypatch.setenv(PROFILE_SLOW_MS_ENV, "250")
+        monkeypatch.setenv(PROFILE_SAMPLE_ENV, "0.5")
+        monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+        profiler = RequestProfiler.from_env()
+        assert profiler.slow_seconds == 0.25 and profiler.sample == 0.5
+        assert profiler.output_dir == tmp_path
+
+        monkeypatch.setenv(PROFILE_SLOW_MS_ENV, "slow")
+        assert RequestProfiler.from_env() is None
+
+
+# ===========================================================================
+# 4. /api/metrics
+# ===========================================================================
+
+
+class TestMetricsEndpoint:
+    @pytest.mark.integration
+    def test_json_and_prometheus_views(self):
+        client = TestClient(app)
+        client.get("/api/health")
+
+        routes = client.get("/api/metrics", params={"format": "json"}).json()["routes"]
+        health = next(r for r in routes if r["route"] == "/api/health")
+        assert health["requests"] >= 1 and "200" in health["status"]
+        assert all(r["route"] != "/api/metrics" for r in routes)
+
+        response = client.get("/api/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'duat_http_requests_total{method="GET",route="/api/health",status="200"}' in response.text
+
+    @pytest.mark.integration
+    def test_unknown_format_rejected(self):
+        assert TestClient(app).get("/api/metrics", params={"format": "xml"}).status_code == 422
@@ -0,0 +1,196 @@
+# MTR DUAT - Streaming OOXML Reader Tests
+"""Unit tests for parsers/ooxml_stream.py and the stream parser engine."""
+
+import pytest
+from pathlib import Path
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import RGBColor
+
+from parsers.docx_parser import (
+    DailyReportParser,
+    ENGINE_DOCX,
+    ENGINE_STREAM,
+    _cell_text,
+    process_docx,
+)
+from parsers.ooxml_stream import (
+    BLOCK_PARAGRAPH,
+    BLOCK_TABLE,
+    StreamCell,
+    iter_body_blocks,
+    iter_body_tables,
+)
+
+
+# ===========================================================================
+# Fixtures
+# ===========================================================================
+
+
+def _add_hyperlink(paragraph, text: str) -> None:
+    """Append a ``w:hyperlink`` containing one run to *paragraph*."""
+    hyperlink = OxmlElement("w:hyperlink")
+    run = OxmlElement("w:r")
+    t = OxmlElement("w:t")
+    t.text = text
+    run.append(t)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+def _set_grid_before(row, count: int) -> None:
+    tr_pr = row._tr.get_or_add_trPr()
+    grid_before = OxmlElement("w:gridBefore")
+    grid_before.set(qn("w:val"), str(count))
+    tr_pr.insert(0, grid_before)
+
+
+@pytest.fixture
+def complex_report(tmp_path: Path) -> Path:
+    """Report exercising merges, blue runs, breaks, hyperlinks and nesting."""
+    filepath = tmp_path / "PS-OHLR_DUAT_Daily Report_WK14_2025.docx"
+    doc = Document()
+    doc.add_paragraph("Daily report heading")
+
+    table = doc.add_table(rows=6, cols=4)
+    for idx, header in enumerate(("Date", "Description", "Qty", "Line")):
+        table.rows[0].cells[idx].text = header
+
+    # Vertical merge on the date column for rows 1-2
+    table.cell(1, 0).merge(table.cell(2, 0)).text = "Mon 31/3"
+    table.cell(1, 1).text = "C9081 install KTL"
+    table.cell(1, 2).text = "4"
+    table.cell(2, 1).text = "C9082 install TWL"
+    table.cell(2, 2).text = "2"
+
+    # Night row with a blue job keyword run
+    table.cell(3, 0).text = "Night Tue 1/4"
+    desc = table.cell(3, 1).paragraphs[0]
+    blue = desc.add_run("CBM ")
+    blue.font.color.rgb = RGBColor(0x00, 0x20, 0xC0)
+    red = desc.add_run("check")
+    red.font.color.rgb = RGBColor(0xFF, 0x00, 0x00)
+    table.cell(3, 2).text = "5"
+
+    # Horizontal merge across description + qty, with a break, tab and hyperlink
+    table.cell(4, 0).text = "Wed 2/4"
+    merged = table.cell(4, 1).merge(table.cell(4, 2))
+    para = merged.paragraphs[0]
+    run = para.add_run("HLM\tAEL")
+    run.add_break()
+    run.add_text("C7001")
+    _add_hyperlink(para, " link text")
+    merged.add_paragraph("second para")
+
+    # Nested table inside a cell is ignored by cell.text
+    table.cell(5, 0).text = "Thu 3/4"
+    table.cell(5, 1).text = "Provide ISL"
+    nested = table.cell(5, 1).add_table(rows=1, cols=1)
+    nested.cell(0, 0).text = "C5555 nested"
+    table.cell(5, 2).text = "1.5"
+
+    doc.add_paragraph("Between tables")
+
+    second = doc.add_table(rows=3, cols=3)
+    second.cell(0, 0).text = "Date"
+    second.cell(1, 1).text = "PA work TCL"
+    second.cell(1, 2).text = "abc"
+    second.cell(2, 1).text = "C1234 EAL"
+    second.cell(2, 2).text = "7"
+    _set_grid_before(second.rows[2], 1)
+    # Drop the trailing cell so the row still spans three grid columns
+    second.rows[2]._tr.remove(second.rows[2]._tr.tc_lst[-1])
+
+    doc.save(str(filepath))
+    return filepath
+
+
+# ===========================================================================
+# 1. Reader semantics match python-docx
+# ===========================================================================
+
+
+class TestStreamReader:
+    @pytest.mark.unit
+    def test_cell_texts_match_python_docx(self, complex_report: Path):
+        doc = Document(str(complex_report))
+        expected = [
+            [[_cell_text(c) for c in row.cells] for row in table.rows]
+            for table in doc.tables
+        ]
+        actual = [
+            [[c.text for c in row] for row in rows]
+            for rows in iter_body_tables(complex_report)
+        ]
+        assert actual == expected
+
+    @pytest.mark.unit
+    def test_body_blocks_in_document_order(self, complex_report: Path):
+        kinds = [kind for kind, _ in iter_body_blocks(complex_report)]
+        assert kinds[:2] == [BLOCK_PARAGRAPH, BLOCK_TABLE]
+        assert kinds.count(BLOCK_TABLE) == 2
+
+        paragraphs = [block for kind, block in iter_body_blocks(complex_report) if kind == BLOCK_PARAGRAPH]
+        assert "Daily report heading" in paragraphs
+        assert "Between tables" in paragraphs
+
+    @pytest.mark.unit
+    def test_merged_cells_repeat_root_cell(self, complex_report: Path):
+        rows = next(iter_body_tables(complex_report))
+        assert rows[2][0] is rows[1][0]
+        assert rows[4][1] is rows[4][2]
+
+    @pytest.mark.unit
+    def test_run_colors(self, complex_report: Path):
+        rows = next(iter_body_tables(complex_report))
+        night_desc = rows[3][1]
+        assert isinstance(night_desc, StreamCell)
+        assert night_desc.run_colors == ((0x00, 0x20, 0xC0), (0xFF, 0x00, 0x00))
+        assert rows[1][1].run_colors == (None,)
+
+    @pytest.mark.unit
+    def test_break_tab_and_hyperlink_text(self, complex_report: Path):
+        rows = next(iter_body_tables(complex_report))
+        assert rows[4][1].text == "HLM\tAEL\nC7001 link text\nsecond para"
+
+
+# ===========================================================================
+# 2. Stream engine produces identical records
+# ===========================================================================
+
+
+class TestStreamEngine:
+    @pytest.mark.unit
+    def test_records_match_docx_engine(self, complex_report: Path):
+        expected = process_docx(complex_report, engine=ENGINE_DOCX)
+        actual = process_docx(complex_report, engine=ENGINE_STREAM)
+        assert len(expected) > 0
+        assert actual == expected
+
+    @pytest.mark.unit
+    def test_blue_night_keyword_zeroes_qty(self, complex_report: Path):
+        records = process_docx(complex_report, engine=ENGINE_STREAM)
+        night = [r for r in records if r["FullDate"] == "Night Tue 1/4"]
+        assert night[0]["Project"] == "CBM"
+        assert night[0]["Qty Delivered"] == 0.0
+
+    @pytest.mark.unit
+    def test_corrupted_file_returns_empty(self, tmp_path: Path):
+        bad = tmp_path / "PS-OHLR_DUAT_Daily Report_WK01_2025.docx"
+        bad.write_bytes(b"this is not a valid docx")
+        assert process_docx(bad, engine=ENGINE_STREAM) == []
+
+    @pytest.mark.unit
+    def test_unknown_engine_rejected(self, complex_report: Path):
+        with pytest.raises(ValueError):
+            process_docx(complex_report, engine="sax")
+        with pytest.raises(ValueError):
+            DailyReportParser(complex_report.parent, engine="sax")
+
+    @pytest.mark.unit
+    def test_parser_engine_parity(self, complex_report: Path):
+        docx_records = DailyReportParser(complex_report.parent).process_all()
+        stream_records = DailyReportParser(complex_report.parent, engine=ENGINE_STREAM).process_all()
+        assert stream_records == docx_records
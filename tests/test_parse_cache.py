@@ -0,0 +1,143 @@
+# MTR DUAT - Parse Cache Tests
+"""Unit tests for parsers/parse_cache.py and its use by DailyReportParser."""
+
+import json
+import os
+import pytest
+from pathlib import Path
+from docx import Document
+
+import parsers.docx_parser as docx_parser
+from parsers.docx_parser import DailyReportParser, PARSER_VERSION
+from parsers.parse_cache import ParseCache
+
+
+RECORDS = [
+    {"FullDate": "Mon 1/3", "Project": "C1001", "Qty Delivered": 2.0, "Week": "3", "Year": "2025", "Line": "KTL"},
+]
+
+
+@pytest.fixture
+def cache_file(tmp_path: Path) -> Path:
+    return tmp_path / "cache" / "parse_cache.json"
+
+
+@pytest.fixture
+def report_file(tmp_path: Path) -> Path:
+    path = tmp_path / "PS-OHLR_DUAT_Daily Report_WK03_2025.docx"
+    path.write_bytes(b"placeholder")
+    return path
+
+
+@pytest.fixture
+def report_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "reports"
+    folder.mkdir()
+    for week in (1, 2, 3):
+        doc = Document()
+        table = doc.add_table(rows=2, cols=3)
+        table.rows[0].cells[0].text = "Date"
+        table.rows[1].cells[0].text = f"Mon {week}/1"
+        table.rows[1].cells[1].text = f"C100{week} KTL"
+        table.rows[1].cells[2].text = "1"
+        doc.save(str(folder / f"PS-OHLR_DUAT_Daily Report_WK{week:02d}_2025.docx"))
+    return folder
+
+
+class TestParseCacheEntries:
+    @pytest.mark.unit
+    def test_miss_then_hit(self, cache_file: Path, report_file: Path):
+        cache = ParseCache(cache_file, "1")
+        assert cache.get(report_file) is None
+        cache.put(report_file, RECORDS)
+        assert cache.get(report_file) == RECORDS
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.unit
+    def test_size_change_invalidates(self, cache_file: Path, report_file: Path):
+        cache = ParseCache(cache_file, "1")
+        cache.put(report_file, RECORDS)
+        report_file.write_bytes(b"placeholder, now longer")
+        assert cache.get(report_file) is None
+
+    @pytest.mark.unit
+    def test_mtime_change_invalidates(self, cache_file: Path, report_file: Path):
+        cache = ParseCache(cache_file, "1")
+        cache.put(report_file, RECORDS)
+        stat = report_file.stat()
+        os.utime(report_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        assert cache.get(report_file) is None
+
+    @pytest.mark.unit
+    def test_version_change_invalidates(self, cache_file: Path, report_file: Path):
+        cache = ParseCache(cache_file, "1")
+        cache.put(report_file, RECORDS)
+        cache.save()
+        assert ParseCache(cache_file, "2").get(report_file) is None
+
+    @pytest.mark.unit
+    def test_persists_across_instances(self, cache_file: Path, report_file: Path):
+        cache = ParseCache(cache_file, "1")
+        cache.put(report_file, RECORDS)
+        assert cache.save() is True
+        assert ParseCache(cache_file, "1").get(report_file) == RECORDS
+
+    @pytest.mark.unit
+    def test_corrupted_file_starts_empty(self, cache_file: Path, report_file: Path):
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text("{not json", encoding="utf-8")
+        cache = ParseCache(cache_file, "1")
+        assert len(cache) == 0
+        assert cache.get(report_file) is None
+
+    @pytest.mark.unit
+    def test_discard_missing(self, cache_file: Path, report_file: Path):
+        cache = ParseCache(cache_file, "1")
+        cache.put(report_file, RECORDS)
+        report_file.unlink()
+        assert cache.discard_missing() == 1
+        assert len(cache) == 0
+
+    @pytest.mark.unit
+    def test_save_writes_json(self, cache_file: Path, report_file: Path):
+        cache = ParseCache(cache_file, "1")
+        cache.put(report_file, RECORDS)
+        cache.save()
+        payload = json.loads(cache_file.read_text(encoding="utf-8"))
+        assert len(payload["entries"]) == 1
+
+
+class TestParserWithCache:
+    @pytest.mark.unit
+    def test_rescan_only_opens_changed_files(self, report_folder: Path, cache_file: Path, monkeypatch):
+        first = DailyReportParser(report_folder, cache=ParseCache(cache_file, PARSER_VERSION)).process_all()
+
+        opened = []
+        real_process_docx = docx_parser.process_docx
+
+        def counting_process_docx(path, *args):
+            opened.append(Path(path).name)
+            return real_process_docx(path, *args)
+
+        monkeypatch.setattr(docx_parser, "process_docx", counting_process_docx)
+
+        changed = report_folder / "PS-OHLR_DUAT_Daily Report_WK02_2025.docx"
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+        parser = DailyReportParser(report_folder, cache=ParseCache(cache_file, PARSER_VERSION))
+        second = parser.process_all()
+
+        assert opened == [changed.name]
+        assert second == first
+        assert parser.cache.hits == 2
+        assert parser.get_max_week() == 3
+
+    @pytest.mark.unit
+    def test_progress_covers_cached_files(self, report_folder: Path, cache_file: Path):
+        DailyReportParser(report_folder, cache=ParseCache(cache_file, PARSER_VERSION)).process_all()
+        calls = []
+        DailyReportParser(report_folder, cache=ParseCache(cache_file, PARSER_VERSION)).process_all(
+            progress_callback=lambda name, p: calls.append(p)
+        )
+        assert calls == pytest.approx([1 / 3, 2 / 3, 1.0])
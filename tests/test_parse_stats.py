@@ -0,0 +1,198 @@
+# MTR DUAT - Parse Stage Timing Tests
+"""Tests for parsers/parse_stats.py and the instrumented parse paths."""
+
+import pytest
+from pathlib import Path
+from docx import Document
+from docx.shared import RGBColor
+from fastapi.testclient import TestClient
+
+from parsers.docx_parser import ENGINES, DailyReportParser, process_docx
+from parsers.manpower_parser import ManpowerParser
+from parsers.parse_stats import COUNTS, STAGES, STATS_ENV, ParseStats, stage_timer, stats_enabled
+
+
+# ===========================================================================
+# Fixtures
+# ===========================================================================
+
+
+def _write_report(path: Path, project: str) -> None:
+    doc = Document()
+    delivery = doc.add_table(rows=3, cols=3)
+    delivery.cell(0, 0).text = "Date"
+    delivery.cell(1, 0).text = "Mon 3/3"
+    delivery.cell(1, 1).text = f"{project} KTL"
+    delivery.cell(1, 2).text = "4"
+    delivery.cell(2, 0).text = "Night"
+    run = delivery.cell(2, 1).paragraphs[0].add_run("CBM TWL")
+    run.font.color.rgb = RGBColor(0x00, 0x00, 0xFF)
+    delivery.cell(2, 2).text = "2"
+
+    manpower = doc.add_table(rows=3, cols=3)
+    manpower.cell(0, 0).text = "Shift"
+    manpower.cell(1, 0).text = "Mon 3/3/2025"
+    manpower.cell(1, 1).text = "Day shift"
+    manpower.cell(2, 0).text = "CBM"
+    manpower.cell(2, 1).text = f"{project} cable S2x3"
+    manpower.cell(2, 2).text = "1"
+    doc.save(str(path))
+
+
+@pytest.fixture
+def report_folder(tmp_path: Path) -> Path:
+    for week, project in ((5, "C1001"), (6, "C1002"), (7, "C1003")):
+        _write_report(tmp_path / f"PS-OHLR_DUAT_Daily Report_WK{week:02d}_2025.docx", project)
+    return tmp_path
+
+
+# ===========================================================================
+# 1. ParseStats
+# ===========================================================================
+
+
+class TestParseStats:
+    @pytest.mark.unit
+    def test_stage_add_count_and_merge(self):
+        stats = ParseStats()
+        with stats.stage("xml"):
+            pass
+        stats.add("match", 0.5)
+        stats.count("rows", 3)
+
+        other = ParseStats()
+        other.add("match", 0.25)
+        other.count("rows")
+        other.count("files")
+        stats.merge(other)
+
+        assert stats.seconds["match"] == 0.75
+        assert stats.seconds["xml"] >= 0
+        assert stats.counts["rows"] == 4 and stats.counts["files"] == 1
+
+    @pytest.mark.unit
+    def test_to_dict_and_summary(self):
+        stats = ParseStats()
+        stats.add("extract", 0.3)
+        stats.add("match", 0.1)
+        stats.count("cells", 12)
+
+        data = stats.to_dict()
+        assert set(data["seconds"]) == set(STAGES)
+        assert set(data["counts"]) == set(COUNTS)
+        assert data["total_seconds"] == pytest.approx(0.4)
+        assert stats.summary().startswith("extract 0.30s (75%), match 0.10s (25%) |")
+        assert ParseStats().summary().startswith("no stages timed")
+
+    @pytest.mark.unit
+    def test_stage_timer_without_stats_is_a_no_op(self):
+        with stage_timer(None, "xml"):
+            pass
+
+    @pytest.mark.unit
+    def test_stats_enabled_reads_env(self, monkeypatch):
+        monkeypatch.delenv(STATS_ENV, raising=False)
+        assert stats_enabled() is False
+        monkeypatch.setenv(STATS_ENV, "1")
+        assert stats_enabled() is True
+        monkeypatch.setenv(STATS_ENV, "off")
+        assert stats_enabled() is False
+
+
+# ===========================================================================
+# 2. Instrumented parsers
+# ===========================================================================
+
+
+class TestInstrumentedParsers:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_process_docx_records_unchanged(self, report_folder: Path, engine: str):
+        for path in DailyReportParser(report_folder).get_report_files():
+            stats = ParseStats()
+            assert process_docx(path, engine, stats=stats) == process_docx(path, engine)
+            assert stats.counts["files"] == 1
+            assert stats.counts["tables"] == 2
+            assert stats.seconds["extract"] > 0 and stats.seconds["match"] > 0
+
+    @pytest.mark.unit
+    def test_engines_agree_on_counts(self, report_folder: Path):
+        counts = {}
+        for engine in ENGINES:
+            stats = ParseStats()
+            DailyReportParser(report_folder, engine=engine, stats=stats).process_all()
+            counts[engine] = stats.counts
+        assert counts["docx"] == counts["stream"]
+        assert counts["docx"]["files"] == 3 and counts["docx"]["runs"] > 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_pool_merges_worker_stats(self, report_folder: Path, engine: str):
+        sequential = ParseStats()
+        records = DailyReportParser(report_folder, engine=engine, stats=sequential).process_all()
+        pooled = ParseStats()
+        assert DailyReportParser(report_folder, workers=2, engine=engine, stats=pooled).process_all() == records
+        assert pooled.counts == sequential.counts
+
+    @pytest.mark.unit
+    def test_manpower_parser_counts_tables_and_rows(self, report_folder: Path):
+        stats = ParseStats()
+        records = ManpowerParser(report_folder, stats=stats).process_all()
+        assert records == ManpowerParser(report_folder).process_all()
+        assert stats.counts["files"] == 3
+        assert stats.counts["tables"] == 3 and stats.counts["rows"] == 6
+        assert stats.seconds["load"] > 0
+
+
+# ===========================================================================
+# 3. Folder parse and manpower scan endpoints
+# ===========================================================================
+
+
+@pytest.fixture
+def _reset_state():
+    from backend.services import manpower_state, parsing_state
+
+    saved = [(state, dict(state)) for state in (parsing_state, manpower_state)]
+    yield
+    for state, snapshot in saved:
+        state.clear()
+        state.update(snapshot)
+
+
+class TestFolderParseStats:
+    @pytest.mark.integration
+    @pytest.mark.parametrize("requested", [True, False])
+    def test_progress_reports_stats_when_requested(
+        self, report_folder: Path, tmp_path_factory, monkeypatch, _reset_state, requested: bool
+    ):
+        from backend.main import app
+
+        monkeypatch.setenv("DUAT_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        monkeypatch.delenv(STATS_ENV, raising=False)
+        client = TestClient(app)
+        resp = client.post("/api/parse/folder", json={"folder_path": str(report_folder), "stats": requested})
+        assert resp.status_code == 200
+
+        progress = client.get("/api/parse/progress").json()
+        assert progress["in_progress"] is False
+        if requested:
+            assert progress["stats"]["counts"]["files"] == 3
+            assert progress["stats"]["total_seconds"] > 0
+        else:
+            assert progress["stats"] is None
+
+    @pytest.mark.integration
+    def test_manpower_scan_reports_stats_from_env(self, report_folder: Path, monkeypatch, _reset_state):
+        from backend.main import app
+
+        client = TestClient(app)
+        monkeypatch.delenv(STATS_ENV, raising=False)
+        plain = client.post("/api/manpower/scan", json={"folder_path": str(report_folder)}).json()
+        assert plain["stats"] is None
+
+        monkeypatch.setenv(STATS_ENV, "1")
+        timed = client.post("/api/manpower/scan", json={"folder_path": str(report_folder)}).json()
+        assert timed["total_records"] == plain["total_records"]
+        assert timed["stats"]["counts"]["tables"] == 3
+        assert timed["stats"]["seconds"]["match"] > 0
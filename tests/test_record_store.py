@@ -0,0 +1,145 @@
+# MTR DUAT - Record Store Tests
+"""Unit tests for parsers/record_store.py and its use by the dashboard and parse API."""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+from docx import Document
+from fastapi.testclient import TestClient
+
+from analysis.dashboard import DashboardAnalyzer, aggregate_records
+from parsers.record_store import RECORD_FIELDS, RecordStore
+
+
+# ===========================================================================
+# Fixtures
+# ===========================================================================
+
+
+def _record(full_date, project, qty, week="05", year="2025", line="KTL"):
+    return {
+        "FullDate": full_date,
+        "Project": project,
+        "Qty Delivered": qty,
+        "Week": week,
+        "Year": year,
+        "Line": line,
+    }
+
+
+@pytest.fixture
+def sample_records():
+    return [
+        _record("Mon 3/2", "C1001", 2.0),
+        _record("Tue 4/2", "C1002", 0.0, line=""),
+        _record("Mon 3/2", "C1001", 5.0, week="06"),
+        _record("", "CBM", 1.5, year="2024", line="TWL"),
+        _record("Wed 31/2", "HLM", 3.0, week="WK7"),
+        _record("Thu 1/1", "C1001", 4.0, year="2026"),
+    ]
+
+
+# ===========================================================================
+# 1. Storage
+# ===========================================================================
+
+
+class TestRecordStore:
+    @pytest.mark.unit
+    def test_round_trip(self, sample_records):
+        store = RecordStore.from_records(sample_records)
+        assert len(store) == len(sample_records)
+        assert store.to_records() == sample_records
+        assert list(store) == sample_records
+
+    @pytest.mark.unit
+    def test_string_fields_are_dictionary_encoded(self, sample_records):
+        store = RecordStore.from_records(sample_records)
+        assert store.categories("Project") == ["C1001", "C1002", "CBM", "HLM"]
+        assert list(store.codes("Project")) == [0, 1, 0, 2, 3, 0]
+        assert list(store.qty) == [2.0, 0.0, 5.0, 1.5, 3.0, 4.0]
+
+    @pytest.mark.unit
+    def test_nbytes_is_fixed_per_record(self, sample_records):
+        store = RecordStore.from_records(sample_records * 100)
+        per_record = (len(RECORD_FIELDS) - 1) * store.codes("Project").itemsize + store.qty.itemsize
+        assert store.nbytes == per_record * len(store)
+
+    @pytest.mark.unit
+    def test_empty_and_clear(self, sample_records):
+        store = RecordStore()
+        assert not store
+        assert store.to_records() == []
+        store.extend(sample_records)
+        store.clear()
+        assert len(store) == 0
+        assert store.categories("Project") == []
+
+
+# ===========================================================================
+# 2. Aggregation
+# ===========================================================================
+
+
+class TestAggregateStore:
+    @pytest.mark.unit
+    def test_matches_list_aggregation(self, sample_records):
+        expected = aggregate_records(sample_records)
+        result = aggregate_records(RecordStore.from_records(sample_records))
+        pd.testing.assert_frame_equal(result, expected)
+
+    @pytest.mark.unit
+    def test_empty_store(self):
+        assert aggregate_records(RecordStore()).empty
+
+    @pytest.mark.unit
+    def test_analyzer_accepts_store(self, sample_records):
+        from_list = DashboardAnalyzer()
+        from_list.load_from_records(sample_records, 6)
+        from_store = DashboardAnalyzer()
+        assert from_store.load_from_records(RecordStore.from_records(sample_records), 6) is True
+        pd.testing.assert_frame_equal(from_store.summary, from_list.summary)
+
+
+# ===========================================================================
+# 3. Parse API
+# ===========================================================================
+
+
+@pytest.fixture
+def report_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "reports"
+    folder.mkdir()
+    for week, project in ((1, "C1001"), (2, "C1002")):
+        doc = Document()
+        table = doc.add_table(rows=2, cols=3)
+        table.cell(0, 0).text = "Date"
+        table.cell(1, 0).text = f"Mon {week}/3"
+        table.cell(1, 1).text = f"{project} KTL"
+        table.cell(1, 2).text = "3"
+        doc.save(str(folder / f"PS-OHLR_DUAT_Daily Report_WK{week:02d}_2025.docx"))
+    return folder
+
+
+class TestParseApiStore:
+    @pytest.mark.integration
+    def test_folder_parse_fills_store(self, report_folder: Path, tmp_path_factory, monkeypatch):
+        from backend.main import app
+        from backend.services import parsing_state
+        from parsers.docx_parser import DailyReportParser
+
+        monkeypatch.setenv("DUAT_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        saved = dict(parsing_state)
+        try:
+            client = TestClient(app)
+            resp = client.post("/api/parse/folder", json={"folder_path": str(report_folder), "workers": 1})
+            assert resp.status_code == 200
+            assert isinstance(parsing_state["records"], RecordStore)
+
+            results = client.get("/api/parse/results").json()
+            assert results["job_id"] == resp.json()["job_id"]
+            assert results["total_records"] == 2
+            assert results["records"] == DailyReportParser(report_folder).process_all()
+        finally:
+            parsing_state.clear()
+            parsing_state.update(saved)
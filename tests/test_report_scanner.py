@@ -0,0 +1,202 @@
+# MTR DUAT - Report Scanner Tests
+"""Unit and API tests for parsers/report_scanner.py."""
+
+import pytest
+from pathlib import Path
+from docx import Document
+from docx.shared import RGBColor
+from fastapi.testclient import TestClient
+
+from parsers.docx_parser import ENGINE_STREAM, process_docx
+from parsers.manpower_parser import ManpowerParser
+from parsers.report_scanner import (
+    ReportScanner,
+    extract_text_entries,
+    read_text_entries,
+    scan_report,
+    search_text_entries,
+)
+
+
+# ===========================================================================
+# Fixtures
+# ===========================================================================
+
+
+def _write_report(path: Path, project: str, day: str) -> None:
+    doc = Document()
+    doc.add_paragraph(f"Daily report {project}")
+
+    delivery = doc.add_table(rows=3, cols=3)
+    delivery.cell(0, 0).text = "Date"
+    delivery.cell(1, 0).text = f"{day} 3/3"
+    delivery.cell(1, 1).text = f"{project} KTL"
+    delivery.cell(1, 2).text = "4"
+    delivery.cell(2, 0).text = "Night"
+    run = delivery.cell(2, 1).paragraphs[0].add_run("CBM TWL")
+    run.font.color.rgb = RGBColor(0x00, 0x00, 0xFF)
+    delivery.cell(2, 2).text = "2"
+
+    manpower = doc.add_table(rows=5, cols=3)
+    manpower.cell(0, 0).text = "Shift"
+    manpower.cell(1, 0).text = f"{day} 3/3/2025"
+    manpower.cell(1, 1).text = "Day shift"
+    manpower.cell(2, 0).text = "CBM"
+    manpower.cell(2, 1).text = f"{project} cable S2x3"
+    manpower.cell(2, 2).text = "1"
+    manpower.cell(3, 0).text = "On duty"
+    manpower.cell(3, 1).text = "On duty: Alan, Ben"
+    manpower.cell(4, 0).text = "Leave"
+    manpower.cell(4, 1).text = "AL: Carl"
+
+    doc.save(str(path))
+
+
+@pytest.fixture
+def report_folder(tmp_path: Path) -> Path:
+    _write_report(tmp_path / "PS-OHLR_DUAT_Daily Report_WK05_2025.docx", "C1001", "Mon")
+    _write_report(tmp_path / "PS-OHLR_DUAT_Daily Report_WK06_2025.docx", "C1002", "Tue")
+    return tmp_path
+
+
+# ===========================================================================
+# 1. scan_report matches the individual pipelines
+# ===========================================================================
+
+
+class TestScanReport:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("engine", ["docx", "stream"])
+    def test_matches_separate_pipelines(self, report_folder: Path, engine: str):
+        for path in ReportScanner(report_folder).get_report_files():
+            scan = scan_report(path, engine)
+            assert scan["records"] == process_docx(path)
+            assert scan["texts"] == extract_text_entries(Document(str(path)))
+            assert scan["has_manpower_table"] is True
+
+        expected_shifts = ManpowerParser(report_folder).process_all()
+        result = ReportScanner(report_folder, engine=engine).scan_all()
+        assert expected_shifts
+        assert result["shifts"] == expected_shifts
+
+    @pytest.mark.unit
+    def test_unreadable_file_returns_empty(self, tmp_path: Path):
+        bad = tmp_path / "PS-OHLR_DUAT_Daily Report_WK01_2025.docx"
+        bad.write_bytes(b"not a docx")
+        for engine in ("docx", ENGINE_STREAM):
+            scan = scan_report(bad, engine)
+            assert scan["records"] == [] and scan["shifts"] == [] and scan["texts"] == []
+
+    @pytest.mark.unit
+    def test_search_dedupes_and_truncates(self):
+        entries = [
+            {"location": "Paragraph", "text": "CBM work"},
+            {"location": "Table 1, Row 2, Col 1", "text": "CBM work"},
+            {"location": "Table 1, Row 3, Col 1", "text": "cbm " + "x" * 600},
+            {"location": "Table 1, Row 4, Col 1", "text": "HLM"},
+        ]
+        matches = search_text_entries(entries, "Cbm")
+        assert [m["location"] for m in matches] == ["Paragraph", "Table 1, Row 3, Col 1"]
+        assert len(matches[1]["text"]) == 500
+
+
+# ===========================================================================
+# 2. ReportScanner folder scan
+# ===========================================================================
+
+
+class TestReportScanner:
+    @pytest.mark.unit
+    def test_scan_all_merges_in_file_order(self, report_folder: Path):
+        scanner = ReportScanner(report_folder)
+        result = scanner.scan_all()
+        expected = [r for f in scanner.get_report_files() for r in process_docx(f)]
+        assert result["records"] == expected
+        assert [r["Project"] for r in result["records"][:2]] == ["C1001", "CBM"]
+        assert result["max_week"] == 6
+        assert result["manpower_files"] == 2
+        assert sorted(result["texts"]) == sorted(result["signatures"])
+
+    @pytest.mark.unit
+    def test_pool_matches_sequential(self, report_folder: Path):
+        sequential = ReportScanner(report_folder).scan_all()
+        parallel = ReportScanner(report_folder, workers=2).scan_all()
+        assert parallel == sequential
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("engine", ["docx", "stream"])
+    def test_read_text_entries_matches_scan(self, report_folder: Path, engine: str):
+        result = ReportScanner(report_folder).scan_all()
+        for path in ReportScanner(report_folder).get_report_files():
+            assert read_text_entries(path, engine) == result["texts"][path.name]
+
+
+# ===========================================================================
+# 3. Combined scan endpoint
+# ===========================================================================
+
+
+@pytest.fixture
+def _reset_state():
+    from backend.services import manpower_state, parsing_state, search_state
+
+    saved = [(state, dict(state)) for state in (parsing_state, manpower_state, search_state)]
+    yield
+    for state, snapshot in saved:
+        state.clear()
+        state.update(snapshot)
+
+
+class TestScanEndpoint:
+    @pytest.mark.integration
+    def test_scan_fills_all_states(self, report_folder: Path, tmp_path_factory, monkeypatch, _reset_state):
+        from backend.main import app
+        from backend.services import get_keyword_index, manpower_state
+
+        monkeypatch.setenv("DUAT_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        client = TestClient(app)
+        resp = client.post("/api/parse/scan", json={"folder_path": str(report_folder), "workers": 1})
+        assert resp.status_code == 200
+
+        progress = client.get("/api/parse/progress").json()
+        assert progress["in_progress"] is False
+        assert progress["records_count"] == len(ReportScanner(report_folder).scan_all()["records"])
+        assert progress["max_week"] == 6
+        assert len(manpower_state["records"]) == 2
+        assert manpower_state["total_files"] == 2
+        assert len(get_keyword_index()) == 2
+
+        search = client.post("/api/keyword/search", json={"folder_path": str(report_folder), "keyword": "c1002"})
+        assert search.json()["matched_files"] == 1
+        # The scan already indexed every report
+        assert search.json()["reindexed_files"] == 0
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("endpoint", ["/api/parse/scan", "/api/parse/folder"])
+    def test_default_request_parses_sequentially(
+        self, report_folder: Path, tmp_path_factory, monkeypatch, _reset_state, endpoint: str
+    ):
+        from backend.main import app
+        from parsers import docx_parser, report_scanner
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started without opting in")
+
+        # Automatic sizing would pick a pool on this many CPUs
+        monkeypatch.setattr(docx_parser.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(docx_parser, "ProcessPoolExecutor", no_pool)
+        monkeypatch.setattr(report_scanner, "ProcessPoolExecutor", no_pool)
+        monkeypatch.setenv("DUAT_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        client = TestClient(app)
+        assert client.post(endpoint, json={"folder_path": str(report_folder)}).status_code == 200
+
+        progress = client.get("/api/parse/progress").json()
+        assert progress["error"] is None
+        assert progress["records_count"] > 0
+
+    @pytest.mark.integration
+    def test_scan_rejects_missing_folder(self, tmp_path: Path):
+        from backend.main import app
+
+        resp = TestClient(app).post("/api/parse/scan", json={"folder_path": str(tmp_path / "nope")})
+        assert resp.status_code == 400
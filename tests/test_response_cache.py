@@ -0,0 +1,97 @@
+# MTR DUAT - Response Cache Tests
+"""Unit tests for backend/response_cache.py."""
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from backend.response_cache import CacheEntry, ResponseCache, cached_json
+from backend.serialization import native_response
+
+
+def _entry(version, size: int) -> CacheEntry:
+    return CacheEntry(version, f'"v{version}"', b"x" * size, "application/json")
+
+
+# ===========================================================================
+# 1. LRU store
+# ===========================================================================
+
+
+class TestResponseCache:
+    @pytest.mark.unit
+    def test_version_mismatch_is_a_miss(self):
+        cache = ResponseCache()
+        cache.put(("/a", "", None), _entry(1, 10))
+        assert cache.get(("/a", "", None), 1) is not None
+        assert cache.get(("/a", "", None), 2) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used_over_size_limit(self):
+        cache = ResponseCache(max_bytes=25)
+        cache.put(("a",), _entry(1, 10))
+        cache.put(("b",), _entry(1, 10))
+        cache.get(("a",), 1)
+        cache.put(("c",), _entry(1, 10))
+        assert cache.get(("b",), 1) is None
+        assert cache.get(("a",), 1) is not None
+        assert len(cache) == 2
+
+    @pytest.mark.unit
+    def test_oversized_body_not_stored(self):
+        cache = ResponseCache(max_bytes=5)
+        cache.put(("a",), _entry(1, 10))
+        assert len(cache) == 0
+
+
+# ===========================================================================
+# 2. cached_json
+# ===========================================================================
+
+
+@pytest.fixture
+def app_state():
+    cache = ResponseCache()
+    state = {"version": 1, "builds": 0, "value": 1}
+    app = FastAPI()
+
+    @app.get("/value")
+    async def value(request: Request):
+        def build():
+            state["builds"] += 1
+            if state["value"] is None:
+                raise HTTPException(status_code=404, detail="No data loaded")
+            return native_response({"value": state["value"]})
+        return cached_json(cache, request, state["version"], build)
+
+    return TestClient(app), state
+
+
+class TestCachedJson:
+    @pytest.mark.unit
+    def test_builds_once_per_version(self, app_state):
+        client, state = app_state
+        assert client.get("/value").json() == {"value": 1}
+        assert client.get("/value").json() == {"value": 1}
+        assert state["builds"] == 1
+
+        state["version"], state["value"] = 2, 5
+        assert client.get("/value").json() == {"value": 5}
+        assert state["builds"] == 2
+
+    @pytest.mark.unit
+    def test_if_none_match(self, app_state):
+        client, _ = app_state
+        etag = client.get("/value").headers["etag"]
+        assert client.get("/value", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/value", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+        assert client.get("/value", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    @pytest.mark.unit
+    def test_errors_are_not_cached(self, app_state):
+        client, state = app_state
+        state["value"] = None
+        assert client.get("/value").status_code == 404
+        state["value"] = 3
+        assert client.get("/value").json() == {"value": 3}
@@ -0,0 +1,109 @@
+# MTR DUAT - Serialization Tests
+"""Unit tests for backend/serialization.py."""
+
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+
+import backend.serialization as serialization
+from backend.serialization import FastJSONResponse, frame_records, native_response, to_native
+
+
+def _reference(obj):
+    """Per-value walk the dashboard router used before, with NaN floats mapped to None."""
+    if isinstance(obj, dict):
+        return {k: _reference(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_reference(item) for item in obj]
+    elif isinstance(obj, (np.integer, np.int64, np.int32)):
+        return int(obj)
+    elif isinstance(obj, (np.floating, np.float64, np.float32)):
+        return float(obj) if not np.isnan(obj) else None
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    elif pd.isna(obj):
+        return None
+    else:
+        return obj
+
+
+@pytest.fixture
+def mixed_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Project": ["C1001", "CBM", None],
+        "Qty Delivered": [1.5, np.nan, 3.0],
+        "NTH": np.array([1, 2, 3], dtype=np.int64),
+        "DateObj": pd.to_datetime(["2025-03-01 00:00:00", None, "2025-03-03 10:15:30"]),
+        "Flag": [True, False, True],
+        "Mixed": [np.int64(4), "x", np.nan],
+    })
+
+
+# ===========================================================================
+# 1. Conversion
+# ===========================================================================
+
+
+class TestToNative:
+    @pytest.mark.unit
+    def test_frame_matches_per_value_conversion(self, mixed_frame: pd.DataFrame):
+        expected = _reference(mixed_frame.to_dict(orient="records"))
+        assert frame_records(mixed_frame) == expected
+
+    @pytest.mark.unit
+    def test_sub_second_timestamps_keep_fraction(self):
+        df = pd.DataFrame({"t": pd.to_datetime(["2025-03-01 00:00:00.250", "2025-03-02 00:00:00.000"])})
+        assert frame_records(df) == [{"t": "2025-03-01T00:00:00.250000"}, {"t": "2025-03-02T00:00:00"}]
+
+    @pytest.mark.unit
+    def test_scalars(self):
+        assert to_native(np.float64(1.5)) == 1.5
+        assert type(to_native(np.float64(1.5))) is float
+        assert to_native(np.int32(7)) == 7
+        assert to_native(np.bool_(True)) is True
+        assert to_native(float("nan")) is None
+        assert to_native(pd.NaT) is None
+        assert to_native(datetime(2025, 3, 1, 8, 30)) == "2025-03-01T08:30:00"
+        assert to_native(date(2025, 3, 1)) == "2025-03-01"
+
+    @pytest.mark.unit
+    def test_containers(self):
+        payload = {
+            "series": pd.Series([1.0, np.nan]),
+            "array": np.array([1, 2]),
+            "tuple": (np.int64(1), "a"),
+            "nested": [{"v": np.float32(0.5)}],
+        }
+        assert to_native(payload) == {
+            "series": [1.0, None],
+            "array": [1, 2],
+            "tuple": [1, "a"],
+            "nested": [{"v": 0.5}],
+        }
+
+
+# ===========================================================================
+# 2. Response rendering
+# ===========================================================================
+
+
+class TestFastJSONResponse:
+    @pytest.mark.unit
+    def test_native_response_body(self, mixed_frame: pd.DataFrame):
+        resp = native_response({"data": mixed_frame, "total": np.int64(3)})
+        assert resp.media_type == "application/json"
+        body = json.loads(resp.body)
+        assert body["total"] == 3
+        assert body["data"][1]["Qty Delivered"] is None
+
+    @pytest.mark.unit
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        payload = {"name": "關鍵字", "values": [1, 2.5, None], "ok": True}
+        rendered = FastJSONResponse(payload).body
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert FastJSONResponse(payload).body == rendered
+        assert json.loads(rendered) == payload
@@ -62,7 +62,7 @@ class TestParsingState:
         assert ps["progress"] == 0
         assert ps["current_file"] == ""
         assert ps["total_files"] == 0
-        assert ps["records"] == []
+        assert len(ps["records"]) == 0
         assert ps["max_week"] == 0
 
 
@@ -148,6 +148,7 @@ class TestLoggerPresence:
         "backend.routers.export",
         "backend.routers.keyword",
         "backend.routers.manpower",
+        "backend.routers.watch",
     ])
     def test_module_has_logger(self, module_path):
         mod = importlib.import_module(module_path)
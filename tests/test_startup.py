@@ -0,0 +1,31 @@
+# MTR DUAT - Startup Import Tests
+"""Sidecar startup must not import the libraries that load on first use."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+DEFERRED = ["matplotlib", "matplotlib.pyplot", "openpyxl", "docx", "lxml"]
+
+
+def _loaded_after(statement: str) -> list:
+    code = f"import sys, json; {statement}; print(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.integration
+class TestLazyImports:
+    def test_backend_startup_defers_heavy_libraries(self):
+        assert _loaded_after("import backend.main") == []
+
+    def test_package_exports_resolve_on_access(self):
+        assert _loaded_after("import analysis, utils, parsers") == []
+        plot = "from analysis import plot_scurve; plot_scurve(['W1'], [1.0], [1.0], 'P', 1.0)"
+        assert "matplotlib.pyplot" in _loaded_after(plot)
+        assert "openpyxl" in _loaded_after("from utils import StreamingWorkbook")
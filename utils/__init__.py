@@ -1,16 +1,37 @@
 # MTR DUAT - Utils Package
 """
-Utility modules for Excel export and other shared operations.
+Utility modules for Excel export, Excel reading and other shared operations.
+
+Exports are resolved on first access, so importing one utility module does
+not load openpyxl through the others.
 """
 
-from .excel_export import (
-    export_dataframe_to_excel,
-    create_dashboard_excel,
-    export_lag_analysis_report,
-)
-
-__all__ = [
-    "export_dataframe_to_excel",
-    "create_dashboard_excel",
-    "export_lag_analysis_report",
-]
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "apply_column_widths": "excel_export",
+    "column_widths": "excel_export",
+    "export_dataframe_to_excel": "excel_export",
+    "create_dashboard_excel": "excel_export",
+    "export_lag_analysis_report": "excel_export",
+    "read_excel_sheet": "excel_reader",
+    "read_excel_sheets": "excel_reader",
+    "StreamingWorkbook": "excel_stream",
+    "get_pyplot": "plotting",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,6 +2,19 @@
 """
 Functions for exporting pandas DataFrames to formatted Excel workbooks.
 
+``create_dashboard_excel`` has two engines:
+
+* ``ENGINE_STREAM`` (default) -- write-only ``StreamingWorkbook``
+  (utils/excel_stream.py);
+* ``ENGINE_PANDAS`` -- ``DataFrame.to_excel`` into an in-memory workbook.
+
+Both produce the same cell values, header/date formats and column widths.
+Widths come from ``column_widths``, which measures the source DataFrame
+with vectorized string lengths instead of walking the written cells.
+
+openpyxl is imported when a workbook is written, not with this module, so
+importing the export helpers does not slow down sidecar startup.
+
 Used by:
 - backend/routers/export.py  (dashboard + lag analysis exports)
 - analysis/dashboard.py      (DashboardAnalyzer.export)
@@ -9,31 +22,73 @@ Used by:
 
 import logging
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Dict, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
-from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
 PathLike = Union[str, Path]
 
+ENGINE_STREAM = "stream"
+ENGINE_PANDAS = "pandas"
+ENGINES: Tuple[str, ...] = (ENGINE_STREAM, ENGINE_PANDAS)
+
+
+def _text_lengths(series: pd.Series) -> np.ndarray:
+    """``len(str(value))`` of each value as written to a cell; blanks count 0."""
+    blank = series.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        # Cells hold datetime objects: "YYYY-MM-DD HH:MM:SS[.ffffff]"
+        lengths = np.where(series.dt.microsecond.to_numpy() > 0, 26, 19)
+    else:
+        lengths = series.astype(str).str.len().to_numpy(dtype=float, na_value=0)
+    return np.where(blank, 0, lengths)
+
+
+def column_widths(
+    df: pd.DataFrame,
+    index: bool = False,
+    padding: int = 2,
+    max_width: Optional[int] = None,
+    sample_rows: Optional[int] = None,
+) -> Dict[int, int]:
+    """
+    Column widths that fit the longest value of each column of *df*.
+
+    Args:
+        df: DataFrame as it will be written by ``to_excel`` / ``add_frame``.
+        index: Whether the index is written as the first column.
+        padding: Characters added so text doesn't touch the cell border.
+        max_width: Optional upper bound per column.
+        sample_rows: Measure only this many randomly chosen rows (fixed
+            seed) when the frame is larger; the header is always measured.
+
+    Returns:
+        1-based column index -> width.
+    """
+    if sample_rows is not None and len(df) > sample_rows:
+        df = df.sample(n=sample_rows, random_state=0)
+
+    columns = [(name, df.iloc[:, i]) for i, name in enumerate(df.columns)]
+    if index:
+        columns.insert(0, (df.index.name, df.index.to_series()))
+
+    widths: Dict[int, int] = {}
+    for col_idx, (name, series) in enumerate(columns, start=1):
+        header_length = len(str(name)) if name is not None else 0
+        width = max(int(_text_lengths(series).max(initial=0)), header_length) + padding
+        widths[col_idx] = min(width, max_width) if max_width is not None else width
+    return widths
+
 
-def _auto_adjust_column_widths(writer: pd.ExcelWriter, sheet_name: str) -> None:
-    """Widen every column to fit its longest value (header included)."""
-    ws = writer.sheets[sheet_name]
-    for col_idx, col_cells in enumerate(ws.iter_cols(min_row=1), start=1):
-        max_length = 0
-        for cell in col_cells:
-            try:
-                cell_len = len(str(cell.value)) if cell.value is not None else 0
-                if cell_len > max_length:
-                    max_length = cell_len
-            except (TypeError, AttributeError):
-                pass
-        # Add a small padding so text doesn't touch the cell border
-        adjusted = max_length + 2
-        ws.column_dimensions[get_column_letter(col_idx)].width = adjusted
+def apply_column_widths(worksheet, widths: Dict[int, int]) -> None:
+    """Set precomputed widths (1-based column index -> width) on *worksheet*."""
+    from openpyxl.utils import get_column_letter
+
+    for col_idx, width in widths.items():
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = width
 
 
 def export_dataframe_to_excel(df: pd.DataFrame, path: PathLike) -> bool:
@@ -62,6 +117,9 @@ def create_dashboard_excel(
     summary_df: pd.DataFrame,
     path: PathLike,
     nth_trend: Optional[pd.DataFrame] = None,
+    engine: str = ENGINE_STREAM,
+    width_sample_rows: Optional[int] = None,
+    progress_callback: Optional[Callable[[str, float], None]] = None,
 ) -> bool:
     """
     Create a multi-sheet dashboard Excel workbook.
@@ -76,22 +134,44 @@ def create_dashboard_excel(
         summary_df: Summary statistics DataFrame.
         path: Destination file path.
         nth_trend: Optional NTH pivot table (index = YearWeek).
+        engine: ENGINE_STREAM or ENGINE_PANDAS.
+        width_sample_rows: Size column widths from a sample of this many
+            rows per sheet (see ``column_widths``); all rows when None.
+        progress_callback: Called as ``(sheet_name, fraction)`` after
+            each sheet is written.
 
     Returns:
         True on success, False on any error.
+
+    Raises:
+        ValueError: If *engine* is unknown.
     """
-    try:
-        path = Path(path)
-        with pd.ExcelWriter(path, engine="openpyxl") as writer:
-            raw_df.to_excel(writer, sheet_name="Raw Data", index=False)
-            _auto_adjust_column_widths(writer, "Raw Data")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown Excel export engine: {engine}")
 
-            summary_df.to_excel(writer, sheet_name="Summary by Project", index=False)
-            _auto_adjust_column_widths(writer, "Summary by Project")
+    sheets = [("Raw Data", raw_df, False), ("Summary by Project", summary_df, False)]
+    if nth_trend is not None and not nth_trend.empty:
+        sheets.append(("NTH Trend by Week", nth_trend, True))
 
-            if nth_trend is not None and not nth_trend.empty:
-                nth_trend.to_excel(writer, sheet_name="NTH Trend by Week", index=True)
-                _auto_adjust_column_widths(writer, "NTH Trend by Week")
+    try:
+        path = Path(path)
+        widths = [column_widths(df, index, sample_rows=width_sample_rows) for _, df, index in sheets]
+        if engine == ENGINE_STREAM:
+            from utils.excel_stream import StreamingWorkbook, date_style, datetime_style, header_style
+
+            with StreamingWorkbook([header_style(), datetime_style(), date_style()]) as book:
+                for done, ((sheet_name, df, index), sheet_widths) in enumerate(zip(sheets, widths), start=1):
+                    book.add_frame(sheet_name, df, index=index, widths=sheet_widths)
+                    if progress_callback:
+                        progress_callback(sheet_name, done / len(sheets))
+                book.save(path)
+        else:
+            with pd.ExcelWriter(path, engine="openpyxl") as writer:
+                for done, ((sheet_name, df, index), sheet_widths) in enumerate(zip(sheets, widths), start=1):
+                    df.to_excel(writer, sheet_name=sheet_name, index=index)
+                    apply_column_widths(writer.sheets[sheet_name], sheet_widths)
+                    if progress_callback:
+                        progress_callback(sheet_name, done / len(sheets))
 
         return True
     except Exception as exc:
@@ -122,7 +202,7 @@ def export_lag_analysis_report(results_df: pd.DataFrame, path: PathLike) -> bool
 
         with pd.ExcelWriter(path, engine="openpyxl") as writer:
             df.to_excel(writer, sheet_name="Lag Analysis", index=False)
-            _auto_adjust_column_widths(writer, "Lag Analysis")
+            apply_column_widths(writer.sheets["Lag Analysis"], column_widths(df))
 
         return True
     except Exception as exc:
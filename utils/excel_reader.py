@@ -0,0 +1,273 @@
+# MTR DUAT - Excel Reader
+"""
+Streaming Excel reader for workbook uploads.
+
+``pd.read_excel`` loads the workbook again for every sheet it is asked for.
+``read_excel_sheets`` opens the workbook once in openpyxl's read-only mode
+and streams each requested sheet row by row, so no cell objects are kept in
+memory.  The rows are handed to pandas' own ``TextParser`` with the same
+cell conversion ``read_excel`` applies (empty cells, integral floats, error
+values), so the resulting frames have the same columns and dtypes.
+
+Two engines produce the row values:
+
+* ``ENGINE_OPENPYXL`` (default) -- ``worksheet.iter_rows(values_only=True)``;
+* ``ENGINE_STREAM`` (opt-in) -- parses the worksheet XML directly with the
+  shared strings, date styles and epoch openpyxl already loaded, following
+  openpyxl's ``data_only`` cell rules.  openpyxl builds a rich-text object
+  for every inline string cell (the way pandas/openpyxl write strings), which
+  dominates the cost of reading large sheets.  It relies on private openpyxl
+  attributes, so it only runs on the openpyxl series in
+  ``STREAM_OPENPYXL_SERIES`` and falls back to ``ENGINE_OPENPYXL`` otherwise.
+
+Used by:
+- analysis/dashboard.py      (DashboardAnalyzer.load_from_excel)
+- analysis/lag_analysis.py   (load_project_master)
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import from_excel, from_ISO8601
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+SheetKey = Union[str, int]
+
+ENGINE_STREAM = "stream"
+ENGINE_OPENPYXL = "openpyxl"
+ENGINES: Tuple[str, ...] = (ENGINE_STREAM, ENGINE_OPENPYXL)
+
+# openpyxl release series _iter_stream_values has been checked against
+STREAM_OPENPYXL_SERIES: Tuple[str, ...] = ("3.1.",)
+
+SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_ROW = f"{{{SHEET_NS}}}row"
+_V = f"{{{SHEET_NS}}}v"
+_IS = f"{{{SHEET_NS}}}is"
+_T = f"{{{SHEET_NS}}}t"
+_R = f"{{{SHEET_NS}}}r"
+_DIGITS = "0123456789"
+
+
+def _convert_value(value: Any) -> Any:
+    """Convert a cell value the way pandas' openpyxl reader does."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    return value
+
+
+def _inline_string(cell) -> Optional[str]:
+    """Plain text of an inline string cell (``<is>``), runs concatenated."""
+    inline = cell.find(_IS)
+    if inline is None:
+        return None
+    parts = []
+    plain = inline.find(_T)
+    if plain is not None and plain.text is not None:
+        parts.append(plain.text)
+    for run in inline.iterfind(_R):
+        text = run.find(_T)
+        if text is not None and text.text is not None:
+            parts.append(text.text)
+    return "".join(parts)
+
+
+def _iter_stream_values(worksheet) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield row value tuples straight from the worksheet XML.
+
+    Mirrors ``ReadOnlyWorksheet.iter_rows(values_only=True)`` after
+    ``reset_dimensions()``: missing rows come out as empty tuples and each
+    row is as wide as its last cell.
+    """
+    workbook = worksheet.parent
+    shared_strings = worksheet._shared_strings
+    date_formats = workbook._date_formats
+    timedelta_formats = workbook._timedelta_formats
+    epoch = workbook.epoch
+
+    def cell_value(cell) -> Any:
+        data_type = cell.get("t", "n")
+        if data_type == "inlineStr":
+            return _inline_string(cell)
+        value = cell.findtext(_V) or None
+        if value is None:
+            return None
+        if data_type == "n":
+            number = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+            style = cell.get("s")
+            style_id = int(style) if style else 0
+            if style_id in date_formats:
+                try:
+                    return from_excel(number, epoch, timedelta=style_id in timedelta_formats)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return number
+        if data_type == "s":
+            return shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        # "str" (formula result) and "e" (error) keep their text
+        return value
+
+    next_row = 1
+    row_number = 0
+    with worksheet._get_source() as source:
+        for _, element in ElementTree.iterparse(source):
+            if element.tag != _ROW:
+                continue
+            r = element.get("r")
+            row_number = int(float(r)) if r else row_number + 1
+            if row_number < next_row:
+                element.clear()
+                continue
+            while next_row < row_number:
+                next_row += 1
+                yield ()
+
+            cells = []
+            column = 0
+            for cell in element:
+                coordinate = cell.get("r")
+                column = column_index_from_string(coordinate.rstrip(_DIGITS)) if coordinate else column + 1
+                cells.append((column, cell_value(cell)))
+            element.clear()
+            next_row += 1
+
+            if not cells:
+                yield ()
+                continue
+            values = [None] * cells[-1][0]
+            for column, value in cells:
+                if column <= len(values):
+                    values[column - 1] = value
+            yield tuple(values)
+
+
+# Private openpyxl attributes the stream reader relies on
+_STREAM_SHEET_ATTRS = ("_get_source", "_shared_strings")
+_STREAM_WORKBOOK_ATTRS = ("_date_formats", "_timedelta_formats", "epoch")
+
+
+def _supports_stream(worksheet) -> bool:
+    """Whether this openpyxl version exposes what _iter_stream_values reads."""
+    workbook = getattr(worksheet, "parent", None)
+    return (
+        openpyxl.__version__.startswith(STREAM_OPENPYXL_SERIES)
+        and all(hasattr(worksheet, name) for name in _STREAM_SHEET_ATTRS)
+        and all(hasattr(workbook, name) for name in _STREAM_WORKBOOK_ATTRS)
+    )
+
+
+def _iter_values(worksheet, engine: str) -> Iterator[Tuple[Any, ...]]:
+    worksheet.reset_dimensions()
+    if engine == ENGINE_STREAM and _supports_stream(worksheet):
+        return _iter_stream_values(worksheet)
+    return worksheet.iter_rows(values_only=True)
+
+
+def _sheet_rows(worksheet, engine: str = ENGINE_OPENPYXL) -> List[List[Any]]:
+    """Read a worksheet into rectangular row lists, trimming trailing blanks."""
+    data: List[List[Any]] = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(_iter_values(worksheet, engine)):
+        converted = [_convert_value(v) for v in row]
+        while converted and converted[-1] == "":
+            converted.pop()
+        if converted:
+            last_row_with_data = row_number
+        data.append(converted)
+    data = data[:last_row_with_data + 1]
+
+    if data:
+        width = max(len(row) for row in data)
+        data = [row + [""] * (width - len(row)) if len(row) < width else row for row in data]
+    return data
+
+
+def _rows_to_frame(data: List[List[Any]], index_col: Optional[int]) -> pd.DataFrame:
+    if not data:
+        return pd.DataFrame()
+    try:
+        # Same TextParser options read_excel uses for a single header row
+        return TextParser(data, header=0, index_col=index_col, skip_blank_lines=False).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def read_excel_sheets(
+    filepath: PathLike,
+    sheets: Iterable[SheetKey],
+    index_col: Optional[Mapping[SheetKey, int]] = None,
+    engine: str = ENGINE_OPENPYXL,
+) -> Dict[SheetKey, pd.DataFrame]:
+    """
+    Read several sheets of a workbook in one pass.
+
+    Args:
+        filepath: Path to the .xlsx file
+        sheets: Sheet names or 0-based sheet positions to read
+        index_col: Optional per-sheet column to use as the index
+        engine: ENGINE_OPENPYXL, or ENGINE_STREAM to opt in to the XML fast path
+
+    Returns:
+        Dict of requested key -> DataFrame; sheets that do not exist are
+        left out
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown Excel engine: {engine}")
+    index_col = index_col or {}
+    workbook = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+    try:
+        frames: Dict[SheetKey, pd.DataFrame] = {}
+        for key in sheets:
+            if isinstance(key, int):
+                if not 0 <= key < len(workbook.worksheets):
+                    continue
+                worksheet = workbook.worksheets[key]
+            elif key in workbook.sheetnames:
+                worksheet = workbook[key]
+            else:
+                continue
+            frames[key] = _rows_to_frame(_sheet_rows(worksheet, engine), index_col.get(key))
+        return frames
+    finally:
+        workbook.close()
+
+
+def read_excel_sheet(
+    filepath: PathLike,
+    sheet: SheetKey = 0,
+    index_col: Optional[int] = None,
+    engine: str = ENGINE_OPENPYXL,
+) -> pd.DataFrame:
+    """
+    Read one sheet; streaming counterpart of ``pd.read_excel(filepath, sheet)``.
+
+    Raises:
+        ValueError: If the sheet does not exist
+    """
+    frames = read_excel_sheets(
+        filepath, [sheet], {sheet: index_col} if index_col is not None else None, engine=engine
+    )
+    if sheet not in frames:
+        raise ValueError(f"Worksheet {sheet!r} not found in {Path(filepath).name}")
+    return frames[sheet]
@@ -0,0 +1,264 @@
+# MTR DUAT - Streaming Excel Writer
+"""
+Write-only Excel workbooks with shared named styles.
+
+openpyxl's regular ``Workbook`` keeps every cell of every sheet in memory
+until ``save()``, and formatting a cell with fresh ``Font`` / ``Border`` /
+``Alignment`` objects costs a style lookup per cell.  ``StreamingWorkbook``
+uses ``Workbook(write_only=True)``: rows are serialised to a temporary file
+as they are appended, and formatting refers to a ``NamedStyle`` registered
+once per workbook.
+
+Usage::
+
+    with StreamingWorkbook([header_style(), datetime_style(), date_style()]) as book:
+        book.add_frame("Raw Data", raw_df, widths={1: 14})
+        book.add_sheet("Totals", headers, rows, header_style=HEADER_STYLE)
+        book.save(path)
+
+Used by:
+- utils/excel_export.py   (create_dashboard_excel, ENGINE_STREAM)
+- analysis/manpower.py    (export_manpower_excel)
+"""
+
+import datetime
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# Named styles for the formats pandas' openpyxl writer applies
+HEADER_STYLE = "DUAT Header"
+DATETIME_STYLE = "DUAT Datetime"
+DATE_STYLE = "DUAT Date"
+
+# DataFrame rows converted to cells at a time by frame_rows
+FRAME_CHUNK_ROWS = 5000
+
+
+def header_style() -> NamedStyle:
+    """Bold, thin-bordered, centred header (``DataFrame.to_excel`` before pandas 3)."""
+    thin = Side(style="thin")
+    return NamedStyle(
+        name=HEADER_STYLE,
+        font=Font(bold=True),
+        border=Border(left=thin, right=thin, top=thin, bottom=thin),
+        alignment=Alignment(horizontal="center", vertical="top"),
+    )
+
+
+def datetime_style() -> NamedStyle:
+    return NamedStyle(name=DATETIME_STYLE, number_format="YYYY-MM-DD HH:MM:SS")
+
+
+def date_style() -> NamedStyle:
+    return NamedStyle(name=DATE_STYLE, number_format="YYYY-MM-DD")
+
+
+class StreamingWorkbook:
+    """Write-only workbook whose cells are formatted through named styles."""
+
+    def __init__(self, styles: Iterable[NamedStyle] = ()) -> None:
+        self.book = Workbook(write_only=True)
+        self._saved = False
+        for style in styles:
+            self.book.add_named_style(style)
+
+    def add_sheet(
+        self,
+        title: str,
+        headers: Sequence[Any],
+        rows: Iterable[Sequence[Any]],
+        widths: Optional[Dict[int, float]] = None,
+        header_style: Optional[str] = None,
+        cell_style: Optional[str] = None,
+    ) -> int:
+        """
+        Append a sheet and stream *rows* into it.
+
+        Args:
+            title: Sheet name
+            headers: Header row values
+            rows: Row value sequences, consumed lazily
+            widths: 1-based column index -> column width
+            header_style: Named style for the header row
+            cell_style: Named style for every data cell
+
+        Returns:
+            Number of data rows written
+        """
+        ws = self._create_sheet(title, headers, widths, header_style)
+        if cell_style is not None:
+            rows = ([self.cell(ws, value, cell_style) for value in row] for row in rows)
+        return self._append_rows(ws, rows)
+
+    def add_frame(
+        self,
+        title: str,
+        df: pd.DataFrame,
+        index: bool = False,
+        widths: Optional[Dict[int, float]] = None,
+    ) -> int:
+        """
+        Append a sheet holding *df*, laid out like ``DataFrame.to_excel``.
+
+        The header row (and the index column when *index* is true) uses
+        HEADER_STYLE; datetime cells use DATETIME_STYLE / DATE_STYLE, so
+        those styles must have been registered.
+
+        Returns:
+            Number of data rows written
+        """
+        ws = self._create_sheet(title, frame_headers(df, index), widths, HEADER_STYLE)
+        return self._append_rows(ws, frame_rows(ws, df, index=index, index_style=HEADER_STYLE))
+
+    def _create_sheet(
+        self,
+        title: str,
+        headers: Sequence[Any],
+        widths: Optional[Dict[int, float]],
+        header_style: Optional[str],
+    ):
+        ws = self.book.create_sheet(title)
+        # Column widths are written ahead of the rows in write-only mode
+        for col_idx, width in (widths or {}).items():
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+        ws.append([self.cell(ws, value, header_style) for value in headers])
+        return ws
+
+    @staticmethod
+    def _append_rows(ws, rows: Iterable[Sequence[Any]]) -> int:
+        count = 0
+        for row in rows:
+            ws.append(row)
+            count += 1
+        return count
+
+    @staticmethod
+    def cell(ws, value: Any, style: Optional[str]) -> Any:
+        """Wrap *value* in a styled ``WriteOnlyCell`` (plain value when unstyled)."""
+        if style is None or isinstance(value, Cell):
+            return value
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    def save(self, path: PathLike) -> None:
+        self.book.save(Path(path))
+        self._saved = True
+
+    def close(self) -> None:
+        """Discard the temporary sheet files of a workbook that was never saved."""
+        if self._saved:
+            return
+        for ws in self.book.worksheets:
+            try:
+                if not ws.closed:
+                    ws.close()
+                ws._writer.cleanup()
+            except (OSError, ValueError) as exc:
+                logger.debug("Could not discard sheet %s: %s", ws.title, exc)
+        self._saved = True
+
+    def __enter__(self) -> "StreamingWorkbook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# DataFrame rows
+# ---------------------------------------------------------------------------
+
+
+def _column_cells(ws, series: pd.Series, style: Optional[str] = None) -> List[Any]:
+    """Excel-ready values of one column: NA -> None, numpy -> Python."""
+    mask = series.isna().to_numpy()
+    dtype = series.dtype
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        values = series.dt.to_pydatetime().tolist() if dtype.kind == "M" else list(series)
+        style = style or DATETIME_STYLE
+    elif isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        values = series.to_numpy().tolist()
+    elif pd.api.types.is_string_dtype(dtype) and not pd.api.types.is_object_dtype(dtype):
+        values = series.to_numpy(dtype=object).tolist()
+    else:
+        values = [_cell_value(v) for v in series.tolist()]
+
+    if mask.any():
+        for idx in np.flatnonzero(mask):
+            values[idx] = None
+    if style is not None:
+        return [None if v is None else StreamingWorkbook.cell(ws, v, _value_style(v, style)) for v in values]
+    if pd.api.types.is_object_dtype(dtype):
+        # Mixed columns: only the date values need a number format
+        return [
+            StreamingWorkbook.cell(ws, v, _value_style(v, DATETIME_STYLE)) if isinstance(v, datetime.date) else v
+            for v in values
+        ]
+    return values
+
+
+def _value_style(value: Any, style: str) -> str:
+    """DATE_STYLE instead of DATETIME_STYLE for plain ``date`` values."""
+    if style == DATETIME_STYLE and not isinstance(value, datetime.datetime):
+        return DATE_STYLE
+    return style
+
+
+def _cell_value(value: Any) -> Any:
+    """Convert one object-column value the way pandas' Excel writer does."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds() / 86400
+    return str(value)
+
+
+def frame_rows(
+    ws,
+    df: pd.DataFrame,
+    index: bool = False,
+    index_style: Optional[str] = None,
+    chunk_rows: int = FRAME_CHUNK_ROWS,
+) -> Iterator[List[Any]]:
+    """
+    Yield the data rows of *df* as values / styled cells for sheet *ws*.
+
+    Rows are converted *chunk_rows* at a time (column by column within a
+    chunk), so only one chunk of cells is held in memory while the sheet
+    is written.  Datetime and date cells get the pandas number formats
+    through DATETIME_STYLE / DATE_STYLE.
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        columns = [_column_cells(ws, chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+        if index:
+            columns.insert(0, _column_cells(ws, chunk.index.to_series(), index_style))
+        for row in zip(*columns):
+            yield list(row)
+
+
+def frame_headers(df: pd.DataFrame, index: bool = False) -> List[Any]:
+    headers = [_cell_value(c) for c in df.columns]
+    if index:
+        headers.insert(0, df.index.name if df.index.name is not None else None)
+    return headers
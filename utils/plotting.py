@@ -0,0 +1,25 @@
+# MTR DUAT - Plotting Helpers
+"""
+Lazy access to matplotlib's pyplot on the headless Agg backend.
+
+Importing pyplot costs a few hundred milliseconds, which used to be paid
+by every analysis import before the sidecar could bind its port.  Plot
+functions call ``get_pyplot()`` instead, so matplotlib loads on the first
+rendered chart (usually inside a chart worker process).
+
+Used by:
+- analysis/scurve.py       (plot_scurve)
+- analysis/performance.py  (plot_performance_chart, plot_cumulative_progress)
+"""
+
+import sys
+
+
+def get_pyplot():
+    """Return ``matplotlib.pyplot``, selecting the Agg backend on first import."""
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    return plt